@@ -13,14 +13,19 @@ from typing import Any
 from fastapi import FastAPI
 
 from app.middleware.metadata_enrichment import EnrichmentConfig, MetadataEnrichmentMiddleware
-from app.services.alert_service import AlertCondition, AlertService, AlertType, NotificationChannel
+from app.services.alert_service import (
+    AlertCondition,
+    AlertType,
+    NotificationChannel,
+    get_alert_service,
+)
 from app.services.risk_engine_service import AlertPriority, RiskEngineService
 from app.services.strategy_execution_service import (
     PositionType,
     StrategyConfig,
     StrategyExecutionService,
 )
-from app.services.trailing_stop_service import TrailingStopService, TrailingStopType
+from app.services.trailing_stop_service import TrailingStopType, get_trailing_stop_service
 
 logger = logging.getLogger(__name__)
 
@@ -35,8 +40,8 @@ enrichment_config = EnrichmentConfig(
 metadata_middleware = MetadataEnrichmentMiddleware(config=enrichment_config)
 strategy_service = StrategyExecutionService()
 risk_service = RiskEngineService()
-trailing_service = TrailingStopService()
-alert_service = AlertService()
+trailing_service = get_trailing_stop_service()
+alert_service = get_alert_service()
 
 class StrategyAPIEnriched:
     """Enhanced Strategy API with automatic metadata enrichment"""
@@ -10,13 +10,15 @@ from typing import Any
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 
-logger = logging.getLogger(__name__)
 from app.core.config import settings
 from app.dependencies import get_moneyness_calculator
 from app.schemas.signal_schemas import BatchGreeksRequest, BatchGreeksResponse
 from app.services.bulk_computation_engine import BulkComputationEngine
+from app.services.chain_greeks import ChainGreeks
 from app.services.moneyness_greeks_calculator import MoneynessAwareGreeksCalculator
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/batch", tags=["batch"])
 
 # Batch job storage (in production, use Redis or database)
@@ -51,7 +53,7 @@ async def compute_batch_greeks(
     """
     try:
         start_time = datetime.utcnow()
-        results = {}
+        chains = []
         errors = {}
 
         # Process in parallel batches
@@ -66,17 +68,17 @@ async def compute_batch_greeks(
         # Wait for all batches
         batch_results = await asyncio.gather(*tasks, return_exceptions=True)
 
-        # Aggregate results
+        # Aggregate columnar results; rows are only built for the response
         for batch_result in batch_results:
             if isinstance(batch_result, Exception):
                 logger.error(f"Batch processing error: {batch_result}")
                 continue
 
-            for instrument_key, result in batch_result.items():
-                if "error" in result:
-                    errors[instrument_key] = result["error"]
-                else:
-                    results[instrument_key] = result
+            chain, batch_errors = batch_result
+            chains.append(chain)
+            errors.update(batch_errors)
+
+        results = ChainGreeks.concat(chains).to_instrument_map() if chains else {}
 
         # Calculate computation time
         computation_time_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
@@ -366,8 +368,11 @@ async def process_async_batch_job(
             results = {}
             for instrument_key in parameters.get("instrument_keys", []):
                 try:
-                    greeks = await engine.compute_greeks_batch([instrument_key])
-                    results[instrument_key] = greeks[instrument_key]
+                    chain, errors = await engine.compute_greeks_batch([instrument_key])
+                    if instrument_key in errors:
+                        results[instrument_key] = {"error": errors[instrument_key]}
+                    else:
+                        results[instrument_key] = chain.to_instrument_map()[instrument_key]
                 except Exception as e:
                     results[instrument_key] = {"error": str(e)}
 
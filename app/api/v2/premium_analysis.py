@@ -4,6 +4,8 @@ Premium analysis API endpoints for F&O option chains.
 Provides market vs theoretical price comparison using vectorized calculations.
 """
 
+import time
+from collections import Counter
 from datetime import datetime
 from typing import Any
 
@@ -12,7 +14,7 @@ from pydantic import BaseModel, Field
 
 from app.services.premium_discount_calculator import PremiumDiscountCalculator
 from app.services.vectorized_pyvollib_engine import VectorizedPyvolibGreeksEngine
-from app.utils.logging_utils import log_exception, log_info
+from app.utils.logging_utils import log_exception, log_info, log_warning
 
 router = APIRouter(prefix="/api/v2/signals/fo", tags=["premium-analysis"])
 
@@ -20,6 +22,11 @@ router = APIRouter(prefix="/api/v2/signals/fo", tags=["premium-analysis"])
 vectorized_engine = VectorizedPyvolibGreeksEngine()
 premium_calculator = PremiumDiscountCalculator(vectorized_engine)
 
+# Option chain source for the arbitrage scan, created on first use
+_ticker_adapter = None
+
+SEVERITY_LEVELS = ['LOW', 'MEDIUM', 'HIGH', 'EXTREME']
+
 
 # Pydantic models for request/response
 class OptionData(BaseModel):
@@ -305,7 +312,10 @@ async def premium_analysis_term_structure(request: TermStructureRequest):
 async def get_arbitrage_opportunities(
     symbol: str,
     min_severity: str = Query("MEDIUM", regex="^(LOW|MEDIUM|HIGH|EXTREME)$", description="Minimum mispricing severity"),
-    expiry_date: str | None = Query(None, description="Filter by specific expiry date")
+    expiry_date: str | None = Query(None, description="Filter by specific expiry date"),
+    spot_reference: bool = Query(
+        False, description="Check put-call parity against spot instead of each expiry's median synthetic forward"
+    )
 ):
     """
     Get current arbitrage opportunities based on premium/discount analysis.
@@ -317,15 +327,56 @@ async def get_arbitrage_opportunities(
         symbol: Underlying symbol
         min_severity: Minimum mispricing severity to include
         expiry_date: Optional expiry filter
+        spot_reference: Use the chain's underlying price as the parity reference; the
+            default synthetic forward already prices in dividends and carry
 
     Returns:
         List of arbitrage opportunities with trading recommendations
     """
     try:
         log_info(f"[AGENT-2] Arbitrage scan for {symbol}, min severity: {min_severity}")
+        start_time = time.perf_counter()
 
-        # Placeholder - would implement arbitrage scan
-        return []
+        option_chain = await _fetch_option_chain(symbol, expiry_date)
+        underlying_price = None
+        if spot_reference:
+            underlying_price = next(
+                (row['underlying_price'] for row in option_chain if row.get('underlying_price')), None
+            )
+            if underlying_price is None:
+                raise HTTPException(status_code=503, detail=f"Underlying price unavailable for {symbol}")
+        opportunities = await premium_calculator.calculate_arbitrage_opportunities(option_chain, underlying_price)
+
+        min_rank = SEVERITY_LEVELS.index(min_severity)
+        selected = []
+        for opportunity in opportunities:
+            rank = _severity_rank(opportunity.get('severity'))
+            if rank >= min_rank:
+                selected.append({
+                    'opportunity_id': _opportunity_id(symbol, opportunity),
+                    'symbol': symbol,
+                    'confidence_score': (rank + 1) / len(SEVERITY_LEVELS),
+                    **opportunity
+                })
+        selected.sort(key=lambda opportunity: opportunity['confidence_score'], reverse=True)
+
+        return {
+            'symbol': symbol,
+            'scan_timestamp': datetime.utcnow().isoformat(),
+            'min_severity_filter': min_severity,
+            'expiry_filter': expiry_date,
+            'options_scanned': len(option_chain),
+            'opportunities_found': len(selected),
+            'opportunities': selected,
+            'summary': {
+                'by_type': dict(Counter(opportunity['type'] for opportunity in selected)),
+                'by_severity': dict(Counter(opportunity.get('severity') for opportunity in selected)),
+                'opportunities_below_severity': len(opportunities) - len(selected),
+                'scan_time_ms': (time.perf_counter() - start_time) * 1000
+            }
+        }
+    except HTTPException:
+        raise
     except Exception as e:
         log_exception(f"[AGENT-2] Arbitrage opportunities scan failed: {e}")
         raise HTTPException(status_code=500, detail=f"Arbitrage scan failed: {str(e)}") from e
@@ -364,6 +415,44 @@ async def get_performance_metrics():
 
 
 # Helper functions
+async def _fetch_option_chain(symbol: str, expiry_date: str | None) -> list[dict]:
+    """Option chain rows from ticker_service, in the calculator's row format (503 if unavailable)."""
+    global _ticker_adapter
+    try:
+        if _ticker_adapter is None:
+            from app.adapters.ticker_adapter import EnhancedTickerAdapter
+            _ticker_adapter = EnhancedTickerAdapter()
+        chain = await _ticker_adapter.get_option_chain(symbol, expiry_date)
+    except Exception as e:
+        log_warning(f"[AGENT-2] Option chain unavailable for {symbol}: {e}")
+        raise HTTPException(status_code=503, detail=f"Option chain unavailable for {symbol}") from e
+
+    rows = []
+    for option in chain:
+        row = dict(option)
+        row.setdefault('expiry_date', option.get('expiry', ''))
+        if row.get('market_price') is None:
+            row['market_price'] = option.get('last_price', option.get('ltp'))
+        if expiry_date is None or row['expiry_date'] == expiry_date:
+            rows.append(row)
+    return rows
+
+
+def _severity_rank(severity: str | None) -> int:
+    return SEVERITY_LEVELS.index(severity) if severity in SEVERITY_LEVELS else 0
+
+
+def _opportunity_id(symbol: str, opportunity: dict) -> str:
+    """Stable id of an opportunity: its type, expiry and strikes."""
+    strikes = opportunity.get('strikes') or [
+        opportunity[key] for key in ('strike', 'lower_strike', 'higher_strike') if key in opportunity
+    ]
+    parts = [symbol, opportunity['type'], str(opportunity.get('expiry_date', ''))]
+    if opportunity.get('option_type'):
+        parts.append(str(opportunity['option_type']))
+    return ':'.join(parts + [f'{strike:g}' if isinstance(strike, float) else str(strike) for strike in strikes])
+
+
 def _calculate_summary_stats(results: list[dict]) -> dict[str, Any]:
     """Calculate summary statistics for premium analysis results."""
     if not results:
@@ -108,6 +108,23 @@ class SignalSubscriptionResponse(BaseModel):
     connection_token: str | None = None
 
 
+async def _get_conflation_window(user_id: str, stream_type: str) -> float | None:
+    """Conflation window from the user's tier limits, or None to keep the default."""
+    try:
+        from app.services.stream_abuse_protection import StreamType, get_stream_abuse_protection
+
+        try:
+            resolved_type = StreamType(stream_type)
+        except ValueError:
+            resolved_type = StreamType.COMMON
+
+        protection = await get_stream_abuse_protection()
+        return await protection.get_conflation_window(user_id, resolved_type)
+    except Exception as e:
+        log_warning(f"Using default conflation window for user {user_id}: {e}")
+        return None
+
+
 async def get_sdk_connection_manager() -> ConnectionManager:
     """Get or create SDK connection manager."""
     global sdk_connection_manager
@@ -322,6 +339,7 @@ async def sdk_websocket_endpoint(
     # Store client's allowed streams (populated from subscription response)
     client_allowed_streams = set()
     client_entitlements = {}  # stream_key -> entitlement info
+    conflation_windows = {}  # stream type -> tier conflation window
 
     try:
         # Connect client
@@ -355,11 +373,11 @@ async def sdk_websocket_endpoint(
 
             manager.connection_metadata[client_id].update(base_metadata)
         else:
-            await websocket.send_json({
+            await manager.send_to_client(client_id, {
                 "type": "error",
                 "message": "Invalid connection token"
             })
-            await websocket.close()
+            await manager.close_client(client_id)
             return
 
         # Optionally, fetch allowed streams from the initial subscription response
@@ -377,12 +395,15 @@ async def sdk_websocket_endpoint(
                 # Handle SDK stream key subscription
                 stream_keys = message.get("stream_keys", [])
                 if not stream_keys:
-                    await websocket.send_json({
+                    await manager.send_to_client(client_id, {
                         "type": "error",
                         "message": "No stream_keys provided"
                     })
                     continue
 
+                # Latest-value-only delivery for these streams (for slow clients)
+                conflate = bool(message.get("conflate", False))
+
                 # Get execution token if provided for marketplace streams
                 execution_token = message.get("execution_token")
                 # Stream-specific tokens can be provided as a dict
@@ -419,7 +440,7 @@ async def sdk_websocket_endpoint(
                         )
 
                         if not entitlement_result.is_allowed:
-                            await websocket.send_json({
+                            await manager.send_to_client(client_id, {
                                 "type": "subscription_denied",
                                 "stream_key": stream_key,
                                 "reason": entitlement_result.reason or "Not authorized for this stream"
@@ -500,13 +521,22 @@ async def sdk_websocket_endpoint(
                         log_error(f"Unsupported stream key type: {parsed['type']}")
                         continue
 
+                    if conflate:
+                        sub_message["conflate"] = True
+                        # The slowest flush allowed by any conflated stream's tier applies to the client
+                        if parsed["type"] not in conflation_windows:
+                            conflation_windows[parsed["type"]] = await _get_conflation_window(user_id, parsed["type"])
+                        windows = [w for w in conflation_windows.values() if w is not None]
+                        if windows:
+                            manager.set_conflation_window(client_id, max(windows))
+
                     # Forward to actual subscription handler
                     await manager.subscribe(client_id, sub_message)
 
                     # Already tracked in entitlement check above
 
                 # Send confirmation with stream keys
-                await websocket.send_json({
+                await manager.send_to_client(client_id, {
                     "type": "subscription",
                     "status": "subscribed",
                     "stream_keys": list(client_allowed_streams),
@@ -520,13 +550,13 @@ async def sdk_websocket_endpoint(
 
             elif message_type == "ping":
                 # Respond to ping
-                await websocket.send_json({
+                await manager.send_to_client(client_id, {
                     "type": "pong",
                     "timestamp": datetime.utcnow().isoformat()
                 })
 
             else:
-                await websocket.send_json({
+                await manager.send_to_client(client_id, {
                     "type": "error",
                     "message": f"Unknown message type: {message_type}"
                 })
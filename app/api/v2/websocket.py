@@ -3,6 +3,7 @@ WebSocket API for Real-time Signal Streaming
 Supports 10,000+ concurrent connections with <50ms latency
 """
 import asyncio
+import contextlib
 import json
 import logging
 from datetime import datetime
@@ -10,12 +11,17 @@ from typing import Any
 
 from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
 
-logger = logging.getLogger(__name__)
 from app.core.redis_manager import get_redis_client
 from app.services.moneyness_greeks_calculator import MoneynessAwareGreeksCalculator
+from app.services.pubsub_pool import ShardedPubSubPool
+from app.services.websocket_fanout import DROP_OLDEST, ClientSendQueue, encode_frame
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/subscriptions", tags=["websocket"])
 
+REDIS_CHANNEL_PREFIX = "signal:updates:"
+
 
 class ConnectionManager:
     """
@@ -31,39 +37,64 @@ class ConnectionManager:
         # Subscription routing
         self.subscription_connections: dict[str, set[str]] = {}
 
+        # Per-client send queues, each drained by its own writer task
+        self.send_queues: dict[str, ClientSendQueue] = {}
+        self.send_queue_size = None
+        self.overflow_policy = None
+        self.default_conflation_window = None
+
+        # Subscriptions delivered latest-value-only, per client
+        self.conflated_subscriptions: dict[str, set[str]] = {}
+        self.fanout_metrics = {
+            'broadcasts': 0,
+            'frames_fanned_out': 0,
+            'clients_dropped': 0
+        }
+
         # Service instances
         self.signal_processor = None
         self.moneyness_calculator = None
         self.redis_client = None
-        self.redis_subscriber = None
+        self.pubsub_pool: ShardedPubSubPool | None = None
+
+        # Pattern mode: one psubscribe per channel family instead of one subscribe per key
+        self.pubsub_patterns = False
+        self.pattern_family_counts: dict[str, int] = {}
 
         # Background tasks
         self.heartbeat_task = None
-        self.redis_listener_task = None
 
     async def initialize(self):
         """Initialize the connection manager"""
         self.redis_client = await get_redis_client()
 
-        # CRITICAL FIX: Use async Redis client for pub/sub to avoid blocking event loop
+        # CRITICAL FIX: Use async Redis clients for pub/sub to avoid blocking event loop
         # The sync redis client's pubsub() doesn't have async methods
         try:
             import redis.asyncio as aioredis
 
             from app.core.config import settings
 
-            # Create async Redis client for pub/sub
-            async_redis_client = await aioredis.from_url(
-                settings.REDIS_URL,
-                decode_responses=True,
-                socket_connect_timeout=5,
-                socket_timeout=5
+            async def create_pubsub_client():
+                # No socket timeout: shard listeners block on reads until Redis pushes a message
+                return await aioredis.from_url(
+                    settings.REDIS_URL,
+                    decode_responses=True,
+                    socket_connect_timeout=5
+                )
+
+            self.pubsub_patterns = settings.WEBSOCKET_PUBSUB_PATTERNS
+            self.pubsub_pool = ShardedPubSubPool(
+                create_pubsub_client,
+                self._on_pubsub_message,
+                shards=settings.WEBSOCKET_PUBSUB_SHARDS,
+                name='websocket'
             )
-            self.redis_subscriber = async_redis_client.pubsub()
-            logger.info("Async Redis pub/sub client initialized for WebSocket")
+            await self.pubsub_pool.start()
+            logger.info(f"Async Redis pub/sub pool initialized for WebSocket ({settings.WEBSOCKET_PUBSUB_SHARDS} shards)")
         except Exception as e:
-            logger.error(f"Failed to create async Redis pub/sub: {e}")
-            self.redis_subscriber = None
+            logger.error(f"Failed to create async Redis pub/sub pool: {e}")
+            self.pubsub_pool = None
 
         # Initialize services - use singleton to avoid duplicate resource initialization
         from app.services.signal_processor import get_signal_processor
@@ -77,11 +108,9 @@ class ConnectionManager:
         # Start background tasks
         self.heartbeat_task = asyncio.create_task(self._heartbeat_loop())
 
-        # Start Redis listener if subscriber is available
-        # The listener will wait for subscriptions to be added via _subscribe_to_redis_channel()
-        if self.redis_subscriber:
-            self.redis_listener_task = asyncio.create_task(self._redis_listener())
-            logger.info("WebSocket ConnectionManager initialized with Redis listener")
+        # Shard listeners start with their first subscription via _subscribe_to_redis_channel()
+        if self.pubsub_pool:
+            logger.info("WebSocket ConnectionManager initialized with Redis pub/sub pool")
         else:
             logger.warning("WebSocket ConnectionManager initialized WITHOUT Redis listener (pubsub unavailable)")
 
@@ -91,19 +120,93 @@ class ConnectionManager:
         self.active_connections[client_id] = websocket
         self.connection_subscriptions[client_id] = set()
 
+        previous = self.send_queues.pop(client_id, None)
+        if previous:
+            previous.stop()
+        send_queue = self._create_send_queue(client_id, websocket)
+        self.send_queues[client_id] = send_queue
+        send_queue.start()
+
         logger.info(f"Client {client_id} connected. Total connections: {len(self.active_connections)}")
 
         # Send welcome message
-        await self.send_personal_message({
+        await self.send_to_client(client_id, {
             "type": "connection",
             "status": "connected",
             "client_id": client_id,
             "timestamp": datetime.utcnow().isoformat(),
             "server_time": datetime.utcnow().isoformat()
-        }, websocket)
+        })
+
+    def _create_send_queue(self, client_id: str, websocket: WebSocket) -> ClientSendQueue:
+        if None in (self.send_queue_size, self.overflow_policy, self.default_conflation_window):
+            from app.core.config import settings
+            if self.send_queue_size is None:
+                self.send_queue_size = getattr(settings, 'WEBSOCKET_SEND_QUEUE_SIZE', 1000)
+            if self.overflow_policy is None:
+                self.overflow_policy = getattr(settings, 'WEBSOCKET_OVERFLOW_POLICY', DROP_OLDEST)
+            if self.default_conflation_window is None:
+                self.default_conflation_window = getattr(settings, 'WEBSOCKET_CONFLATION_WINDOW_MS', 250) / 1000.0
+
+        return ClientSendQueue(
+            client_id,
+            websocket,
+            max_frames=self.send_queue_size,
+            overflow_policy=self.overflow_policy,
+            on_close=self._on_send_queue_closed,
+            conflation_window=self.default_conflation_window
+        )
+
+    def set_conflation_window(self, client_id: str, window_seconds: float):
+        """Set how often a client's conflated subscriptions are flushed (e.g. from its tier limits)"""
+        send_queue = self.send_queues.get(client_id)
+        if send_queue:
+            send_queue.conflation_window = window_seconds
+
+    def _on_send_queue_closed(self, client_id: str, reason: str):
+        """Writer gave up on a client (send failure or queue overflow): drop the connection."""
+        websocket = self.active_connections.get(client_id)
+        self.fanout_metrics['clients_dropped'] += 1
+        self.disconnect(client_id)
+        if websocket is not None:
+            asyncio.create_task(self._close_websocket(websocket))
+
+    async def close_client(self, client_id: str, code: int = 1000):
+        """Flush a client's queued frames, then close and disconnect it"""
+        send_queue = self.send_queues.get(client_id)
+        if send_queue:
+            await send_queue.drain()
+        websocket = self.active_connections.get(client_id)
+        self.disconnect(client_id)
+        if websocket is not None:
+            await self._close_websocket(websocket, code)
+
+    @staticmethod
+    async def _close_websocket(websocket: WebSocket, code: int = 1008):
+        with contextlib.suppress(Exception):
+            await websocket.close(code=code)
+
+    def get_fanout_metrics(self) -> dict[str, Any]:
+        """Fan-out counters plus per-client queue totals"""
+        queues = list(self.send_queues.values())
+        return {
+            **self.fanout_metrics,
+            'send_queues': len(queues),
+            'queued_frames': sum(q.depth for q in queues),
+            'frames_dropped': sum(q.metrics['frames_dropped'] for q in queues),
+            'frames_conflated': sum(q.metrics['frames_conflated'] for q in queues),
+            'conflated_subscriptions': sum(len(keys) for keys in self.conflated_subscriptions.values()),
+            'max_queue_depth': max((q.metrics['max_queue_depth'] for q in queues), default=0),
+            'overflow_policy': self.overflow_policy
+        }
 
     def disconnect(self, client_id: str):
         """Handle client disconnection"""
+        send_queue = self.send_queues.pop(client_id, None)
+        if send_queue:
+            send_queue.stop()
+        self.conflated_subscriptions.pop(client_id, None)
+
         if client_id in self.active_connections:
             # Remove from active connections
             del self.active_connections[client_id]
@@ -129,8 +232,12 @@ class ConnectionManager:
             "type": "subscribe",
             "channel": "greeks|indicators|moneyness",
             "instrument_key": "EXCHANGE@SYMBOL@...",
-            "params": {...}
+            "params": {...},
+            "conflate": false
         }
+
+        With "conflate": true only the latest update for the subscription is
+        kept while the client is behind, flushed once per conflation window.
         """
         channel = subscription.get("channel")
         instrument_key = subscription.get("instrument_key")
@@ -148,6 +255,11 @@ class ConnectionManager:
 
         # Add subscription
         self.connection_subscriptions[client_id].add(sub_key)
+        conflate = bool(subscription.get("conflate", False))
+        if conflate:
+            self.conflated_subscriptions.setdefault(client_id, set()).add(sub_key)
+        else:
+            self._discard_conflation(client_id, sub_key)
 
         if sub_key not in self.subscription_connections:
             self.subscription_connections[sub_key] = set()
@@ -163,6 +275,7 @@ class ConnectionManager:
             "channel": channel,
             "instrument_key": instrument_key,
             "subscription_key": sub_key,
+            "conflated": conflate,
             "timestamp": datetime.utcnow().isoformat()
         })
 
@@ -188,6 +301,7 @@ class ConnectionManager:
         # Remove subscription
         if client_id in self.connection_subscriptions:
             self.connection_subscriptions[client_id].discard(sub_key)
+        self._discard_conflation(client_id, sub_key)
 
         if sub_key in self.subscription_connections:
             self.subscription_connections[sub_key].discard(client_id)
@@ -204,18 +318,26 @@ class ConnectionManager:
             "timestamp": datetime.utcnow().isoformat()
         })
 
+    def _discard_conflation(self, client_id: str, sub_key: str):
+        conflated = self.conflated_subscriptions.get(client_id)
+        if conflated and sub_key in conflated:
+            conflated.discard(sub_key)
+            send_queue = self.send_queues.get(client_id)
+            if send_queue:
+                send_queue.discard_slot(sub_key)
+
     async def send_personal_message(self, message: dict, websocket: WebSocket):
-        """Send message to specific WebSocket"""
+        """Send message directly to a WebSocket, bypassing its send queue"""
         try:
             await websocket.send_json(message)
         except Exception as e:
             logger.error(f"Error sending personal message: {e}")
 
-    async def send_to_client(self, client_id: str, message: dict):
-        """Send message to specific client"""
-        if client_id in self.active_connections:
-            websocket = self.active_connections[client_id]
-            await self.send_personal_message(message, websocket)
+    async def send_to_client(self, client_id: str, message: dict | str):
+        """Queue a message (dict or pre-serialized JSON frame) for a specific client"""
+        send_queue = self.send_queues.get(client_id)
+        if send_queue:
+            send_queue.enqueue(message if isinstance(message, str) else encode_frame(message))
 
     async def send_error(self, client_id: str, error_message: str):
         """Send error message to client"""
@@ -225,19 +347,35 @@ class ConnectionManager:
             "timestamp": datetime.utcnow().isoformat()
         })
 
-    async def broadcast_to_subscription(self, sub_key: str, data: dict):
-        """Broadcast data to all clients subscribed to a key"""
-        if sub_key in self.subscription_connections:
-            # Create tasks for parallel sending
-            tasks = []
-            for client_id in self.subscription_connections[sub_key]:
-                if client_id in self.active_connections:
-                    websocket = self.active_connections[client_id]
-                    tasks.append(self.send_personal_message(data, websocket))
+    async def broadcast_to_subscription(self, sub_key: str, data: dict | str):
+        """
+        Broadcast data to all clients subscribed to a key.
 
-            # Send to all clients in parallel
-            if tasks:
-                await asyncio.gather(*tasks, return_exceptions=True)
+        The payload is serialized once (a str is taken as an already serialized
+        JSON frame) and the same frame is queued for every subscriber; the
+        per-client writers do the actual sends. Clients that subscribed with
+        conflation get the frame in the subscription's slot instead, replacing
+        any value they have not been sent yet.
+        """
+        client_ids = self.subscription_connections.get(sub_key)
+        if not client_ids:
+            return
+
+        frame = data if isinstance(data, str) else encode_frame(data)
+        self.fanout_metrics['broadcasts'] += 1
+
+        conflated = self.conflated_subscriptions
+        # Copy: an overflowing client is disconnected (and unsubscribed) mid-loop
+        for client_id in list(client_ids):
+            send_queue = self.send_queues.get(client_id)
+            if not send_queue:
+                continue
+            if sub_key in conflated.get(client_id, ()):
+                queued = send_queue.conflate(sub_key, frame)
+            else:
+                queued = send_queue.enqueue(frame)
+            if queued:
+                self.fanout_metrics['frames_fanned_out'] += 1
 
     async def _send_initial_data(self, client_id: str, channel: str, instrument_key: str, params: dict):
         """Send initial data upon subscription"""
@@ -303,56 +441,55 @@ class ConnectionManager:
 
     async def _subscribe_to_redis_channel(self, sub_key: str):
         """Subscribe to Redis channel for updates"""
-        channel = f"signal:updates:{sub_key}"
-        await self.redis_subscriber.subscribe(channel)
+        if not self.pubsub_pool:
+            logger.warning(f"No Redis pub/sub pool - {sub_key} will not receive live updates")
+            return
+
+        if self.pubsub_patterns:
+            family = sub_key.split(':', 1)[0]
+            self.pattern_family_counts[family] = self.pattern_family_counts.get(family, 0) + 1
+            if self.pattern_family_counts[family] == 1:
+                pattern = f"{REDIS_CHANNEL_PREFIX}{family}:*"
+                await self.pubsub_pool.psubscribe(pattern)
+                logger.info(f"Subscribed to Redis pattern: {pattern}")
+            return
+
+        channel = f"{REDIS_CHANNEL_PREFIX}{sub_key}"
+        await self.pubsub_pool.subscribe(channel)
         logger.info(f"Subscribed to Redis channel: {channel}")
 
     async def _unsubscribe_from_redis_channel(self, sub_key: str):
         """Unsubscribe from Redis channel"""
-        channel = f"signal:updates:{sub_key}"
-        await self.redis_subscriber.unsubscribe(channel)
-        logger.info(f"Unsubscribed from Redis channel: {channel}")
-
-    async def _redis_listener(self):
-        """Listen for Redis updates and broadcast to WebSocket clients"""
-        # Safety guard: Exit if redis_subscriber is not available
-        if not self.redis_subscriber:
-            logger.error("Redis listener cannot start - redis_subscriber is None")
+        if not self.pubsub_pool:
             return
 
-        # Initialize pub/sub connection without dummy subscription
-        # Connection will be established when first real subscription occurs
-        try:
-            # Just validate the connection is ready
-            await self.redis_subscriber.ping()
-            logger.info("Redis listener initialized - ready for subscriptions")
-        except Exception as e:
-            logger.error(f"Failed to initialize Redis pub/sub: {e}")
+        if self.pubsub_patterns:
+            family = sub_key.split(':', 1)[0]
+            remaining = self.pattern_family_counts.get(family, 0) - 1
+            if remaining > 0:
+                self.pattern_family_counts[family] = remaining
+                return
+            self.pattern_family_counts.pop(family, None)
+            pattern = f"{REDIS_CHANNEL_PREFIX}{family}:*"
+            await self.pubsub_pool.punsubscribe(pattern)
+            logger.info(f"Unsubscribed from Redis pattern: {pattern}")
             return
 
-        while True:
-            try:
-                message = await self.redis_subscriber.get_message(
-                    ignore_subscribe_messages=True,
-                    timeout=1.0
-                )
-
-                if message and message['data']:
-                    # Parse the message
-                    channel = message['channel'].decode('utf-8')
-                    if channel.startswith('signal:updates:'):
-                        sub_key = channel.replace('signal:updates:', '')
+        channel = f"{REDIS_CHANNEL_PREFIX}{sub_key}"
+        await self.pubsub_pool.unsubscribe(channel)
+        logger.info(f"Unsubscribed from Redis channel: {channel}")
 
-                        try:
-                            data = json.loads(message['data'])
-                            # Broadcast to all subscribed clients
-                            await self.broadcast_to_subscription(sub_key, data)
-                        except json.JSONDecodeError:
-                            logger.error(f"Invalid JSON in Redis message: {message['data']}")
+    async def _on_pubsub_message(self, channel: str, payload: str | bytes):
+        """Broadcast a Redis update to the WebSocket clients subscribed to its key"""
+        if not channel.startswith(REDIS_CHANNEL_PREFIX):
+            return
 
-            except Exception as e:
-                logger.exception(f"Error in Redis listener: {e}")
-                await asyncio.sleep(1)
+        # Publishers write JSON, so the payload is forwarded as the frame
+        # as-is instead of being decoded and re-encoded per client. In pattern
+        # mode keys nobody on this pod subscribed to are dropped by the lookup.
+        if isinstance(payload, bytes):
+            payload = payload.decode('utf-8')
+        await self.broadcast_to_subscription(channel[len(REDIS_CHANNEL_PREFIX):], payload)
 
     async def _heartbeat_loop(self):
         """Send periodic heartbeat to all connections"""
@@ -360,25 +497,16 @@ class ConnectionManager:
             try:
                 await asyncio.sleep(30)  # 30 second heartbeat
 
-                # Send heartbeat to all connections
-                heartbeat = {
+                # Send heartbeat to all connections; writers that fail to
+                # deliver it disconnect their client
+                heartbeat = encode_frame({
                     "type": "heartbeat",
                     "timestamp": datetime.utcnow().isoformat(),
                     "connections": len(self.active_connections)
-                }
-
-                # Create tasks for parallel sending
-                disconnected = []
-
-                for client_id, websocket in self.active_connections.items():
-                    try:
-                        await websocket.send_json(heartbeat)
-                    except Exception:
-                        disconnected.append(client_id)
+                })
 
-                # Clean up disconnected clients
-                for client_id in disconnected:
-                    self.disconnect(client_id)
+                for send_queue in list(self.send_queues.values()):
+                    send_queue.enqueue(heartbeat)
 
             except Exception as e:
                 logger.exception(f"Error in heartbeat loop: {e}")
@@ -388,21 +516,22 @@ class ConnectionManager:
         # Cancel background tasks
         if self.heartbeat_task:
             self.heartbeat_task.cancel()
-        if self.redis_listener_task:
-            self.redis_listener_task.cancel()
 
         # Close all connections
+        closing = encode_frame({
+            "type": "connection",
+            "status": "closing",
+            "message": "Server shutting down"
+        })
+        for client_id in list(self.active_connections.keys()):
+            await self.send_to_client(client_id, closing)
+        await asyncio.gather(*(q.drain() for q in self.send_queues.values()), return_exceptions=True)
         for client_id in list(self.active_connections.keys()):
-            await self.send_to_client(client_id, {
-                "type": "connection",
-                "status": "closing",
-                "message": "Server shutting down"
-            })
             self.disconnect(client_id)
 
-        # Close Redis connection
-        if self.redis_subscriber:
-            await self.redis_subscriber.close()
+        # Close Redis pub/sub connections
+        if self.pubsub_pool:
+            await self.pubsub_pool.close()
 
 
 # Global connection manager
@@ -479,5 +608,7 @@ async def websocket_health_check():
         "component": "websocket",
         "active_connections": len(manager.active_connections),
         "active_subscriptions": len(manager.subscription_connections),
+        "fanout": manager.get_fanout_metrics(),
+        "pubsub": manager.pubsub_pool.get_metrics() if manager.pubsub_pool else None,
         "timestamp": datetime.utcnow().isoformat()
     }
@@ -297,6 +297,28 @@ class SignalServiceConfig:
         self.MAX_BATCH_SIZE = _get_config_int("MAX_BATCH_SIZE", 100)
         self.MAX_CPU_CORES = _get_config_int("MAX_CPU_CORES", 4)
 
+        # Memory budget of the shared historical bar cache
+        self.HISTORICAL_BAR_CACHE_MAX_MB = _get_config_int("HISTORICAL_BAR_CACHE_MAX_MB", 256)
+        # Seconds the latest, possibly still forming, historical bars are served from memory
+        self.HISTORICAL_TAIL_TTL_SECONDS = _get_config_int("HISTORICAL_TAIL_TTL_SECONDS", 15)
+        # Symbols per bulk request to ticker_service's historical context API
+        self.HISTORICAL_BATCH_MAX_SYMBOLS = _get_config_int("HISTORICAL_BATCH_MAX_SYMBOLS", 25)
+        # Use ticker_service's bulk historical endpoint (off: one request per symbol)
+        self.HISTORICAL_BATCH_ENABLED = _get_config_bool("HISTORICAL_BATCH_ENABLED", False)
+
+        # Indicator process pool (0 workers runs every indicator in-process)
+        self.INDICATOR_PROCESS_POOL_WORKERS = _get_config_int("INDICATOR_PROCESS_POOL_WORKERS", 0)
+        self.INDICATOR_PROCESS_POOL_CATEGORIES = _get_config_str(
+            "INDICATOR_PROCESS_POOL_CATEGORIES", "smart_money,clustering"
+        )
+
+        # Tick of the timer wheel that schedules periodic/on-close config computations
+        self.SCHEDULER_RESOLUTION_SECONDS = _get_config_int("SCHEDULER_RESOLUTION_SECONDS", 1)
+        # Most due batches of scheduled computations dispatched at once
+        self.SCHEDULER_MAX_IN_FLIGHT_BATCHES = _get_config_int("SCHEDULER_MAX_IN_FLIGHT_BATCHES", 4)
+        # Seconds after a bar's bucket ends before a bar with no later tick is closed
+        self.BAR_CLOSE_DELAY_SECONDS = _get_config_int("BAR_CLOSE_DELAY_SECONDS", 2)
+
         # Greeks calculation config (can come from config_service)
         greeks_rate = _get_from_config_service("GREEKS_RISK_FREE_RATE", required=False, is_secret=False, default="0.06")
         self.GREEKS_RISK_FREE_RATE = float(greeks_rate)
@@ -310,6 +332,16 @@ class SignalServiceConfig:
         # WebSocket Config
         self.WEBSOCKET_MAX_CONNECTIONS = _get_config_int("WEBSOCKET_MAX_CONNECTIONS", 10000)
         self.WEBSOCKET_HEARTBEAT_INTERVAL = _get_config_int("WEBSOCKET_HEARTBEAT_INTERVAL", 30)
+        # Per-client send queue; a client that falls behind either loses its oldest
+        # frames (drop_oldest) or is disconnected (disconnect)
+        self.WEBSOCKET_SEND_QUEUE_SIZE = _get_config_int("WEBSOCKET_SEND_QUEUE_SIZE", 1000)
+        self.WEBSOCKET_OVERFLOW_POLICY = _get_config_str("WEBSOCKET_OVERFLOW_POLICY", "drop_oldest")
+        # Flush interval for conflated subscriptions when the client's tier does not set one
+        self.WEBSOCKET_CONFLATION_WINDOW_MS = _get_config_int("WEBSOCKET_CONFLATION_WINDOW_MS", 250)
+        # Redis pub/sub connections that websocket subscriptions are hashed across;
+        # pattern mode psubscribes once per channel family instead of once per key
+        self.WEBSOCKET_PUBSUB_SHARDS = _get_config_int("WEBSOCKET_PUBSUB_SHARDS", 4)
+        self.WEBSOCKET_PUBSUB_PATTERNS = _get_config_bool("WEBSOCKET_PUBSUB_PATTERNS", False)
 
         # Subscription Config
         self.DEFAULT_SUBSCRIPTION_LEASE_SECONDS = _get_config_int("DEFAULT_SUBSCRIPTION_LEASE_SECONDS", 300)
@@ -195,13 +195,13 @@ class ThresholdMetricsCollector:
             priority=priority
         ).inc()
 
-    def record_threshold_check(self, indicator: str, tier: str, symbol: str, duration_ms: float):
-        """Record a threshold check"""
+    def record_threshold_check(self, indicator: str, tier: str, symbol: str, duration_ms: float, count: int = 1):
+        """Record a threshold check (or count checks that shared one computation)"""
         self.metrics['threshold_checks_total'].labels(
             indicator=indicator,
             tier=tier,
             symbol=symbol
-        ).inc()
+        ).inc(count)
 
         self.metrics['threshold_check_duration_seconds'].labels(
             indicator=indicator,
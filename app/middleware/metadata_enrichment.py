@@ -14,13 +14,14 @@ import asyncio
 import json
 import logging
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
 from functools import wraps
 from typing import Any
 
 from app.sdk import InstrumentClient, create_instrument_client
+from app.utils.lru_cache import LRUCache, read_only
 
 logger = logging.getLogger(__name__)
 
@@ -51,65 +52,41 @@ class EnrichmentMetrics:
     last_reset: datetime = field(default_factory=datetime.now)
 
 class MetadataCache:
-    """High-performance metadata cache with TTL"""
+    """
+    High-performance metadata cache with TTL
+
+    Backed by a bounded LRUCache: O(1) get, set and eviction without a lock.
+    Cached metadata is stored read-only, so it is returned without copying.
+    """
 
     def __init__(self, max_size: int = 1000, ttl_seconds: int = 300):
-        self._cache: dict[str, dict[str, Any]] = {}
-        self._timestamps: dict[str, datetime] = {}
         self.max_size = max_size
         self.ttl_seconds = ttl_seconds
-        self._lock = asyncio.Lock()
-
-    async def get(self, instrument_key: str) -> dict[str, Any] | None:
-        """Get cached metadata for instrument"""
-        async with self._lock:
-            if instrument_key not in self._cache:
-                return None
+        self._cache = LRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
 
-            # Check TTL
-            timestamp = self._timestamps[instrument_key]
-            if datetime.now() - timestamp > timedelta(seconds=self.ttl_seconds):
-                del self._cache[instrument_key]
-                del self._timestamps[instrument_key]
-                return None
+    async def get(self, instrument_key: str) -> Mapping[str, Any] | None:
+        """Get cached metadata for instrument (read-only)"""
+        return self._cache.get(instrument_key)
 
-            return self._cache[instrument_key].copy()
-
-    async def set(self, instrument_key: str, metadata: dict[str, Any]):
+    async def set(self, instrument_key: str, metadata: Mapping[str, Any]):
         """Cache metadata for instrument"""
-        async with self._lock:
-            # Implement LRU eviction if cache is full
-            if len(self._cache) >= self.max_size and instrument_key not in self._cache:
-                # Remove oldest entry
-                oldest_key = min(self._timestamps, key=self._timestamps.get)
-                del self._cache[oldest_key]
-                del self._timestamps[oldest_key]
-
-            self._cache[instrument_key] = metadata.copy()
-            self._timestamps[instrument_key] = datetime.now()
-
-    async def batch_get(self, instrument_keys: list[str]) -> dict[str, dict[str, Any]]:
-        """Get multiple cached metadata entries"""
-        result = {}
-        for key in instrument_keys:
-            cached = await self.get(key)
-            if cached:
-                result[key] = cached
-        return result
+        self._cache.set(instrument_key, read_only(metadata))
+
+    async def batch_get(self, instrument_keys: list[str]) -> dict[str, Mapping[str, Any]]:
+        """Get multiple cached metadata entries in one pass"""
+        return self._cache.get_many(instrument_keys)
 
     async def clear(self):
         """Clear all cached metadata"""
-        async with self._lock:
-            self._cache.clear()
-            self._timestamps.clear()
+        self._cache.clear()
 
     def get_stats(self) -> dict[str, Any]:
         """Get cache statistics"""
         return {
-            "size": len(self._cache),
-            "max_size": self.max_size,
-            "ttl_seconds": self.ttl_seconds,
-            "memory_usage_kb": len(json.dumps(self._cache).encode()) / 1024
+            **self._cache.get_stats(),
+            "memory_usage_kb": sum(
+                len(json.dumps(dict(metadata), default=str)) for metadata in self._cache.values()
+            ) / 1024
         }
 
 class MetadataEnrichmentMiddleware:
@@ -239,12 +216,13 @@ class MetadataEnrichmentMiddleware:
             Enriched metadata dictionary
         """
         metadata_map = await self._get_metadata_batch([instrument_key])
-        return metadata_map.get(instrument_key, {
+        # Cached metadata is read-only; callers get their own dict
+        return dict(metadata_map.get(instrument_key, {
             "symbol": "Unknown",
             "exchange": "Unknown",
             "sector": "Unknown",
             "enrichment_status": "failed"
-        })
+        }))
 
     async def enrich_market_data(self, market_data: dict[str, Any]) -> dict[str, Any]:
         """
@@ -335,10 +313,8 @@ class MetadataEnrichmentMiddleware:
             return
 
         # Only fetch keys not already cached
-        uncached_keys = []
-        for key in instrument_keys:
-            if await self.cache.get(key) is None:
-                uncached_keys.append(key)
+        cached = await self.cache.batch_get(instrument_keys)
+        uncached_keys = [key for key in instrument_keys if key not in cached]
 
         if uncached_keys:
             # Fetch and cache in background
@@ -458,7 +434,7 @@ class MetadataEnrichmentMiddleware:
     def _filter_metadata_fields(self, metadata: dict[str, Any]) -> dict[str, Any]:
         """Filter metadata fields based on configuration"""
         if not self.config.include_fields:
-            return metadata
+            return dict(metadata)
 
         filtered = {}
         for field_name in self.config.include_fields:
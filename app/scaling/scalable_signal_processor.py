@@ -645,6 +645,9 @@ class ScalableSignalProcessor:
         for worker in self.computation_workers:
             worker.stop()
 
+        if self.pandas_ta_executor:
+            self.pandas_ta_executor.close()
+
         # Unregister pod
         await self.assignment_manager.unregister_pod(self.pod_id)
 
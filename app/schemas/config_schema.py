@@ -128,6 +128,13 @@ class SignalConfigData(BaseModel):
     # Processing options
     parallel_execution: bool = Field(True, description="Execute computations in parallel")
     max_concurrent: int = Field(5, description="Maximum concurrent computations", ge=1, le=20)
+    coalesce_ticks: bool = Field(
+        False, description="Compute only the latest tick when several arrive in one stream batch"
+    )
+
+    class Config:
+        # Validated instances are shared across ticks by the ConfigHandler index
+        frozen = True
 
     @validator('instrument_key')
     def validate_instrument_key(self, v):
@@ -0,0 +1,236 @@
+"""
+Price-level index for alert evaluation on the tick path.
+
+Price threshold alerts are kept per instrument in two sorted arrays: one for
+"price above" levels and one for "price below" levels. A price update finds
+every crossed level with a single bisect, and the triggered alerts are one
+contiguous slice that is removed in one operation. Other alerts are tracked by
+instrument so they can be looked up without scanning every active alert.
+Expirations are kept in a min-heap. Entries for alerts that were removed early
+are skipped when they surface (lazy deletion).
+"""
+
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right
+
+ABOVE = 'above'
+BELOW = 'below'
+
+
+class _LevelBook:
+    """Sorted threshold levels with the alert id stored at each level."""
+
+    __slots__ = ('levels', 'alert_ids')
+
+    def __init__(self):
+        self.levels = array('d')
+        self.alert_ids: list[str] = []
+
+    def add(self, level: float, alert_id: str):
+        # bisect_right keeps alerts at the same level in creation order
+        position = bisect_right(self.levels, level)
+        self.levels.insert(position, level)
+        self.alert_ids.insert(position, alert_id)
+
+    def remove(self, level: float, alert_id: str) -> bool:
+        start = bisect_left(self.levels, level)
+        end = bisect_right(self.levels, level, start)
+        try:
+            position = self.alert_ids.index(alert_id, start, end)
+        except ValueError:
+            return False
+        del self.levels[position]
+        del self.alert_ids[position]
+        return True
+
+    def pop_through(self, price: float) -> list[str]:
+        """Remove and return alerts with level <= price (crossed from below)."""
+        end = bisect_right(self.levels, price)
+        return self._pop_slice(0, end)
+
+    def pop_from(self, price: float) -> list[str]:
+        """Remove and return alerts with level >= price (crossed from above)."""
+        start = bisect_left(self.levels, price)
+        return self._pop_slice(start, len(self.levels))
+
+    def _pop_slice(self, start: int, end: int) -> list[str]:
+        if start >= end:
+            return []
+        alert_ids = self.alert_ids[start:end]
+        del self.levels[start:end]
+        del self.alert_ids[start:end]
+        return alert_ids
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+
+class AlertPriceIndex:
+    """Per-instrument price-level and expiry index for active alerts."""
+
+    # Rebuild the expiry heap once stale entries outnumber live ones by this factor
+    HEAP_COMPACTION_FACTOR = 2
+
+    def __init__(self):
+        self._above: dict[str, _LevelBook] = {}
+        self._below: dict[str, _LevelBook] = {}
+        self._instrument_alerts: dict[str, dict[str, str | None]] = {}  # instrument -> alert_id -> side
+        self._entries: dict[str, tuple[str, str | None, float, float | None]] = {}
+        self._expiries: list[tuple[float, str]] = []
+        self.metrics = {
+            'lookups': 0,
+            'crossed': 0,
+            'expired': 0
+        }
+
+    def add(self,
+            alert_id: str,
+            instrument_key: str,
+            side: str | None = None,
+            level: float = 0.0,
+            expires_at: float | None = None):
+        """
+        Index an active alert.
+
+        Args:
+            alert_id: Alert identifier
+            instrument_key: Instrument the alert watches
+            side: ABOVE or BELOW for price level alerts, None for other alerts
+            level: Price threshold for ABOVE/BELOW alerts
+            expires_at: Expiry as a POSIX timestamp, None if the alert never expires
+        """
+        if alert_id in self._entries:
+            self.remove(alert_id)
+
+        if side == ABOVE:
+            self._above.setdefault(instrument_key, _LevelBook()).add(level, alert_id)
+        elif side == BELOW:
+            self._below.setdefault(instrument_key, _LevelBook()).add(level, alert_id)
+        elif side is not None:
+            raise ValueError(f"Unknown price level side: {side}")
+
+        self._instrument_alerts.setdefault(instrument_key, {})[alert_id] = side
+        self._entries[alert_id] = (instrument_key, side, level, expires_at)
+
+        if expires_at is not None:
+            heapq.heappush(self._expiries, (expires_at, alert_id))
+            self._compact_expiries()
+
+    def remove(self, alert_id: str) -> bool:
+        """Remove an alert from the index; False if it was not indexed."""
+        entry = self._entries.pop(alert_id, None)
+        if entry is None:
+            return False
+
+        instrument_key, side, level, _ = entry
+        if side is not None:
+            books = self._above if side == ABOVE else self._below
+            book = books[instrument_key]
+            book.remove(level, alert_id)
+            if not book:
+                del books[instrument_key]
+
+        self._forget(instrument_key, (alert_id,))
+        return True
+
+    def pop_crossed(self, instrument_key: str, price: float) -> list[str]:
+        """
+        Remove and return the price level alerts crossed by price.
+
+        "Above" alerts trigger when price >= level and "below" alerts trigger
+        when price <= level. Alerts at the same level come back in creation order.
+
+        Args:
+            instrument_key: Instrument the price belongs to
+            price: Latest traded price
+
+        Returns:
+            List: Triggered alert ids, above alerts first
+        """
+        self.metrics['lookups'] += 1
+        crossed = []
+
+        above = self._above.get(instrument_key)
+        if above is not None:
+            crossed.extend(above.pop_through(price))
+            if not above:
+                del self._above[instrument_key]
+
+        below = self._below.get(instrument_key)
+        if below is not None:
+            crossed.extend(below.pop_from(price))
+            if not below:
+                del self._below[instrument_key]
+
+        if crossed:
+            for alert_id in crossed:
+                del self._entries[alert_id]
+            self._forget(instrument_key, crossed)
+            self.metrics['crossed'] += len(crossed)
+
+        return crossed
+
+    def pop_expired(self, now: float) -> list[str]:
+        """Remove and return alerts whose expiry is at or before now."""
+        expired = []
+        while self._expiries and self._expiries[0][0] <= now:
+            expires_at, alert_id = heapq.heappop(self._expiries)
+            entry = self._entries.get(alert_id)
+            # Skip stale heap entries for alerts removed or re-added since they were pushed
+            if entry is None or entry[3] != expires_at:
+                continue
+            self.remove(alert_id)
+            expired.append(alert_id)
+
+        self.metrics['expired'] += len(expired)
+        return expired
+
+    def alert_ids(self, instrument_key: str) -> list[str]:
+        """All indexed alert ids for an instrument, in creation order."""
+        return list(self._instrument_alerts.get(instrument_key, ()))
+
+    def unleveled_alert_ids(self, instrument_key: str) -> list[str]:
+        """Alert ids for an instrument that are not price level alerts."""
+        alerts = self._instrument_alerts.get(instrument_key, {})
+        return [alert_id for alert_id, side in alerts.items() if side is None]
+
+    def has_alerts(self, instrument_key: str) -> bool:
+        return instrument_key in self._instrument_alerts
+
+    @property
+    def instruments(self) -> set[str]:
+        """Instrument keys with at least one indexed alert."""
+        return set(self._instrument_alerts)
+
+    def __contains__(self, alert_id: str) -> bool:
+        return alert_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_metrics(self) -> dict[str, int]:
+        return {
+            **self.metrics,
+            'indexed_alerts': len(self._entries),
+            'instruments': len(self._instrument_alerts),
+            'pending_expiries': len(self._expiries)
+        }
+
+    def _forget(self, instrument_key: str, alert_ids):
+        alerts = self._instrument_alerts.get(instrument_key)
+        if alerts is None:
+            return
+        for alert_id in alert_ids:
+            alerts.pop(alert_id, None)
+        if not alerts:
+            del self._instrument_alerts[instrument_key]
+
+    def _compact_expiries(self):
+        if len(self._expiries) <= self.HEAP_COMPACTION_FACTOR * len(self._entries) + 64:
+            return
+        self._expiries = [
+            (entry[3], alert_id) for alert_id, entry in self._entries.items()
+            if entry[3] is not None
+        ]
+        heapq.heapify(self._expiries)
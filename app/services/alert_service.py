@@ -20,6 +20,7 @@ from enum import Enum
 from typing import Any
 
 from app.sdk import InstrumentClient, create_instrument_client
+from app.services.alert_price_index import ABOVE, BELOW, AlertPriceIndex
 
 logger = logging.getLogger(__name__)
 
@@ -144,6 +145,9 @@ class AlertService:
         self._user_preferences: dict[str, UserAlertPreferences] = {}
         self._notifications: dict[str, AlertNotification] = {}
 
+        # Price levels and expiries of active alerts, kept in step with _active_alerts
+        self._price_index = AlertPriceIndex()
+
         # Monitoring and processing
         self._price_subscriptions: dict[str, dict[str, Any]] = {}
         self._monitoring_task: asyncio.Task | None = None
@@ -231,6 +235,7 @@ class AlertService:
 
         # Store alert
         self._active_alerts[alert_id] = alert
+        self._index_alert(alert)
 
         # Initialize user alert history if needed
         if user_id not in self._alert_history:
@@ -311,11 +316,34 @@ class AlertService:
     # PRICE MONITORING AND ALERT CHECKING
     # =============================================================================
 
+    def _index_alert(self, alert: PriceAlert):
+        """Add an active alert to the price-level and expiry index"""
+        condition_type = alert.condition.condition_type
+        if condition_type == AlertType.PRICE_ABOVE:
+            side = ABOVE
+        elif condition_type == AlertType.PRICE_BELOW:
+            side = BELOW
+        else:
+            side = None
+
+        self._price_index.add(
+            alert.alert_id,
+            alert.instrument_key,
+            side=side,
+            level=float(alert.condition.value),
+            expires_at=alert.expires_at.timestamp() if alert.expires_at else None
+        )
+
+    def _deactivate_alert(self, alert_id: str) -> PriceAlert | None:
+        """Remove an alert from the active set and the index"""
+        self._price_index.remove(alert_id)
+        return self._active_alerts.pop(alert_id, None)
+
     async def _add_price_monitoring(self, instrument_key: str):
         """Add price monitoring for instrument alerts"""
         if instrument_key not in self._price_subscriptions:
             self._price_subscriptions[instrument_key] = {
-                "last_price": 0.0,
+                "last_price": None,
                 "last_update": datetime.now(),
                 "alert_count": 0
             }
@@ -326,23 +354,43 @@ class AlertService:
         if self._monitoring_task is None or self._monitoring_task.done():
             self._monitoring_task = asyncio.create_task(self._price_monitoring_loop())
 
+    async def on_price_update(self, instrument_key: str, price: float):
+        """
+        Evaluate alerts for an instrument against a real tick
+
+        Called by the tick consumer (through TickPriceFeed) for every traded
+        price. Instruments without alerts return after a single dict lookup.
+
+        Args:
+            instrument_key: Instrument the tick belongs to
+            price: Latest traded price
+        """
+        subscription = self._price_subscriptions.get(instrument_key)
+        if subscription is None:
+            return
+
+        subscription["last_price"] = price
+        subscription["last_update"] = datetime.now()
+
+        self._expire_due_alerts()
+        await self._check_instrument_alerts(instrument_key, price)
+
+    def watched_instruments(self) -> frozenset[str]:
+        """Instruments with active price alerts, whose ticks must be read"""
+        return frozenset(self._price_subscriptions)
+
     async def _price_monitoring_loop(self):
-        """Main price monitoring loop for all subscribed instruments"""
+        """
+        Housekeeping loop for alert expiry and subscription cleanup
+
+        Price evaluation is driven by on_price_update(); this loop only expires
+        alerts on instruments that are not ticking.
+        """
         logger.info("Starting alert service price monitoring loop")
 
         try:
             while True:
-                if not self._price_subscriptions:
-                    await asyncio.sleep(self.check_interval)
-                    continue
-
-                # Check prices for all monitored instruments
-                tasks = []
-                for instrument_key in list(self._price_subscriptions.keys()):
-                    tasks.append(self._check_instrument_alerts(instrument_key))
-
-                if tasks:
-                    await asyncio.gather(*tasks, return_exceptions=True)
+                self._expire_due_alerts()
 
                 # Clean up inactive subscriptions
                 await self._cleanup_price_subscriptions()
@@ -358,39 +406,54 @@ class AlertService:
             await asyncio.sleep(5)
             self._monitoring_task = asyncio.create_task(self._price_monitoring_loop())
 
-    async def _check_instrument_alerts(self, instrument_key: str):
-        """Check all alerts for a specific instrument"""
+    def _expire_due_alerts(self, now: datetime | None = None):
+        """Expire alerts whose expiry time has passed"""
+        now = now or datetime.now()
+        for alert_id in self._price_index.pop_expired(now.timestamp()):
+            alert = self._active_alerts.pop(alert_id, None)
+            if alert is None:
+                continue
+            alert.status = AlertStatus.EXPIRED
+            self._alert_history.setdefault(alert.user_id, []).append(alert)
+            logger.info(f"Alert expired: {alert_id}")
+
+    async def _check_instrument_alerts(self, instrument_key: str, current_price: float):
+        """Check alerts for a specific instrument against the current price"""
         try:
-            # Get current price (simplified - would use real market data)
-            import random
-            base_price = 150.0  # Mock base price
-            current_price = base_price * (1 + random.uniform(-0.05, 0.05))
-
-            # Update subscription
-            subscription = self._price_subscriptions[instrument_key]
-            subscription["last_price"] = current_price
-            subscription["last_update"] = datetime.now()
-
-            # Find alerts for this instrument
-            instrument_alerts = [
-                alert for alert in self._active_alerts.values()
-                if alert.instrument_key == instrument_key and alert.status == AlertStatus.ACTIVE
+            # Price level alerts: one bisect per side finds every crossed threshold
+            triggered = [
+                self._active_alerts[alert_id]
+                for alert_id in self._price_index.pop_crossed(instrument_key, current_price)
+                if alert_id in self._active_alerts
             ]
+            for alert in triggered:
+                await self._run_alert_check(alert, self._trigger_alert(alert, current_price))
 
-            for alert in instrument_alerts:
-                try:
-                    await self._evaluate_alert(alert, current_price)
-                except Exception as e:
-                    logger.error(f"Failed to evaluate alert {alert.alert_id}: {e}")
-                    alert._check_failures += 1
-
-                    if alert._check_failures >= self.max_check_failures:
-                        alert.status = AlertStatus.ERROR
-                        logger.error(f"Alert {alert.alert_id} marked as error after {self.max_check_failures} failures")
+            # Remaining alert types are evaluated individually
+            for alert_id in self._price_index.unleveled_alert_ids(instrument_key):
+                alert = self._active_alerts.get(alert_id)
+                if alert is not None and alert.status == AlertStatus.ACTIVE:
+                    await self._run_alert_check(alert, self._evaluate_alert(alert, current_price))
 
         except Exception as e:
             logger.error(f"Failed to check alerts for {instrument_key}: {e}")
 
+    async def _run_alert_check(self, alert: PriceAlert, check):
+        """Await an alert check, counting failures towards the error threshold"""
+        try:
+            await check
+        except Exception as e:
+            logger.error(f"Failed to evaluate alert {alert.alert_id}: {e}")
+            alert._check_failures += 1
+
+            if alert._check_failures >= self.max_check_failures:
+                alert.status = AlertStatus.ERROR
+                self._price_index.remove(alert.alert_id)
+                logger.error(f"Alert {alert.alert_id} marked as error after {self.max_check_failures} failures")
+            elif alert.status == AlertStatus.ACTIVE and alert.alert_id not in self._price_index:
+                # Re-arm a price level alert that was popped but not delivered
+                self._index_alert(alert)
+
     async def _evaluate_alert(self, alert: PriceAlert, current_price: float):
         """Evaluate individual alert condition"""
         alert._last_check = datetime.now()
@@ -398,6 +461,8 @@ class AlertService:
         # Check expiration
         if alert.expires_at and datetime.now() > alert.expires_at:
             alert.status = AlertStatus.EXPIRED
+            self._deactivate_alert(alert.alert_id)
+            self._alert_history.setdefault(alert.user_id, []).append(alert)
             logger.info(f"Alert expired: {alert.alert_id}")
             return
 
@@ -461,8 +526,7 @@ class AlertService:
         self._alert_history[alert.user_id].append(alert)
 
         # Remove from active alerts (one-time trigger)
-        if alert.alert_id in self._active_alerts:
-            del self._active_alerts[alert.alert_id]
+        self._deactivate_alert(alert.alert_id)
 
     async def _send_notification(self, notification: AlertNotification, channel: NotificationChannel):
         """Send notification through specific channel"""
@@ -511,7 +575,7 @@ class AlertService:
             metadata = type('obj', (object,), {'symbol': 'Unknown', 'exchange': 'Unknown'})(...)
 
         # Remove from active alerts
-        del self._active_alerts[alert_id]
+        self._deactivate_alert(alert_id)
 
         logger.info(f"Alert cancelled: {alert_id}")
 
@@ -595,8 +659,7 @@ class AlertService:
                 "status": alert.status.value,
                 "created_at": alert.created_at.isoformat()
             }
-            for alert in self._active_alerts.values()
-            if alert.instrument_key == instrument_key
+            for alert in (self._active_alerts[alert_id] for alert_id in self._price_index.alert_ids(instrument_key))
         ]
 
         return {
@@ -701,17 +764,10 @@ class AlertService:
 
     async def _cleanup_price_subscriptions(self):
         """Clean up inactive price subscriptions"""
-        instruments_to_remove = []
-
-        for instrument_key, _subscription in self._price_subscriptions.items():
-            # Check if any active alerts exist for this instrument
-            has_active_alerts = any(
-                alert.instrument_key == instrument_key and alert.status == AlertStatus.ACTIVE
-                for alert in self._active_alerts.values()
-            )
-
-            if not has_active_alerts:
-                instruments_to_remove.append(instrument_key)
+        instruments_to_remove = [
+            instrument_key for instrument_key in self._price_subscriptions
+            if not self._price_index.has_alerts(instrument_key)
+        ]
 
         for instrument_key in instruments_to_remove:
             del self._price_subscriptions[instrument_key]
@@ -726,7 +782,8 @@ class AlertService:
                 "active_alerts": len(self._active_alerts),
                 "monitored_instruments": len(self._price_subscriptions),
                 "registered_users": len(self._user_preferences),
-                "total_notifications": len(self._notifications)
+                "total_notifications": len(self._notifications),
+                "price_index": self._price_index.get_metrics()
             },
             "configuration": {
                 "check_interval": self.check_interval,
@@ -744,3 +801,14 @@ class AlertService:
                 await self._monitoring_task
 
         logger.info("Alert service shutdown complete")
+
+
+_alert_service: AlertService | None = None
+
+
+def get_alert_service() -> AlertService:
+    """Process-wide alert service shared by the API and the tick consumer."""
+    global _alert_service
+    if _alert_service is None:
+        _alert_service = AlertService()
+    return _alert_service
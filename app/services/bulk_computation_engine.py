@@ -8,8 +8,13 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
+import numpy as np
 from scipy.stats import norm
 
+from app.core.config import settings
+from app.services.chain_greeks import ChainGreeks
+from app.services.implied_volatility_solver import get_implied_volatility_solver
+from app.services.vectorized_greeks_kernel import GREEK_NAMES, compute_greeks
 from app.utils.logging_config import get_logger
 from app.utils.redis import get_redis_client
 
@@ -136,33 +141,46 @@ class GreeksCalculator:
         risk_free_rate: float,
         option_type: str
     ) -> float:
-        """Calculate implied volatility using Newton-Raphson method"""
+        """Calculate implied volatility using the shared batched solver (NaN if unsolvable)"""
 
         if time_to_expiry <= 0:
-            return 0.0
-
-        # Initial guess
-        volatility = 0.2
+            return float('nan')
 
-        for _ in range(100):  # Max iterations
-            try:
-                price = GreeksCalculator.black_scholes_price(spot, strike, time_to_expiry, risk_free_rate, volatility, option_type)
-                vega = GreeksCalculator.calculate_vega(spot, strike, time_to_expiry, risk_free_rate, volatility)
+        return float(GreeksCalculator.calculate_implied_volatilities(
+            [market_price], spot, [strike], time_to_expiry, risk_free_rate, [option_type]
+        )[0])
 
-                if abs(vega) < 1e-6:
-                    break
-
-                price_diff = price - market_price
-                if abs(price_diff) < 0.01:  # Convergence threshold
-                    break
+    @staticmethod
+    def calculate_implied_volatilities(
+        market_prices: list[float],
+        spot: float,
+        strikes: list[float],
+        time_to_expiry: float,
+        risk_free_rate: float,
+        option_types: list[str],
+        keys: list[str] | None = None
+    ) -> np.ndarray:
+        """
+        Calculate implied volatilities for a batch of options in one solve.
 
-                volatility = volatility - price_diff / vega
-                volatility = max(0.01, min(5.0, volatility))  # Constrain volatility
+        Newton with a bisection fallback over the whole batch, warm-started from
+        the previous IV of each keyed option. Returns NaN where no IV exists.
+        """
 
-            except (ValueError, ZeroDivisionError, OverflowError):
-                break
+        if time_to_expiry <= 0 or not market_prices:
+            return np.full(len(market_prices), np.nan)
 
-        return max(0.01, min(5.0, volatility))
+        result = get_implied_volatility_solver().solve(
+            'black_scholes',
+            market_prices,
+            [option_type == 'CE' for option_type in option_types],
+            spot,
+            strikes,
+            time_to_expiry,
+            risk_free_rate,
+            keys=keys
+        )
+        return result.implied_volatilities
 
     @staticmethod
     def calculate_delta(
@@ -499,8 +517,18 @@ class BulkComputationEngine:
             from app.adapters.ticker_adapter import EnhancedTickerAdapter
             ticker_adapter = EnhancedTickerAdapter()
 
+        # IV and Greeks for the whole batch in one solve and one kernel pass
+        chain = None
+        if compute_greeks and options:
+            chain = self._compute_chain_greeks(
+                options,
+                np.full(len(options), underlying_price),
+                np.full(len(options), time_to_expiry),
+                risk_free_rate
+            )
+
         try:
-            for option in options:
+            for i, option in enumerate(options):
                 try:
                     # Create a copy to avoid modifying the original
                     updated_option = OptionData(
@@ -516,39 +544,17 @@ class BulkComputationEngine:
                         ask=option.ask
                     )
 
-                    if compute_greeks and option.ltp > 0:
-                        # Calculate implied volatility first
-                        iv = GreeksCalculator.calculate_implied_volatility(
-                            option.ltp,
-                            underlying_price,
-                            option.strike_price,
-                            time_to_expiry,
-                            risk_free_rate,
-                            option.option_type
-                        )
-                        updated_option.iv = round(iv, 4)
-
-                        # Calculate Greeks using implied volatility
-                        if iv > 0:
-                            updated_option.delta = round(GreeksCalculator.calculate_delta(
-                                underlying_price, option.strike_price, time_to_expiry, risk_free_rate, iv, option.option_type
-                            ), 4)
-
-                            updated_option.gamma = round(GreeksCalculator.calculate_gamma(
-                                underlying_price, option.strike_price, time_to_expiry, risk_free_rate, iv
-                            ), 6)
-
-                            updated_option.theta = round(GreeksCalculator.calculate_theta(
-                                underlying_price, option.strike_price, time_to_expiry, risk_free_rate, iv, option.option_type
-                            ), 4)
-
-                            updated_option.vega = round(GreeksCalculator.calculate_vega(
-                                underlying_price, option.strike_price, time_to_expiry, risk_free_rate, iv
-                            ), 4)
-
-                            updated_option.rho = round(GreeksCalculator.calculate_rho(
-                                underlying_price, option.strike_price, time_to_expiry, risk_free_rate, iv, option.option_type
-                            ), 4)
+                    if chain is not None and option.ltp > 0:
+                        iv = float(chain.implied_volatilities[i])
+
+                        # An unsolvable IV stays None rather than reading as a real 0.0
+                        if np.isfinite(iv) and iv > 0:
+                            updated_option.iv = round(iv, 4)
+                            updated_option.delta = round(float(chain.greeks['delta'][i]), 4)
+                            updated_option.gamma = round(float(chain.greeks['gamma'][i]), 6)
+                            updated_option.theta = round(float(chain.greeks['theta'][i]), 4)
+                            updated_option.vega = round(float(chain.greeks['vega'][i]), 4)
+                            updated_option.rho = round(float(chain.greeks['rho'][i]), 4)
 
                     if compute_technical_indicators:
                         # Calculate technical indicators using historical data
@@ -596,6 +602,116 @@ class BulkComputationEngine:
 
         return updated_options
 
+    async def compute_greeks_batch(self, instrument_keys: list[str]) -> tuple[ChainGreeks, dict[str, str]]:
+        """
+        Compute Greeks for option instruments from their latest market snapshots.
+
+        Snapshots are read from market:latest:{instrument_key} in a single MGET and
+        need strike_price, option_type, expiry_date, ltp and underlying_price.
+
+        Args:
+            instrument_keys: Option instrument keys
+
+        Returns:
+            Tuple of (ChainGreeks keyed by instrument, error message per skipped instrument)
+        """
+        if self.redis is None:
+            self.redis = await get_redis_client()
+
+        payloads = await self.redis.mget([f"market:latest:{key}" for key in instrument_keys])
+
+        options = []
+        underlying_prices = []
+        errors = {}
+        for instrument_key, payload in zip(instrument_keys, payloads, strict=True):
+            if not payload:
+                errors[instrument_key] = "No market data available"
+                continue
+            try:
+                data = json.loads(payload)
+                options.append(OptionData(
+                    instrument_key=instrument_key,
+                    symbol=data.get('symbol', ''),
+                    strike_price=float(data['strike_price']),
+                    option_type=data['option_type'],
+                    expiry_date=data['expiry_date'],
+                    ltp=float(data['ltp']),
+                    volume=data.get('volume', 0),
+                    oi=data.get('oi', 0),
+                    bid=data.get('bid', 0.0),
+                    ask=data.get('ask', 0.0)
+                ))
+                underlying_prices.append(float(data['underlying_price']))
+            except (KeyError, TypeError, ValueError) as e:
+                errors[instrument_key] = f"Invalid market data: {e}"
+
+        if not options:
+            return ChainGreeks.empty(GREEK_NAMES), errors
+
+        times_to_expiry = np.array([self._calculate_time_to_expiry(opt.expiry_date) for opt in options])
+        chain = self._compute_chain_greeks(
+            options,
+            np.asarray(underlying_prices),
+            times_to_expiry,
+            settings.GREEKS_RISK_FREE_RATE
+        )
+        return chain, errors
+
+    def _compute_chain_greeks(
+        self,
+        options: list[OptionData],
+        underlying_prices: np.ndarray,
+        times_to_expiry: np.ndarray,
+        risk_free_rate: float
+    ) -> ChainGreeks:
+        """
+        Solve IV and compute Black-Scholes Greeks for every option as columns.
+
+        Options without a traded price, an IV or time left get NaN Greeks.
+        """
+        n_options = len(options)
+        strikes = np.array([opt.strike_price for opt in options], dtype=np.float64)
+        ltps = np.array([opt.ltp for opt in options], dtype=np.float64)
+        is_call = np.array([opt.option_type == 'CE' for opt in options], dtype=bool)
+
+        implied_vols = np.full(n_options, np.nan)
+        priced = np.flatnonzero((ltps > 0) & (times_to_expiry > 0))
+        if priced.size:
+            implied_vols[priced] = get_implied_volatility_solver().solve(
+                'black_scholes',
+                ltps[priced],
+                is_call[priced],
+                underlying_prices[priced],
+                strikes[priced],
+                times_to_expiry[priced],
+                risk_free_rate,
+                keys=[options[i].instrument_key for i in priced]
+            ).implied_volatilities
+
+        greeks = {greek: np.full(n_options, np.nan) for greek in GREEK_NAMES}
+        solved = np.flatnonzero(implied_vols > 0)
+        if solved.size:
+            values = compute_greeks(
+                'black_scholes',
+                is_call[solved],
+                underlying_prices[solved],
+                strikes[solved],
+                times_to_expiry[solved],
+                risk_free_rate,
+                implied_vols[solved]
+            )
+            for greek, column in values.items():
+                greeks[greek][solved] = column
+
+        return ChainGreeks.from_arrays(
+            strikes,
+            [opt.expiry_date for opt in options],
+            [opt.option_type for opt in options],
+            greeks,
+            instrument_keys=[opt.instrument_key for opt in options],
+            implied_volatilities=implied_vols
+        )
+
     def _calculate_time_to_expiry(self, expiry_date: str) -> float:
         """Calculate time to expiry in years"""
 
@@ -0,0 +1,290 @@
+"""
+Columnar Greeks result for a whole option chain.
+
+ChainGreeks stores a chain as one float64 array per Greek, aligned with
+strike, expiry and option type key columns. The engine, the premium/discount
+calculator and the batch API pass it along unchanged. It only becomes
+per-option rows at the HTTP or Redis boundary (to_rows / to_json).
+
+Indexing and iteration build row dicts on demand, so callers that read a few
+options as if it were a list keep working without converting the whole chain.
+"""
+
+import json
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any
+
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+CALL_TYPES = ('CE', 'CALL', 'C')
+
+
+@dataclass(frozen=True, eq=False)
+class ChainGreeks:
+    """
+    Struct of NumPy arrays holding Greeks for every option in a chain.
+
+    Missing values (failed validation, unsupported Greek) are NaN and are
+    emitted as None/null when rows or JSON are produced.
+    """
+    strikes: np.ndarray
+    expiries: np.ndarray          # object array of the caller's expiry values
+    option_types: np.ndarray      # 'CE' / 'PE'
+    greeks: dict[str, np.ndarray] = field(default_factory=dict)
+    instrument_keys: np.ndarray | None = None
+    implied_volatilities: np.ndarray | None = None
+
+    @classmethod
+    def from_arrays(
+        cls,
+        strikes: np.ndarray | Sequence[float],
+        expiries: np.ndarray | Sequence[Any],
+        option_types: np.ndarray | Sequence[str],
+        greeks: dict[str, np.ndarray],
+        instrument_keys: Sequence[str] | None = None,
+        implied_volatilities: np.ndarray | Sequence[float] | None = None
+    ) -> 'ChainGreeks':
+        """Build a chain from column arrays, normalising option types to CE/PE."""
+        strikes = np.asarray(strikes, dtype=np.float64)
+        types = np.asarray(option_types, dtype=str)
+        is_call = np.isin(np.char.upper(types), CALL_TYPES) if types.size else np.zeros(0, dtype=bool)
+
+        return cls(
+            strikes=strikes,
+            expiries=_object_array(expiries),
+            option_types=np.where(is_call, 'CE', 'PE'),
+            greeks={name: np.asarray(values, dtype=np.float64) for name, values in greeks.items()},
+            instrument_keys=_object_array(instrument_keys) if instrument_keys is not None else None,
+            implied_volatilities=(
+                np.asarray(implied_volatilities, dtype=np.float64)
+                if implied_volatilities is not None else None
+            )
+        )
+
+    @classmethod
+    def from_rows(
+        cls,
+        option_chain_data: Sequence[dict],
+        rows: Sequence[dict],
+        greeks_to_calculate: Sequence[str]
+    ) -> 'ChainGreeks':
+        """
+        Build a chain from per-option Greek dicts (legacy and fallback paths).
+
+        Args:
+            option_chain_data: Option metadata with strike, expiry_date and option_type
+            rows: One Greeks dict per option, aligned with option_chain_data
+            greeks_to_calculate: Greek columns to keep
+
+        Returns:
+            Chain truncated to the shorter of option_chain_data and rows
+        """
+        n_options = min(len(option_chain_data), len(rows))
+        option_chain_data = option_chain_data[:n_options]
+        rows = rows[:n_options]
+
+        greeks = {
+            name: np.array(
+                [_float_or_nan(row.get(name)) if row else np.nan for row in rows],
+                dtype=np.float64
+            )
+            for name in greeks_to_calculate
+        }
+        return cls.from_arrays(
+            [_float_or_nan(opt.get('strike')) for opt in option_chain_data],
+            [opt.get('expiry_date') for opt in option_chain_data],
+            [str(opt.get('option_type', '')) for opt in option_chain_data],
+            greeks,
+            instrument_keys=_optional_keys(option_chain_data)
+        )
+
+    @classmethod
+    def concat(cls, chains: Sequence['ChainGreeks']) -> 'ChainGreeks':
+        """Concatenate chains (e.g. one per expiry) keeping only Greeks present in all of them."""
+        chains = [chain for chain in chains if chain is not None and len(chain)]
+        if not chains:
+            return cls.empty()
+        if len(chains) == 1:
+            return chains[0]
+
+        names = [name for name in chains[0].greeks if all(name in c.greeks for c in chains[1:])]
+        keyed = all(c.instrument_keys is not None for c in chains)
+        with_iv = all(c.implied_volatilities is not None for c in chains)
+
+        return cls(
+            strikes=np.concatenate([c.strikes for c in chains]),
+            expiries=np.concatenate([c.expiries for c in chains]),
+            option_types=np.concatenate([c.option_types for c in chains]),
+            greeks={name: np.concatenate([c.greeks[name] for c in chains]) for name in names},
+            instrument_keys=np.concatenate([c.instrument_keys for c in chains]) if keyed else None,
+            implied_volatilities=(
+                np.concatenate([c.implied_volatilities for c in chains]) if with_iv else None
+            )
+        )
+
+    @classmethod
+    def empty(cls, greeks_to_calculate: Sequence[str] = ()) -> 'ChainGreeks':
+        """Chain with no options."""
+        return cls.from_arrays([], [], [], {name: np.zeros(0) for name in greeks_to_calculate})
+
+    def __len__(self) -> int:
+        return self.strikes.shape[0]
+
+    def __getitem__(self, index: int) -> dict[str, float | None]:
+        """Greeks of one option as a dict (built on demand)."""
+        if not -len(self) <= index < len(self):
+            raise IndexError(f"ChainGreeks index {index} out of range")
+        return {name: _json_float(values[index]) for name, values in self.greeks.items()}
+
+    def __iter__(self) -> Iterator[dict[str, float | None]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def greek_names(self) -> tuple[str, ...]:
+        return tuple(self.greeks)
+
+    @property
+    def is_call(self) -> np.ndarray:
+        return self.option_types == 'CE'
+
+    def column(self, name: str) -> np.ndarray:
+        """Greek column by name; all-NaN when the Greek was not calculated."""
+        values = self.greeks.get(name)
+        return values if values is not None else np.full(len(self), np.nan)
+
+    def take(self, indices: np.ndarray | Sequence[int]) -> 'ChainGreeks':
+        """Sub-chain for the given positions or boolean mask."""
+        indices = np.asarray(indices)
+        return ChainGreeks(
+            strikes=self.strikes[indices],
+            expiries=self.expiries[indices],
+            option_types=self.option_types[indices],
+            greeks={name: values[indices] for name, values in self.greeks.items()},
+            instrument_keys=self.instrument_keys[indices] if self.instrument_keys is not None else None,
+            implied_volatilities=(
+                self.implied_volatilities[indices] if self.implied_volatilities is not None else None
+            )
+        )
+
+    def to_rows(self, include_keys: bool = True) -> list[dict[str, Any]]:
+        """
+        Per-option dicts for JSON responses and Redis payloads.
+
+        Args:
+            include_keys: Include strike, expiry_date, option_type and instrument_key
+
+        Returns:
+            One dict per option, NaN emitted as None
+        """
+        columns: dict[str, list] = {}
+        if include_keys:
+            columns['strike'] = self.strikes.tolist()
+            columns['expiry_date'] = [_json_expiry(e) for e in self.expiries]
+            columns['option_type'] = self.option_types.tolist()
+            if self.instrument_keys is not None:
+                columns['instrument_key'] = self.instrument_keys.tolist()
+        if self.implied_volatilities is not None:
+            columns['implied_volatility'] = _nan_to_none(self.implied_volatilities)
+        for name, values in self.greeks.items():
+            columns[name] = _nan_to_none(values)
+
+        return _zip_rows(columns, len(self))
+
+    def greek_rows(self, names: Sequence[str] | None = None) -> list[dict[str, float | None]]:
+        """
+        Per-option Greek dicts without key columns.
+
+        Args:
+            names: Greeks to include (default: all calculated); missing ones are None
+        """
+        names = list(names) if names is not None else list(self.greeks)
+        return _zip_rows({name: _nan_to_none(self.column(name)) for name in names}, len(self))
+
+    def to_instrument_map(self) -> dict[str, dict[str, float | None]]:
+        """Greeks keyed by instrument key (requires instrument_keys)."""
+        if self.instrument_keys is None:
+            raise ValueError("ChainGreeks has no instrument keys")
+        return dict(zip(self.instrument_keys.tolist(), self.greek_rows(), strict=True))
+
+    def to_columns(self) -> dict[str, Any]:
+        """Column-oriented payload; float columns stay as NumPy arrays for orjson."""
+        payload: dict[str, Any] = {
+            'strike': self.strikes,
+            'expiry_date': [_json_expiry(e) for e in self.expiries],
+            'option_type': self.option_types.tolist(),
+            'greeks': dict(self.greeks)
+        }
+        if self.instrument_keys is not None:
+            payload['instrument_key'] = self.instrument_keys.tolist()
+        if self.implied_volatilities is not None:
+            payload['implied_volatility'] = self.implied_volatilities
+        return payload
+
+    def to_json(self) -> bytes:
+        """Serialize the columnar payload, using orjson's NumPy support when installed."""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(
+                self.to_columns(),
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            )
+
+        payload = self.to_columns()
+        payload['strike'] = self.strikes.tolist()
+        payload['greeks'] = {name: _nan_to_none(values) for name, values in self.greeks.items()}
+        if self.implied_volatilities is not None:
+            payload['implied_volatility'] = _nan_to_none(self.implied_volatilities)
+        return json.dumps(payload).encode()
+
+
+def _zip_rows(columns: dict[str, list], n_rows: int) -> list[dict[str, Any]]:
+    if not columns:
+        return [{} for _ in range(n_rows)]
+    names = list(columns)
+    return [dict(zip(names, row, strict=True)) for row in zip(*columns.values(), strict=True)]
+
+
+def _object_array(values) -> np.ndarray:
+    arr = np.empty(len(values), dtype=object)
+    arr[:] = list(values)
+    return arr
+
+
+def _optional_keys(option_chain_data: Sequence[dict]) -> list[str] | None:
+    keys = [opt.get('instrument_key') for opt in option_chain_data]
+    return keys if keys and all(key is not None for key in keys) else None
+
+
+def _float_or_nan(value) -> float:
+    try:
+        return float(value) if value is not None else np.nan
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _json_float(value) -> float | None:
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+def _nan_to_none(values: np.ndarray) -> list[float | None]:
+    out = values.tolist()
+    if np.isnan(values).any():
+        for i in np.flatnonzero(np.isnan(values)):
+            out[i] = None
+    return out
+
+
+def _json_expiry(value) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
@@ -0,0 +1,159 @@
+"""
+Per-tick computation planning across signal configurations.
+
+All configurations executing on a tick for one instrument are folded into a
+plan of unique computation nodes. Every (interval, indicator, parameters)
+appears once, named with the IndicatorAggregationManager key scheme, and
+every distinct option Greeks setup once. Each node is computed a single time
+and its result fanned out to every configuration that asked for it, under
+that configuration's own output key.
+"""
+
+import asyncio
+import hashlib
+import json
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+
+def indicator_computation_key(symbol: str, indicator_name: str, timeframe: str, parameters: dict) -> str:
+    """Unique key for an indicator computation (shared with IndicatorAggregationManager)"""
+    # Sort parameters for consistent hashing
+    sorted_params = json.dumps(parameters, sort_keys=True)
+    param_hash = hashlib.md5(sorted_params.encode()).hexdigest()[:8]
+
+    return f"indicator:{symbol}:{indicator_name}:{timeframe}:{param_hash}"
+
+
+def greeks_computation_key(symbol: str, timeframe: str, greeks_config: Any) -> str:
+    """Unique key for an option Greeks computation"""
+    sorted_params = json.dumps(greeks_config.dict(), sort_keys=True)
+    param_hash = hashlib.md5(sorted_params.encode()).hexdigest()[:8]
+
+    return f"greeks:{symbol}:{timeframe}:{param_hash}"
+
+
+def output_settings_key(config: Any) -> str:
+    """Output and cache settings of a configuration, as a stable string"""
+    return json.dumps(config.output.dict(), sort_keys=True)
+
+
+@dataclass
+class IndicatorGroup:
+    """Unique indicators sharing one interval and frequency, computed in one executor call."""
+    template: Any
+    indicators: dict[str, Any] = field(default_factory=dict)
+
+    def to_config(self) -> Any:
+        """The template configuration carrying every unique indicator, keyed by node key."""
+        return self.template.copy(update={
+            'technical_indicators': [
+                indicator.copy(update={'output_key': node_key})
+                for node_key, indicator in self.indicators.items()
+            ]
+        })
+
+
+@dataclass
+class ComputationPlan:
+    """
+    Unique indicator and Greeks nodes for one instrument's configurations on a tick.
+
+    Indicator nodes are grouped by (interval, frequency, output settings):
+    interval and frequency shape the executor's response metadata and result
+    cache key, and the group's template configuration decides whether and
+    for how long results are cached.
+    """
+    instrument_key: str
+    indicator_groups: dict[tuple[str, str, str], IndicatorGroup] = field(default_factory=dict)
+    greeks_nodes: dict[str, Any] = field(default_factory=dict)
+    indicator_outputs: dict[int, tuple[tuple[str, str, str], list[tuple[str, str]]]] = field(default_factory=dict)
+    greeks_outputs: dict[int, str] = field(default_factory=dict)
+    requested: int = 0
+
+    @classmethod
+    def build(cls, instrument_key: str, configs: Sequence[Any]) -> 'ComputationPlan':
+        plan = cls(instrument_key)
+        for config in configs:
+            interval = config.interval.value
+
+            if config.technical_indicators:
+                group_key = (interval, config.frequency.value, output_settings_key(config))
+                group = plan.indicator_groups.get(group_key)
+                if group is None:
+                    group = plan.indicator_groups[group_key] = IndicatorGroup(config)
+
+                outputs = []
+                for indicator in config.technical_indicators:
+                    node_key = indicator_computation_key(
+                        instrument_key, indicator.name, interval, indicator.parameters or {}
+                    )
+                    group.indicators.setdefault(node_key, indicator)
+                    outputs.append((indicator.output_key, node_key))
+                plan.indicator_outputs[id(config)] = (group_key, outputs)
+                plan.requested += len(outputs)
+
+            if config.option_greeks and config.option_greeks.enabled:
+                node_key = greeks_computation_key(instrument_key, interval, config.option_greeks)
+                plan.greeks_nodes.setdefault(node_key, config)
+                plan.greeks_outputs[id(config)] = node_key
+                plan.requested += 1
+
+        return plan
+
+    @property
+    def unique_nodes(self) -> int:
+        return sum(len(group.indicators) for group in self.indicator_groups.values()) + len(self.greeks_nodes)
+
+
+def fan_out_indicator_results(computed: dict, outputs: list[tuple[str, str]]) -> dict:
+    """One configuration's view of a group response, re-keyed from node keys to its output keys."""
+    if not computed:
+        return {}
+
+    node_results = computed.get('results') or {}
+    results = {
+        output_key: node_results[node_key]
+        for output_key, node_key in outputs
+        if node_key in node_results
+    }
+    return {**computed, 'indicators_count': len(results), 'results': results}
+
+
+class PlannedComputations:
+    """
+    Starts every node of a plan once and serves per-configuration results.
+
+    Awaiting a node from several configurations shares one task, so a failure
+    surfaces in each configuration exactly as its own computation would have.
+    """
+
+    def __init__(
+        self,
+        plan: ComputationPlan,
+        compute_indicators: Callable[[Any], Awaitable[dict]],
+        compute_greeks: Callable[[Any], Awaitable[dict]]
+    ):
+        """
+        Args:
+            plan: Plan for the tick
+            compute_indicators: Computes the technical indicators of a configuration
+            compute_greeks: Computes the option Greeks of a configuration
+        """
+        self.plan = plan
+        self._indicator_tasks = {
+            group_key: asyncio.ensure_future(compute_indicators(group.to_config()))
+            for group_key, group in plan.indicator_groups.items()
+        }
+        self._greeks_tasks = {
+            node_key: asyncio.ensure_future(compute_greeks(config))
+            for node_key, config in plan.greeks_nodes.items()
+        }
+
+    async def technical_indicators(self, config: Any) -> dict:
+        group_key, outputs = self.plan.indicator_outputs[id(config)]
+        return fan_out_indicator_results(await self._indicator_tasks[group_key], outputs)
+
+    async def greeks(self, config: Any) -> dict:
+        return await self._greeks_tasks[self.plan.greeks_outputs[id(config)]]
@@ -2,12 +2,15 @@
 import asyncio
 import json
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
 from app.core.config import settings
 from app.errors import ConfigurationError, InvalidConfigurationError, MissingConfigurationError
 from app.schemas.config_schema import ConfigurationMessage, SignalConfigData
+from app.services.config_index import InstrumentConfigIndex
+from app.services.incremental_bar_builder import Bar, IncrementalBarBuilder
+from app.services.timer_wheel import TimerWheelScheduler
 from app.utils.logging_utils import log_error, log_exception, log_info, log_warning
 
 
@@ -16,14 +19,29 @@ class ConfigHandler:
     Manages the lifecycle of signal service configurations:
     - Validates incoming configurations
     - Caches configurations in Redis
-    - Manages scheduled tasks for configurations
+    - Runs periodic and on-close computations when their interval's bar closes
+      (intervals without a fixed bar length fall back to a shared timer wheel)
     - Handles configuration updates and deletions
     """
 
     def __init__(self, redis_client):
         self.redis_client = redis_client
-        self.active_tasks = {}  # {config_key: asyncio.Task}
         self.current_configs = {}  # In-memory cache of active configs
+        self.config_index = InstrumentConfigIndex()  # instrument_key -> validated configs
+
+        # One timer wheel for every scheduled config; due configs are dispatched as a batch
+        self.scheduler = TimerWheelScheduler(
+            self.execute_scheduled_computations,
+            resolution=settings.SCHEDULER_RESOLUTION_SECONDS,
+            max_in_flight=settings.SCHEDULER_MAX_IN_FLIGHT_BATCHES,
+            name='config_scheduler'
+        )
+
+        # Live bars of every configured interval; their closes trigger scheduled configs
+        self.bar_builder = IncrementalBarBuilder(
+            close_delay=getattr(settings, 'BAR_CLOSE_DELAY_SECONDS', 2)
+        )
+        self.bar_builder.add_listener(self.execute_bar_close_computations)
 
         log_info("ConfigHandler initialized")
 
@@ -68,6 +86,7 @@ class ConfigHandler:
 
             # Add to in-memory cache
             self.current_configs[config_key] = config.dict()
+            self.config_index.upsert(config_key, config)
 
             # Apply configuration (start scheduled tasks if needed)
             await self.apply_config(config)
@@ -91,6 +110,7 @@ class ConfigHandler:
 
             # Update in-memory cache
             self.current_configs[config_key] = config.dict()
+            self.config_index.upsert(config_key, config)
 
             # Apply updated configuration
             await self.apply_config(config)
@@ -125,6 +145,7 @@ class ConfigHandler:
 
             # Remove from in-memory cache
             self.current_configs.pop(config_key, None)
+            self.config_index.remove(config_key)
 
             # Invalidate related cache
             await self.invalidate_cache_for_instrument(instrument_key, interval, frequency)
@@ -135,6 +156,15 @@ class ConfigHandler:
             log_exception(f"Failed to delete config {config_key}: {e}")
             raise
 
+    async def load_config(self, config_data: dict):
+        """Register a configuration restored from the Redis cache (no write-back)"""
+        config = await self.validate_config(config_data)
+        config_key = self.get_config_key(config)
+
+        self.current_configs[config_key] = config.dict()
+        self.config_index.upsert(config_key, config)
+        await self.apply_config(config)
+
     async def store_config(self, config_key: str, config: SignalConfigData):
         """Store configuration in Redis"""
         try:
@@ -149,13 +179,16 @@ class ConfigHandler:
             raise
 
     async def apply_config(self, config: SignalConfigData):
-        """Apply configuration by setting up scheduled tasks"""
+        """Apply configuration by building its interval's bars and setting up scheduled tasks"""
         config_key = self.get_config_key(config)
 
         try:
             # Set up scheduled tasks based on frequency
             if config.frequency.value in ['every_interval', 'on_close']:
                 await self.setup_scheduled_tasks(config_key, config)
+            else:
+                # Tick-driven configs still read the live bars of their interval
+                self.bar_builder.subscribe(config.instrument_key, config.interval.value, config_key)
 
             log_info(f"Applied configuration: {config_key}")
 
@@ -164,101 +197,99 @@ class ConfigHandler:
             raise
 
     async def setup_scheduled_tasks(self, config_key: str, config: SignalConfigData):
-        """Set up scheduled tasks for configuration"""
+        """Set up scheduled computations for configuration"""
         try:
-            # Cancel existing task if any
+            # Cancel existing schedule if any
             await self.cancel_config_tasks(config_key)
 
-            # Create new task based on frequency
-            if config.frequency.value == 'every_interval':
+            # Bar closes of the config's interval trigger it; see execute_bar_close_computations
+            if self.bar_builder.subscribe(config.instrument_key, config.interval.value, config_key):
+                log_info(f"Scheduled {config.frequency.value} computation for {config_key} on {config.interval.value} bar close")
+
+            # Schedule based on frequency
+            elif config.frequency.value == 'every_interval':
                 # Determine interval in seconds
                 interval_seconds = self.parse_interval_to_seconds(config.interval.value)
 
                 if interval_seconds:
-                    task = asyncio.create_task(
-                        self.execute_periodic_computation(config, interval_seconds)
-                    )
-                    self.active_tasks[config_key] = task
-                    log_info(f"Started periodic task for {config_key} (every {interval_seconds}s)")
+                    self.scheduler.schedule(config_key, config, interval_seconds)
+                    log_info(f"Scheduled periodic computation for {config_key} (every {interval_seconds}s)")
 
             elif config.frequency.value == 'on_close':
-                # Set up market close detection task
-                task = asyncio.create_task(
-                    self.execute_on_close_computation(config)
-                )
-                self.active_tasks[config_key] = task
-                log_info(f"Started on-close task for {config_key}")
+                # Fire at the next market close, then daily
+                next_close = self.next_market_close(datetime.now())
+                self.scheduler.schedule(config_key, config, 86400, first_due=next_close.timestamp())
+                log_info(f"Scheduled on-close computation for {config_key} at {next_close.isoformat()}")
 
         except Exception as e:
             log_exception(f"Failed to setup scheduled tasks for {config_key}: {e}")
             raise
 
-    async def execute_periodic_computation(self, config: SignalConfigData, interval_seconds: int):
-        """Execute computation periodically"""
-        config_key = self.get_config_key(config)
-
-        while config_key in self.active_tasks:
-            try:
-                # Wait for the interval
-                await asyncio.sleep(interval_seconds)
-
-                # Check if task is still active (config not deleted)
-                if config_key not in self.active_tasks:
-                    break
-
-                log_info(f"Executing periodic computation for {config_key}")
-
-                # Trigger actual computation via SignalProcessor
-                await self._trigger_computation(config)
+    async def execute_scheduled_computations(self, configs: list[SignalConfigData]):
+        """Run one batch of configs that came due on the same scheduler tick"""
+        periodic = [config for config in configs if config.frequency.value == 'every_interval']
+        on_close = [config for config in configs if config.frequency.value == 'on_close']
 
-            except asyncio.CancelledError:
-                log_info(f"Periodic task cancelled for {config_key}")
-                break
-            except Exception as e:
-                log_exception(f"Error in periodic computation for {config_key}: {e}")
-                # Continue running despite errors
-                await asyncio.sleep(5)
-
-    async def execute_on_close_computation(self, config: SignalConfigData):
-        """Execute computation on market close"""
-        config_key = self.get_config_key(config)
+        await asyncio.gather(
+            self.execute_periodic_computation(periodic),
+            self.execute_on_close_computation(on_close)
+        )
 
-        while config_key in self.active_tasks:
-            try:
-                # Wait until market close (simplified logic)
-                # In reality, this would integrate with market schedule
-                await asyncio.sleep(3600)  # Check every hour
-
-                current_time = datetime.now()
-                if self.is_market_close_time(current_time):
-                    log_info(f"Executing on-close computation for {config_key}")
-                    # Trigger actual computation via SignalProcessor
-                    await self._trigger_computation(config)
-
-            except asyncio.CancelledError:
-                log_info(f"On-close task cancelled for {config_key}")
-                break
-            except Exception as e:
-                log_exception(f"Error in on-close computation for {config_key}: {e}")
-                await asyncio.sleep(60)
+    async def execute_bar_close_computations(self, bars: list[Bar]):
+        """Run the periodic and on-close configs of the intervals whose bars just closed"""
+        due = {}
+        for bar in bars:
+            for config in self.configs_for_instrument(bar.instrument_key):
+                if config.interval.value == bar.interval and config.frequency.value in ('every_interval', 'on_close'):
+                    due[self.get_config_key(config)] = config
+
+        if due:
+            await self.execute_scheduled_computations(list(due.values()))
+
+    async def execute_periodic_computation(self, configs: list[SignalConfigData]):
+        """Execute a batch of due periodic computations"""
+        if configs:
+            log_info(f"Executing periodic computation for {len(configs)} configs")
+            await self._trigger_computation_batch(configs)
+
+    async def execute_on_close_computation(self, configs: list[SignalConfigData]):
+        """Execute a batch of on-close computations"""
+        if configs:
+            log_info(f"Executing on-close computation for {len(configs)} configs")
+            await self._trigger_computation_batch(configs)
 
     async def cancel_config_tasks(self, config_key: str):
-        """Cancel all tasks for a configuration"""
-        if config_key in self.active_tasks:
-            task = self.active_tasks[config_key]
-            task.cancel()
-
-            try:
-                await task
-            except asyncio.CancelledError:
-                # Expected after explicit cancellation - task properly cancelled
-                log_info(f"Task cancelled successfully for {config_key}")
-
-            del self.active_tasks[config_key]
-            log_info(f"Cancelled tasks for {config_key}")
+        """Cancel scheduled computations for a configuration"""
+        unsubscribed = self.bar_builder.unsubscribe(config_key)
+        if self.scheduler.cancel(config_key) or unsubscribed:
+            log_info(f"Cancelled scheduled computations for {config_key}")
+
+    async def _trigger_computation_batch(self, configs: list[SignalConfigData]):
+        """Trigger computations for a batch of configs, merged per instrument"""
+        by_instrument: dict[str, list[SignalConfigData]] = {}
+        for config in configs:
+            by_instrument.setdefault(config.instrument_key, []).append(config)
+
+        results = await asyncio.gather(
+            *(self._trigger_instrument_computation(instrument_key, instrument_configs)
+              for instrument_key, instrument_configs in by_instrument.items()),
+            return_exceptions=True
+        )
+        failed = sum(1 for result in results if isinstance(result, Exception))
+        if failed:
+            log_warning(f"Scheduled computation failed for {failed} of {len(by_instrument)} instruments")
 
     async def _trigger_computation(self, config: SignalConfigData):
         """Trigger actual signal computation for a configuration"""
+        await self._trigger_instrument_computation(config.instrument_key, [config])
+
+    async def _trigger_instrument_computation(self, instrument_key: str, configs: list[SignalConfigData]):
+        """
+        Trigger signal computation for one instrument's due configurations
+
+        Greeks are computed once for the instrument and indicators are merged
+        into a single request, with duplicates across configs removed.
+        """
         try:
             # Import here to avoid circular dependencies
             from app.services.signal_processor import get_signal_processor
@@ -267,54 +298,59 @@ class ConfigHandler:
             processor = await get_signal_processor()
 
             # Trigger computation based on actual config fields (not signal_type which doesn't exist)
-            if config.option_greeks:
+            if any(config.option_greeks for config in configs):
                 # Trigger Greeks calculation using actual method
                 result = await processor.compute_greeks_for_instrument(
-                    instrument_key=config.instrument_key
+                    instrument_key=instrument_key
                 )
-                log_info(f"Triggered Greeks computation for {config.instrument_key}: {result is not None}")
-
-            if config.technical_indicators:
-                # Trigger indicator calculation using actual method
-                # Convert TechnicalIndicatorConfig objects to dict format expected by processor
-                indicators = []
-                for indicator_config in config.technical_indicators:
-                    indicators.append({
+                log_info(f"Triggered Greeks computation for {instrument_key}: {result is not None}")
+
+            # Convert TechnicalIndicatorConfig objects to dict format expected by processor
+            indicators = {}
+            for config in configs:
+                for indicator_config in config.technical_indicators or []:
+                    dedupe_key = (indicator_config.name, json.dumps(indicator_config.parameters, sort_keys=True, default=str))
+                    indicators.setdefault(dedupe_key, {
                         "name": indicator_config.name,
                         "params": indicator_config.parameters
                     })
 
+            if indicators:
+                # Trigger indicator calculation using actual method
                 result = await processor.compute_indicators_for_instrument(
-                    instrument_key=config.instrument_key,
-                    indicators=indicators
+                    instrument_key=instrument_key,
+                    indicators=list(indicators.values())
                 )
-                log_info(f"Triggered indicator computation for {config.instrument_key}: {result is not None}")
+                log_info(f"Triggered indicator computation for {instrument_key}: {result is not None}")
 
-            if config.external_functions:
+            external_configs = [config for config in configs if config.external_functions]
+            if external_configs:
                 # Trigger external function execution using SignalProcessor's existing method
                 from app.schemas.config_schema import TickProcessingContext
 
                 # External functions require real market data for proper execution
                 # Get latest market data - fail fast if unavailable (no synthetic fallback)
-                market_data = await processor._get_latest_market_data(config.instrument_key)
+                market_data = await processor._get_latest_market_data(instrument_key)
                 if not market_data:
-                    log_error(f"No market data available for external function execution: {config.instrument_key}")
-                    log_warning(f"Skipping {len(config.external_functions)} external functions due to missing market data")
+                    log_error(f"No market data available for external function execution: {instrument_key}")
+                    skipped = sum(len(config.external_functions) for config in external_configs)
+                    log_warning(f"Skipping {skipped} external functions due to missing market data")
                 else:
                     context = TickProcessingContext(
                         tick_data=market_data,  # Required field - only real data
-                        instrument_key=config.instrument_key,
+                        instrument_key=instrument_key,
                         timestamp=datetime.utcnow()
                     )
 
-                    result = await processor.compute_external_functions(config, context)
-                    log_info(f"Triggered external function computation for {config.instrument_key}: {result is not None}")
+                    for config in external_configs:
+                        result = await processor.compute_external_functions(config, context)
+                        log_info(f"Triggered external function computation for {instrument_key}: {result is not None}")
 
-            if not config.option_greeks and not config.technical_indicators and not config.external_functions:
-                log_warning(f"No computation types configured for {config.instrument_key}")
+            if not any(config.option_greeks or config.technical_indicators or config.external_functions for config in configs):
+                log_warning(f"No computation types configured for {instrument_key}")
 
         except Exception as e:
-            log_exception(f"Failed to trigger computation for {config.instrument_key}: {e}")
+            log_exception(f"Failed to trigger computation for {instrument_key}: {e}")
             raise
 
     async def get_active_configs(self) -> dict[str, dict]:
@@ -323,17 +359,25 @@ class ConfigHandler:
 
     async def get_configs_for_instrument(self, instrument_key: str) -> list[SignalConfigData]:
         """Get all configurations for a specific instrument"""
-        configs = []
+        return list(self.config_index.get(instrument_key))
 
-        for config_key, config_data in self.current_configs.items():
-            if config_data.get('instrument_key') == instrument_key:
-                try:
-                    config = SignalConfigData(**config_data)
-                    configs.append(config)
-                except Exception as e:
-                    log_exception(f"Failed to parse config {config_key}: {e}")
+    def configs_for_instrument(self, instrument_key: str) -> tuple[SignalConfigData, ...]:
+        """
+        Hot-path lookup of an instrument's validated configurations.
 
-        return configs
+        Returns the shared immutable tuple from the index; no copy, lock or await.
+        """
+        return self.config_index.get(instrument_key)
+
+    @property
+    def active_instruments(self) -> frozenset[str]:
+        """Instrument keys with at least one active configuration"""
+        return self.config_index.instruments
+
+    @property
+    def config_version(self) -> int:
+        """Incremented on every configuration create, update or delete"""
+        return self.config_index.version
 
     async def invalidate_cache_for_config(self, config: SignalConfigData):
         """Invalidate cached data related to configuration"""
@@ -399,10 +443,19 @@ class ConfigHandler:
         # Check if it's around 3:30 PM (15:30)
         return hour == 15 and 25 <= minute <= 35
 
+    def next_market_close(self, current_time: datetime) -> datetime:
+        """Next market close (15:30) at or after current_time (simplified, no holiday calendar)"""
+        close = current_time.replace(hour=15, minute=30, second=0, microsecond=0)
+        if close < current_time:
+            close += timedelta(days=1)
+        return close
+
     async def cleanup(self):
-        """Cleanup all active tasks"""
+        """Stop the scheduler and bar builder and drop all scheduled computations"""
         try:
-            for config_key in list(self.active_tasks.keys()):
+            await self.scheduler.stop()
+            await self.bar_builder.stop()
+            for config_key in list(self.current_configs):
                 await self.cancel_config_tasks(config_key)
             log_info("ConfigHandler cleanup completed")
         except Exception as e:
@@ -412,9 +465,9 @@ class ConfigHandler:
         """Get configuration handler metrics"""
         return {
             "active_configs": len(self.current_configs),
-            "active_tasks": len(self.active_tasks),
-            "task_status": {
-                config_key: "running" if not task.done() else "completed"
-                for config_key, task in self.active_tasks.items()
-            }
+            "indexed_instruments": len(self.config_index.instruments),
+            "config_version": self.config_index.version,
+            "scheduled_configs": len(self.scheduler.wheel),
+            "scheduler": self.scheduler.get_metrics(),
+            "bar_builder": self.bar_builder.get_metrics()
         }
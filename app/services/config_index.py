@@ -0,0 +1,79 @@
+"""
+In-memory instrument → configuration index for the tick hot path.
+
+The index maps each instrument key to an immutable tuple of validated
+configurations. Writers (configuration create/update/delete) touch only the
+affected instrument: its {config_key: config} map is updated and its tuple
+republished, so a change costs O(configs of that instrument) and a bulk load
+stays linear. Readers on the tick path do a plain dict lookup with no lock
+or await; the tuples they get back are never mutated.
+"""
+
+from typing import Any
+
+
+class InstrumentConfigIndex:
+    """Index of configurations keyed by instrument, republished per instrument."""
+
+    def __init__(self):
+        self._configs: dict[str, Any] = {}                        # config_key -> config
+        self._members: dict[str, dict[str, Any]] = {}             # instrument_key -> {config_key: config}
+        self._by_instrument: dict[str, tuple] = {}                # instrument_key -> configs
+        self._instruments: frozenset[str] | None = frozenset()    # rebuilt lazily when the key set changes
+        self.version = 0
+
+    def upsert(self, config_key: str, config: Any):
+        """Add or replace the configuration stored under config_key."""
+        previous = self._configs.get(config_key)
+        self._configs[config_key] = config
+
+        if previous is not None and previous.instrument_key != config.instrument_key:
+            self._discard(previous.instrument_key, config_key)
+        self._members.setdefault(config.instrument_key, {})[config_key] = config
+        self._publish(config.instrument_key)
+        self.version += 1
+
+    def remove(self, config_key: str) -> bool:
+        """Remove the configuration stored under config_key; False if it was not indexed."""
+        previous = self._configs.pop(config_key, None)
+        if previous is None:
+            return False
+
+        self._discard(previous.instrument_key, config_key)
+        self.version += 1
+        return True
+
+    def get(self, instrument_key: str) -> tuple:
+        """Configurations for an instrument (empty tuple when none)."""
+        return self._by_instrument.get(instrument_key, ())
+
+    def get_config(self, config_key: str) -> Any | None:
+        return self._configs.get(config_key)
+
+    @property
+    def instruments(self) -> frozenset[str]:
+        """Instrument keys with at least one configuration."""
+        if self._instruments is None:
+            self._instruments = frozenset(self._by_instrument)
+        return self._instruments
+
+    def __len__(self) -> int:
+        return len(self._configs)
+
+    def _discard(self, instrument_key: str, config_key: str):
+        members = self._members.get(instrument_key)
+        if members is not None:
+            members.pop(config_key, None)
+        self._publish(instrument_key)
+
+    def _publish(self, instrument_key: str):
+        """Swap in a fresh tuple for one instrument (dropping it when empty)."""
+        members = self._members.get(instrument_key)
+        if members:
+            if instrument_key not in self._by_instrument:
+                self._instruments = None
+            self._by_instrument[instrument_key] = tuple(members.values())
+        else:
+            self._members.pop(instrument_key, None)
+            if self._by_instrument.pop(instrument_key, None) is not None:
+                self._instruments = None
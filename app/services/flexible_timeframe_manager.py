@@ -7,9 +7,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Any
 
-import numpy as np
-import pandas as pd
-
+from app.services.timeframe_resampler import BaseBars, MultiTimeframeResampler
 from app.utils.redis import get_redis_client
 from common.storage.database import get_timescaledb_session
 
@@ -50,6 +48,7 @@ class FlexibleTimeframeManager:
             1440: 86400   # Daily data: 24 hour TTL
         }
         self._default_ttl = 300  # 5 minutes for custom timeframes
+        self.resampler = MultiTimeframeResampler()
 
     async def initialize(self):
         """Initialize connections"""
@@ -145,6 +144,68 @@ class FlexibleTimeframeManager:
             from app.errors import TimeframeAggregationError
             raise TimeframeAggregationError(f"Failed to aggregate data: {str(e)}") from e
 
+    async def get_multi_timeframe_data(
+        self,
+        instrument_key: str,
+        signal_type: str,
+        timeframes: list[str],
+        start_time: datetime,
+        end_time: datetime,
+        fields: list[str] | None = None
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Get aggregated signal data for several timeframes from one load of the base data
+
+        Args:
+            instrument_key: Instrument identifier
+            signal_type: Type of signal (greeks, indicators, etc.)
+            timeframes: Target timeframes
+            start_time: Start of time range
+            end_time: End of time range
+            fields: Optional list of fields to return
+
+        Returns:
+            Dict of timeframe to list of aggregated data points
+        """
+        try:
+            minutes = {timeframe: self.parse_timeframe(timeframe)[1] for timeframe in timeframes}
+
+            results = {}
+            for timeframe in timeframes:
+                cached_data = await self._get_cached_data(
+                    instrument_key, signal_type, timeframe, start_time, end_time
+                )
+                if cached_data:
+                    results[timeframe] = cached_data
+
+            missing = [timeframe for timeframe in timeframes if timeframe not in results]
+            if not missing:
+                return results
+
+            # Get base data (1-minute) once for every missing timeframe
+            base_data = await self._get_base_data(
+                instrument_key, signal_type, start_time, end_time
+            )
+            if not base_data:
+                return {**results, **{timeframe: [] for timeframe in missing}}
+
+            bars = BaseBars.from_records(base_data, fields)
+            resampled = self.resampler.resample(bars, [minutes[timeframe] for timeframe in missing])
+
+            for timeframe in missing:
+                aggregated = resampled[minutes[timeframe]].to_records()
+                await self._cache_data(
+                    instrument_key, signal_type, timeframe, aggregated, minutes[timeframe]
+                )
+                results[timeframe] = aggregated
+
+            return {timeframe: results[timeframe] for timeframe in timeframes}
+
+        except Exception as e:
+            logger.exception("Error getting multi-timeframe data: %s", e)
+            from app.errors import TimeframeAggregationError
+            raise TimeframeAggregationError(f"Failed to aggregate data: {str(e)}") from e
+
     async def store_custom_timeframe(
         self,
         instrument_key: str,
@@ -286,60 +347,8 @@ class FlexibleTimeframeManager:
         if not base_data:
             return []
 
-        # Convert to DataFrame for easier aggregation
-        df = pd.DataFrame(base_data)
-
-        # Set timestamp as index
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df.set_index('timestamp', inplace=True)
-
-        # Define aggregation rules
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-
-        # Remove ID columns from aggregation
-        id_cols = ['id', 'signal_id']
-        numeric_cols = [col for col in numeric_cols if col not in id_cols]
-
-        if fields:
-            numeric_cols = [col for col in numeric_cols if col in fields]
-
-        # Create aggregation dictionary
-        agg_dict = {}
-        for col in numeric_cols:
-            if col in ['delta', 'gamma', 'theta', 'vega', 'rho', 'price', 'volume']:
-                # For Greeks and prices, use mean
-                agg_dict[col] = 'mean'
-            elif col in ['high', 'ask']:
-                agg_dict[col] = 'max'
-            elif col in ['low', 'bid']:
-                agg_dict[col] = 'min'
-            elif col in ['volume', 'trades']:
-                agg_dict[col] = 'sum'
-            else:
-                # Default to mean
-                agg_dict[col] = 'mean'
-
-        # Also get open/close values
-        if 'value' in df.columns:
-            agg_dict['open'] = ('value', 'first')
-            agg_dict['close'] = ('value', 'last')
-
-        # Resample and aggregate
-        resampled = df.resample(f'{timeframe_minutes}T').agg(agg_dict)
-
-        # Reset index and format output
-        resampled.reset_index(inplace=True)
-
-        # Convert back to list of dicts
-        result = []
-        for _, row in resampled.iterrows():
-            record = row.to_dict()
-            # Ensure timestamp is ISO format string
-            record['timestamp'] = record['timestamp'].isoformat()
-            record['timeframe_minutes'] = timeframe_minutes
-            result.append(record)
-
-        return result
+        bars = BaseBars.from_records(base_data, fields)
+        return self.resampler.resample(bars, [timeframe_minutes])[timeframe_minutes].to_records()
 
     async def _get_cached_data(
         self,
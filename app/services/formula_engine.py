@@ -1,16 +1,81 @@
 """
 Formula Engine for custom calculations
 Safely evaluates mathematical expressions with access to market data and indicators
+
+Formulas are validated and compiled once into nested Python closures, cached
+per formula, so repeated evaluations (every tick, every subscriber) skip
+parsing and AST dispatch. A compiled formula can also be applied element-wise
+over NumPy arrays / pandas Series to score a whole watchlist or bar history
+in one call.
 """
 import ast
 import math
 import operator
+from collections import OrderedDict
+from collections.abc import Callable
 from datetime import datetime
+from functools import reduce
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
-from app.utils.logging_utils import log_exception, log_info
+from app.utils.logging_utils import log_exception
+
+Evaluator = Callable[[dict[str, Any]], Any]
+
+
+def _is_array(value: Any) -> bool:
+    return isinstance(value, np.ndarray | pd.Series)
+
+
+def _vector_not(value: Any) -> Any:
+    return np.logical_not(value) if _is_array(value) else not value
+
+
+def _vector_where(test: Any, body: Any, orelse: Any) -> Any:
+    result = np.where(test, body, orelse)
+    return pd.Series(result, index=test.index) if isinstance(test, pd.Series) else result
+
+
+def _vector_extreme(builtin: Callable, elementwise: np.ufunc) -> Callable:
+    """min/max: reduce a single iterable as usual, combine several arguments element-wise."""
+    def extreme(*args):
+        if len(args) == 1:
+            return builtin(args[0])
+        return reduce(elementwise, args)
+    return extreme
+
+
+def _vector_log(value: Any, base: float | None = None) -> Any:
+    return np.log(value) if base is None else np.log(value) / np.log(base)
+
+
+class CompiledFormula:
+    """
+    A validated formula compiled into nested closures.
+
+    Calling it evaluates with scalar semantics (chained comparisons and
+    and/or short-circuit to Python booleans). evaluate_vectorized applies the
+    same formula element-wise to array or Series inputs.
+    """
+
+    __slots__ = ('formula', 'node', '_engine', '_scalar', '_vectorized')
+
+    def __init__(self, engine: 'FormulaEngine', formula: str, node: ast.AST):
+        self.formula = formula
+        self.node = node
+        self._engine = engine
+        self._scalar = engine._compile_node(node, vectorized=False)
+        self._vectorized: Evaluator | None = None
+
+    def __call__(self, context: dict[str, Any]) -> Any:
+        return self._scalar(context)
+
+    def evaluate_vectorized(self, context: dict[str, Any]) -> Any:
+        if self._vectorized is None:
+            self._vectorized = self._engine._compile_node(self.node, vectorized=True)
+        return self._vectorized(context)
 
 
 class FormulaEngine:
@@ -79,6 +144,27 @@ class FormulaEngine:
         'quantile': lambda s, q: s.quantile(q) if isinstance(s, pd.Series) else None,
     }
 
+    # Element-wise replacements used when evaluating over arrays/Series
+    VECTORIZED_FUNCTIONS = {
+        'abs': np.abs,
+        'round': np.round,
+        'min': _vector_extreme(min, np.minimum),
+        'max': _vector_extreme(max, np.maximum),
+        'sqrt': np.sqrt,
+        'pow': np.power,
+        'log': _vector_log,
+        'log10': np.log10,
+        'exp': np.exp,
+        'sin': np.sin,
+        'cos': np.cos,
+        'tan': np.tan,
+        'asin': np.arcsin,
+        'acos': np.arccos,
+        'atan': np.arctan,
+        'ceil': np.ceil,
+        'floor': np.floor,
+    }
+
     # Constants
     ALLOWED_CONSTANTS = {
         'pi': math.pi,
@@ -88,9 +174,24 @@ class FormulaEngine:
         'none': None,
     }
 
+    # Compiled formulas kept per engine (least recently used evicted first)
+    MAX_COMPILED_FORMULAS = 1024
+
     def __init__(self):
-        self._compiled_formulas: dict[str, ast.AST] = {}
+        self._compiled_formulas: OrderedDict[str, CompiledFormula] = OrderedDict()
         self._formula_metadata: dict[str, dict[str, Any]] = {}
+        self.metrics = {'compilations': 0, 'cache_hits': 0, 'evictions': 0}
+
+        # Name resolution: constants and functions can be shadowed by the
+        # caller's context, helper functions cannot
+        self._builtins = {**self.ALLOWED_CONSTANTS, **self.ALLOWED_FUNCTIONS}
+        self._vectorized_builtins = {**self._builtins, **self.VECTORIZED_FUNCTIONS}
+        self._helpers = {
+            'iif': lambda cond, true_val, false_val: true_val if cond else false_val,
+            'between': lambda val, low, high: low <= val <= high,
+            'crossover': self._crossover,
+            'crossunder': self._crossunder,
+        }
 
     def evaluate(
         self,
@@ -110,21 +211,7 @@ class FormulaEngine:
             Result of formula evaluation
         """
         try:
-            # Check cache
-            if cache_key and cache_key in self._compiled_formulas:
-                parsed = self._compiled_formulas[cache_key]
-                log_info(f"Using cached formula: {cache_key}")
-            else:
-                # Parse and validate formula
-                parsed = self._parse_formula(formula)
-                if cache_key:
-                    self._compiled_formulas[cache_key] = parsed
-
-            # Create safe evaluation context
-            safe_context = self._create_safe_context(context)
-
-            # Evaluate
-            result = self._eval_node(parsed, safe_context)
+            result = self.compile(formula, cache_key)(context)
 
             # Handle pandas Series results
             if isinstance(result, pd.Series):
@@ -137,6 +224,64 @@ class FormulaEngine:
             log_exception(f"Error evaluating formula '{formula}': {str(e)}")
             raise ValueError(f"Formula evaluation failed: {str(e)}")
 
+    def evaluate_vectorized(
+        self,
+        formula: str,
+        context: dict[str, Any],
+        cache_key: str | None = None
+    ) -> Any:
+        """
+        Evaluate a formula element-wise over array or Series inputs
+
+        Comparisons, and/or/not and ternaries combine element-wise, and math
+        functions map to their NumPy equivalents. Scalars broadcast.
+
+        Args:
+            formula: Mathematical formula to evaluate
+            context: Variables (arrays/Series, e.g. one value per symbol or bar)
+            cache_key: Optional key for caching compiled formula
+
+        Returns:
+            Full result (array, Series or scalar), not just the latest value
+        """
+        try:
+            return self.compile(formula, cache_key).evaluate_vectorized(context)
+
+        except Exception as e:
+            log_exception(f"Error evaluating formula '{formula}' vectorized: {str(e)}")
+            raise ValueError(f"Formula evaluation failed: {str(e)}") from e
+
+    def compile(self, formula: str, cache_key: str | None = None) -> CompiledFormula:
+        """
+        Validate and compile a formula, reusing the cached compilation
+
+        Args:
+            formula: Mathematical formula to compile
+            cache_key: Cache key (defaults to the formula text)
+
+        Returns:
+            Compiled formula
+        """
+        key = cache_key or formula
+        compiled = self._compiled_formulas.get(key)
+        if compiled is not None:
+            self._compiled_formulas.move_to_end(key)
+            self.metrics['cache_hits'] += 1
+            return compiled
+
+        compiled = CompiledFormula(self, formula, self._parse_formula(formula))
+        self._compiled_formulas[key] = compiled
+        self.metrics['compilations'] += 1
+
+        if len(self._compiled_formulas) > self.MAX_COMPILED_FORMULAS:
+            self._compiled_formulas.popitem(last=False)
+            self.metrics['evictions'] += 1
+
+        return compiled
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {**self.metrics, 'cached_formulas': len(self._compiled_formulas)}
+
     def validate(self, formula: str) -> dict[str, Any]:
         """
         Validate a formula without evaluating it
@@ -285,96 +430,125 @@ class FormulaEngine:
         else:
             raise ValueError(f"AST node type {type(node).__name__} not allowed")
 
-    def _create_safe_context(self, context: dict[str, Any]) -> dict[str, Any]:
-        """Create a safe evaluation context"""
-        safe_context = {}
-
-        # Add allowed constants
-        safe_context.update(self.ALLOWED_CONSTANTS)
-
-        # Add allowed functions
-        safe_context.update(self.ALLOWED_FUNCTIONS)
-
-        # Add user context (market data, indicators, etc.)
-        safe_context.update(context)
+    def _compile_node(self, node: ast.AST, vectorized: bool) -> Evaluator:
+        """Compile a validated AST node into a closure over the evaluation context"""
+        def compile_child(child: ast.AST) -> Evaluator:
+            return self._compile_node(child, vectorized)
 
-        # Add helper functions
-        safe_context['iif'] = lambda cond, true_val, false_val: true_val if cond else false_val
-        safe_context['between'] = lambda val, low, high: low <= val <= high
-        safe_context['crossover'] = self._crossover
-        safe_context['crossunder'] = self._crossunder
-
-        return safe_context
-
-    def _eval_node(self, node: ast.AST, context: dict[str, Any]) -> Any:
-        """Recursively evaluate AST nodes"""
         if isinstance(node, ast.BinOp):
-            left = self._eval_node(node.left, context)
-            right = self._eval_node(node.right, context)
-            return self.ALLOWED_OPS[type(node.op)](left, right)
+            op = self.ALLOWED_OPS[type(node.op)]
+            left, right = compile_child(node.left), compile_child(node.right)
+            return lambda ctx: op(left(ctx), right(ctx))
 
         if isinstance(node, ast.UnaryOp):
-            operand = self._eval_node(node.operand, context)
-            return self.ALLOWED_OPS[type(node.op)](operand)
+            op = _vector_not if vectorized and isinstance(node.op, ast.Not) else self.ALLOWED_OPS[type(node.op)]
+            operand = compile_child(node.operand)
+            return lambda ctx: op(operand(ctx))
 
         if isinstance(node, ast.Compare):
-            left = self._eval_node(node.left, context)
-            for op, comparator in zip(node.ops, node.comparators, strict=False):
-                right = self._eval_node(comparator, context)
-                if not self.ALLOWED_OPS[type(op)](left, right):
-                    return False
-                left = right
-            return True
+            ops = [self.ALLOWED_OPS[type(op)] for op in node.ops]
+            operands = [compile_child(operand) for operand in [node.left, *node.comparators]]
+            if vectorized:
+                def compare_elementwise(ctx):
+                    values = [operand(ctx) for operand in operands]
+                    return reduce(np.logical_and, [
+                        op(left, right) for op, left, right in zip(ops, values, values[1:], strict=False)
+                    ])
+                return compare_elementwise
+
+            def compare(ctx):
+                left = operands[0](ctx)
+                for op, comparator in zip(ops, operands[1:], strict=True):
+                    right = comparator(ctx)
+                    if not op(left, right):
+                        return False
+                    left = right
+                return True
+            return compare
 
         if isinstance(node, ast.BoolOp):
-            if isinstance(node.op, ast.And):
-                return all(self._eval_node(value, context) for value in node.values)
+            values = [compile_child(value) for value in node.values]
+            is_and = isinstance(node.op, ast.And)
+            if vectorized:
+                combine = np.logical_and if is_and else np.logical_or
+
+                def bool_op_elementwise(ctx):
+                    results = [value(ctx) for value in values]
+                    if any(_is_array(result) for result in results):
+                        return reduce(combine, results)
+                    return all(results) if is_and else any(results)
+                return bool_op_elementwise
+
+            if is_and:
+                return lambda ctx: all(value(ctx) for value in values)
             # Or
-            return any(self._eval_node(value, context) for value in node.values)
+            return lambda ctx: any(value(ctx) for value in values)
 
         if isinstance(node, ast.Call):
-            func = context.get(node.func.id)
-            if func is None:
-                raise ValueError(f"Unknown function: {node.func.id}")
-
-            args = [self._eval_node(arg, context) for arg in node.args]
-            kwargs = {kw.arg: self._eval_node(kw.value, context) for kw in node.keywords}
-
-            return func(*args, **kwargs)
+            name = node.func.id
+            resolve = self._compile_name(name, vectorized)
+            args = [compile_child(arg) for arg in node.args]
+            kwargs = {kw.arg: compile_child(kw.value) for kw in node.keywords}
+
+            def call(ctx):
+                func = resolve(ctx)
+                if func is None:
+                    raise ValueError(f"Unknown function: {name}")
+                return func(*[arg(ctx) for arg in args], **{key: value(ctx) for key, value in kwargs.items()})
+            return call
 
         if isinstance(node, ast.IfExp):
-            test = self._eval_node(node.test, context)
-            if test:
-                return self._eval_node(node.body, context)
-            return self._eval_node(node.orelse, context)
+            test, body, orelse = compile_child(node.test), compile_child(node.body), compile_child(node.orelse)
+            if vectorized:
+                def if_exp_elementwise(ctx):
+                    condition = test(ctx)
+                    if _is_array(condition):
+                        return _vector_where(condition, body(ctx), orelse(ctx))
+                    return body(ctx) if condition else orelse(ctx)
+                return if_exp_elementwise
+
+            return lambda ctx: body(ctx) if test(ctx) else orelse(ctx)
 
         if isinstance(node, ast.Name):
-            if node.id not in context:
-                raise ValueError(f"Unknown variable: {node.id}")
-            return context[node.id]
+            return self._compile_name(node.id, vectorized)
 
         if isinstance(node, ast.Constant):
-            return node.value
-
-        if isinstance(node, ast.Num | ast.Str):  # For Python < 3.8
-            return node.n if isinstance(node, ast.Num) else node.s
+            value = node.value
+            return lambda ctx: value
 
         if isinstance(node, ast.List):
-            return [self._eval_node(elt, context) for elt in node.elts]
+            elements = [compile_child(elt) for elt in node.elts]
+            return lambda ctx: [element(ctx) for element in elements]
 
         if isinstance(node, ast.Tuple):
-            return tuple(self._eval_node(elt, context) for elt in node.elts)
+            elements = [compile_child(elt) for elt in node.elts]
+            return lambda ctx: tuple(element(ctx) for element in elements)
 
         if isinstance(node, ast.Subscript):
-            value = self._eval_node(node.value, context)
-            if isinstance(node.slice, ast.Index):  # Python < 3.9
-                index = self._eval_node(node.slice.value, context)
-            else:
-                index = self._eval_node(node.slice, context)
-            return value[index]
+            value = compile_child(node.value)
+            index = compile_child(node.slice.value if isinstance(node.slice, ast.Index) else node.slice)
+            return lambda ctx: value(ctx)[index(ctx)]
 
         raise ValueError(f"Unsupported node type: {type(node).__name__}")
 
+    def _compile_name(self, name: str, vectorized: bool) -> Evaluator:
+        """Resolve a name: helpers first, then the caller's context, then constants and functions"""
+        if name in self._helpers:
+            helper = self._helpers[name]
+            return lambda ctx: helper
+
+        builtins = self._vectorized_builtins if vectorized else self._builtins
+        if name in builtins:
+            default = builtins[name]
+            return lambda ctx: ctx.get(name, default)
+
+        def load(ctx):
+            try:
+                return ctx[name]
+            except KeyError:
+                raise ValueError(f"Unknown variable: {name}") from None
+        return load
+
     def _crossover(self, series1: pd.Series, series2: pd.Series) -> bool:
         """Check if series1 crosses over series2"""
         if not isinstance(series1, pd.Series) or not isinstance(series2, pd.Series):
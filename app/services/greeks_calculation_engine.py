@@ -11,6 +11,7 @@ from py_vollib.black_scholes.implied_volatility import implied_volatility
 from app.core.circuit_breaker import get_circuit_breaker
 from app.core.greeks_model_config import get_greeks_model_config
 from app.errors import GreeksCalculationError
+from app.services.chain_greeks import ChainGreeks
 from app.utils.logging_utils import log_exception, log_info, log_warning
 
 
@@ -332,7 +333,7 @@ class GreeksCalculationEngine:
             force_vectorized: Force use of vectorized mode regardless of threshold
 
         Returns:
-            Dict with results and performance metrics
+            Dict with results (a ChainGreeks on every path) and performance metrics
         """
         n_options = len(option_chain_data)
 
@@ -434,7 +435,7 @@ class GreeksCalculationEngine:
         execution_time_ms = (time.perf_counter() - start_time) * 1000
 
         return {
-            'results': results,
+            'results': ChainGreeks.from_rows(option_chain_data, results, greeks_to_calculate),
             'performance': {
                 'execution_time_ms': execution_time_ms,
                 'options_processed': len(option_chain_data),
@@ -0,0 +1,535 @@
+"""
+Range-aware in-memory cache of historical bars.
+
+Bars are kept per (symbol, timeframe) as a sorted list of segments. Each
+segment is one contiguous time range that was fetched from ticker_service,
+with its bars stored column by column as numpy arrays. Any sub-range of a
+segment is served from memory. For a range that is only partly covered,
+only the gaps are fetched and merged with the segments they touch. This
+way indicators with different lookbacks on the same symbol and timeframe
+share one copy of the bars, and a window that moves forward only fetches
+the new bars.
+
+Concurrent requests are coalesced: a range that another request is already
+fetching is awaited rather than fetched again, and get_bars_many() hands the
+missing ranges of many symbols to one batch fetch.
+
+Bars that may still be forming (opened less than one bar length ago) are
+kept apart as the series' tail for a short TTL. Until it expires the tail
+also covers the time up to its expiry, so repeated requests for the latest
+bars are served from memory and the forming bars are fetched again at most
+once per TTL.
+
+Once the cached bars exceed the byte budget, the least recently used
+series are evicted.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import UTC, datetime, tzinfo
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.services.incremental_indicators import interval_to_seconds
+from app.utils.logging_utils import log_info
+
+NS_PER_SECOND = 1_000_000_000
+
+# Ranges are inclusive; adjacent ranges are one datetime resolution (1us) apart
+RESOLUTION_NS = 1_000
+
+# Approximate heap size of one boxed value held by an object column
+_OBJECT_VALUE_BYTES = 48
+
+# fetch(start, end) -> bar rows with a timestamp field, for the inclusive range
+BarFetcher = Callable[[datetime, datetime], Awaitable[list[dict[str, Any]]]]
+
+# fetch_many([(symbol, start, end), ...]) -> bar rows of each range, in order;
+# an exception in place of a range's rows fails only that range
+BatchBarFetcher = Callable[[list[tuple[str, datetime, datetime]]], Awaitable[list[list[dict[str, Any]]]]]
+
+_SHORT_UNITS = {'m': 'minute', 'h': 'hour', 'd': 'day', 'w': 'week'}
+
+
+def timeframe_seconds(timeframe: str) -> int | None:
+    """Bar length of a '5m' or '5minute' style timeframe; None if not fixed."""
+    if timeframe and timeframe[-1] in _SHORT_UNITS and timeframe[:-1].isdigit():
+        timeframe = timeframe[:-1] + _SHORT_UNITS[timeframe[-1]]
+    return interval_to_seconds(timeframe)
+
+
+def to_ns(value: datetime | str) -> int:
+    """Epoch nanoseconds of a datetime or ISO string; naive values are taken as UTC."""
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize(UTC)
+    return timestamp.value
+
+
+def from_ns(value: int, tz: tzinfo | None = UTC) -> datetime:
+    """Datetime of epoch nanoseconds, in tz (naive UTC when tz is None)."""
+    timestamp = pd.Timestamp(value, tz=UTC).floor('us')
+    if tz is None:
+        return timestamp.tz_localize(None).to_pydatetime()
+    return timestamp.tz_convert(tz).to_pydatetime()
+
+
+def _column(values: list) -> np.ndarray:
+    """Numeric values as a float/int array; anything else as an object array."""
+    try:
+        array = np.asarray(values)
+        if array.ndim == 1 and array.dtype.kind in 'biuf':
+            return array
+    except (TypeError, ValueError):
+        pass
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _column_nbytes(column: np.ndarray) -> int:
+    if column.dtype == object:
+        return column.nbytes + _OBJECT_VALUE_BYTES * len(column)
+    return column.nbytes
+
+
+class BarSegment:
+    """Bars of one contiguous covered range [start, end] (epoch ns), stored as columns."""
+
+    __slots__ = ('start', 'end', 'timestamps', 'columns', 'nbytes')
+
+    def __init__(self, start: int, end: int, timestamps: np.ndarray, columns: dict[str, np.ndarray]):
+        self.start = start
+        self.end = end
+        self.timestamps = timestamps
+        self.columns = columns
+        self.nbytes = timestamps.nbytes + sum(_column_nbytes(column) for column in columns.values())
+
+    @classmethod
+    def from_rows(cls, start: int, end: int, rows: list[dict[str, Any]],
+                  time_field: str = 'timestamp') -> 'BarSegment':
+        """
+        Segment of the rows that fall in [start, end], sorted by time.
+
+        Rows without a parseable timestamp are dropped; of rows with the same
+        timestamp the last one is kept.
+        """
+        if not rows:
+            return cls(start, end, np.empty(0, dtype=np.int64), {})
+
+        parsed = pd.to_datetime(
+            pd.Index([row.get(time_field) for row in rows], dtype=object),
+            utc=True, errors='coerce', format='ISO8601'
+        )
+        timestamps = parsed.as_unit('ns').asi8
+        keep = ~parsed.isna() & (timestamps >= start) & (timestamps <= end)
+
+        # Stable sort of the reversed rows, then first of each timestamp = last in the input
+        candidates = np.flatnonzero(keep)[::-1]
+        order = candidates[np.argsort(timestamps[candidates], kind='stable')]
+        if order.size:
+            first = np.concatenate([[True], np.diff(timestamps[order]) != 0])
+            order = order[first]
+
+        selected = [rows[i] for i in order.tolist()]
+        names = list(dict.fromkeys(name for row in selected for name in row))
+        columns = {name: _column([row.get(name) for row in selected]) for name in names}
+        return cls(start, end, timestamps[order], columns)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def bounds(self, start: int, end: int) -> tuple[int, int]:
+        """Index range of the bars in [start, end]."""
+        return (int(np.searchsorted(self.timestamps, start, side='left')),
+                int(np.searchsorted(self.timestamps, end, side='right')))
+
+    def clip(self, start: int, end: int) -> 'BarSegment':
+        """The part of the segment within [start, end]."""
+        low, high = self.bounds(start, end)
+        return BarSegment(
+            max(self.start, start), min(self.end, end), self.timestamps[low:high],
+            {name: column[low:high] for name, column in self.columns.items()}
+        )
+
+    def rows(self, start: int, end: int) -> list[dict[str, Any]]:
+        low, high = self.bounds(start, end)
+        if low >= high:
+            return []
+        names = list(self.columns)
+        values = [self.columns[name][low:high].tolist() for name in names]
+        return [dict(zip(names, row, strict=True)) for row in zip(*values, strict=True)]
+
+
+def _concat(start: int, end: int, parts: list[BarSegment]) -> BarSegment:
+    """One segment from time-ordered, non-overlapping parts; missing columns are filled with None."""
+    parts = [part for part in parts if len(part)]
+    names = list(dict.fromkeys(name for part in parts for name in part.columns))
+    columns = {}
+    for name in names:
+        pieces = [part.columns.get(name) for part in parts]
+        if any(piece is None for piece in pieces):
+            pieces = [
+                piece if piece is not None else np.full(len(part), None, dtype=object)
+                for piece, part in zip(pieces, parts, strict=True)
+            ]
+        columns[name] = np.concatenate(pieces) if len(pieces) > 1 else pieces[0]
+    timestamps = np.concatenate([part.timestamps for part in parts]) if parts else np.empty(0, dtype=np.int64)
+    return BarSegment(start, end, timestamps, columns)
+
+
+class BarSeries:
+    """Covered ranges of one (symbol, timeframe): sorted, non-overlapping segments."""
+
+    def __init__(self):
+        self.segments: list[BarSegment] = []
+        self.nbytes = 0
+        # Bars that may still be forming, served until tail_expires (epoch ns)
+        self.tail: BarSegment | None = None
+        self.tail_expires = 0
+
+    def cached_segments(self) -> list[BarSegment]:
+        """Settled segments and the tail, sorted by start."""
+        if self.tail is None:
+            return self.segments
+        return sorted([*self.segments, self.tail], key=lambda segment: segment.start)
+
+    def missing_ranges(self, start: int, end: int) -> list[tuple[int, int]]:
+        """Sub-ranges of [start, end] that neither a segment nor the tail covers."""
+        gaps = []
+        cursor = start
+        for segment in self.cached_segments():
+            if segment.end < cursor:
+                continue
+            if segment.start > end:
+                break
+            if segment.start > cursor:
+                gaps.append((cursor, segment.start - RESOLUTION_NS))
+            cursor = segment.end + RESOLUTION_NS
+            if cursor > end:
+                return gaps
+        gaps.append((cursor, end))
+        return gaps
+
+    def insert(self, new: BarSegment):
+        """Merge freshly fetched bars; they replace cached bars in the same range."""
+        tail = self.tail
+        if tail is not None and new.end >= tail.start:
+            self.set_tail(tail.clip(new.end + RESOLUTION_NS, tail.end) if new.end < tail.end else None,
+                          self.tail_expires)
+
+        segments = self.segments
+        touching = [
+            i for i, segment in enumerate(segments)
+            if segment.end + RESOLUTION_NS >= new.start and segment.start - RESOLUTION_NS <= new.end
+        ]
+        if not touching:
+            index = sum(1 for segment in segments if segment.start < new.start)
+            segments.insert(index, new)
+            self.nbytes += new.nbytes
+            return
+
+        first, last = segments[touching[0]], segments[touching[-1]]
+        merged = _concat(
+            min(first.start, new.start),
+            max(last.end, new.end),
+            [first.clip(first.start, new.start - RESOLUTION_NS), new, last.clip(new.end + RESOLUTION_NS, last.end)]
+        )
+        self.nbytes += merged.nbytes - sum(segments[i].nbytes for i in touching)
+        segments[touching[0]:touching[-1] + 1] = [merged]
+
+    def set_tail(self, tail: BarSegment | None, expires: int):
+        """Replace the tail; it covers up to its end or expires, whichever is later."""
+        if self.tail is not None:
+            self.nbytes -= self.tail.nbytes
+        self.tail = tail
+        self.tail_expires = expires
+        if tail is not None:
+            tail.end = max(tail.end, expires)
+            self.nbytes += tail.nbytes
+
+    def expire_tail(self, now: int):
+        if self.tail is not None and self.tail_expires <= now:
+            self.set_tail(None, 0)
+
+    def rows(self, start: int, end: int) -> list[dict[str, Any]]:
+        rows = []
+        for segment in self.cached_segments():
+            if segment.end >= start and segment.start <= end:
+                rows.extend(segment.rows(start, end))
+        return rows
+
+    @property
+    def bar_count(self) -> int:
+        return sum(len(segment) for segment in self.segments)
+
+
+def _subtract(start: int, end: int,
+              flights: list[tuple[int, int, asyncio.Future]]) -> tuple[list[tuple[int, int]], list[asyncio.Future]]:
+    """Parts of [start, end] not covered by the in-flight ranges, and the in-flight fetches that overlap it."""
+    remaining = []
+    joined = []
+    cursor = start
+    for flight_start, flight_end, future in sorted(flights, key=lambda flight: flight[0]):
+        if flight_end < cursor or flight_start > end:
+            continue
+        joined.append(future)
+        if flight_start > cursor:
+            remaining.append((cursor, flight_start - RESOLUTION_NS))
+        cursor = max(cursor, flight_end + RESOLUTION_NS)
+        if cursor > end:
+            break
+    if cursor <= end:
+        remaining.append((cursor, end))
+    return remaining, joined
+
+
+def _retrieve_exception(future: asyncio.Future):
+    # Every waiter may have been cancelled; don't report a failed fetch as never retrieved
+    if not future.cancelled():
+        future.exception()
+
+
+class HistoricalBarStore:
+    """Bar series per (symbol, timeframe), evicted least recently used first under a byte budget."""
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, time_field: str = 'timestamp',
+                 tail_ttl_seconds: float = 15.0):
+        """
+        Args:
+            max_bytes: Budget for the cached bars (approximate in-memory size)
+            time_field: Row field holding the bar's open time
+            tail_ttl_seconds: How long bars that may still be forming are served
+                from memory (0 fetches them on every request)
+        """
+        self.max_bytes = max_bytes
+        self.time_field = time_field
+        self.tail_ttl_seconds = tail_ttl_seconds
+        self._series: OrderedDict[tuple[str, str], BarSeries] = OrderedDict()
+        self.nbytes = 0
+
+        # (symbol, timeframe) -> ranges being fetched: (start, end, future of the fetched BarSegment)
+        self._in_flight: dict[tuple[str, str], list[tuple[int, int, asyncio.Future]]] = {}
+        self._fetch_tasks: set[asyncio.Task] = set()
+
+        self.metrics = {
+            'hits': 0,
+            'partial_hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'gap_fetches': 0,
+            'bars_fetched': 0,
+            'evictions': 0
+        }
+
+    async def get_bars(self, symbol: str, timeframe: str, start: datetime | str, end: datetime | str,
+                       fetch: BarFetcher) -> list[dict[str, Any]]:
+        """
+        Bars of [start, end], fetching only the parts that are not cached.
+
+        Args:
+            symbol: Instrument the bars belong to
+            timeframe: Bar timeframe, e.g. '1m' or '5minute'
+            start: Range start (naive datetimes are UTC)
+            end: Range end, inclusive
+            fetch: Coroutine fetching the bars of an inclusive range; it receives
+                datetimes in the timezone of start (naive UTC if start is naive)
+
+        Returns:
+            List of bar rows in time order
+        """
+        async def fetch_many(ranges: list[tuple[str, datetime, datetime]]) -> list[list[dict[str, Any]]]:
+            return await asyncio.gather(*(fetch(range_start, range_end) for _, range_start, range_end in ranges))
+
+        return (await self.get_bars_many([symbol], timeframe, start, end, fetch_many))[symbol]
+
+    async def get_bars_many(self, symbols: Iterable[str], timeframe: str, start: datetime | str,
+                            end: datetime | str, fetch_many: BatchBarFetcher,
+                            return_exceptions: bool = False) -> dict[str, list[dict[str, Any]] | Exception]:
+        """
+        Bars of [start, end] for several symbols, with one fetch for all missing ranges.
+
+        Missing ranges already being fetched by another request are awaited
+        instead of fetched again.
+
+        Args:
+            symbols: Instruments to load
+            timeframe: Bar timeframe, e.g. '1m' or '5minute'
+            start: Range start (naive datetimes are UTC)
+            end: Range end, inclusive
+            fetch_many: Coroutine fetching a list of (symbol, start, end) ranges;
+                returns the bar rows of each range, in the same order
+            return_exceptions: Map a symbol whose bars could not be fetched to
+                the error instead of raising it
+
+        Returns:
+            Dict: symbol -> list of bar rows in time order (or the fetch error)
+        """
+        symbols = list(dict.fromkeys(symbols))
+        start_ns, end_ns = to_ns(start), to_ns(end)
+        if end_ns < start_ns:
+            return {symbol: [] for symbol in symbols}
+        tz = start.tzinfo if isinstance(start, datetime) else UTC
+        loop = asyncio.get_running_loop()
+        now_ns = time.time_ns()
+
+        results = {}
+        waiting = {}
+        own = []
+        for symbol in symbols:
+            key = (symbol, timeframe)
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = BarSeries()
+            self._series.move_to_end(key)
+            before = series.nbytes
+            series.expire_tail(now_ns)
+            self.nbytes += series.nbytes - before
+
+            gaps = series.missing_ranges(start_ns, end_ns)
+            if not gaps:
+                self.metrics['hits'] += 1
+                results[symbol] = series.rows(start_ns, end_ns)
+                continue
+            self.metrics['partial_hits' if series.segments else 'misses'] += 1
+
+            flights = self._in_flight.setdefault(key, [])
+            futures = []
+            for gap_start, gap_end in gaps:
+                remaining, joined = _subtract(gap_start, gap_end, flights)
+                self.metrics['coalesced'] += len(joined)
+                futures.extend(joined)
+                for piece_start, piece_end in remaining:
+                    future = loop.create_future()
+                    future.add_done_callback(_retrieve_exception)
+                    flights.append((piece_start, piece_end, future))
+                    own.append((key, series, piece_start, piece_end, future))
+                    futures.append(future)
+            waiting[symbol] = (series, futures)
+
+        if own:
+            # A task of its own, so a cancelled caller doesn't fail the requests that joined it
+            task = loop.create_task(self._fetch(own, timeframe, tz, fetch_many))
+            self._fetch_tasks.add(task)
+            task.add_done_callback(self._fetch_tasks.discard)
+
+        for symbol, (series, futures) in waiting.items():
+            fetched = await asyncio.gather(
+                *(asyncio.shield(future) for future in futures), return_exceptions=return_exceptions
+            )
+            error = next((segment for segment in fetched if isinstance(segment, BaseException)), None)
+            if error is not None:
+                results[symbol] = error
+                continue
+
+            # Fetched segments go in last: they are the newest and include bars still forming
+            view = BarSeries()
+            for segment in series.cached_segments():
+                if segment.end >= start_ns and segment.start <= end_ns:
+                    view.insert(segment.clip(start_ns, end_ns))
+            for segment in fetched:
+                view.insert(segment.clip(start_ns, end_ns))
+            results[symbol] = view.rows(start_ns, end_ns)
+
+        return {symbol: results[symbol] for symbol in symbols}
+
+    async def _fetch(self, own: list[tuple], timeframe: str, tz: tzinfo | None, fetch_many: BatchBarFetcher):
+        """Fetch the ranges this store owns, merge them and resolve everyone waiting on them."""
+        try:
+            fetched = await fetch_many([
+                (key[0], from_ns(gap_start, tz), from_ns(gap_end, tz)) for key, _, gap_start, gap_end, _ in own
+            ])
+        except asyncio.CancelledError:
+            for flight in own:
+                self._land(flight)
+                flight[-1].cancel()
+            raise
+        except Exception as e:
+            for flight in own:
+                self._land(flight)
+                flight[-1].set_exception(e)
+            return
+
+        # Bars that opened less than one bar ago may still change
+        bar_seconds = timeframe_seconds(timeframe)
+        settled_ns = time.time_ns() - bar_seconds * NS_PER_SECOND if bar_seconds else max(f[3] for f in own)
+        settled_ns -= settled_ns % RESOLUTION_NS
+        tail_expires = time.time_ns() + int(self.tail_ttl_seconds * NS_PER_SECOND)
+
+        for flight, rows in zip(own, fetched, strict=True):
+            key, series, gap_start, gap_end, future = flight
+            if isinstance(rows, BaseException):
+                self._land(flight)
+                future.set_exception(rows)
+                continue
+            segment = BarSegment.from_rows(gap_start, gap_end, rows, self.time_field)
+            self.metrics['gap_fetches'] += 1
+            self.metrics['bars_fetched'] += len(segment)
+            before = series.nbytes
+            if gap_start <= settled_ns:
+                series.insert(segment.clip(gap_start, min(gap_end, settled_ns)))
+            if gap_end > settled_ns and self.tail_ttl_seconds > 0:
+                series.set_tail(segment.clip(max(gap_start, settled_ns + RESOLUTION_NS), gap_end), tail_expires)
+            # An evicted series may still be filled by a late fetch; it no longer counts
+            if self._series.get(key) is series:
+                self.nbytes += series.nbytes - before
+            self._land(flight)
+            future.set_result(segment)
+
+        self._evict()
+
+    def _land(self, flight: tuple):
+        key, _, gap_start, gap_end, future = flight
+        flights = self._in_flight.get(key)
+        if flights is not None:
+            flights.remove((gap_start, gap_end, future))
+            if not flights:
+                del self._in_flight[key]
+
+    def _evict(self):
+        while self.nbytes > self.max_bytes and self._series:
+            key, series = self._series.popitem(last=False)
+            self.nbytes -= series.nbytes
+            self.metrics['evictions'] += 1
+            log_info(f"Evicted historical bars for {key[0]} {key[1]} ({series.nbytes} bytes)")
+
+    def invalidate(self, symbols: Iterable[str] | None = None):
+        """Drop the cached bars of the given symbols (all symbols if None)."""
+        if symbols is None:
+            self._series.clear()
+            self.nbytes = 0
+            return
+        symbols = set(symbols)
+        for key in [key for key in self._series if key[0] in symbols]:
+            self.nbytes -= self._series.pop(key).nbytes
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            **self.metrics,
+            'series': len(self._series),
+            'segments': sum(len(series.segments) for series in self._series.values()),
+            'bars': sum(series.bar_count for series in self._series.values()),
+            'in_flight': sum(len(flights) for flights in self._in_flight.values()),
+            'bytes': self.nbytes,
+            'max_bytes': self.max_bytes
+        }
+
+
+_historical_bar_store: HistoricalBarStore | None = None
+
+
+def get_historical_bar_store() -> HistoricalBarStore:
+    """Process-wide bar store shared by the historical data services."""
+    global _historical_bar_store
+    if _historical_bar_store is None:
+        from app.core.config import settings
+        max_mb = getattr(settings, 'HISTORICAL_BAR_CACHE_MAX_MB', 256)
+        _historical_bar_store = HistoricalBarStore(
+            max_bytes=max_mb * 1024 * 1024,
+            tail_ttl_seconds=getattr(settings, 'HISTORICAL_TAIL_TTL_SECONDS', 15)
+        )
+    return _historical_bar_store
@@ -5,15 +5,16 @@ Production implementation with real ticker_service integration.
 Follows Architecture v3.0 - API Delegation Era patterns from CLAUDE.md
 """
 import asyncio
-import json
 import logging
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
 from typing import Any
 
 import aiohttp
 
 from app.core.config import settings
+from app.errors import DataAccessError
+from app.services.historical_bar_store import get_historical_bar_store, timeframe_seconds
 from app.utils.redis import get_redis_client
 
 logger = logging.getLogger(__name__)
@@ -57,9 +58,18 @@ class ProductionHistoricalDataManager:
         self.redis_client = None
         self.session: aiohttp.ClientSession | None = None
 
-        # Cache configuration
-        self.cache_ttl = 300  # 5 minutes cache for historical data
-        self.cache_prefix = "historical_data:"
+        # Bars are cached by range, shared across indicators and lookbacks
+        self.bar_store = get_historical_bar_store()
+        self.batch_max_symbols = max(1, getattr(settings, 'HISTORICAL_BATCH_MAX_SYMBOLS', 25))
+        # ticker_service's bulk endpoint; switched off when it turns out not to exist
+        self.batch_enabled = getattr(settings, 'HISTORICAL_BATCH_ENABLED', False)
+
+        self.metrics = {
+            'requests': 0,
+            'ticker_service_calls': 0,
+            'batch_calls': 0,
+            'symbols_batched': 0
+        }
 
         logger.info("ProductionHistoricalDataManager initialized with ticker_service integration")
 
@@ -123,46 +133,63 @@ class ProductionHistoricalDataManager:
             end_date=end_date
         )
 
-        try:
-            # Check cache first
-            cached_data = await self._get_cached_data(request)
-            if cached_data:
-                logger.debug(f"Cache hit for historical data: {symbol} {timeframe}")
-                return cached_data
+        self.metrics['requests'] += 1
 
-            # Fetch from ticker_service
+        try:
             response = await self._fetch_from_ticker_service(request)
-
-            if response.success:
-                # Cache the successful response
-                await self._cache_data(request, response)
-
-                return {
-                    "success": True,
-                    "data": response.data,
-                    "source": "ticker_service",
-                    "quality": response.metadata.get("quality", "good"),
-                    "symbol": symbol,
-                    "timeframe": timeframe,
-                    "periods": len(response.data),
-                    "periods_requested": periods_required,
-                    "indicator": indicator_name,
-                    "cached": False,
-                    "metadata": response.metadata
-                }
-            logger.error(f"Failed to fetch historical data: {response.error}")
-            return self._error_response(symbol, timeframe, periods_required, indicator_name, response.error)
+            return self._indicator_response(request, response)
 
         except Exception as e:
             logger.error(f"Error getting historical data for {symbol}: {e}")
             return self._error_response(symbol, timeframe, periods_required, indicator_name, str(e))
 
+    def _indicator_response(self, request: HistoricalDataRequest, response: HistoricalDataResponse) -> dict[str, Any]:
+        """Response of get_historical_data_for_indicator for a fetched HistoricalDataResponse"""
+        if not response.success:
+            logger.error(f"Failed to fetch historical data: {response.error}")
+            return self._error_response(
+                request.symbol, request.timeframe, request.periods_required, request.indicator_name, response.error
+            )
+
+        return {
+            "success": True,
+            "data": response.data,
+            "source": "ticker_service",
+            "quality": response.metadata.get("quality", "good"),
+            "symbol": request.symbol,
+            "timeframe": request.timeframe,
+            "periods": len(response.data),
+            "periods_requested": request.periods_required,
+            "indicator": request.indicator_name,
+            "cached": response.metadata["ranges_fetched"] == 0,
+            "metadata": response.metadata
+        }
+
     async def _fetch_from_ticker_service(self, request: HistoricalDataRequest) -> HistoricalDataResponse:
         """Fetch historical data from ticker_service using internal APIs"""
 
         if not self.session:
             raise ValueError("Historical data manager not initialized")
 
+        api_timeframe, range_start, range_end = self._resolve_range(request)
+        fetched = []
+
+        async def fetch_range(gap_start: datetime, gap_end: datetime) -> list[dict[str, Any]]:
+            data = await self._request_historical(request, api_timeframe, request.symbol, gap_start.date(), gap_end.date())
+            fetched.append(data)
+            return data.get("historical_data", [])
+
+        try:
+            historical_data = await self.bar_store.get_bars(
+                request.symbol, api_timeframe, range_start, range_end, fetch_range
+            )
+        except Exception as e:
+            return self._fetch_failure(e)
+
+        return self._build_response(request, api_timeframe, historical_data, fetched)
+
+    def _resolve_range(self, request: HistoricalDataRequest) -> tuple[str, datetime, datetime]:
+        """ticker_service timeframe and the (start, end) range covering periods_required bars"""
         # Calculate date range
         end_date = request.end_date or datetime.now().strftime("%Y-%m-%d")
 
@@ -185,80 +212,212 @@ class ProductionHistoricalDataManager:
         # Calculate start date based on periods required
         start_date = self._calculate_start_date(end_date, api_timeframe, request.periods_required)
 
-        # Use ticker_service internal API for signal_service context
-        # Following CLAUDE.md pattern: signal_service → ticker_service/api/v1/internal/context/*
-        url = f"{self.ticker_service_url}/api/v1/internal/context/historical"
+        # Cover whole days up to now (no bar opens later); only the parts not in the bar store are requested
+        range_start = datetime.strptime(start_date, "%Y-%m-%d")
+        day_end = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1, microseconds=-1)
+        range_end = min(day_end, datetime.now(UTC).replace(tzinfo=None))
+        return api_timeframe, range_start, range_end
+
+    def _fetch_failure(self, error: Exception) -> HistoricalDataResponse:
+        if isinstance(error, TimeoutError):
+            message = "Timeout connecting to ticker_service"
+        elif isinstance(error, DataAccessError):
+            message = str(error)
+        else:
+            message = f"Connection error: {str(error)}"
+        return HistoricalDataResponse(success=False, data=[], metadata={}, error=message)
+
+    def _build_response(
+        self,
+        request: HistoricalDataRequest,
+        api_timeframe: str,
+        historical_data: list[dict[str, Any]],
+        fetched: list[dict[str, Any]]
+    ) -> HistoricalDataResponse:
+        """Response of the most recent periods_required bars; fetched holds the ticker_service responses used"""
+        # Ensure we have enough data points
+        if len(historical_data) < request.periods_required:
+            return HistoricalDataResponse(
+                success=False,
+                data=[],
+                metadata={},
+                error=f"Insufficient data: got {len(historical_data)}, needed {request.periods_required}"
+            )
 
-        params = {
-            "symbol": request.symbol,
-            "start_date": start_date,
-            "end_date": end_date,
+        # Take the most recent periods_required data points
+        limited_data = historical_data[-request.periods_required:]
+        qualities = [data.get("data_quality", "good") for data in fetched]
+
+        return HistoricalDataResponse(
+            success=True,
+            data=limited_data,
+            metadata={
+                "source": "ticker_service_internal",
+                "quality": next((quality for quality in qualities if quality != "good"), "good"),
+                "timeframe": api_timeframe,
+                "total_available": len(historical_data),
+                "returned": len(limited_data),
+                "ranges_fetched": len(fetched),
+                "api_response_time_ms": sum(data.get("response_time_ms") or 0 for data in fetched),
+                "cached_at_source": all(data.get("cached", False) for data in fetched)
+            }
+        )
+
+    def _historical_params(
+        self,
+        request: HistoricalDataRequest,
+        api_timeframe: str,
+        start_day: date,
+        end_day: date
+    ) -> dict[str, Any]:
+        """
+        Query of the historical context API for whole days.
+
+        The bar store keeps only the bars within the range it asked for.
+        """
+        bar_seconds = timeframe_seconds(api_timeframe) or 86400
+        range_seconds = ((end_day - start_day).days + 1) * 86400
+        return {
+            "start_date": start_day.strftime("%Y-%m-%d"),
+            "end_date": end_day.strftime("%Y-%m-%d"),
             "timeframe": api_timeframe,
-            "limit": request.periods_required + 50,  # Get extra data to ensure we have enough
+            "limit": range_seconds // bar_seconds + 1,
             "include_volume": request.include_volume,
             "format": "signal_context"  # Optimized format for signal calculations
         }
 
-        try:
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-
-                    if data.get("success", False):
-                        historical_data = data.get("historical_data", [])
-
-                        # Ensure we have enough data points
-                        if len(historical_data) >= request.periods_required:
-                            # Take the most recent periods_required data points
-                            limited_data = historical_data[-request.periods_required:]
-
-                            return HistoricalDataResponse(
-                                success=True,
-                                data=limited_data,
-                                metadata={
-                                    "source": "ticker_service_internal",
-                                    "quality": data.get("data_quality", "good"),
-                                    "timeframe": api_timeframe,
-                                    "total_available": len(historical_data),
-                                    "returned": len(limited_data),
-                                    "api_response_time_ms": data.get("response_time_ms"),
-                                    "cached_at_source": data.get("cached", False)
-                                }
-                            )
-                        return HistoricalDataResponse(
-                            success=False,
-                            data=[],
-                            metadata={},
-                            error=f"Insufficient data: got {len(historical_data)}, needed {request.periods_required}"
-                        )
-                    return HistoricalDataResponse(
-                        success=False,
-                        data=[],
-                        metadata={},
-                        error=data.get("error", "Unknown ticker_service error")
-                    )
+    async def _request_historical(
+        self,
+        request: HistoricalDataRequest,
+        api_timeframe: str,
+        symbol: str,
+        start_day: date,
+        end_day: date
+    ) -> dict[str, Any]:
+        """
+        Fetch the bars of one symbol from ticker_service.
+
+        Raises:
+            DataAccessError: ticker_service returned an error
+        """
+        # Use ticker_service internal API for signal_service context
+        # Following CLAUDE.md pattern: signal_service → ticker_service/api/v1/internal/context/*
+        url = f"{self.ticker_service_url}/api/v1/internal/context/historical"
+        params = {"symbol": symbol, **self._historical_params(request, api_timeframe, start_day, end_day)}
+
+        self.metrics['ticker_service_calls'] += 1
+        async with self.session.get(url, params=params) as response:
+            if response.status != 200:
                 error_text = await response.text()
-                return HistoricalDataResponse(
-                    success=False,
-                    data=[],
-                    metadata={},
-                    error=f"HTTP {response.status}: {error_text}"
-                )
-
-        except TimeoutError:
-            return HistoricalDataResponse(
-                success=False,
-                data=[],
-                metadata={},
-                error="Timeout connecting to ticker_service"
-            )
-        except Exception as e:
-            return HistoricalDataResponse(
-                success=False,
-                data=[],
-                metadata={},
-                error=f"Connection error: {str(e)}"
-            )
+                raise DataAccessError(f"HTTP {response.status}: {error_text}")
+
+            data = await response.json()
+            if not data.get("success", False):
+                raise DataAccessError(data.get("error", "Unknown ticker_service error"))
+            return data
+
+    async def _request_historical_batch(
+        self,
+        request: HistoricalDataRequest,
+        api_timeframe: str,
+        symbols: list[str],
+        start_day: date,
+        end_day: date
+    ) -> dict[str, dict[str, Any] | Exception]:
+        """
+        Fetch the bars of several symbols over the same days in one bulk request.
+
+        Without the bulk endpoint (HISTORICAL_BATCH_ENABLED off, or ticker_service
+        answering 404/405) each symbol is fetched on its own.
+
+        Returns:
+            Dict: symbol -> historical context response of that symbol, or the
+            error of a symbol fetched on its own
+
+        Raises:
+            DataAccessError: ticker_service returned an error or left out a symbol
+        """
+        if len(symbols) == 1 or not self.batch_enabled:
+            return await self._request_historical_each(request, api_timeframe, symbols, start_day, end_day)
+
+        url = f"{self.ticker_service_url}/api/v1/internal/context/historical/batch"
+        payload = {"symbols": symbols, **self._historical_params(request, api_timeframe, start_day, end_day)}
+
+        self.metrics['ticker_service_calls'] += 1
+        self.metrics['batch_calls'] += 1
+        self.metrics['symbols_batched'] += len(symbols)
+        async with self.session.post(url, json=payload) as response:
+            if response.status in (404, 405):
+                logger.warning(f"ticker_service has no bulk historical endpoint (HTTP {response.status}); "
+                               "fetching symbols one by one")
+                self.batch_enabled = False
+                return await self._request_historical_each(request, api_timeframe, symbols, start_day, end_day)
+            if response.status != 200:
+                error_text = await response.text()
+                raise DataAccessError(f"HTTP {response.status}: {error_text}")
+
+            data = await response.json()
+            if not data.get("success", False):
+                raise DataAccessError(data.get("error", "Unknown ticker_service error"))
+
+        results = data.get("results", {})
+        missing = [symbol for symbol in symbols if symbol not in results]
+        if missing:
+            raise DataAccessError(f"ticker_service batch response has no data for {', '.join(missing)}")
+        return results
+
+    async def _request_historical_each(
+        self,
+        request: HistoricalDataRequest,
+        api_timeframe: str,
+        symbols: list[str],
+        start_day: date,
+        end_day: date
+    ) -> dict[str, dict[str, Any] | Exception]:
+        """Fetch the bars of each symbol with its own request; a failing symbol maps to its error"""
+        responses = await asyncio.gather(*(
+            self._request_historical(request, api_timeframe, symbol, start_day, end_day) for symbol in symbols
+        ), return_exceptions=True)
+        return dict(zip(symbols, responses, strict=True))
+
+    async def _fetch_ranges_batched(
+        self,
+        request: HistoricalDataRequest,
+        api_timeframe: str,
+        ranges: list[tuple[str, datetime, datetime]],
+        fetched: dict[str, list[dict[str, Any]]]
+    ) -> list[list[dict[str, Any]] | Exception]:
+        """
+        Fetch (symbol, start, end) ranges in bulk requests of at most batch_max_symbols symbols.
+
+        Ranges over the same days share a request; the bulk requests run concurrently.
+        A failed request fails only its own ranges: they get the error instead of rows.
+        """
+        by_days: dict[tuple[date, date], dict[str, list[int]]] = {}
+        for index, (symbol, start, end) in enumerate(ranges):
+            by_days.setdefault((start.date(), end.date()), {}).setdefault(symbol, []).append(index)
+
+        calls = []
+        for (start_day, end_day), by_symbol in by_days.items():
+            symbols = list(by_symbol)
+            for offset in range(0, len(symbols), self.batch_max_symbols):
+                calls.append((symbols[offset:offset + self.batch_max_symbols], start_day, end_day))
+
+        responses = await asyncio.gather(*(
+            self._request_historical_batch(request, api_timeframe, *call) for call in calls
+        ), return_exceptions=True)
+
+        rows: list[list[dict[str, Any]] | Exception] = [[] for _ in ranges]
+        for (symbols, start_day, end_day), results in zip(calls, responses, strict=True):
+            if isinstance(results, Exception):
+                logger.error(f"Bulk historical request for {len(symbols)} symbols failed: {results}")
+            for symbol in symbols:
+                data = results if isinstance(results, Exception) else results[symbol]
+                if not isinstance(data, Exception):
+                    fetched.setdefault(symbol, []).append(data)
+                for index in by_days[(start_day, end_day)][symbol]:
+                    rows[index] = data if isinstance(data, Exception) else data.get("historical_data", [])
+        return rows
 
     def _calculate_start_date(self, end_date: str, timeframe: str, periods_required: int) -> str:
         """Calculate start date based on timeframe and required periods"""
@@ -285,59 +444,6 @@ class ProductionHistoricalDataManager:
             fallback_start = datetime.now() - timedelta(days=90)
             return fallback_start.strftime("%Y-%m-%d")
 
-    async def _get_cached_data(self, request: HistoricalDataRequest) -> dict[str, Any] | None:
-        """Get cached historical data if available"""
-        if not self.redis_client:
-            return None
-
-        try:
-            cache_key = self._build_cache_key(request)
-            cached_json = await self.redis_client.get(cache_key)
-
-            if cached_json:
-                cached_data = json.loads(cached_json)
-                cached_data["cached"] = True
-                return cached_data
-
-        except Exception as e:
-            logger.warning(f"Cache retrieval error: {e}")
-
-        return None
-
-    async def _cache_data(self, request: HistoricalDataRequest, response: HistoricalDataResponse):
-        """Cache successful historical data response"""
-        if not self.redis_client or not response.success:
-            return
-
-        try:
-            cache_key = self._build_cache_key(request)
-            cache_data = {
-                "success": True,
-                "data": response.data,
-                "source": "ticker_service",
-                "quality": response.metadata.get("quality", "good"),
-                "symbol": request.symbol,
-                "timeframe": request.timeframe,
-                "periods": len(response.data),
-                "periods_requested": request.periods_required,
-                "indicator": request.indicator_name,
-                "metadata": response.metadata,
-                "cached_at": datetime.utcnow().isoformat()
-            }
-
-            await self.redis_client.setex(
-                cache_key,
-                self.cache_ttl,
-                json.dumps(cache_data)
-            )
-
-        except Exception as e:
-            logger.warning(f"Cache storage error: {e}")
-
-    def _build_cache_key(self, request: HistoricalDataRequest) -> str:
-        """Build cache key for historical data request"""
-        return f"{self.cache_prefix}{request.symbol}:{request.timeframe}:{request.periods_required}:{request.indicator_name or 'general'}"
-
     def _error_response(
         self,
         symbol: str,
@@ -367,28 +473,59 @@ class ProductionHistoricalDataManager:
         symbols: list[str],
         timeframe: str,
         periods_required: int,
-        indicator_name: str = None
+        indicator_name: str = None,
+        end_date: str | None = None
     ) -> dict[str, dict[str, Any]]:
-        """Get historical data for multiple symbols efficiently"""
-        tasks = []
-        for symbol in symbols:
-            task = self.get_historical_data_for_indicator(
-                symbol, timeframe, periods_required, indicator_name
+        """
+        Get historical data for multiple symbols efficiently.
+
+        The missing bars of all symbols are fetched together, packed into bulk
+        requests of at most batch_max_symbols symbols. A failed request only
+        fails the symbols it carried.
+        """
+        requests = {
+            symbol: HistoricalDataRequest(
+                symbol=symbol,
+                timeframe=timeframe,
+                periods_required=periods_required,
+                indicator_name=indicator_name,
+                end_date=end_date
             )
-            tasks.append(task)
+            for symbol in symbols
+        }
+        if not requests:
+            return {}
+        self.metrics['requests'] += len(requests)
+
+        template = next(iter(requests.values()))
+        fetched: dict[str, list[dict[str, Any]]] = {}
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            if not self.session:
+                raise ValueError("Historical data manager not initialized")
+            api_timeframe, range_start, range_end = self._resolve_range(template)
+
+            async def fetch_many(ranges: list[tuple[str, datetime, datetime]]) -> list[list[dict[str, Any]]]:
+                return await self._fetch_ranges_batched(template, api_timeframe, ranges, fetched)
+
+            bars = await self.bar_store.get_bars_many(
+                requests, api_timeframe, range_start, range_end, fetch_many, return_exceptions=True
+            )
+            responses = {
+                symbol: self._fetch_failure(bars[symbol]) if isinstance(bars[symbol], BaseException)
+                else self._build_response(request, api_timeframe, bars[symbol], fetched.get(symbol, []))
+                for symbol, request in requests.items()
+            }
+        except Exception as e:
+            logger.error(f"Error getting historical data for {len(requests)} symbols: {e}")
+            failure = self._fetch_failure(e)
+            responses = dict.fromkeys(requests, failure)
 
-        symbol_data = {}
-        for i, symbol in enumerate(symbols):
-            if isinstance(results[i], Exception):
-                symbol_data[symbol] = self._error_response(
-                    symbol, timeframe, periods_required, indicator_name, str(results[i])
-                )
-            else:
-                symbol_data[symbol] = results[i]
+        return {symbol: self._indicator_response(request, responses[symbol]) for symbol, request in requests.items()}
 
-        return symbol_data
+    def get_metrics(self) -> dict[str, Any]:
+        """Request, ticker_service call and bar cache metrics"""
+        return {**self.metrics, "bar_store": self.bar_store.get_stats()}
 
     async def health_check(self) -> dict[str, Any]:
         """Check health of historical data manager and ticker_service connection"""
@@ -0,0 +1,336 @@
+"""
+Batched implied volatility solver shared by the Greeks engines.
+
+Solves IV for a whole option chain at once. Every element keeps its own
+[low, high] volatility bracket and convergence flag: Newton steps are taken
+where they stay inside the bracket, and a bisection step is taken wherever
+vega is too small or the Newton step would leave it. Converged elements drop
+out of the active set, so later iterations only touch the stragglers.
+
+Seeds come from the last solved IV for the same option when one is cached,
+which on consecutive ticks usually converges in one or two Newton steps.
+"""
+
+import logging
+import threading
+from collections.abc import Hashable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from app.services.vectorized_greeks_kernel import SUPPORTED_KERNEL_MODELS, price_and_vega
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IVSolveResult:
+    """Per-element output of a batched IV solve."""
+    implied_volatilities: np.ndarray  # NaN where no IV exists inside the bracket
+    iterations: np.ndarray
+    converged: np.ndarray
+    warm_started: np.ndarray
+
+
+class BatchImpliedVolatilitySolver:
+    """
+    Newton/bisection implied volatility solver over NumPy arrays.
+
+    Features:
+    - Per-element convergence masks and brackets
+    - Warm start from the previously solved IV of the same option
+    - No-arbitrage bounds check before iterating (out-of-bounds prices yield NaN)
+    """
+
+    def __init__(
+        self,
+        vol_min: float = 1e-4,
+        vol_max: float = 5.0,
+        price_tolerance: float = 1e-10,
+        vol_tolerance: float = 1e-6,
+        max_iterations: int = 64,
+        cache_size: int = 100_000
+    ):
+        """
+        Args:
+            vol_min: Lower edge of the volatility bracket
+            vol_max: Upper edge of the volatility bracket
+            price_tolerance: Price error, relative to the market price, accepted as converged
+            vol_tolerance: Newton step or bracket width accepted as converged
+            max_iterations: Iteration cap per solve
+            cache_size: Maximum number of warm-start seeds kept
+        """
+        self.vol_min = vol_min
+        self.vol_max = vol_max
+        self.price_tolerance = price_tolerance
+        self.vol_tolerance = vol_tolerance
+        self.max_iterations = max_iterations
+        self.cache_size = cache_size
+
+        self._seed_cache: dict[Hashable, float] = {}
+        self._cache_lock = threading.Lock()
+
+        self.metrics = {
+            'solve_calls': 0,
+            'options_solved': 0,
+            'options_unsolvable': 0,
+            'warm_starts': 0,
+            'total_iterations': 0
+        }
+
+    def solve(
+        self,
+        model_name: str,
+        prices: np.ndarray | Sequence[float],
+        is_call: np.ndarray | Sequence[bool],
+        underlying: np.ndarray | float,
+        strikes: np.ndarray | Sequence[float],
+        times: np.ndarray | float,
+        rates: np.ndarray | float,
+        dividend_yields: np.ndarray | float = 0.0,
+        keys: Sequence[Hashable] | None = None
+    ) -> IVSolveResult:
+        """
+        Solve implied volatility for every option in the batch.
+
+        Args:
+            model_name: 'black_scholes', 'black_scholes_merton' or 'black76'
+            prices: Observed option prices
+            is_call: True for calls, False for puts
+            underlying: Spot prices (forward prices for black76)
+            strikes: Strike prices
+            times: Times to expiry in years
+            rates: Annual risk-free rates
+            dividend_yields: Continuous dividend yields (black_scholes_merton only)
+            keys: Optional per-option cache keys used for warm starts
+
+        Returns:
+            IVSolveResult with NaN for options whose price has no IV in the bracket
+        """
+        if model_name not in SUPPORTED_KERNEL_MODELS:
+            raise ValueError(f"Unsupported IV model: {model_name}")
+
+        market = np.ascontiguousarray(prices, dtype=np.float64)
+        n = market.shape[0]
+        is_call = np.asarray(is_call, dtype=bool)
+        S = self._broadcast(underlying, n)
+        K = self._broadcast(strikes, n)
+        t = self._broadcast(times, n)
+        r = self._broadcast(rates, n)
+        q = self._broadcast(dividend_yields, n) if model_name == 'black_scholes_merton' else np.zeros(n)
+
+        sigma = np.full(n, np.nan)
+        iterations = np.zeros(n, dtype=np.int32)
+        converged = np.zeros(n, dtype=bool)
+        warm_started = np.zeros(n, dtype=bool)
+
+        if n == 0:
+            return IVSolveResult(sigma, iterations, converged, warm_started)
+
+        with np.errstate(invalid='ignore', over='ignore'):
+            disc_r = np.exp(-r * t)
+            carry_disc = disc_r if model_name == 'black76' else np.exp(-q * t)
+        forward_gap = S * carry_disc - K * disc_r
+
+        valid = self._within_price_bounds(market, is_call, S * carry_disc, K * disc_r, t)
+
+        # Solve ITM options on their OTM twin via put-call parity: same IV, but the
+        # price is pure time value so the root is far better conditioned
+        itm = np.where(is_call, forward_gap > 0, forward_gap < 0) & valid
+        market = np.where(itm, market - np.where(is_call, forward_gap, -forward_gap), market)
+        is_call = np.where(itm, ~is_call, is_call)
+
+        lo = np.full(n, self.vol_min)
+        hi = np.full(n, self.vol_max)
+
+        # Prices outside [price(vol_min), price(vol_max)] have no IV inside the bracket
+        idx = np.flatnonzero(valid)
+        if idx.size:
+            p_lo, _ = price_and_vega(model_name, is_call[idx], S[idx], K[idx], t[idx], r[idx], lo[idx], q[idx])
+            p_hi, _ = price_and_vega(model_name, is_call[idx], S[idx], K[idx], t[idx], r[idx], hi[idx], q[idx])
+            valid[idx] = (market[idx] >= p_lo) & (market[idx] <= p_hi)
+
+        seeds = self._initial_guesses(market, S * carry_disc, t, keys, warm_started)
+        sigma[valid] = np.clip(seeds[valid], self.vol_min, self.vol_max)
+
+        idx = np.flatnonzero(valid)
+        for _ in range(self.max_iterations):
+            if idx.size == 0:
+                break
+
+            model_prices, vegas = price_and_vega(
+                model_name, is_call[idx], S[idx], K[idx], t[idx], r[idx], sigma[idx], q[idx]
+            )
+            diff = model_prices - market[idx]
+            iterations[idx] += 1
+
+            # Price is increasing in sigma, so the sign of diff tightens the bracket
+            above = diff > 0
+            hi[idx] = np.where(above, sigma[idx], hi[idx])
+            lo[idx] = np.where(above, lo[idx], sigma[idx])
+
+            with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+                newton_step = diff / vegas
+            newton = sigma[idx] - newton_step
+            use_bisection = ~np.isfinite(newton) | (newton <= lo[idx]) | (newton >= hi[idx])
+            next_sigma = np.where(use_bisection, 0.5 * (lo[idx] + hi[idx]), newton)
+
+            price_converged = np.abs(diff) <= self.price_tolerance * market[idx]
+            # A tiny in-bracket Newton step is accepted without another evaluation
+            step_converged = ~use_bisection & (np.abs(newton_step) <= self.vol_tolerance)
+            bracket_converged = (hi[idx] - lo[idx]) <= self.vol_tolerance
+
+            sigma[idx[step_converged]] = newton[step_converged]
+            done = price_converged | step_converged | bracket_converged
+            converged[idx[done]] = True
+
+            pending = ~done
+            sigma[idx[pending]] = next_sigma[pending]
+            idx = idx[pending]
+
+        # Anything left after the iteration cap is still inside its bracket; accept it
+        if idx.size:
+            converged[idx] = True
+
+        self._store_seeds(keys, sigma, converged)
+        self._record_metrics(n, converged, warm_started, iterations)
+
+        sigma[~converged] = np.nan
+        return IVSolveResult(sigma, iterations, converged, warm_started)
+
+    def solve_one(
+        self,
+        model_name: str,
+        price: float,
+        is_call: bool,
+        underlying: float,
+        strike: float,
+        time_to_expiry: float,
+        rate: float,
+        dividend_yield: float = 0.0,
+        key: Hashable | None = None
+    ) -> float | None:
+        """Solve implied volatility for a single option; None if no IV exists."""
+        result = self.solve(
+            model_name,
+            [price],
+            [is_call],
+            underlying,
+            [strike],
+            time_to_expiry,
+            rate,
+            dividend_yield,
+            keys=[key] if key is not None else None
+        )
+        iv = result.implied_volatilities[0]
+        return None if np.isnan(iv) else float(iv)
+
+    def clear_cache(self):
+        """Drop all cached warm-start seeds."""
+        with self._cache_lock:
+            self._seed_cache.clear()
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Get solver counters and average iterations per solved option."""
+        metrics = self.metrics.copy()
+        solved = metrics['options_solved']
+        metrics['avg_iterations'] = metrics['total_iterations'] / solved if solved else 0.0
+        metrics['cached_seeds'] = len(self._seed_cache)
+        return metrics
+
+    @staticmethod
+    def _broadcast(value, n: int) -> np.ndarray:
+        arr = np.asarray(value, dtype=np.float64)
+        if arr.ndim == 0:
+            return np.full(n, float(arr))
+        return np.ascontiguousarray(arr)
+
+    @staticmethod
+    def _within_price_bounds(
+        market: np.ndarray,
+        is_call: np.ndarray,
+        underlying_pv: np.ndarray,
+        strike_pv: np.ndarray,
+        t: np.ndarray
+    ) -> np.ndarray:
+        """Mask of options whose price lies strictly inside the no-arbitrage bounds."""
+        with np.errstate(invalid='ignore'):
+            finite = np.isfinite(market) & np.isfinite(underlying_pv) & np.isfinite(strike_pv)
+            positive = (underlying_pv > 0) & (strike_pv > 0) & (t > 0) & (market > 0)
+
+            sign = np.where(is_call, 1.0, -1.0)
+            lower = np.maximum(sign * (underlying_pv - strike_pv), 0.0)
+            upper = np.where(is_call, underlying_pv, strike_pv)
+
+            return finite & positive & (market > lower) & (market < upper)
+
+    def _initial_guesses(
+        self,
+        market: np.ndarray,
+        underlying_pv: np.ndarray,
+        t: np.ndarray,
+        keys: Sequence[Hashable] | None,
+        warm_started: np.ndarray
+    ) -> np.ndarray:
+        """Cached IV where available, otherwise the Brenner-Subrahmanyam approximation."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            seeds = np.sqrt(2.0 * np.pi / t) * market / underlying_pv
+        seeds = np.where(np.isfinite(seeds), seeds, 0.2)
+
+        if keys is not None:
+            cache = self._seed_cache
+            for i, key in enumerate(keys):
+                if key is None:
+                    continue
+                cached = cache.get(key)
+                if cached is not None:
+                    seeds[i] = cached
+                    warm_started[i] = True
+
+        return seeds
+
+    def _store_seeds(self, keys: Sequence[Hashable] | None, sigma: np.ndarray, converged: np.ndarray):
+        if keys is None:
+            return
+
+        with self._cache_lock:
+            cache = self._seed_cache
+            for i, key in enumerate(keys):
+                if key is None:
+                    continue
+                if converged[i]:
+                    cache.pop(key, None)
+                    cache[key] = float(sigma[i])
+                else:
+                    cache.pop(key, None)
+
+            # Oldest entries go first once over capacity
+            while len(cache) > self.cache_size:
+                cache.pop(next(iter(cache)))
+
+    def _record_metrics(
+        self,
+        n: int,
+        converged: np.ndarray,
+        warm_started: np.ndarray,
+        iterations: np.ndarray
+    ):
+        solved = int(converged.sum())
+        self.metrics['solve_calls'] += 1
+        self.metrics['options_solved'] += solved
+        self.metrics['options_unsolvable'] += n - solved
+        self.metrics['warm_starts'] += int(warm_started.sum())
+        self.metrics['total_iterations'] += int(iterations[converged].sum())
+
+
+# Global instance
+_implied_volatility_solver: BatchImpliedVolatilitySolver | None = None
+
+
+def get_implied_volatility_solver() -> BatchImpliedVolatilitySolver:
+    """Get the shared implied volatility solver instance"""
+    global _implied_volatility_solver
+    if _implied_volatility_solver is None:
+        _implied_volatility_solver = BatchImpliedVolatilitySolver()
+    return _implied_volatility_solver
@@ -0,0 +1,428 @@
+"""
+Incremental bars built from live ticks.
+
+One builder per process keeps, for every instrument, the forming (open) bar
+of each subscribed timeframe. A tick is taken once and updates all of them:
+a price within the open bar's bucket is a few comparisons per timeframe, so
+a tick costs O(timeframes) with no re-aggregation of earlier ticks.
+
+When a tick falls past an open bar's bucket, that bar is closed and handed
+to the listeners as a bar-close event. Bars of instruments that stop ticking
+are closed by a sweep once their bucket has ended (plus a small delay for
+late ticks), so a close never waits for the next tick.
+
+Buckets are aligned to the exchange session by TradingSession, like
+MultiTimeframeResampler's: intraday buckets count from the session open,
+the last intraday bar and day bars close at the session close and week bars
+start on Monday. Ticks that arrive after their bar closed are dropped.
+"""
+
+import asyncio
+import contextlib
+import heapq
+import inspect
+import itertools
+import json
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime, time as dt_time
+from typing import Any
+
+from app.services.historical_bar_store import timeframe_seconds
+from app.services.trading_session import TradingSession
+from app.utils.logging_utils import log_exception, log_info, log_warning
+
+# listener(bars) is called with every batch of closed bars; it may return an awaitable
+BarListener = Callable[[list['Bar']], Any]
+
+
+@dataclass(slots=True)
+class Bar:
+    """An OHLCV bar of one instrument and interval; start is the bucket start (UTC epoch seconds)."""
+    instrument_key: str
+    interval: str
+    start: float
+    close_at: float
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float = 0.0
+    ticks: int = 0
+    closed: bool = False
+
+    def as_ohlcv(self) -> tuple[float, float, float, float, float, float]:
+        """(timestamp, open, high, low, close, volume) as stored by OHLCVStore."""
+        return (self.start, self.open, self.high, self.low, self.close, self.volume)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'instrument_key': self.instrument_key,
+            'interval': self.interval,
+            'timestamp': datetime.fromtimestamp(self.start, UTC).isoformat(),
+            'open': self.open,
+            'high': self.high,
+            'low': self.low,
+            'close': self.close,
+            'volume': self.volume,
+            'ticks': self.ticks,
+            'closed': self.closed
+        }
+
+
+class _Timeframe:
+    """Open bar of one (instrument, interval) and the bucket it covers: ticks in [low, close_at)."""
+
+    __slots__ = ('interval', 'seconds', 'owners', 'bar', 'low')
+
+    def __init__(self, interval: str, seconds: int):
+        self.interval = interval
+        self.seconds = seconds
+        self.owners: set = set()
+        self.bar: Bar | None = None
+        self.low = 0.0
+
+
+class _Instrument:
+    __slots__ = ('timeframes', 'last_volume')
+
+    def __init__(self):
+        self.timeframes: dict[str, _Timeframe] = {}
+        self.last_volume: float | None = None
+
+
+def _epoch_seconds(timestamp: datetime | float | str) -> float:
+    """Epoch seconds of a datetime, ISO string or number; naive datetimes are taken as UTC."""
+    if isinstance(timestamp, int | float):
+        return float(timestamp)
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=UTC)
+    return timestamp.timestamp()
+
+
+def _number(value: Any) -> float | None:
+    if isinstance(value, dict):
+        value = value.get('value')
+    elif isinstance(value, str) and value.startswith('{'):
+        try:
+            value = json.loads(value).get('value')
+        except (ValueError, AttributeError):
+            return None
+    try:
+        return float(value) if value is not None and value != '' else None
+    except (TypeError, ValueError):
+        return None
+
+
+def tick_trade(fields: dict[str, Any]) -> tuple[float, float, float | None] | None:
+    """
+    (timestamp, price, volume) of a stream tick's decoded fields.
+
+    The price is the LTP (plain or {'value': ...}); the time is the exchange
+    timestamp ('ts_exch', else 'timestamp', else now). None without a price.
+    """
+    price = _number(fields.get('ltp'))
+    if price is None:
+        return None
+
+    stamp = fields.get('ts_exch') or fields.get('timestamp')
+    try:
+        timestamp = _epoch_seconds(stamp) if stamp else time.time()
+    except (TypeError, ValueError):
+        timestamp = time.time()
+    return timestamp, price, _number(fields.get('v', fields.get('volume')))
+
+
+class IncrementalBarBuilder:
+    """Forming bars of every subscribed timeframe per instrument, with bar-close events."""
+
+    def __init__(
+        self,
+        session_timezone: str = 'Asia/Kolkata',
+        session_open: dt_time = dt_time(9, 15),
+        session_close: dt_time = dt_time(15, 30),
+        close_delay: float = 2.0,
+        sweep_interval: float = 1.0,
+        cumulative_volume: bool = True
+    ):
+        """
+        Args:
+            session_timezone: Exchange timezone (IANA name)
+            session_open: Local time the session opens; intraday buckets start here
+            session_close: Local time the session's last intraday bar and day (and longer) bars close
+            close_delay: Seconds after a bucket ends before the sweep closes its bar
+            sweep_interval: Seconds between sweeps for bars whose bucket has ended
+            cumulative_volume: Tick volume is the day's traded volume so far
+                (bar volume is its increase); otherwise each tick's own quantity
+        """
+        self.session = TradingSession(session_timezone, session_open, session_close)
+        self.close_delay = close_delay
+        self.sweep_interval = sweep_interval
+        self.cumulative_volume = cumulative_volume
+
+        self._instruments: dict[str, _Instrument] = {}
+        self._owners: dict[Any, set[tuple[str, str]]] = {}
+        self._listeners: list[BarListener] = []
+
+        # (close_at, sequence, timeframe, bar) of every open bar; entries of bars closed by a tick are skipped
+        self._due: list[tuple[float, int, _Timeframe, Bar]] = []
+        self._sequence = itertools.count()
+        self._task: asyncio.Task | None = None
+        self._notifying: set[asyncio.Task] = set()
+
+        self.metrics = {
+            'ticks': 0,
+            'bar_updates': 0,
+            'bars_opened': 0,
+            'bars_closed': 0,
+            'closed_by_sweep': 0,
+            'late_ticks': 0,
+            'listener_errors': 0
+        }
+
+    # Subscriptions
+
+    def subscribe(self, instrument_key: str, interval: str, owner: Any) -> bool:
+        """
+        Build bars of interval for the instrument on behalf of owner.
+
+        Args:
+            instrument_key: Instrument to build bars for
+            interval: Bar interval, e.g. '5minute' or '5m'
+            owner: Subscriber key (e.g. a config key); unsubscribe(owner) releases it
+
+        Returns:
+            False if the interval has no fixed length (nothing is built)
+        """
+        seconds = timeframe_seconds(interval)
+        if not seconds or seconds % 60:
+            return False
+
+        instrument = self._instruments.setdefault(instrument_key, _Instrument())
+        timeframe = instrument.timeframes.get(interval)
+        if timeframe is None:
+            timeframe = instrument.timeframes[interval] = _Timeframe(interval, seconds)
+        timeframe.owners.add(owner)
+        self._owners.setdefault(owner, set()).add((instrument_key, interval))
+        return True
+
+    def unsubscribe(self, owner: Any) -> bool:
+        """Release everything owner subscribed; timeframes nobody else wants are dropped with their open bar."""
+        subscriptions = self._owners.pop(owner, None)
+        if not subscriptions:
+            return False
+
+        for instrument_key, interval in subscriptions:
+            instrument = self._instruments.get(instrument_key)
+            timeframe = instrument.timeframes.get(interval) if instrument else None
+            if timeframe is None:
+                continue
+            timeframe.owners.discard(owner)
+            if not timeframe.owners:
+                timeframe.bar = None
+                del instrument.timeframes[interval]
+                if not instrument.timeframes:
+                    del self._instruments[instrument_key]
+        return True
+
+    def intervals(self, instrument_key: str) -> tuple[str, ...]:
+        instrument = self._instruments.get(instrument_key)
+        return tuple(instrument.timeframes) if instrument else ()
+
+    def add_listener(self, listener: BarListener):
+        """Call listener(bars) with every batch of closed bars; coroutine results run as tasks."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: BarListener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    # Ticks
+
+    def on_tick(self, instrument_key: str, timestamp: datetime | float, price: float,
+                volume: float | None = None) -> list[Bar]:
+        """
+        Apply one trade to every subscribed timeframe of the instrument.
+
+        Args:
+            instrument_key: Instrument that traded
+            timestamp: Exchange time of the trade (datetime or UTC epoch seconds)
+            price: Traded price
+            volume: Cumulative day volume or the trade quantity (see cumulative_volume)
+
+        Returns:
+            List: Bars this tick closed (also passed to the listeners)
+        """
+        instrument = self._instruments.get(instrument_key)
+        if instrument is None:
+            return []
+
+        self.metrics['ticks'] += 1
+        ts = _epoch_seconds(timestamp)
+        quantity = self._quantity(instrument, volume)
+
+        closed = []
+        for timeframe in instrument.timeframes.values():
+            bar = timeframe.bar
+            if bar is not None and timeframe.low <= ts < bar.close_at:
+                if not bar.closed:
+                    if price > bar.high:
+                        bar.high = price
+                    elif price < bar.low:
+                        bar.low = price
+                    bar.close = price
+                    bar.volume += quantity
+                    bar.ticks += 1
+                    self.metrics['bar_updates'] += 1
+                else:
+                    self.metrics['late_ticks'] += 1
+                continue
+
+            if bar is not None and ts < timeframe.low:
+                self.metrics['late_ticks'] += 1
+                continue
+
+            # The tick lies past the open bar's bucket: close it and open the tick's bucket
+            if bar is not None and not bar.closed:
+                bar.closed = True
+                closed.append(bar)
+
+            start, low, close_at = self.session.bucket(ts, timeframe.seconds)
+            if ts >= close_at:
+                # After the session close (of the last day, for day and longer bars)
+                self.metrics['late_ticks'] += 1
+                continue
+            timeframe.low = low
+            timeframe.bar = Bar(instrument_key, timeframe.interval, start, close_at,
+                                price, price, price, price, quantity, 1)
+            heapq.heappush(self._due, (close_at, next(self._sequence), timeframe, timeframe.bar))
+            self.metrics['bars_opened'] += 1
+            self.ensure_started()
+
+        if closed:
+            self._notify(closed)
+        return closed
+
+    def open_bar(self, instrument_key: str, interval: str) -> Bar | None:
+        """The forming bar of the instrument's interval, if one is open."""
+        instrument = self._instruments.get(instrument_key)
+        timeframe = instrument.timeframes.get(interval) if instrument else None
+        if timeframe is None or timeframe.bar is None or timeframe.bar.closed:
+            return None
+        return timeframe.bar
+
+    def close_due(self, now: float | None = None) -> list[Bar]:
+        """Close every open bar whose bucket ended at least close_delay seconds before now."""
+        now = time.time() if now is None else now
+        closed = []
+        while self._due and self._due[0][0] + self.close_delay <= now:
+            _, _, timeframe, bar = heapq.heappop(self._due)
+            if bar.closed or timeframe.bar is not bar:
+                continue
+            bar.closed = True
+            closed.append(bar)
+
+        if closed:
+            self.metrics['closed_by_sweep'] += len(closed)
+            self._notify(closed)
+        return closed
+
+    def _quantity(self, instrument: _Instrument, volume: float | None) -> float:
+        if volume is None:
+            return 0.0
+        if not self.cumulative_volume:
+            return volume
+
+        previous = instrument.last_volume
+        instrument.last_volume = volume
+        if previous is None:
+            return 0.0
+        # The day's volume restarts from zero on a new session
+        return volume - previous if volume >= previous else volume
+
+    # Events
+
+    def _notify(self, bars: list[Bar]):
+        self.metrics['bars_closed'] += len(bars)
+        for listener in list(self._listeners):
+            try:
+                result = listener(bars)
+            except Exception as e:
+                self.metrics['listener_errors'] += 1
+                log_exception(f"Bar close listener failed for {len(bars)} bars: {e}")
+                continue
+
+            if inspect.isawaitable(result):
+                # Listeners run as tasks so a slow computation cannot hold up the tick path
+                task = asyncio.ensure_future(result)
+                self._notifying.add(task)
+                task.add_done_callback(self._listener_done)
+
+    def _listener_done(self, task: asyncio.Task):
+        self._notifying.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.metrics['listener_errors'] += 1
+            log_warning(f"Bar close listener failed: {task.exception()}")
+
+    # Sweep
+
+    def ensure_started(self):
+        """Start the sweep task if a loop is running and it is not already running."""
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._task = loop.create_task(self._run())
+
+    async def stop(self):
+        """Stop the sweep and wait for listeners still running."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+        if self._notifying:
+            await asyncio.gather(*self._notifying, return_exceptions=True)
+
+    async def _run(self):
+        log_info(f"Bar close sweep started (every {self.sweep_interval}s)")
+        try:
+            while self._due:
+                await asyncio.sleep(self.sweep_interval)
+                self.close_due()
+        except asyncio.CancelledError:
+            log_info("Bar close sweep stopped")
+            raise
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            **self.metrics,
+            'instruments': len(self._instruments),
+            'timeframes': sum(len(instrument.timeframes) for instrument in self._instruments.values()),
+            'open_bars': sum(
+                1 for instrument in self._instruments.values()
+                for timeframe in instrument.timeframes.values()
+                if timeframe.bar is not None and not timeframe.bar.closed
+            ),
+            'pending_closes': len(self._due),
+            'listeners': len(self._listeners),
+            'running': self._task is not None and not self._task.done()
+        }
+
+
+def feed_stream_ticks(builder: IncrementalBarBuilder, instrument_key: str,
+                      ticks: Iterable[dict[str, Any]]) -> list[Bar]:
+    """Apply decoded stream tick fields to the builder in order; returns the bars they closed."""
+    closed = []
+    for fields in ticks:
+        trade = tick_trade(fields)
+        if trade is not None:
+            closed.extend(builder.on_tick(instrument_key, *trade))
+    return closed
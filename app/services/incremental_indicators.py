@@ -0,0 +1,756 @@
+"""
+Incremental technical indicators with O(1) per-bar updates.
+
+Each indicator keeps just enough state to advance by one bar:
+- update(bar) commits a closed bar and returns the indicator value
+- peek(bar) returns the value as if the forming bar closed now, without
+  changing any state, so every tick is answered from committed state
+
+IncrementalIndicatorSet holds the indicators of one instrument and interval.
+It either takes its bars from IncrementalBarBuilder (commit() on each bar
+close, set_forming() with the open bar) or merges ticks into the forming bar
+itself and commits it when a tick opens the next interval. Intervals are
+bucketed by TradingSession, so both ways produce the same bars. Its state round-trips through plain dicts,
+which is what SignalRedisManager.store_indicator_state/get_indicator_state
+persist.
+
+Multi-value indicators (MACD, Bollinger Bands, stochastic) key their values
+by the pandas_ta column names, e.g. MACD_12_26_9, MACDh_12_26_9 and
+MACDs_12_26_9, so both execution paths return the same keys.
+
+Supported: EMA, SMA, RSI (Wilder), MACD, ATR (Wilder), Bollinger Bands, VWAP
+(anchored to the UTC day) and the stochastic oscillator. EMAs are seeded with
+the SMA of their first `length` values, as pandas_ta does; Bollinger Bands use
+the population standard deviation, also as pandas_ta does.
+"""
+
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from app.services.trading_session import SECONDS_PER_DAY, TradingSession
+
+
+@dataclass
+class Bar:
+    """OHLCV bar; timestamp is epoch seconds of the bar start (or its first tick)."""
+    timestamp: float
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float = 0.0
+
+    def merge_tick(self, price: float, volume: float):
+        self.high = max(self.high, price)
+        self.low = min(self.low, price)
+        self.close = price
+        self.volume += volume
+
+
+class _EmaCore:
+    """EMA seeded with the SMA of the first `length` values."""
+
+    __slots__ = ('length', 'alpha', 'count', 'seed_sum', 'value')
+
+    def __init__(self, length: int):
+        self.length = length
+        self.alpha = 2.0 / (length + 1)
+        self.count = 0
+        self.seed_sum = 0.0
+        self.value = None
+
+    def next(self, x: float, commit: bool) -> float | None:
+        if self.value is not None:
+            value = self.value + self.alpha * (x - self.value)
+        elif self.count + 1 == self.length:
+            value = (self.seed_sum + x) / self.length
+        else:
+            value = None
+
+        if commit:
+            if self.value is None:
+                self.count += 1
+                self.seed_sum += x
+            self.value = value
+        return value
+
+    def to_state(self) -> dict:
+        return {'count': self.count, 'seed_sum': self.seed_sum, 'value': self.value}
+
+    def load_state(self, state: dict):
+        self.count = state['count']
+        self.seed_sum = state['seed_sum']
+        self.value = state['value']
+
+
+class _RollingWindow:
+    """
+    Running sum and sum of squares over the last `length` values.
+
+    Values are stored relative to the first value seen so that the variance
+    of e.g. index prices does not lose precision to cancellation. Sums are
+    recomputed from the window once per `length` pushes to stop drift.
+    """
+
+    def __init__(self, length: int):
+        self.length = length
+        self.values: deque[float] = deque()
+        self.shift = None
+        self.total = 0.0
+        self.total_sq = 0.0
+        self._pushes = 0
+
+    def stats(self, x: float, commit: bool) -> tuple[float, float] | None:
+        """(mean, population variance) of the window including x, once it is full."""
+        shift = self.shift if self.shift is not None else x
+        if commit:
+            self.shift = shift
+        dx = x - shift
+
+        total = self.total + dx
+        total_sq = self.total_sq + dx * dx
+        count = len(self.values) + 1
+        if count > self.length:
+            oldest = self.values[0]
+            total -= oldest
+            total_sq -= oldest * oldest
+            count -= 1
+
+        if commit:
+            self.values.append(dx)
+            if len(self.values) > self.length:
+                self.values.popleft()
+            self.total, self.total_sq = total, total_sq
+            self._pushes += 1
+            if self._pushes >= self.length:
+                self._resum()
+
+        if count < self.length:
+            return None
+        mean = total / count
+        variance = max(total_sq / count - mean * mean, 0.0)
+        return mean + shift, variance
+
+    def mean(self, x: float, commit: bool) -> float | None:
+        stats = self.stats(x, commit)
+        return stats[0] if stats is not None else None
+
+    def _resum(self):
+        self.total = sum(self.values)
+        self.total_sq = sum(v * v for v in self.values)
+        self._pushes = 0
+
+    def to_state(self) -> dict:
+        return {'values': list(self.values), 'shift': self.shift}
+
+    def load_state(self, state: dict):
+        self.values = deque(state['values'])
+        self.shift = state['shift']
+        self._resum()
+
+
+class _RollingExtreme:
+    """Rolling max (or min) over `length` values using a monotonic deque."""
+
+    def __init__(self, length: int, is_max: bool):
+        self.length = length
+        self.is_max = is_max
+        self.items: deque[tuple[int, float]] = deque()  # (index, value), monotonic
+        self.index = 0
+
+    def _better(self, a: float, b: float) -> bool:
+        return a >= b if self.is_max else a <= b
+
+    def extreme(self, x: float, commit: bool) -> float | None:
+        """Extreme of the window including x, once it is full."""
+        full = self.index + 1 >= self.length
+        oldest_kept = self.index - self.length + 1
+
+        if commit:
+            while self.items and self.items[0][0] < oldest_kept:
+                self.items.popleft()
+            while self.items and self._better(x, self.items[-1][1]):
+                self.items.pop()
+            self.items.append((self.index, x))
+            self.index += 1
+            return self.items[0][1] if full else None
+
+        # Only the front can fall out of the window on a single step
+        front = None
+        for idx, value in self.items:
+            if idx >= oldest_kept:
+                front = value
+                break
+        if front is not None and not self._better(x, front):
+            x = front
+        return x if full else None
+
+    def to_state(self) -> dict:
+        return {'items': [list(item) for item in self.items], 'index': self.index}
+
+    def load_state(self, state: dict):
+        self.items = deque((int(idx), value) for idx, value in state['items'])
+        self.index = state['index']
+
+
+class IncrementalIndicator(ABC):
+    """Base class: subclasses implement _next(bar, commit) and the state round trip."""
+
+    kind = ''
+    PARAMETERS: dict[str, Any] = {}
+
+    def __init__(self, **params):
+        unknown = set(params) - set(self.PARAMETERS)
+        if unknown:
+            raise ValueError(f"Unsupported {self.kind} parameters: {sorted(unknown)}")
+        self.params = {**self.PARAMETERS, **params}
+
+    def update(self, bar: Bar) -> Any:
+        """Commit a closed bar and return the indicator value."""
+        return self._next(bar, commit=True)
+
+    def peek(self, bar: Bar) -> Any:
+        """Value if `bar` closed now; state is left unchanged."""
+        return self._next(bar, commit=False)
+
+    @abstractmethod
+    def _next(self, bar: Bar, commit: bool) -> Any:
+        """Value after `bar`; state advances only when commit is true."""
+
+    @abstractmethod
+    def to_state(self) -> dict:
+        """JSON-serialisable state."""
+
+    @abstractmethod
+    def load_state(self, state: dict):
+        """Restore state produced by to_state()."""
+
+
+class EMA(IncrementalIndicator):
+    kind = 'ema'
+    PARAMETERS = {'length': 20}
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        self._ema = _EmaCore(int(self.params['length']))
+
+    def _next(self, bar: Bar, commit: bool) -> float | None:
+        return self._ema.next(bar.close, commit)
+
+    def to_state(self) -> dict:
+        return self._ema.to_state()
+
+    def load_state(self, state: dict):
+        self._ema.load_state(state)
+
+
+class SMA(IncrementalIndicator):
+    kind = 'sma'
+    PARAMETERS = {'length': 20}
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        self._window = _RollingWindow(int(self.params['length']))
+
+    def _next(self, bar: Bar, commit: bool) -> float | None:
+        return self._window.mean(bar.close, commit)
+
+    def to_state(self) -> dict:
+        return self._window.to_state()
+
+    def load_state(self, state: dict):
+        self._window.load_state(state)
+
+
+class RSI(IncrementalIndicator):
+    """RSI with Wilder smoothing, seeded with the simple average of the first `length` moves."""
+
+    kind = 'rsi'
+    PARAMETERS = {'length': 14}
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        self.length = int(self.params['length'])
+        self.prev_close = None
+        self.count = 0
+        self.gain_sum = 0.0
+        self.loss_sum = 0.0
+        self.avg_gain = None
+        self.avg_loss = None
+
+    def _next(self, bar: Bar, commit: bool) -> float | None:
+        if self.prev_close is None:
+            if commit:
+                self.prev_close = bar.close
+            return None
+
+        n = self.length
+        change = bar.close - self.prev_close
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+
+        count, gain_sum, loss_sum = self.count, self.gain_sum, self.loss_sum
+        if self.avg_gain is not None:
+            avg_gain = (self.avg_gain * (n - 1) + gain) / n
+            avg_loss = (self.avg_loss * (n - 1) + loss) / n
+        else:
+            count += 1
+            gain_sum += gain
+            loss_sum += loss
+            avg_gain = gain_sum / n if count == n else None
+            avg_loss = loss_sum / n if count == n else None
+
+        if commit:
+            self.prev_close = bar.close
+            self.count, self.gain_sum, self.loss_sum = count, gain_sum, loss_sum
+            self.avg_gain, self.avg_loss = avg_gain, avg_loss
+
+        if avg_gain is None or avg_gain + avg_loss == 0:
+            return None
+        return 100.0 * avg_gain / (avg_gain + avg_loss)
+
+    def to_state(self) -> dict:
+        return {
+            'prev_close': self.prev_close, 'count': self.count,
+            'gain_sum': self.gain_sum, 'loss_sum': self.loss_sum,
+            'avg_gain': self.avg_gain, 'avg_loss': self.avg_loss
+        }
+
+    def load_state(self, state: dict):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+
+class MACD(IncrementalIndicator):
+    kind = 'macd'
+    PARAMETERS = {'fast': 12, 'slow': 26, 'signal': 9}
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        self._fast = _EmaCore(int(self.params['fast']))
+        self._slow = _EmaCore(int(self.params['slow']))
+        self._signal = _EmaCore(int(self.params['signal']))
+        suffix = f"_{self._fast.length}_{self._slow.length}_{self._signal.length}"
+        self.columns = (f"MACD{suffix}", f"MACDh{suffix}", f"MACDs{suffix}")
+
+    def _next(self, bar: Bar, commit: bool) -> dict[str, float | None] | None:
+        fast = self._fast.next(bar.close, commit)
+        slow = self._slow.next(bar.close, commit)
+        if fast is None or slow is None:
+            return None
+
+        macd = fast - slow
+        signal = self._signal.next(macd, commit)
+        macd_key, histogram_key, signal_key = self.columns
+        return {
+            macd_key: macd,
+            histogram_key: macd - signal if signal is not None else None,
+            signal_key: signal
+        }
+
+    def to_state(self) -> dict:
+        return {
+            'fast': self._fast.to_state(),
+            'slow': self._slow.to_state(),
+            'signal': self._signal.to_state()
+        }
+
+    def load_state(self, state: dict):
+        self._fast.load_state(state['fast'])
+        self._slow.load_state(state['slow'])
+        self._signal.load_state(state['signal'])
+
+
+class ATR(IncrementalIndicator):
+    """Average true range with Wilder smoothing, seeded with the SMA of the first `length` ranges."""
+
+    kind = 'atr'
+    PARAMETERS = {'length': 14}
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        self.length = int(self.params['length'])
+        self.prev_close = None
+        self.count = 0
+        self.range_sum = 0.0
+        self.value = None
+
+    def _next(self, bar: Bar, commit: bool) -> float | None:
+        if self.prev_close is None:
+            if commit:
+                self.prev_close = bar.close
+            return None
+
+        n = self.length
+        true_range = max(
+            bar.high - bar.low,
+            abs(bar.high - self.prev_close),
+            abs(bar.low - self.prev_close)
+        )
+
+        count, range_sum = self.count, self.range_sum
+        if self.value is not None:
+            value = (self.value * (n - 1) + true_range) / n
+        else:
+            count += 1
+            range_sum += true_range
+            value = range_sum / n if count == n else None
+
+        if commit:
+            self.prev_close = bar.close
+            self.count, self.range_sum, self.value = count, range_sum, value
+        return value
+
+    def to_state(self) -> dict:
+        return {
+            'prev_close': self.prev_close, 'count': self.count,
+            'range_sum': self.range_sum, 'value': self.value
+        }
+
+    def load_state(self, state: dict):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+
+class BollingerBands(IncrementalIndicator):
+    kind = 'bbands'
+    PARAMETERS = {'length': 20, 'std': 2.0}
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        self._window = _RollingWindow(int(self.params['length']))
+        self.width = float(self.params['std'])
+        suffix = f"_{self._window.length}_{self.width}"
+        self.columns = tuple(f"BB{band}{suffix}" for band in 'LMUBP')
+
+    def _next(self, bar: Bar, commit: bool) -> dict[str, float | None] | None:
+        stats = self._window.stats(bar.close, commit)
+        if stats is None:
+            return None
+
+        middle, variance = stats
+        offset = self.width * variance ** 0.5
+        lower, upper = middle - offset, middle + offset
+        # lower, middle, upper, bandwidth, percent
+        return dict(zip(self.columns, (
+            lower,
+            middle,
+            upper,
+            100.0 * (upper - lower) / middle if middle else None,
+            (bar.close - lower) / (upper - lower) if upper > lower else None
+        ), strict=True))
+
+    def to_state(self) -> dict:
+        return self._window.to_state()
+
+    def load_state(self, state: dict):
+        self._window.load_state(state)
+
+
+class VWAP(IncrementalIndicator):
+    """Volume-weighted average of the typical price, reset at each UTC day."""
+
+    kind = 'vwap'
+    PARAMETERS = {}
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        self.session = None
+        self.price_volume = 0.0
+        self.volume = 0.0
+
+    def _next(self, bar: Bar, commit: bool) -> float | None:
+        session = int(bar.timestamp // SECONDS_PER_DAY)
+        if session != self.session:
+            price_volume, volume = 0.0, 0.0
+        else:
+            price_volume, volume = self.price_volume, self.volume
+
+        typical = (bar.high + bar.low + bar.close) / 3.0
+        price_volume += typical * bar.volume
+        volume += bar.volume
+
+        if commit:
+            self.session, self.price_volume, self.volume = session, price_volume, volume
+        return price_volume / volume if volume > 0 else None
+
+    def to_state(self) -> dict:
+        return {'session': self.session, 'price_volume': self.price_volume, 'volume': self.volume}
+
+    def load_state(self, state: dict):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+
+class Stochastic(IncrementalIndicator):
+    """Slow stochastic: %K over `k` bars smoothed by `smooth_k`, %D its `d`-bar SMA."""
+
+    kind = 'stoch'
+    PARAMETERS = {'k': 14, 'd': 3, 'smooth_k': 3}
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        k = int(self.params['k'])
+        self._highs = _RollingExtreme(k, is_max=True)
+        self._lows = _RollingExtreme(k, is_max=False)
+        self._k_window = _RollingWindow(int(self.params['smooth_k']))
+        self._d_window = _RollingWindow(int(self.params['d']))
+        suffix = f"_{k}_{self._d_window.length}_{self._k_window.length}"
+        self.columns = (f"STOCHk{suffix}", f"STOCHd{suffix}")
+
+    def _next(self, bar: Bar, commit: bool) -> dict[str, float | None] | None:
+        highest = self._highs.extreme(bar.high, commit)
+        lowest = self._lows.extreme(bar.low, commit)
+        if highest is None or lowest is None or highest == lowest:
+            return None
+
+        raw_k = 100.0 * (bar.close - lowest) / (highest - lowest)
+        k_line = self._k_window.mean(raw_k, commit)
+        if k_line is None:
+            return None
+        k_key, d_key = self.columns
+        return {k_key: k_line, d_key: self._d_window.mean(k_line, commit)}
+
+    def to_state(self) -> dict:
+        return {
+            'highs': self._highs.to_state(), 'lows': self._lows.to_state(),
+            'k_window': self._k_window.to_state(), 'd_window': self._d_window.to_state()
+        }
+
+    def load_state(self, state: dict):
+        self._highs.load_state(state['highs'])
+        self._lows.load_state(state['lows'])
+        self._k_window.load_state(state['k_window'])
+        self._d_window.load_state(state['d_window'])
+
+
+INCREMENTAL_INDICATORS: dict[str, type[IncrementalIndicator]] = {
+    'ema': EMA,
+    'sma': SMA,
+    'rsi': RSI,
+    'macd': MACD,
+    'atr': ATR,
+    'bbands': BollingerBands,
+    'bb': BollingerBands,
+    'vwap': VWAP,
+    'stoch': Stochastic,
+}
+
+
+def create_indicator(name: str, parameters: dict | None = None) -> IncrementalIndicator | None:
+    """Incremental implementation of an indicator, or None if it is not supported with these parameters."""
+    indicator_cls = INCREMENTAL_INDICATORS.get(name.lower())
+    if indicator_cls is None:
+        return None
+    try:
+        return indicator_cls(**(parameters or {}))
+    except (TypeError, ValueError):
+        return None
+
+
+def indicator_spec_key(name: str, parameters: dict | None = None) -> str:
+    """Stable key for an indicator and its parameters, e.g. 'rsi(length=14)'."""
+    params = ','.join(f"{key}={value}" for key, value in sorted((parameters or {}).items()))
+    return f"{name.lower()}({params})"
+
+
+class IncrementalIndicatorSet:
+    """
+    Incremental indicators for one instrument and interval.
+
+    Closed bars are committed to every indicator, either from a bar builder
+    (commit) or when the first tick of the next interval arrives (on_tick).
+    values() answers from committed state plus the forming bar. Buckets are
+    the session-aligned ones of `session`.
+    """
+
+    def __init__(self, interval_seconds: int, session: TradingSession | None = None,
+                 cumulative_volume: bool = False):
+        """
+        Args:
+            interval_seconds: Bar length
+            session: Exchange session the bars are aligned to
+            cumulative_volume: Tick volume is the day's traded volume so far
+                (bar volume is its increase, as in IncrementalBarBuilder);
+                otherwise each tick's own quantity
+        """
+        self.interval_seconds = interval_seconds
+        self.session = session or TradingSession()
+        self.cumulative_volume = cumulative_volume
+        self.indicators: dict[str, IncrementalIndicator] = {}
+        self.forming: Bar | None = None
+        self.bars_committed = 0
+        self.committed_bucket: float | None = None   # label of the last committed bar's bucket
+        self.last_volume: float | None = None
+        self._last_tick = None
+        self._bounds: tuple[float, float] | None = None   # [first second, close) of the forming bucket
+
+    def bucket(self, timestamp: float) -> float:
+        """Label (start) of the bucket holding timestamp, as UTC epoch seconds."""
+        return self.session.bucket(timestamp, self.interval_seconds)[0]
+
+    @property
+    def forming_bucket(self) -> float | None:
+        return self.bucket(self.forming.timestamp) if self.forming is not None else None
+
+    def _forming_bounds(self) -> tuple[float, float]:
+        if self._bounds is None:
+            _, low, close_at = self.session.bucket(self.forming.timestamp, self.interval_seconds)
+            self._bounds = (low, close_at)
+        return self._bounds
+
+    def start(self, history: Sequence[Bar], now: float):
+        """
+        Adopt historical bars; the last one becomes the forming bar if it is still open at `now`.
+        """
+        closed = list(history)
+        if closed and self.bucket(closed[-1].timestamp) >= self.bucket(now):
+            self.forming = closed.pop()
+            self._bounds = None
+        self.bars_committed = len(closed)
+        self.committed_bucket = self.bucket(closed[-1].timestamp) if closed else None
+
+    def add(self, key: str, indicator: IncrementalIndicator, history: Sequence[Bar], now: float):
+        """Register an indicator and warm it up on the closed bars in `history`."""
+        cutoff = self.forming_bucket if self.forming is not None else self.bucket(now)
+        for bar in history:
+            if self.bucket(bar.timestamp) < cutoff:
+                indicator.update(bar)
+        self.indicators[key] = indicator
+
+    def is_stale(self, now: float) -> bool:
+        """
+        Whether bars were missed since this state was saved.
+
+        True once `now` is a whole interval past the forming bar's close, i.e.
+        at least one bar closed without this set seeing it.
+        """
+        if self.forming is None:
+            return True
+        return now >= self._forming_bounds()[1] + self.interval_seconds
+
+    def on_tick(self, timestamp: float, price: float, volume: float = 0.0) -> bool:
+        """
+        Merge a tick into the forming bar.
+
+        Returns:
+            True when the tick opened a new interval and the previous bar was committed
+        """
+        marker = (timestamp, price, volume)
+        if marker == self._last_tick:
+            return False  # same tick seen through another configuration
+        self._last_tick = marker
+        volume = self._quantity(volume)
+
+        if self.forming is not None:
+            low, close_at = self._forming_bounds()
+            if low <= timestamp < close_at:
+                self.forming.merge_tick(price, volume)
+                return False
+            if timestamp < low:
+                return False  # late tick for an already committed bar
+
+        _, low, close_at = self.session.bucket(timestamp, self.interval_seconds)
+        if timestamp >= close_at:
+            return False  # after the session close (of the last day, for day and longer bars)
+
+        committed = self.forming is not None
+        if committed:
+            for indicator in self.indicators.values():
+                indicator.update(self.forming)
+            self.bars_committed += 1
+            self.committed_bucket = self.bucket(self.forming.timestamp)
+        self.forming = Bar(timestamp, price, price, price, price, volume)
+        self._bounds = (low, close_at)
+        return committed
+
+    def commit(self, bar: Bar) -> bool:
+        """
+        Commit a bar closed by a bar builder.
+
+        Bars of a bucket already committed, or older than the forming bar, are
+        ignored (they are part of the warm-up history).
+
+        Returns:
+            True if the bar was committed
+        """
+        bucket = self.bucket(bar.timestamp)
+        if self.committed_bucket is not None and bucket <= self.committed_bucket:
+            return False
+        if self.forming is not None and bucket < self.forming_bucket:
+            return False
+
+        for indicator in self.indicators.values():
+            indicator.update(bar)
+        self.bars_committed += 1
+        self.committed_bucket = bucket
+        if self.forming is not None and self.forming_bucket <= bucket:
+            self.forming = None
+            self._bounds = None
+        return True
+
+    def set_forming(self, bar: Bar):
+        """Use a bar builder's open bar as the forming bar."""
+        self.forming = bar
+        self._bounds = None
+
+    def _quantity(self, volume: float) -> float:
+        if not self.cumulative_volume:
+            return volume
+
+        previous = self.last_volume
+        self.last_volume = volume
+        if previous is None:
+            return 0.0
+        # The day's volume restarts from zero on a new session
+        return volume - previous if volume >= previous else volume
+
+    def values(self, keys: Sequence[str]) -> dict[str, Any]:
+        """Indicator values as of the forming bar (None before warm-up completes)."""
+        if self.forming is None:
+            return dict.fromkeys(keys)
+        return {key: self.indicators[key].peek(self.forming) for key in keys}
+
+    def to_state(self) -> dict[str, Any]:
+        return {
+            'interval_seconds': self.interval_seconds,
+            'bars_committed': self.bars_committed,
+            'committed_bucket': self.committed_bucket,
+            'cumulative_volume': self.cumulative_volume,
+            'last_volume': self.last_volume,
+            'forming': asdict(self.forming) if self.forming is not None else None,
+            'indicators': {
+                key: {'kind': indicator.kind, 'params': indicator.params, 'state': indicator.to_state()}
+                for key, indicator in self.indicators.items()
+            }
+        }
+
+    @classmethod
+    def from_state(cls, state: dict[str, Any], session: TradingSession | None = None) -> 'IncrementalIndicatorSet':
+        indicator_set = cls(state['interval_seconds'], session, state.get('cumulative_volume', False))
+        indicator_set.bars_committed = state.get('bars_committed', 0)
+        indicator_set.committed_bucket = state.get('committed_bucket')
+        indicator_set.last_volume = state.get('last_volume')
+        if state.get('forming'):
+            indicator_set.forming = Bar(**state['forming'])
+
+        for key, entry in state.get('indicators', {}).items():
+            indicator = INCREMENTAL_INDICATORS[entry['kind']](**entry['params'])
+            indicator.load_state(entry['state'])
+            indicator_set.indicators[key] = indicator
+        return indicator_set
+
+
+def interval_to_seconds(interval: str) -> int | None:
+    """Bar length of a config interval ('5minute', '1hour', '1day', '1week'); None if not fixed."""
+    units = {'minute': 60, 'hour': 3600, 'day': SECONDS_PER_DAY, 'week': 7 * SECONDS_PER_DAY}
+    for unit, seconds in units.items():
+        if interval.endswith(unit):
+            try:
+                return int(interval[:-len(unit)]) * seconds
+            except ValueError:
+                return None
+    return None
@@ -1,11 +1,11 @@
 # Indicator Aggregation Manager - Deduplication and Coordination
-import hashlib
 import json
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
+from app.services.computation_planner import indicator_computation_key
 from app.utils.logging_utils import log_exception, log_info, log_warning
 from app.utils.redis import get_redis_client
 
@@ -138,12 +138,7 @@ class IndicatorAggregationManager:
     def generate_indicator_key(self, symbol: str, indicator_name: str,
                              timeframe: str, parameters: dict) -> str:
         """Generate unique key for indicator deduplication"""
-
-        # Sort parameters for consistent hashing
-        sorted_params = json.dumps(parameters, sort_keys=True)
-        param_hash = hashlib.md5(sorted_params.encode()).hexdigest()[:8]
-
-        return f"indicator:{symbol}:{indicator_name}:{timeframe}:{param_hash}"
+        return indicator_computation_key(symbol, indicator_name, timeframe, parameters)
 
     async def process_indicator_request(self, request: dict) -> dict:
         """Process new indicator request with smart deduplication"""
@@ -0,0 +1,305 @@
+"""
+Optional process-pool execution for CPU-heavy indicators.
+
+Custom registry indicators in selected IndicatorRegistry categories (and,
+optionally, pandas_ta strategies) run in worker processes instead of on the
+event loop or the GIL-bound default thread pool.
+
+The DataFrame's numeric columns are copied once into a
+multiprocessing.shared_memory segment that the worker maps directly; only the
+column layout is pickled. Workers reduce results before returning them
+(latest value, records, or the last strategy row), so little comes back.
+
+Workers are spawned once, import pandas_ta and the indicator modules up front
+and keep resolved indicator functions between calls.
+"""
+
+import asyncio
+import contextlib
+import importlib
+import logging
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing import get_context, shared_memory
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.services.indicator_registry import IndicatorCategory, IndicatorMetadata, IndicatorRegistry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_CATEGORIES = (IndicatorCategory.SMART_MONEY, IndicatorCategory.CLUSTERING)
+
+
+@dataclass(frozen=True)
+class SharedFrame:
+    """Layout of a DataFrame's numeric columns inside a shared memory segment."""
+    shm_name: str
+    columns: tuple[str, ...]
+    datetime_columns: tuple[str, ...]
+    n_rows: int
+
+
+def share_frame(df: pd.DataFrame) -> tuple[SharedFrame, shared_memory.SharedMemory]:
+    """
+    Copy the numeric and datetime columns of df into a new shared memory segment.
+
+    Datetime columns are stored as int64 nanoseconds (UTC) bit-cast to float64.
+    The caller owns the segment and must close and unlink it.
+    """
+    columns, datetime_columns = [], []
+    for name in df.columns:
+        dtype = df[name].dtype
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            datetime_columns.append(str(name))
+            columns.append(name)
+        elif pd.api.types.is_numeric_dtype(dtype):
+            columns.append(name)
+
+    n_rows = len(df)
+    shm = shared_memory.SharedMemory(create=True, size=max(len(columns) * n_rows * 8, 1))
+    data = np.ndarray((len(columns), n_rows), dtype=np.float64, buffer=shm.buf)
+    for i, name in enumerate(columns):
+        series = df[name]
+        if str(name) in datetime_columns:
+            if series.dt.tz is not None:
+                series = series.dt.tz_convert(None)
+            data[i] = series.to_numpy(dtype='datetime64[ns]').view(np.int64).view(np.float64)
+        else:
+            data[i] = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    del data
+
+    frame = SharedFrame(shm.name, tuple(str(c) for c in columns), tuple(datetime_columns), n_rows)
+    return frame, shm
+
+
+def attach_frame(frame: SharedFrame) -> pd.DataFrame:
+    """Rebuild the DataFrame described by frame (columns are copied out of the segment)."""
+    shm = shared_memory.SharedMemory(name=frame.shm_name)
+    try:
+        data = np.ndarray((len(frame.columns), frame.n_rows), dtype=np.float64, buffer=shm.buf)
+        columns = {}
+        for i, name in enumerate(frame.columns):
+            if name in frame.datetime_columns:
+                columns[name] = pd.to_datetime(data[i].view(np.int64).copy())
+            else:
+                columns[name] = data[i].copy()
+        del data
+        return pd.DataFrame(columns)
+    finally:
+        shm.close()
+
+
+def shape_indicator_result(output_type: str, result: Any) -> Any:
+    """Reduce a custom indicator's output to what is returned to callers."""
+    if output_type == "series":
+        # Return latest value
+        if isinstance(result, pd.Series):
+            return float(result.iloc[-1]) if not result.empty and pd.notna(result.iloc[-1]) else None
+        return result
+    if output_type == "dataframe":
+        # Convert DataFrame to dict
+        if isinstance(result, pd.DataFrame):
+            return result.to_dict('records')
+        return result
+    if output_type == "float":
+        return float(result) if result is not None else None
+    return result
+
+
+def execute_pandas_ta_strategy(df: pd.DataFrame, strategy_dict: dict) -> pd.DataFrame:
+    """Run a pandas_ta strategy over df in place and return it."""
+    import pandas_ta as ta
+
+    custom_strategy = ta.Strategy(
+        name="SignalService",
+        description="Custom strategy for signal service",
+        ta=strategy_dict
+    )
+    df.ta.strategy(custom_strategy)
+    return df
+
+
+def is_poolable(function: Callable) -> bool:
+    """Workers resolve functions by module and qualified name, so closures cannot be shipped."""
+    qualname = getattr(function, '__qualname__', '')
+    return bool(getattr(function, '__module__', None)) and bool(qualname) and '<locals>' not in qualname
+
+
+# Worker-side state (one copy per worker process)
+_worker_functions: dict[tuple[str, str], Callable] = {}
+
+
+def _init_worker(modules: tuple[str, ...]):
+    with contextlib.suppress(ImportError):
+        import pandas_ta  # noqa: F401
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            logger.warning(f"Indicator worker could not import {module}: {e}")
+
+
+def _resolve_function(module: str, qualname: str) -> Callable:
+    key = (module, qualname)
+    function = _worker_functions.get(key)
+    if function is None:
+        function = importlib.import_module(module)
+        for part in qualname.split('.'):
+            function = getattr(function, part)
+        _worker_functions[key] = function
+    return function
+
+
+def _run_custom_indicator(frame: SharedFrame, module: str, qualname: str, output_type: str, params: dict) -> Any:
+    function = _resolve_function(module, qualname)
+    return shape_indicator_result(output_type, function(attach_frame(frame), **params))
+
+
+def _run_strategy(frame: SharedFrame, strategy_dict: dict) -> pd.DataFrame:
+    df = attach_frame(frame)
+    return execute_pandas_ta_strategy(df, strategy_dict).iloc[-1:]
+
+
+class IndicatorProcessPool:
+    """
+    Process pool for indicator categories that should not run on the event loop.
+
+    Features:
+    - Category-based routing from IndicatorRegistry metadata
+    - Shared memory transport for OHLCV columns
+    - Lazy start; a broken pool is replaced on the next call
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        categories: Iterable[IndicatorCategory | str] = DEFAULT_POOL_CATEGORIES,
+        preload_modules: Iterable[str] = ()
+    ):
+        """
+        Args:
+            max_workers: Worker process count
+            categories: Registry categories to run in the pool ('pandas_ta' routes strategies too)
+            preload_modules: Indicator modules imported by each worker at start-up
+                (default: the registry modules of the pooled categories)
+        """
+        self.max_workers = max_workers
+        self.categories = {IndicatorCategory(category) for category in categories}
+        self.preload_modules = tuple(preload_modules)
+        self._executor: ProcessPoolExecutor | None = None
+
+        self.metrics = {
+            'custom_runs': 0,
+            'strategy_runs': 0,
+            'pool_restarts': 0,
+            'shared_bytes': 0
+        }
+
+    @property
+    def runs_pandas_ta(self) -> bool:
+        return IndicatorCategory.PANDAS_TA in self.categories
+
+    def handles(self, metadata: IndicatorMetadata) -> bool:
+        """True if this registry indicator should run in the pool."""
+        return metadata.category in self.categories and is_poolable(metadata.function)
+
+    async def run_custom_indicator(self, metadata: IndicatorMetadata, df: pd.DataFrame, params: dict) -> Any:
+        """Run a registry indicator in a worker; returns the shaped result."""
+        function = metadata.function
+        self.metrics['custom_runs'] += 1
+        return await self._submit(
+            _run_custom_indicator, df,
+            function.__module__, function.__qualname__, metadata.output_type, params
+        )
+
+    async def run_strategy(self, df: pd.DataFrame, strategy_dict: dict) -> pd.DataFrame:
+        """Run a pandas_ta strategy in a worker; returns only the last row with indicator columns."""
+        self.metrics['strategy_runs'] += 1
+        return await self._submit(_run_strategy, df, strategy_dict)
+
+    async def _submit(self, function: Callable, df: pd.DataFrame, *args) -> Any:
+        frame, shm = share_frame(df)
+        self.metrics['shared_bytes'] += shm.size
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), function, frame, *args)
+        except BrokenProcessPool:
+            self._executor = None
+            self.metrics['pool_restarts'] += 1
+            raise
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            modules = self.preload_modules or tuple(IndicatorRegistry.list_modules(self.categories))
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(modules,)
+            )
+        return self._executor
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            **self.metrics,
+            'max_workers': self.max_workers,
+            'categories': sorted(category.value for category in self.categories)
+        }
+
+
+def create_indicator_process_pool(
+    max_workers: int,
+    categories: str | Iterable[str],
+    preload_modules: Iterable[str] = ()
+) -> IndicatorProcessPool | None:
+    """
+    Pool from settings-style values; None when disabled (no workers or no categories).
+
+    Args:
+        max_workers: Worker count; 0 disables the pool
+        categories: Comma-separated string or iterable of IndicatorCategory values
+        preload_modules: Indicator modules to import in each worker
+    """
+    if isinstance(categories, str):
+        categories = [c.strip() for c in categories.split(',') if c.strip()]
+
+    valid = []
+    for category in categories:
+        try:
+            valid.append(IndicatorCategory(category))
+        except ValueError:
+            logger.warning(f"Ignoring unknown indicator category for process pool: {category}")
+
+    if max_workers <= 0 or not valid:
+        return None
+    return IndicatorProcessPool(max_workers, valid, preload_modules)
+
+
+_indicator_process_pool: IndicatorProcessPool | None = None
+_indicator_process_pool_configured = False
+
+
+def get_indicator_process_pool() -> IndicatorProcessPool | None:
+    """Process-wide pool shared by every PandasTAExecutor; None when disabled in settings."""
+    global _indicator_process_pool, _indicator_process_pool_configured
+    if not _indicator_process_pool_configured:
+        from app.core.config import settings
+        _indicator_process_pool = create_indicator_process_pool(
+            settings.INDICATOR_PROCESS_POOL_WORKERS,
+            settings.INDICATOR_PROCESS_POOL_CATEGORIES
+        )
+        _indicator_process_pool_configured = True
+    return _indicator_process_pool
@@ -197,6 +197,15 @@ class IndicatorRegistry:
             return indicator.parameters.copy()
         return {}
 
+    @classmethod
+    def list_modules(cls, categories: set[IndicatorCategory] | None = None) -> list[str]:
+        """Modules defining the registered indicator functions, optionally filtered by category"""
+        return sorted({
+            ind.function.__module__
+            for ind in cls._indicators.values()
+            if categories is None or ind.category in categories
+        })
+
     @classmethod
     def count(cls) -> int:
         """Total number of registered indicators"""
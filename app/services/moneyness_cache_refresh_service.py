@@ -15,6 +15,7 @@ from enum import Enum
 from typing import Any
 
 from .enhanced_cache_invalidation_service import get_enhanced_cache_service
+from .moneyness_strike_index import MoneynessBandIndex, StrikeLadder
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +58,22 @@ class MoneynessCalculationResult:
     time_value: float
     option_type: str  # call or put
 
+# Categories from the lowest strike to the highest (moneyness = spot / strike falls as strike rises)
+STRIKE_ORDERED_CATEGORIES = [
+    MoneynessCategory.DEEP_ITM,
+    MoneynessCategory.ITM,
+    MoneynessCategory.ATM,
+    MoneynessCategory.OTM,
+    MoneynessCategory.DEEP_OTM
+]
+
+@dataclass
+class ChainMoneynessState:
+    """Moneyness band index of an underlying's chain, kept between spot updates"""
+    band_index: MoneynessBandIndex
+    option_data: dict[float, dict[str, Any]]  # chain entry per strike
+    anchor_spot: float                        # spot of the last full-chain refresh
+
 class MoneynessClassifier:
     """Classifies options by moneyness levels"""
 
@@ -322,14 +339,28 @@ class MoneynessRefreshService:
             "cache_invalidations": 0,
             "full_chain_refreshes": 0,
             "selective_refreshes": 0,
+            "boundary_checks": 0,
+            "category_changes_published": 0,
             "avg_refresh_time_ms": 0.0
         }
 
+        # Band index of each underlying's chain, rebuilt on full refreshes
+        self._chain_states: dict[str, ChainMoneynessState] = {}
+
     async def handle_spot_price_update(self, underlying: str, new_spot_price: float,
                                      previous_spot_price: float | None = None) -> dict[str, Any]:
-        """Handle spot price update with intelligent moneyness cache refresh"""
+        """
+        Handle spot price update with incremental moneyness cache refresh
+
+        The chain's strikes are kept sorted with their moneyness band boundaries.
+        On a spot move only the strikes that crossed a category boundary are
+        recalculated, cached and published; the whole chain is recalculated
+        when the index is first built and once the spot has drifted more than
+        the moneyness_change threshold since the last full refresh, so cached
+        moneyness ratios stay within that tolerance.
+        """
 
-        logger.info(f"Handling spot price update for {underlying}: {new_spot_price}")
+        logger.debug(f"Handling spot price update for {underlying}: {new_spot_price}")
 
         start_time = time.time()
         result = {
@@ -347,57 +378,52 @@ class MoneynessRefreshService:
             if previous_spot_price and previous_spot_price > 0:
                 price_change_pct = abs(new_spot_price - previous_spot_price) / previous_spot_price * 100
 
-            # Create refresh context
-            refresh_context = MoneynessRefreshContext(
-                underlying=underlying,
-                trigger=RefreshTrigger.SPOT_PRICE_CHANGE,
-                spot_price=new_spot_price,
-                spot_price_change_pct=price_change_pct,
-                timestamp=datetime.now()
-            )
+            state = self._chain_states.get(underlying)
+            drift = abs(new_spot_price - state.anchor_spot) / state.anchor_spot if state else None
 
-            # Determine refresh strategy based on price change magnitude
-            if price_change_pct > self.refresh_thresholds["spot_price_change_pct"]:
-                if price_change_pct > 2.0:  # Large price change
-                    refresh_context.full_chain_refresh = True
-                    refresh_context.refresh_priority = "high"
-                    result["refresh_type"] = "full_chain"
-                else:  # Moderate price change
-                    refresh_context.affected_strikes = await self._identify_affected_strikes(
-                        underlying, new_spot_price, price_change_pct
+            if state is None or drift > self.refresh_thresholds["moneyness_change"]:
+                result["refresh_type"] = "full_chain"
+                refresh_result = await self._refresh_chain_index(underlying, new_spot_price)
+                if refresh_result["success"]:
+                    self.performance_metrics["full_chain_refreshes"] += 1
+            else:
+                self.performance_metrics["boundary_checks"] += 1
+                changes = state.band_index.update(new_spot_price)
+                if not changes:
+                    logger.debug(f"No moneyness category changes for {underlying} at {new_spot_price}")
+                    result["refresh_type"] = "no_category_change"
+                    refresh_result = None
+                else:
+                    result["refresh_type"] = "boundary_crossings"
+                    refresh_result = await self._refresh_strikes(
+                        underlying, new_spot_price, state.option_data, [strike for strike, _, _ in changes]
                     )
-                    refresh_context.refresh_priority = "normal"
-                    result["refresh_type"] = "selective"
+                    await self._publish_category_changes(underlying, new_spot_price, changes)
+                    result["category_changes"] = len(changes)
+                    self.performance_metrics["selective_refreshes"] += 1
 
-                # Perform the refresh
-                refresh_result = await self._execute_moneyness_refresh(refresh_context)
+            if refresh_result is not None:
                 result.update(refresh_result)
                 result["refresh_success"] = refresh_result.get("success", False)
                 result["strikes_refreshed"] = refresh_result.get("strikes_calculated", 0)
-
                 self.performance_metrics["total_refreshes"] += 1
-                if refresh_context.full_chain_refresh:
-                    self.performance_metrics["full_chain_refreshes"] += 1
-                else:
-                    self.performance_metrics["selective_refreshes"] += 1
-            else:
-                logger.debug(f"Price change {price_change_pct:.2f}% below threshold, no refresh needed")
-                result["refresh_type"] = "threshold_not_met"
+                self.performance_metrics["strikes_calculated"] += result["strikes_refreshed"]
 
             # Record performance metrics
             refresh_time = (time.time() - start_time) * 1000
             result["performance"] = {
                 "refresh_time_ms": refresh_time,
                 "price_change_pct": price_change_pct,
-                "threshold_met": price_change_pct > self.refresh_thresholds["spot_price_change_pct"]
+                "threshold_met": refresh_result is not None
             }
 
             # Update average refresh time
-            current_avg = self.performance_metrics["avg_refresh_time_ms"]
-            total_refreshes = max(1, self.performance_metrics["total_refreshes"])
-            self.performance_metrics["avg_refresh_time_ms"] = (
-                (current_avg * (total_refreshes - 1) + refresh_time) / total_refreshes
-            )
+            if refresh_result is not None:
+                current_avg = self.performance_metrics["avg_refresh_time_ms"]
+                total_refreshes = max(1, self.performance_metrics["total_refreshes"])
+                self.performance_metrics["avg_refresh_time_ms"] = (
+                    (current_avg * (total_refreshes - 1) + refresh_time) / total_refreshes
+                )
 
             return result
 
@@ -421,6 +447,9 @@ class MoneynessRefreshService:
             "refresh_success": False
         }
 
+        # Strikes may have been added or removed: rebuild the index on the next spot update
+        self._chain_states.pop(underlying, None)
+
         try:
             # Get current spot price
             spot_price = await self._get_current_spot_price(underlying)
@@ -457,7 +486,8 @@ class MoneynessRefreshService:
 
             # Update performance metrics
             self.performance_metrics["total_refreshes"] += 1
-            self.performance_metrics["full_chain_refreshes"] += 1
+            if result["refresh_success"]:
+                self.performance_metrics["full_chain_refreshes"] += 1
             self.performance_metrics["strikes_calculated"] += total_strikes_refreshed
 
             result["performance"] = {
@@ -473,46 +503,8 @@ class MoneynessRefreshService:
             result["performance"] = {"refresh_time_ms": (time.time() - start_time) * 1000}
             return result
 
-    async def _execute_moneyness_refresh(self, context: MoneynessRefreshContext) -> dict[str, Any]:
-        """Execute moneyness cache refresh based on context"""
-
-        result = {
-            "success": False,
-            "strikes_calculated": 0,
-            "cache_invalidations": 0,
-            "refresh_strategy": "unknown"
-        }
-
-        try:
-            if context.full_chain_refresh:
-                # Full chain refresh
-                result["refresh_strategy"] = "full_chain"
-                chain_refresh_result = await self._refresh_full_chain(context.underlying, context.spot_price)
-                result.update(chain_refresh_result)
-
-            elif context.affected_strikes:
-                # Selective strike refresh
-                result["refresh_strategy"] = "selective_strikes"
-                selective_result = await self._refresh_selective_strikes(
-                    context.underlying, context.spot_price, context.affected_strikes
-                )
-                result.update(selective_result)
-
-            else:
-                # Default to ATM strikes refresh
-                result["refresh_strategy"] = "atm_focused"
-                atm_result = await self._refresh_atm_strikes(context.underlying, context.spot_price)
-                result.update(atm_result)
-
-            return result
-
-        except Exception as e:
-            logger.error(f"Moneyness refresh execution failed: {e}")
-            result["error"] = str(e)
-            return result
-
-    async def _refresh_full_chain(self, underlying: str, spot_price: float) -> dict[str, Any]:
-        """Refresh moneyness for entire option chain"""
+    async def _refresh_chain_index(self, underlying: str, spot_price: float) -> dict[str, Any]:
+        """Recalculate the whole chain and rebuild its moneyness band index"""
 
         start_time = time.time()
         result = {"success": False, "strikes_calculated": 0}
@@ -536,6 +528,21 @@ class MoneynessRefreshService:
 
                 logger.info(f"Refreshed moneyness for {len(chain_moneyness)} strikes in {underlying} chain")
 
+            option_data = self._option_data_by_strike(chain_data)
+            band_index = MoneynessBandIndex(
+                StrikeLadder(option_data),
+                lambda strike, spot: self.calculation_engine.classifier.classify_moneyness(
+                    self.calculation_engine.classifier.calculate_moneyness(spot, strike)
+                ),
+                STRIKE_ORDERED_CATEGORIES
+            )
+            band_index.update(spot_price)
+            self._chain_states[underlying] = ChainMoneynessState(
+                band_index=band_index,
+                option_data=option_data,
+                anchor_spot=spot_price
+            )
+
             return result
 
         except Exception as e:
@@ -543,137 +550,75 @@ class MoneynessRefreshService:
             result["error"] = str(e)
             return result
 
-    async def _refresh_selective_strikes(self, underlying: str, spot_price: float,
-                                       affected_strikes: set[float]) -> dict[str, Any]:
-        """Refresh moneyness for selective strikes"""
+    async def _refresh_strikes(self, underlying: str, spot_price: float,
+                               option_data: dict[float, dict[str, Any]],
+                               strikes: list[float]) -> dict[str, Any]:
+        """Recalculate and cache moneyness for the given strikes of a chain"""
 
         result = {"success": False, "strikes_calculated": 0}
 
         try:
-            # Get option data for affected strikes
-            chain_data = await self._get_chain_data(underlying)
-            if not chain_data:
-                raise ValueError(f"No chain data available for {underlying}")
-
             strikes_calculated = 0
-            for strike_price in affected_strikes:
-                strike_str = str(strike_price)
-                if strike_str in chain_data:
-                    option_data = chain_data[strike_str]
-
-                    # Calculate moneyness for this strike
-                    moneyness_result = await self.calculation_engine.calculate_option_moneyness(
-                        spot_price=spot_price,
-                        strike_price=strike_price,
-                        time_to_expiry=float(option_data.get("time_to_expiry", 0)),
-                        option_type=option_data.get("option_type", "call"),
-                        premium=option_data.get("premium")
-                    )
+            for strike_price in strikes:
+                data = option_data.get(strike_price)
+                if data is None:
+                    continue
+
+                moneyness_result = await self.calculation_engine.calculate_option_moneyness(
+                    spot_price=spot_price,
+                    strike_price=strike_price,
+                    time_to_expiry=float(data.get("time_to_expiry", 0)),
+                    option_type=data.get("option_type", "call"),
+                    premium=data.get("premium")
+                )
 
-                    # Store in cache
-                    await self.cache.store_moneyness_result(underlying, strike_price, moneyness_result)
-                    strikes_calculated += 1
+                await self.cache.store_moneyness_result(underlying, strike_price, moneyness_result)
+                strikes_calculated += 1
 
             result["success"] = strikes_calculated > 0
             result["strikes_calculated"] = strikes_calculated
 
-            logger.info(f"Selectively refreshed {strikes_calculated} strikes for {underlying}")
-            return result
-
-        except Exception as e:
-            logger.error(f"Selective strikes refresh failed for {underlying}: {e}")
-            result["error"] = str(e)
-            return result
-
-    async def _refresh_atm_strikes(self, underlying: str, spot_price: float) -> dict[str, Any]:
-        """Refresh moneyness for ATM and near-ATM strikes"""
-
-        result = {"success": False, "strikes_calculated": 0}
-
-        try:
-            # Get ATM-focused strikes (within 5% of spot price)
-            atm_strikes = await self._get_atm_strikes(underlying, spot_price, tolerance_pct=5.0)
-
-            if atm_strikes:
-                atm_result = await self._refresh_selective_strikes(underlying, spot_price, atm_strikes)
-                result.update(atm_result)
-            else:
-                logger.warning(f"No ATM strikes found for {underlying}")
-
+            logger.debug(f"Refreshed {strikes_calculated} strikes that changed moneyness category for {underlying}")
             return result
 
         except Exception as e:
-            logger.error(f"ATM strikes refresh failed for {underlying}: {e}")
+            logger.error(f"Strike refresh failed for {underlying}: {e}")
             result["error"] = str(e)
             return result
 
-    async def _identify_affected_strikes(self, underlying: str, new_spot_price: float,
-                                       price_change_pct: float) -> set[float]:
-        """Identify strikes affected by spot price change"""
-
-        affected_strikes = set()
+    async def _publish_category_changes(self, underlying: str, spot_price: float,
+                                        changes: list[tuple[float, MoneynessCategory, MoneynessCategory]]):
+        """Publish strikes whose moneyness category changed"""
 
         try:
-            # Get current chain data
-            chain_data = await self._get_chain_data(underlying)
-            if not chain_data:
-                return affected_strikes
-
-            # Calculate range of affected strikes based on price change
-            price_tolerance = price_change_pct * 0.5  # Half the price change as tolerance
-            lower_bound = new_spot_price * (1 - price_tolerance / 100)
-            upper_bound = new_spot_price * (1 + price_tolerance / 100)
-
-            for strike_str in chain_data:
-                try:
-                    strike_price = float(strike_str)
-
-                    # Include strikes within tolerance range
-                    if lower_bound <= strike_price <= upper_bound:
-                        affected_strikes.add(strike_price)
-
-                    # Always include ATM strikes for high sensitivity
-                    moneyness = new_spot_price / strike_price
-                    if 0.95 <= moneyness <= 1.05:  # ATM range
-                        affected_strikes.add(strike_price)
-
-                except ValueError:
-                    continue
-
-            logger.debug(f"Identified {len(affected_strikes)} affected strikes for {underlying}")
-            return affected_strikes
+            message = {
+                "underlying": underlying,
+                "spot_price": spot_price,
+                "changes": [
+                    {"strike": strike, "from": old.value, "to": new.value}
+                    for strike, old, new in changes
+                ],
+                "timestamp": datetime.now().isoformat()
+            }
+            await self.redis_client.publish(f"moneyness:category_changes:{underlying}", json.dumps(message))
+            self.performance_metrics["category_changes_published"] += len(changes)
 
         except Exception as e:
-            logger.error(f"Failed to identify affected strikes for {underlying}: {e}")
-            return affected_strikes
-
-    async def _get_atm_strikes(self, underlying: str, spot_price: float, tolerance_pct: float = 5.0) -> set[float]:
-        """Get ATM and near-ATM strike prices"""
+            logger.error(f"Failed to publish moneyness category changes for {underlying}: {e}")
 
-        atm_strikes = set()
-
-        try:
-            chain_data = await self._get_chain_data(underlying)
-            if not chain_data:
-                return atm_strikes
-
-            tolerance = tolerance_pct / 100
-            lower_bound = spot_price * (1 - tolerance)
-            upper_bound = spot_price * (1 + tolerance)
-
-            for strike_str in chain_data:
-                try:
-                    strike_price = float(strike_str)
-                    if lower_bound <= strike_price <= upper_bound:
-                        atm_strikes.add(strike_price)
-                except ValueError:
-                    continue
-
-            return atm_strikes
+    @staticmethod
+    def _option_data_by_strike(chain_data: dict[str, Any]) -> dict[float, dict[str, Any]]:
+        """Chain entries keyed by numeric strike (non-positive and malformed strikes are skipped)"""
 
-        except Exception as e:
-            logger.error(f"Failed to get ATM strikes for {underlying}: {e}")
-            return atm_strikes
+        option_data = {}
+        for strike_str, data in chain_data.items():
+            try:
+                strike = float(strike_str)
+            except (TypeError, ValueError):
+                continue
+            if strike > 0:
+                option_data[strike] = data
+        return option_data
 
     async def _execute_expiry_moneyness_refresh(self, context: MoneynessRefreshContext, expiry_date: str) -> dict[str, Any]:
         """Execute moneyness refresh for specific expiry"""
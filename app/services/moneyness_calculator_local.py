@@ -4,6 +4,8 @@ Performs real-time moneyness calculations without external dependencies
 """
 from enum import Enum
 
+from app.services.moneyness_strike_index import MoneynessBandIndex, StrikeLadder
+
 
 class MoneynessLevel(Enum):
     """Moneyness level classifications"""
@@ -17,6 +19,16 @@ class MoneynessLevel(Enum):
     OTM25DELTA = "OTM25delta"  # 25-delta OTM
 
 
+# Ratio-based levels from the lowest strike to the highest (calls and puts alike)
+STRIKE_ORDERED_LEVELS = [
+    MoneynessLevel.DITM,
+    MoneynessLevel.ITM,
+    MoneynessLevel.ATM,
+    MoneynessLevel.OTM,
+    MoneynessLevel.DOTM
+]
+
+
 class LocalMoneynessCalculator:
     """
     High-performance moneyness calculator for Signal Service
@@ -33,9 +45,11 @@ class LocalMoneynessCalculator:
             "DOTM": {"min": 1.15, "max": float('inf')}  # > 115% of spot
         }
 
-        # Cache for performance
-        self._strike_cache = {}
-        self._cache_ttl = 60  # 1 minute cache
+        # Sorted strikes per (underlying, expiry) and their moneyness bands per option type
+        self._strike_ladders: dict[tuple[str, str], StrikeLadder] = {}
+        self._band_indexes: dict[tuple[str, str, str], MoneynessBandIndex] = {}
+        # Strike lists the ladders were built from, to tell when a chain's strikes changed
+        self._ladder_sources: dict[tuple[str, str], list[float]] = {}
 
     def calculate_moneyness_ratio(
         self,
@@ -100,45 +114,124 @@ class LocalMoneynessCalculator:
             return MoneynessLevel.OTM
         return MoneynessLevel.DOTM
 
+    def get_strike_ladder(
+        self,
+        underlying: str,
+        expiry_date: str,
+        strikes: list[float] | None = None
+    ) -> StrikeLadder | None:
+        """
+        Get (or register) the sorted strikes of an (underlying, expiry) chain
+
+        Args:
+            underlying: Underlying symbol
+            expiry_date: Expiry date
+            strikes: Strikes to register; replaces the chain's ladder and band indexes
+
+        Returns:
+            StrikeLadder, or None if no strikes were registered for the chain
+        """
+        key = (underlying, expiry_date)
+        if strikes is not None:
+            self._strike_ladders[key] = StrikeLadder(strikes)
+            self._ladder_sources[key] = list(strikes)
+            for index_key in [k for k in self._band_indexes if k[:2] == key]:
+                del self._band_indexes[index_key]
+        return self._strike_ladders.get(key)
+
+    def update_spot(
+        self,
+        underlying: str,
+        expiry_date: str,
+        spot_price: float,
+        option_type: str = 'call'
+    ) -> list[tuple[float, MoneynessLevel | None, MoneynessLevel]]:
+        """
+        Move a chain's moneyness bands to a new spot
+
+        Only strikes that crossed a level boundary since the previous spot are
+        reclassified; the band boundaries are found by bisection.
+
+        Args:
+            underlying: Underlying symbol
+            expiry_date: Expiry date of a chain registered with get_strike_ladder
+            spot_price: New spot price
+            option_type: 'call' or 'put'
+
+        Returns:
+            (strike, old_level, new_level) for every strike whose level changed
+            (old_level is None on the chain's first update)
+        """
+        return self._chain_band_index(underlying, expiry_date, option_type).update(spot_price)
+
+    def _chain_band_index(self, underlying: str, expiry_date: str, option_type: str) -> MoneynessBandIndex:
+        key = (underlying, expiry_date, option_type.lower())
+        band_index = self._band_indexes.get(key)
+        if band_index is None:
+            ladder = self._strike_ladders.get(key[:2])
+            if ladder is None:
+                raise KeyError(f"No strikes registered for {underlying} {expiry_date}")
+            band_index = self._band_indexes[key] = self._band_index(ladder, option_type)
+        return band_index
+
+    def _band_index(self, ladder: StrikeLadder, option_type: str) -> MoneynessBandIndex:
+        return MoneynessBandIndex(
+            ladder,
+            lambda strike, spot: self.classify_moneyness(strike, spot, option_type),
+            STRIKE_ORDERED_LEVELS
+        )
+
     def find_strikes_by_moneyness(
         self,
         spot_price: float,
-        available_strikes: list[float],
+        available_strikes: list[float] | StrikeLadder,
         moneyness_level: str,
-        option_type: str
+        option_type: str,
+        underlying: str | None = None,
+        expiry_date: str | None = None
     ) -> list[float]:
         """
         Find strikes matching moneyness level
 
         Args:
             spot_price: Current spot price
-            available_strikes: List of available strikes
+            available_strikes: List of available strikes, or a StrikeLadder
             moneyness_level: Target moneyness level
             option_type: 'call' or 'put'
+            underlying: Underlying of the chain; with expiry_date, a plain strike
+                list is sorted once per chain and reused while it is unchanged
+            expiry_date: Expiry date of the chain
 
         Returns:
             List of strikes matching moneyness
         """
-        matching_strikes = []
-
-        for strike in available_strikes:
-            level = self.classify_moneyness(strike, spot_price, option_type)
-            if level.value == moneyness_level:
-                matching_strikes.append(strike)
-
-        return sorted(matching_strikes)
+        levels = [level.value for level in STRIKE_ORDERED_LEVELS]
+        if moneyness_level not in levels:
+            return []
+
+        # Each level is a contiguous run of sorted strikes, so only the band edges are classified
+        if isinstance(available_strikes, StrikeLadder):
+            band_index = self._band_index(available_strikes, option_type)
+        elif underlying is not None and expiry_date is not None:
+            if self._ladder_sources.get((underlying, expiry_date)) != available_strikes:
+                self.get_strike_ladder(underlying, expiry_date, available_strikes)
+            band_index = self._chain_band_index(underlying, expiry_date, option_type)
+        else:
+            band_index = self._band_index(StrikeLadder(available_strikes), option_type)
+        band_index.update(spot_price)
+        return band_index.strikes_in(MoneynessLevel(moneyness_level))
 
     def find_atm_strike(
         self,
         spot_price: float,
-        available_strikes: list[float]
+        available_strikes: list[float] | StrikeLadder
     ) -> float:
         """
         Find the ATM strike
 
         Args:
             spot_price: Current spot price
-            available_strikes: List of available strikes
+            available_strikes: List of available strikes, or a StrikeLadder
 
         Returns:
             ATM strike price
@@ -147,12 +240,14 @@ class LocalMoneynessCalculator:
         if not available_strikes:
             return spot_price
 
+        if isinstance(available_strikes, StrikeLadder):
+            return available_strikes.nearest(spot_price)
         return min(available_strikes, key=lambda x: abs(x - spot_price))
 
     def find_strikes_by_delta(
         self,
         spot_price: float,
-        available_strikes: list[float],
+        available_strikes: list[float] | StrikeLadder,
         target_delta: float,
         option_type: str,
         greeks_data: dict[float, dict[str, float]]
@@ -160,9 +255,12 @@ class LocalMoneynessCalculator:
         """
         Find strike by target delta
 
+        With a StrikeLadder whose strikes all have Greeks, delta is monotonic in
+        strike and the strike is found by bisection; otherwise all strikes are scanned.
+
         Args:
             spot_price: Current spot price
-            available_strikes: List of available strikes
+            available_strikes: List of available strikes, or a StrikeLadder
             target_delta: Target delta (e.g., 0.05 for 5-delta)
             option_type: 'call' or 'put'
             greeks_data: Greeks data by strike {strike: {delta, gamma, ...}}
@@ -170,6 +268,19 @@ class LocalMoneynessCalculator:
         Returns:
             Strike matching target delta
         """
+        is_put = option_type.lower() == 'put'
+        if isinstance(available_strikes, StrikeLadder):
+            def strike_delta(strike: float) -> float | None:
+                greeks = greeks_data.get(strike)
+                if greeks is None:
+                    return None
+                delta = greeks.get('delta', 0)
+                return abs(delta) if is_put else delta
+
+            strike = available_strikes.nearest_by_value(target_delta, strike_delta)
+            if strike is not None:
+                return strike
+
         best_strike = None
         min_delta_diff = float('inf')
 
@@ -12,6 +12,7 @@ import numpy as np
 from app.core.greeks_model_config import get_greeks_model_config
 from app.errors import UnsupportedModelError
 from app.services.greeks_calculator import GreeksCalculator
+from app.services.implied_volatility_solver import get_implied_volatility_solver
 from app.services.instrument_service_client import InstrumentServiceClient
 
 
@@ -34,6 +35,9 @@ class MoneynessAwareGreeksCalculator:
         self._greeks_functions = {}
         self._load_model_functions()
 
+        # Shared batched IV solver (warm-starts from the previous tick's IV)
+        self._iv_solver = get_implied_volatility_solver()
+
     def _load_model_functions(self):
         """Load PyVolLib functions based on configured model (following existing pattern)"""
         try:
@@ -176,50 +180,53 @@ class MoneynessAwareGreeksCalculator:
                     "error": "No ATM options found"
                 }
 
+            # Collect priced ATM options, then solve their IVs in one batch
+            risk_free_rate = 0.06  # 6% default risk-free rate (simplified - could use real rate data)
+            expiry_dt = datetime.strptime(expiry_date, '%Y-%m-%d')
+            time_to_expiry = (expiry_dt - datetime.now()).days / 365.25
+
+            batch = []
+            for option in atm_options:
+                # Extract option details
+                strike = option.get('strike_price')
+                option_type = option.get('option_type', '').upper()  # 'CE' or 'PE'
+                market_price = option.get('last_price') or option.get('close_price')
+
+                if not all([strike, option_type, market_price]):
+                    self.logger.warning("Missing option data for IV calculation: %s", option.get("instrument_key"))
+                    continue
+
+                if time_to_expiry <= 0:
+                    self.logger.warning("Option expired, skipping IV calculation")
+                    continue
+
+                batch.append((option, float(strike), option_type, float(market_price)))
+
+            calculated_ivs = self._calculate_implied_volatilities(
+                [market_price for _, _, _, market_price in batch],
+                spot_price,
+                [strike for _, strike, _, _ in batch],
+                time_to_expiry,
+                risk_free_rate,
+                [option_type for _, _, option_type, _ in batch],
+                keys=[option.get('instrument_key') for option, _, _, _ in batch]
+            )
+
             # Calculate IV for calls and puts
             call_ivs = []
             put_ivs = []
 
-            for option in atm_options:
-                try:
-                    # Extract option details
-                    strike = option.get('strike_price')
-                    option_type = option.get('option_type', '').upper()  # 'CE' or 'PE'
-                    market_price = option.get('last_price') or option.get('close_price')
-
-                    if not all([strike, option_type, market_price]):
-                        self.logger.warning("Missing option data for IV calculation: %s", option.get("instrument_key"))
-                        continue
-
-                    # Calculate time to expiry in years
-                    expiry_dt = datetime.strptime(expiry_date, '%Y-%m-%d')
-                    time_to_expiry = (expiry_dt - datetime.now()).days / 365.25
-
-                    if time_to_expiry <= 0:
-                        self.logger.warning("Option expired, skipping IV calculation")
-                        continue
-
-                    # Get risk-free rate (simplified - could be enhanced with real rate data)
-                    risk_free_rate = 0.06  # 6% default risk-free rate
-
-                    # Calculate IV using configured PyVolLib model
-                    calculated_iv = self._calculate_implied_volatility(
-                        market_price, spot_price, strike, time_to_expiry,
-                        risk_free_rate, option_type
-                    )
-
-                    if calculated_iv and calculated_iv > 0:
-                        if option_type in ['CE', 'CALL']:
-                            call_ivs.append(calculated_iv)
-                        elif option_type in ['PE', 'PUT']:
-                            put_ivs.append(calculated_iv)
-
-                        self.logger.info("Calculated IV %.4f for %s", calculated_iv, option.get("instrument_key"))
-
-                except Exception as e:
-                    self.logger.warning("Failed to calculate IV for option %s: %s", option.get("instrument_key"), e)
+            for (option, _, option_type, _), calculated_iv in zip(batch, calculated_ivs, strict=True):
+                if calculated_iv is None:
                     continue
 
+                if option_type in ['CE', 'CALL']:
+                    call_ivs.append(calculated_iv)
+                elif option_type in ['PE', 'PUT']:
+                    put_ivs.append(calculated_iv)
+
+                self.logger.info("Calculated IV %.4f for %s", calculated_iv, option.get("instrument_key"))
+
             # Average IVs
             avg_call_iv = np.mean(call_ivs) if call_ivs else None
             avg_put_iv = np.mean(put_ivs) if put_ivs else None
@@ -271,52 +278,65 @@ class MoneynessAwareGreeksCalculator:
         Returns:
             Implied volatility or None if calculation fails
         """
+        return self._calculate_implied_volatilities(
+            [market_price], spot_price, [strike], time_to_expiry, risk_free_rate, [option_type]
+        )[0]
+
+    def _calculate_implied_volatilities(
+        self,
+        market_prices: list[float],
+        spot_price: float,
+        strikes: list[float],
+        time_to_expiry: float,
+        risk_free_rate: float,
+        option_types: list[str],
+        keys: list[str | None] | None = None
+    ) -> list[float | None]:
+        """
+        Calculate implied volatilities for a batch of options with the configured model.
+
+        Uses the shared batched solver; options keyed by instrument_key warm-start
+        from their previously solved IV.
+
+        Returns:
+            One implied volatility per option, None where it can't be solved or is
+            outside the configured volatility bounds
+        """
+        if not market_prices:
+            return []
+
         try:
-            if not self._iv_function:
-                self.logger.warning("PyVolLib IV function not available")
-                return None
+            is_call = [option_type in ['CE', 'CALL'] for option_type in option_types]
 
-            # Normalize option type to PyVolLib flag
-            flag = 'c' if option_type in ['CE', 'CALL'] else 'p'
-
-            # Get model parameters
-            dividend_yield = self._model_config.parameters.dividend_yield
-
-            # Use configured PyVolLib model for IV calculation
-            if self._model_config.model_name == "black_scholes_merton":
-                iv = self._iv_function(
-                    price=market_price,
-                    S=spot_price,
-                    K=strike,
-                    t=time_to_expiry,
-                    r=risk_free_rate,
-                    q=dividend_yield,
-                    flag=flag
-                )
-            else:
-                # Black-Scholes or Black76 models
-                iv = self._iv_function(
-                    price=market_price,
-                    S=spot_price,
-                    K=strike,
-                    t=time_to_expiry,
-                    r=risk_free_rate,
-                    flag=flag
-                )
+            result = self._iv_solver.solve(
+                self._model_config.model_name,
+                market_prices,
+                is_call,
+                spot_price,
+                strikes,
+                time_to_expiry,
+                risk_free_rate,
+                self._model_config.parameters.dividend_yield,
+                keys=keys
+            )
 
             # Validate result
             min_vol = self._model_config.parameters.volatility_min
             max_vol = self._model_config.parameters.volatility_max
 
-            if iv and min_vol <= iv <= max_vol:
-                return float(iv)
-            self.logger.warning("IV out of valid range: %.6f (valid: %.3f-%.3f)",
-                              iv, min_vol, max_vol)
-            return None
+            ivs = []
+            for iv in result.implied_volatilities:
+                if not np.isnan(iv) and min_vol <= iv <= max_vol:
+                    ivs.append(float(iv))
+                else:
+                    self.logger.warning("IV out of valid range: %.6f (valid: %.3f-%.3f)",
+                                      iv, min_vol, max_vol)
+                    ivs.append(None)
+            return ivs
 
         except Exception as e:
             self.logger.warning("IV calculation failed: %s", e)
-            return None
+            return [None] * len(market_prices)
 
     async def calculate_otm_delta_greeks(
         self,
@@ -0,0 +1,170 @@
+"""
+Sorted strike ladders and incremental moneyness bands.
+
+Moneyness categories are monotonic in strike for a given spot: every
+category is one contiguous run of the sorted strikes. A StrikeLadder holds
+the strikes of one (underlying, expiry) sorted once, so ATM and band lookups
+are bisections instead of scans over the chain.
+
+MoneynessBandIndex keeps the band boundaries of a ladder for the last spot
+it saw. When the spot moves, the boundaries are re-found by bisection and
+only the strikes between an old and a new boundary changed category; those
+are the only strikes reclassified and reported.
+"""
+
+import bisect
+from collections.abc import Callable, Hashable, Iterable, Sequence
+from typing import Any
+
+# classify(strike, spot) -> category
+StrikeClassifier = Callable[[float, float], Hashable]
+
+
+class StrikeLadder:
+    """The distinct strikes of one option chain, sorted ascending."""
+
+    def __init__(self, strikes: Iterable[float]):
+        self.strikes: list[float] = sorted({float(strike) for strike in strikes})
+
+    def __len__(self) -> int:
+        return len(self.strikes)
+
+    def __iter__(self):
+        return iter(self.strikes)
+
+    def __contains__(self, strike: float) -> bool:
+        index = bisect.bisect_left(self.strikes, strike)
+        return index < len(self.strikes) and self.strikes[index] == strike
+
+    def nearest(self, price: float) -> float | None:
+        """Strike closest to price (the lower one on a tie)."""
+        strikes = self.strikes
+        if not strikes:
+            return None
+        index = bisect.bisect_left(strikes, price)
+        if index == 0:
+            return strikes[0]
+        if index == len(strikes):
+            return strikes[-1]
+        below, above = strikes[index - 1], strikes[index]
+        return below if price - below <= above - price else above
+
+    def between(self, low: float, high: float) -> list[float]:
+        """Strikes in [low, high]."""
+        strikes = self.strikes
+        return strikes[bisect.bisect_left(strikes, low):bisect.bisect_right(strikes, high)]
+
+    def band_boundaries(self, spot: float, classify: StrikeClassifier, order: Sequence[Hashable]) -> list[int]:
+        """
+        Index where each band after the first starts.
+
+        Args:
+            spot: Spot price to classify against
+            classify: Category of a strike at spot; must follow order as strike rises
+            order: Categories from the lowest strike to the highest
+
+        Returns:
+            List: len(order) - 1 indexes; band i is strikes[bounds[i - 1]:bounds[i]]
+        """
+        rank = {category: i for i, category in enumerate(order)}
+        strikes = self.strikes
+        return [
+            bisect.bisect_left(strikes, True, key=lambda strike, r=r: rank[classify(strike, spot)] > r)
+            for r in range(len(order) - 1)
+        ]
+
+    def nearest_by_value(self, target: float, value_of: Callable[[float], float | None]) -> float | None:
+        """
+        Strike whose value is closest to target, for values monotonic in strike (e.g. delta).
+
+        Only O(log n) strikes are probed. Returns None if the ladder is empty or
+        a probed strike has no value (value_of returns None); callers then fall
+        back to a scan.
+        """
+        strikes = self.strikes
+        if not strikes:
+            return None
+
+        def probe(strike: float) -> float:
+            value = value_of(strike)
+            if value is None:
+                raise LookupError(strike)
+            return value
+
+        try:
+            sign = 1.0 if probe(strikes[-1]) >= probe(strikes[0]) else -1.0
+            index = bisect.bisect_left(strikes, sign * target, key=lambda strike: sign * probe(strike))
+            # The closest value is next to the insertion point; ties go to the lower strike
+            candidates = [i for i in (index - 1, index) if 0 <= i < len(strikes)]
+            best = min(candidates, key=lambda i: (abs(probe(strikes[i]) - target), i))
+        except LookupError:
+            return None
+        return strikes[best]
+
+
+class MoneynessBandIndex:
+    """Moneyness bands of a ladder, updated incrementally as the spot moves."""
+
+    def __init__(self, ladder: StrikeLadder, classify: StrikeClassifier, order: Sequence[Hashable]):
+        """
+        Args:
+            ladder: Strikes of the chain
+            classify: Category of a strike at a spot; must follow order as strike rises
+            order: Categories from the lowest strike to the highest
+        """
+        self.ladder = ladder
+        self.classify = classify
+        self.order = list(order)
+        self.spot: float | None = None
+        self._bounds: list[int] | None = None
+
+    def update(self, spot: float) -> list[tuple[float, Any, Any]]:
+        """
+        Move the index to a new spot.
+
+        Returns:
+            List: (strike, old_category, new_category) for strikes whose category
+            changed, in strike order; every strike on the first update (old None)
+        """
+        new_bounds = self.ladder.band_boundaries(spot, self.classify, self.order)
+        old_bounds = self._bounds
+        self.spot = spot
+        self._bounds = new_bounds
+
+        strikes = self.ladder.strikes
+        if old_bounds is None:
+            return [(strike, None, self._category_at(i, new_bounds)) for i, strike in enumerate(strikes)]
+
+        changed = set()
+        for old, new in zip(old_bounds, new_bounds, strict=True):
+            if old != new:
+                changed.update(range(min(old, new), max(old, new)))
+
+        return [
+            (strikes[i], self._category_at(i, old_bounds), self._category_at(i, new_bounds))
+            for i in sorted(changed)
+        ]
+
+    def strikes_in(self, category: Hashable) -> list[float]:
+        """Strikes currently in a category."""
+        if self._bounds is None:
+            raise RuntimeError("MoneynessBandIndex has no spot yet; call update() first")
+        band = self.order.index(category)
+        start = self._bounds[band - 1] if band > 0 else 0
+        end = self._bounds[band] if band < len(self._bounds) else len(self.ladder)
+        return self.ladder.strikes[start:end]
+
+    def category_of(self, strike: float) -> Any:
+        if self._bounds is None:
+            raise RuntimeError("MoneynessBandIndex has no spot yet; call update() first")
+        return self._category_at(bisect.bisect_left(self.ladder.strikes, strike), self._bounds)
+
+    def distribution(self) -> dict[Any, int]:
+        """Number of strikes per category."""
+        if self._bounds is None:
+            return {}
+        edges = [0, *self._bounds, len(self.ladder)]
+        return {category: edges[i + 1] - edges[i] for i, category in enumerate(self.order)}
+
+    def _category_at(self, index: int, bounds: list[int]) -> Any:
+        return self.order[bisect.bisect_right(bounds, index)]
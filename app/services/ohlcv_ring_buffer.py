@@ -0,0 +1,224 @@
+"""
+Fixed-capacity columnar OHLCV ring buffers.
+
+Each (instrument, interval) keeps its recent bars as packed float64 columns
+(timestamp, open, high, low, close, volume) in one flat buffer:
+
+    int64[2] header (bars ever appended, capacity) | float64[6, capacity]
+
+Appending a bar writes one slot; reading the last N bars returns NumPy
+columns with at most two slice copies. Nothing is serialized per tick.
+
+The buffer can live in process memory or in a named
+multiprocessing.shared_memory segment that worker processes attach to
+without copying.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from multiprocessing import shared_memory
+
+import numpy as np
+
+OHLCV_FIELDS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+N_FIELDS = len(OHLCV_FIELDS)
+HEADER_BYTES = 2 * 8
+
+
+def ring_buffer_nbytes(capacity: int) -> int:
+    return HEADER_BYTES + N_FIELDS * capacity * 8
+
+
+class OHLCVRingBuffer:
+    """Columnar OHLCV ring buffer over a flat byte buffer."""
+
+    def __init__(self, buffer, capacity: int | None = None, shm: shared_memory.SharedMemory | None = None):
+        """
+        Args:
+            buffer: Writable buffer of at least ring_buffer_nbytes(capacity) bytes
+            capacity: Number of bar slots; None to read it from an initialised header
+            shm: Shared memory segment owning the buffer, if any
+        """
+        self._shm = shm
+        self._header = np.ndarray((2,), dtype=np.int64, buffer=buffer)
+        if capacity is not None:
+            self._header[:] = (0, capacity)
+        self.capacity = int(self._header[1])
+        self._columns = np.ndarray(
+            (N_FIELDS, self.capacity), dtype=np.float64, buffer=buffer, offset=HEADER_BYTES
+        )
+
+    @classmethod
+    def create(cls, capacity: int, shared: bool = False) -> 'OHLCVRingBuffer':
+        """New empty buffer in process memory, or in a new shared memory segment."""
+        nbytes = ring_buffer_nbytes(capacity)
+        if shared:
+            shm = shared_memory.SharedMemory(create=True, size=nbytes)
+            return cls(shm.buf, capacity, shm)
+        return cls(bytearray(nbytes), capacity)
+
+    @classmethod
+    def attach(cls, name: str) -> 'OHLCVRingBuffer':
+        """Attach to a buffer created with shared=True in another process."""
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm.buf, None, shm)
+
+    @property
+    def shm_name(self) -> str | None:
+        return self._shm.name if self._shm is not None else None
+
+    @property
+    def appended(self) -> int:
+        """Bars appended since creation (monotonic; doubles as a version)."""
+        return int(self._header[0])
+
+    def __len__(self) -> int:
+        return min(self.appended, self.capacity)
+
+    def append(self, timestamp: float, open_: float, high: float, low: float, close: float, volume: float = 0.0):
+        """Append one bar, overwriting the oldest once full."""
+        slot = self.appended % self.capacity
+        self._columns[:, slot] = (timestamp, open_, high, low, close, volume)
+        self._header[0] += 1
+
+    def replace_last(self, timestamp: float, open_: float, high: float, low: float, close: float, volume: float = 0.0):
+        """Overwrite the newest bar (e.g. a bar that was still forming when it was loaded)."""
+        if not len(self):
+            raise IndexError("replace_last on an empty ring buffer")
+        self._columns[:, (self.appended - 1) % self.capacity] = (timestamp, open_, high, low, close, volume)
+
+    def extend(self, columns: np.ndarray):
+        """Append bars from a (6, n) array; only the last `capacity` are kept."""
+        columns = np.asarray(columns, dtype=np.float64)
+        n = columns.shape[1]
+        if n > self.capacity:
+            columns = columns[:, -self.capacity:]
+            self._header[0] += n - self.capacity
+            n = self.capacity
+        if n == 0:
+            return
+
+        start = self.appended % self.capacity
+        first = min(n, self.capacity - start)
+        self._columns[:, start:start + first] = columns[:, :first]
+        self._columns[:, :n - first] = columns[:, first:]
+        self._header[0] += n
+
+    def last(self, n: int | None = None) -> np.ndarray:
+        """The last n bars (default: all) as a new (6, n) array in chronological order."""
+        size = len(self)
+        n = size if n is None else min(n, size)
+        end = self.appended % self.capacity
+        start = end - n
+        if start >= 0:
+            return self._columns[:, start:end].copy()
+        return np.concatenate([self._columns[:, start:], self._columns[:, :end]], axis=1)
+
+    def last_as_dict(self, n: int | None = None) -> dict[str, np.ndarray]:
+        return dict(zip(OHLCV_FIELDS, self.last(n), strict=True))
+
+    def close(self, unlink: bool = False):
+        """Release the shared memory mapping (and remove the segment if unlink)."""
+        if self._shm is None:
+            return
+        # Drop views before closing the mapping
+        self._header = self._columns = None
+        self._shm.close()
+        if unlink:
+            self._shm.unlink()
+        self._shm = None
+
+
+class OHLCVStore:
+    """
+    Ring buffers keyed by (instrument_key, interval) with an LRU bound.
+
+    A buffer not written for `ttl_seconds` counts as stale so that history is
+    refreshed at the same cadence as the cache it replaces.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1000,
+        max_buffers: int = 2048,
+        ttl_seconds: float | None = None,
+        shared: bool = False
+    ):
+        self.capacity = capacity
+        self.max_buffers = max_buffers
+        self.ttl_seconds = ttl_seconds
+        self.shared = shared
+        self._buffers: OrderedDict[tuple[str, str], tuple[OHLCVRingBuffer, float]] = OrderedDict()
+        self.metrics = {'hits': 0, 'misses': 0, 'loads': 0, 'appends': 0, 'evictions': 0}
+
+    def get(self, instrument_key: str, interval: str) -> OHLCVRingBuffer | None:
+        """Fresh, non-empty buffer for the key, or None on a miss."""
+        key = (instrument_key, interval)
+        entry = self._buffers.get(key)
+        if entry is None or not len(entry[0]) or self._is_stale(entry[1]):
+            self.metrics['misses'] += 1
+            return None
+
+        self._buffers.move_to_end(key)
+        self.metrics['hits'] += 1
+        return entry[0]
+
+    def load(self, instrument_key: str, interval: str, columns: np.ndarray | Sequence) -> OHLCVRingBuffer:
+        """Replace the key's buffer with historical bars given as a (6, n) array."""
+        key = (instrument_key, interval)
+        self.discard(instrument_key, interval)
+
+        buffer = OHLCVRingBuffer.create(self.capacity, shared=self.shared)
+        buffer.extend(columns)
+        self._buffers[key] = (buffer, time.monotonic())
+        self.metrics['loads'] += 1
+
+        while len(self._buffers) > self.max_buffers:
+            _, (evicted, _) = self._buffers.popitem(last=False)
+            evicted.close(unlink=True)
+            self.metrics['evictions'] += 1
+        return buffer
+
+    def append(self, instrument_key: str, interval: str, bar: Sequence[float]) -> bool:
+        """
+        Append a closed bar to an existing buffer; False if the key is not loaded.
+
+        A bar with the newest buffered timestamp replaces that bar; an older bar is ignored (False).
+        """
+        key = (instrument_key, interval)
+        entry = self._buffers.get(key)
+        if entry is None:
+            return False
+
+        buffer = entry[0]
+        newest = buffer.last(1)[0] if len(buffer) else ()
+        if len(newest) and bar[0] <= newest[0]:
+            if bar[0] < newest[0]:
+                return False
+            buffer.replace_last(*bar)
+        else:
+            buffer.append(*bar)
+        self._buffers[key] = (buffer, time.monotonic())
+        self.metrics['appends'] += 1
+        return True
+
+    def discard(self, instrument_key: str, interval: str):
+        entry = self._buffers.pop((instrument_key, interval), None)
+        if entry is not None:
+            entry[0].close(unlink=True)
+
+    def clear(self):
+        for buffer, _ in self._buffers.values():
+            buffer.close(unlink=True)
+        self._buffers.clear()
+
+    def get_metrics(self) -> dict:
+        return {
+            **self.metrics,
+            'buffers': len(self._buffers),
+            'bytes': len(self._buffers) * ring_buffer_nbytes(self.capacity)
+        }
+
+    def _is_stale(self, written_at: float) -> bool:
+        return self.ttl_seconds is not None and time.monotonic() - written_at > self.ttl_seconds
@@ -0,0 +1,159 @@
+"""
+Static-arbitrage checks on one expiry of an option chain, run as whole-array operations.
+
+Calls and puts are aligned by strike into float64 arrays (NaN where a strike
+has no quote), and each no-arbitrage condition is evaluated on the whole
+strike axis at once:
+- put-call parity: C - P + K * D equals the present value of the forward
+- monotonicity: call prices fall and put prices rise as strike rises
+- convexity: no price lies above the chord of its neighbouring strikes
+- box spreads: a K1/K2 box costs (K2 - K1) * D
+
+The edge of a box spread is the difference of its two strikes' synthetic
+forwards, so the mispriced boxes among all k * (k - 1) / 2 strike pairs are
+found from the sorted forwards without building the k x k matrix.
+D is the discount factor exp(-r * T).
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class StrikeAlignedChain:
+    """Call and put prices of one expiry on a shared, sorted strike axis."""
+    strikes: np.ndarray
+    call_prices: np.ndarray   # NaN where the strike has no (positive) call quote
+    put_prices: np.ndarray    # NaN where the strike has no (positive) put quote
+
+    @classmethod
+    def from_quotes(cls, call_strikes, call_prices, put_strikes, put_prices) -> 'StrikeAlignedChain':
+        """
+        Align call and put quotes by strike; a repeated strike keeps its last quote.
+
+        Args:
+            call_strikes: Strike of each call quote
+            call_prices: Market price of each call quote
+            put_strikes: Strike of each put quote
+            put_prices: Market price of each put quote
+        """
+        call_strikes = np.asarray(call_strikes, dtype=np.float64)
+        put_strikes = np.asarray(put_strikes, dtype=np.float64)
+        strikes = np.unique(np.concatenate([call_strikes, put_strikes]))
+        return cls(
+            strikes=strikes,
+            call_prices=_place(strikes, call_strikes, call_prices),
+            put_prices=_place(strikes, put_strikes, put_prices)
+        )
+
+    def __len__(self) -> int:
+        return len(self.strikes)
+
+
+def _place(strikes: np.ndarray, quote_strikes: np.ndarray, quote_prices) -> np.ndarray:
+    prices = np.full(len(strikes), np.nan)
+    quote_prices = np.asarray(quote_prices, dtype=np.float64)
+    # Fancy assignment keeps the last of repeated indexes
+    prices[np.searchsorted(strikes, quote_strikes)] = np.where(quote_prices > 0, quote_prices, np.nan)
+    return prices
+
+
+def synthetic_forwards(chain: StrikeAlignedChain, discount: float) -> np.ndarray:
+    """Present value of the forward implied at each strike, C - P + K * D (NaN without both quotes)."""
+    return chain.call_prices - chain.put_prices + chain.strikes * discount
+
+
+def parity_residuals(forwards: np.ndarray, underlying_price: float | None = None) -> np.ndarray:
+    """
+    Deviation of each strike's synthetic forward from the reference forward.
+
+    The reference is the underlying price when given (C - P = S - K * D), else the
+    median synthetic forward, which needs no dividend or carry assumptions.
+    Positive residuals mean the call is rich against the put.
+    """
+    if underlying_price is not None:
+        return forwards - underlying_price
+    valid = forwards[~np.isnan(forwards)]
+    if valid.size == 0:
+        return forwards.copy()
+    return forwards - np.median(valid)
+
+
+def monotonicity_violations(strikes: np.ndarray, prices: np.ndarray, is_call: bool,
+                            threshold: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Adjacent quoted strikes whose prices are inverted by more than threshold.
+
+    Returns:
+        (lower_index, higher_index, inversion) into strikes, one entry per violation
+    """
+    quoted = np.flatnonzero(~np.isnan(prices))
+    steps = np.diff(prices[quoted])
+    # A call must not get dearer as strike rises, a put must not get cheaper
+    inversion = steps if is_call else -steps
+    hits = np.flatnonzero(inversion > threshold)
+    return quoted[hits], quoted[hits + 1], inversion[hits]
+
+
+def convexity_violations(strikes: np.ndarray, prices: np.ndarray,
+                         threshold: float) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Quoted strikes priced above the chord of their quoted neighbours by more than threshold.
+
+    Returns:
+        (lower_index, middle_index, higher_index, excess) into strikes, one entry per violation
+    """
+    quoted = np.flatnonzero(~np.isnan(prices))
+    if quoted.size < 3:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty, empty, np.empty(0)
+
+    k, p = strikes[quoted], prices[quoted]
+    weight = (k[2:] - k[1:-1]) / (k[2:] - k[:-2])
+    chord = weight * p[:-2] + (1.0 - weight) * p[2:]
+    excess = p[1:-1] - chord
+    hits = np.flatnonzero(excess > threshold)
+    return quoted[hits], quoted[hits + 1], quoted[hits + 2], excess[hits]
+
+
+def box_spread_edges(forwards: np.ndarray, threshold: float,
+                     limit: int | None = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Box spreads whose price is off their discounted width by more than threshold.
+
+    A long K_i/K_j box (i < j) costs (C_i - C_j) - (P_i - P_j) and pays K_j - K_i,
+    so its edge (discounted payoff minus cost) is forwards[j] - forwards[i].
+    With the forwards sorted, the pairs further apart than threshold are, for
+    each forward, a suffix of the sorted array; only those pairs are built.
+
+    Args:
+        forwards: Synthetic forwards on the strike axis (see synthetic_forwards)
+        threshold: Minimum absolute edge to report
+        limit: Keep only the largest edges
+
+    Returns:
+        (lower_index, higher_index, edge) ordered by decreasing absolute edge;
+        a positive edge means the box is cheap (buy it), a negative one rich (sell it)
+    """
+    quoted = np.flatnonzero(~np.isnan(forwards))
+    order = quoted[np.argsort(forwards[quoted], kind='stable')]
+    ranked = forwards[order]
+
+    # Pairs (p, q) of sorted positions with ranked[q] - ranked[p] > threshold
+    first = np.searchsorted(ranked, ranked + threshold, side='right')
+    counts = len(ranked) - first
+    p = np.repeat(np.arange(len(ranked)), counts)
+    q = first[p] + np.arange(p.size) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    lower = np.minimum(order[p], order[q])
+    higher = np.maximum(order[p], order[q])
+    found = forwards[higher] - forwards[lower]
+
+    magnitude = np.abs(found)
+    if limit is not None and found.size > limit:
+        top = np.argpartition(-magnitude, limit - 1)[:limit] if limit > 0 else np.empty(0, dtype=np.intp)
+    else:
+        top = np.arange(found.size)
+    top = top[np.lexsort((higher[top], lower[top], -magnitude[top]))]
+    return lower[top], higher[top], found[top]
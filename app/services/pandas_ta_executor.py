@@ -1,14 +1,16 @@
 """Technical Indicators executor using pandas_ta"""
 import asyncio
 import json
-from datetime import datetime
+from collections import defaultdict
+from datetime import UTC, datetime
 from decimal import Decimal
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 try:
-    import pandas_ta as ta
+    import pandas_ta  # noqa: F401
     PANDAS_TA_AVAILABLE = True
 except ImportError:
     PANDAS_TA_AVAILABLE = False
@@ -21,7 +23,24 @@ from app.schemas.config_schema import (
     TechnicalIndicatorConfig,
     TickProcessingContext,
 )
+from app.services.incremental_bar_builder import IncrementalBarBuilder
+from app.services.incremental_indicators import (
+    Bar,
+    IncrementalIndicator,
+    IncrementalIndicatorSet,
+    create_indicator,
+    indicator_spec_key,
+    interval_to_seconds,
+)
+from app.services.indicator_process_pool import (
+    execute_pandas_ta_strategy,
+    get_indicator_process_pool,
+    shape_indicator_result,
+)
 from app.services.indicator_registry import IndicatorRegistry
+from app.services.ohlcv_ring_buffer import OHLCV_FIELDS, OHLCVRingBuffer, OHLCVStore
+from app.services.signal_redis_manager import signal_redis_manager
+from app.services.trading_session import TradingSession
 from app.services.unified_historical_data_service import (
     get_production_historical_data_manager as get_historical_data_manager,
 )
@@ -38,6 +57,28 @@ class PandasTAExecutor:
         self.redis_client = redis_client
         self.ticker_adapter = EnhancedTickerAdapter()
 
+        # Incremental indicator state per (instrument_key, interval), persisted via the state store
+        self.state_store = signal_redis_manager
+        self.incremental_sets: dict[tuple[str, str], IncrementalIndicatorSet] = {}
+        self.incremental_metrics = defaultdict(int)
+        # Serializes load, warm-up and store of one set across concurrent ticks
+        self._incremental_locks: dict[tuple[str, str], asyncio.Lock] = {}
+        # Sets that committed bar-builder bars since they were last persisted
+        self._committed_sets: set[tuple[str, str]] = set()
+        # Session the incremental buckets align to (the bar builder's once attached)
+        self.trading_session = TradingSession()
+
+        # Optional worker processes for CPU-heavy indicator categories, shared by every executor
+        self.process_pool = get_indicator_process_pool()
+
+        # Recent bars per (instrument_key, interval) as packed float64 columns
+        self.ohlcv_store = OHLCVStore(
+            capacity=getattr(settings, 'TA_MAX_PERIODS', 1000),
+            ttl_seconds=settings.CACHE_TTL_SECONDS
+        )
+        # Live bars built from ticks (see attach_bar_builder)
+        self.bar_builder: IncrementalBarBuilder | None = None
+
         if not PANDAS_TA_AVAILABLE:
             from app.errors import TechnicalIndicatorError
             raise TechnicalIndicatorError("pandas_ta library not available - technical indicators require pandas_ta library")
@@ -57,22 +98,42 @@ class PandasTAExecutor:
             instrument_key = context.instrument_key
             log_info(f"Executing technical indicators for {instrument_key}: {len(config.technical_indicators)} indicators")
 
-            # Get historical data for indicators
-            df = await self.prepare_dataframe(instrument_key, config, context)
+            # Indicators with an incremental implementation are answered from
+            # per-instrument state; the rest run through pandas_ta as before
+            incremental, remaining = self.split_incremental_indicators(
+                config.technical_indicators, config.interval.value
+            )
 
-            if df is None or df.empty:
-                log_warning(f"No data available for technical indicators: {instrument_key}")
-                return {}
+            results = {}
+            data_points = 0
 
-            # Build and execute strategy
-            strategy_dict = self.build_strategy(config.technical_indicators)
+            if incremental:
+                incremental_results, data_points = await self.execute_incremental_indicators(
+                    instrument_key, config, context, incremental
+                )
+                results.update(incremental_results)
 
-            if not strategy_dict:
-                log_warning("No valid strategy built from indicators")
-                return {}
+            if remaining:
+                self.incremental_metrics['pandas_ta_fallbacks'] += len(remaining)
+
+                # Get historical data for indicators
+                df = await self.prepare_dataframe(instrument_key, config, context)
 
-            # Execute indicators
-            results = await self.execute_strategy(df, strategy_dict, config.technical_indicators)
+                if df is None or df.empty:
+                    log_warning(f"No data available for technical indicators: {instrument_key}")
+                    if not incremental:
+                        return {}
+                else:
+                    # Build and execute strategy
+                    strategy_dict = self.build_strategy(remaining)
+
+                    if strategy_dict:
+                        results.update(await self.execute_strategy(df, strategy_dict, remaining))
+                        data_points = max(data_points, len(df))
+                    else:
+                        log_warning("No valid strategy built from indicators")
+                        if not incremental:
+                            return {}
 
             # Cache results if enabled
             if config.output.cache_results:
@@ -93,7 +154,7 @@ class PandasTAExecutor:
                 "instrument_key": instrument_key,
                 "calculation_type": "technical_indicators",
                 "indicators_count": len(results),
-                "data_points": len(df),
+                "data_points": data_points,
                 "results": results,
                 "metadata": {
                     "interval": config.interval.value,
@@ -109,6 +170,201 @@ class PandasTAExecutor:
             log_exception(f"Error in technical indicators execution: {error}")
             raise error from e
 
+    def split_incremental_indicators(
+        self,
+        indicators: list[TechnicalIndicatorConfig],
+        interval: str
+    ) -> tuple[list[tuple[TechnicalIndicatorConfig, str, IncrementalIndicator]], list[TechnicalIndicatorConfig]]:
+        """
+        Split indicators into those served incrementally and those left to pandas_ta.
+
+        Custom registry indicators always take the registry path, as do indicators
+        whose parameters the incremental implementation does not understand.
+
+        Returns:
+            ([(indicator, spec_key, incremental implementation), ...], remaining indicators)
+        """
+        if interval_to_seconds(interval) is None:
+            return [], list(indicators)
+
+        incremental, remaining = [], []
+        for indicator in indicators:
+            name = indicator.name.lower()
+            if IndicatorRegistry.get(name) is None:
+                parameters = self.normalize_indicator_parameters(name, indicator.parameters)
+                implementation = create_indicator(name, parameters)
+                if implementation is not None:
+                    incremental.append((indicator, indicator_spec_key(name, parameters), implementation))
+                    continue
+            remaining.append(indicator)
+        return incremental, remaining
+
+    async def execute_incremental_indicators(
+        self,
+        instrument_key: str,
+        config: SignalConfigData,
+        context: TickProcessingContext,
+        indicators: list[tuple[TechnicalIndicatorConfig, str, IncrementalIndicator]]
+    ) -> tuple[dict[str, Any], int]:
+        """
+        Evaluate indicators from incremental state: O(1) per tick once warmed up.
+
+        State is looked up in memory, then in the state store; indicators without
+        state are warmed up once from the historical DataFrame. With a bar builder
+        attached, closed bars are committed by append_closed_bars and the builder's
+        open bar is the forming bar; otherwise the tick is merged here.
+
+        Returns:
+            (results keyed by output_key, number of committed bars behind the values)
+        """
+        interval = config.interval.value
+        set_key = (instrument_key, interval)
+        empty_results = {indicator.output_key: None for indicator, _, _ in indicators}
+
+        tick = self.extract_ohlcv_from_tick(context.tick_data, context.timestamp)
+        if tick is None:
+            return empty_results, 0
+        now = _epoch_seconds(context.timestamp)
+
+        lock = self._incremental_locks.get(set_key)
+        if lock is None:
+            lock = self._incremental_locks[set_key] = asyncio.Lock()
+
+        async with lock:
+            indicator_set = self.incremental_sets.get(set_key)
+            if indicator_set is None:
+                indicator_set = await self._load_indicator_set(instrument_key, interval, now)
+
+            missing = [
+                (key, implementation) for _, key, implementation in indicators
+                if indicator_set is None or key not in indicator_set.indicators
+            ]
+            if missing:
+                history = await self._history_bars(instrument_key, config, context)
+                if history is None:
+                    log_warning(f"No history to warm up incremental indicators: {instrument_key}")
+                    return empty_results, 0
+
+                if indicator_set is None:
+                    # Stream ticks carry the day's cumulative traded volume
+                    indicator_set = IncrementalIndicatorSet(
+                        interval_to_seconds(interval), self.trading_session, cumulative_volume=True
+                    )
+                    indicator_set.start(history, now)
+                for key, implementation in missing:
+                    indicator_set.add(key, implementation, history, now)
+                self.incremental_metrics['state_warmups'] += len(missing)
+
+            self.incremental_sets[set_key] = indicator_set
+
+            live_bar = self.bar_builder.open_bar(instrument_key, interval) if self.bar_builder else None
+            if live_bar is not None:
+                indicator_set.set_forming(Bar(*live_bar.as_ohlcv()))
+                committed = set_key in self._committed_sets
+                self._committed_sets.discard(set_key)
+            else:
+                committed = indicator_set.on_tick(now, tick['close'], tick['volume'])
+            if committed or missing:
+                await self._store_indicator_set(instrument_key, interval, indicator_set)
+
+        values = indicator_set.values([key for _, key, _ in indicators])
+        self.incremental_metrics['incremental_evaluations'] += len(indicators)
+
+        return (
+            {indicator.output_key: values[key] for indicator, key, _ in indicators},
+            indicator_set.bars_committed
+        )
+
+    async def _load_indicator_set(
+        self,
+        instrument_key: str,
+        interval: str,
+        now: float
+    ) -> IncrementalIndicatorSet | None:
+        """Restore persisted incremental state, if any; state that missed a bar is rebuilt from history"""
+        try:
+            await self.state_store.initialize()
+            state = await self.state_store.get_indicator_state(instrument_key, f"incremental:{interval}")
+            if not state:
+                return None
+            indicator_set = IncrementalIndicatorSet.from_state(state, self.trading_session)
+            if indicator_set.is_stale(now):
+                self.incremental_metrics['stale_states_discarded'] += 1
+                log_info(f"Rebuilding stale incremental indicator state for {instrument_key}:{interval}")
+                return None
+            return indicator_set
+        except Exception as e:
+            log_warning(f"Discarding incremental indicator state for {instrument_key}:{interval}: {e}")
+            return None
+
+    async def _store_indicator_set(self, instrument_key: str, interval: str, indicator_set: IncrementalIndicatorSet):
+        """Persist incremental state (on warm-up and bar commits only)"""
+        try:
+            await self.state_store.initialize()
+            await self.state_store.store_indicator_state(
+                instrument_key, f"incremental:{interval}", indicator_set.to_state()
+            )
+        except Exception as e:
+            log_warning(f"Failed to persist incremental indicator state for {instrument_key}: {e}")
+
+    async def _history_bars(
+        self,
+        instrument_key: str,
+        config: SignalConfigData,
+        context: TickProcessingContext
+    ) -> list[Bar] | None:
+        """Historical bars for warm-up (the DataFrame without the current tick row)"""
+        df = await self.prepare_dataframe(instrument_key, config, context)
+        if df is None or df.empty or 'timestamp' not in df.columns:
+            return None
+
+        history = df.iloc[:-1]
+        timestamps = pd.to_datetime(history['timestamp'], utc=True)
+        epochs = (timestamps - pd.Timestamp(0, tz='UTC')).dt.total_seconds()
+        return [
+            Bar(timestamp, open_, high, low, close, volume)
+            for timestamp, open_, high, low, close, volume in zip(
+                epochs.tolist(),
+                history['open'].tolist(),
+                history['high'].tolist(),
+                history['low'].tolist(),
+                history['close'].tolist(),
+                history['volume'].fillna(0.0).tolist(),
+                strict=True
+            )
+        ]
+
+    def attach_bar_builder(self, bar_builder: IncrementalBarBuilder):
+        """Append closed live bars to the ring buffers and use the forming bar as the newest row"""
+        self.bar_builder = bar_builder
+        self.trading_session = bar_builder.session
+        bar_builder.add_listener(self.append_closed_bars)
+
+    def append_closed_bars(self, bars: list):
+        """Bar-close listener: extend the buffered history and commit the bar to its incremental set"""
+        for bar in bars:
+            self.ohlcv_store.append(bar.instrument_key, bar.interval, bar.as_ohlcv())
+
+            set_key = (bar.instrument_key, bar.interval)
+            indicator_set = self.incremental_sets.get(set_key)
+            if indicator_set is not None and indicator_set.commit(Bar(*bar.as_ohlcv())):
+                self._committed_sets.add(set_key)
+                self.incremental_metrics['builder_bars_committed'] += 1
+
+    def _forming_bar(self, instrument_key: str, interval: str) -> dict | None:
+        """The live bar still forming for the interval, shaped like extract_ohlcv_from_tick"""
+        bar = self.bar_builder.open_bar(instrument_key, interval) if self.bar_builder else None
+        if bar is None:
+            return None
+        return {
+            'timestamp': datetime.fromtimestamp(bar.start, UTC),
+            'open': bar.open,
+            'high': bar.high,
+            'low': bar.low,
+            'close': bar.close,
+            'volume': bar.volume
+        }
+
     async def prepare_dataframe(
         self,
         instrument_key: str,
@@ -117,23 +373,17 @@ class PandasTAExecutor:
     ) -> pd.DataFrame | None:
         """Prepare pandas DataFrame for technical analysis"""
         try:
-            # Try to get from cache first
-            cache_key = f"ta_data:{instrument_key}:{config.interval.value}"
-            cached_data = await self.redis_client.get(cache_key)
+            interval = config.interval.value
 
-            if cached_data:
+            # Try the bar ring buffer first
+            buffer = self.ohlcv_store.get(instrument_key, interval)
+            if buffer is not None:
                 try:
-                    data = json.loads(cached_data)
-                    df = pd.DataFrame(data)
-
-                    # Add current tick data
-                    current_tick = self.extract_ohlcv_from_tick(context.tick_data, context.timestamp)
-                    if current_tick:
-                        df = pd.concat([df, pd.DataFrame([current_tick])], ignore_index=True)
-
-                    return self.format_dataframe(df)
+                    current_tick = (self._forming_bar(instrument_key, interval)
+                                    or self.extract_ohlcv_from_tick(context.tick_data, context.timestamp))
+                    return self.format_dataframe(self._dataframe_from_buffer(buffer, current_tick))
                 except Exception as e:
-                    log_exception(f"Failed to use cached TA data: {e}")
+                    log_exception(f"Failed to use buffered TA data: {e}")
 
             # Get aggregated data from context
             if context.aggregated_data and config.interval.value in context.aggregated_data:
@@ -142,18 +392,14 @@ class PandasTAExecutor:
                 if isinstance(data, list) and data:
                     df = pd.DataFrame(data)
 
+                    # Keep the history for future ticks
+                    self._buffer_history(instrument_key, interval, df)
+
                     # Add current tick
                     current_tick = self.extract_ohlcv_from_tick(context.tick_data, context.timestamp)
                     if current_tick:
                         df = pd.concat([df, pd.DataFrame([current_tick])], ignore_index=True)
 
-                    # Cache for future use
-                    await self.redis_client.setex(
-                        cache_key,
-                        settings.CACHE_TTL_SECONDS,
-                        json.dumps(df.to_dict('records'))
-                    )
-
                     return self.format_dataframe(df)
 
             # Try to get historical data from ticker_service - required for accurate indicators
@@ -189,18 +435,14 @@ class PandasTAExecutor:
                         # Convert historical data to DataFrame
                         df = pd.DataFrame(historical_result["data"])
                         if not df.empty and all(col in df.columns for col in ['open', 'high', 'low', 'close']):
+                            # Keep the history for future ticks
+                            self._buffer_history(instrument_key, interval, df)
+
                             # Add current tick to historical data
                             current_tick = self.extract_ohlcv_from_tick(context.tick_data, context.timestamp)
                             if current_tick:
                                 df = pd.concat([df, pd.DataFrame([current_tick])], ignore_index=True)
 
-                            # Cache the combined data
-                            await self.redis_client.setex(
-                                cache_key,
-                                settings.CACHE_TTL_SECONDS,
-                                json.dumps(df.to_dict('records'))
-                            )
-
                             log_info(f"Successfully prepared DataFrame with {len(df)} periods from historical data")
                             return self.format_dataframe(df)
 
@@ -217,6 +459,39 @@ class PandasTAExecutor:
             log_exception(f"Failed to prepare DataFrame: {e}")
             return None
 
+    def _buffer_history(self, instrument_key: str, interval: str, df: pd.DataFrame):
+        """Load historical bars into the ring buffer (on a miss only)"""
+        try:
+            if 'timestamp' not in df.columns or any(col not in df.columns for col in OHLCV_FIELDS[1:5]):
+                return
+
+            timestamps = pd.to_datetime(df['timestamp'], utc=True)
+            volume = df['volume'] if 'volume' in df.columns else pd.Series(0.0, index=df.index)
+            columns = np.vstack([
+                (timestamps - pd.Timestamp(0, tz='UTC')).dt.total_seconds().to_numpy(),
+                *(pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64) for col in OHLCV_FIELDS[1:5]),
+                pd.to_numeric(volume, errors='coerce').fillna(0.0).to_numpy(dtype=np.float64)
+            ])
+            order = np.argsort(columns[0], kind='stable')
+            self.ohlcv_store.load(instrument_key, interval, columns[:, order])
+        except Exception as e:
+            log_warning(f"Failed to buffer TA history for {instrument_key}: {e}")
+
+    def _dataframe_from_buffer(self, buffer: OHLCVRingBuffer, current_tick: dict | None) -> pd.DataFrame:
+        """DataFrame of the buffered bars, with the current tick as the last row"""
+        columns = buffer.last()
+        if current_tick:
+            row = [
+                _epoch_seconds(current_tick['timestamp']),
+                current_tick['open'], current_tick['high'], current_tick['low'],
+                current_tick['close'], current_tick['volume']
+            ]
+            columns = np.concatenate([columns, np.array(row, dtype=np.float64)[:, None]], axis=1)
+
+        df = pd.DataFrame(dict(zip(OHLCV_FIELDS, columns, strict=True)))
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
+        return df
+
     def extract_ohlcv_from_tick(self, tick_data: dict, timestamp: datetime) -> dict | None:
         """Extract OHLCV data from enhanced tick format"""
         try:
@@ -365,21 +640,7 @@ class PandasTAExecutor:
             for indicator in indicators:
                 try:
                     indicator_name = indicator.name.lower()
-                    parameters = indicator.parameters.copy()
-
-                    # Map common parameter names
-                    param_mapping = {
-                        'period': 'length',
-                        'periods': 'length',
-                        'window': 'length'
-                    }
-
-                    for old_key, new_key in param_mapping.items():
-                        if old_key in parameters:
-                            parameters[new_key] = parameters.pop(old_key)
-
-                    # Validate parameters for specific indicators
-                    parameters = self.validate_indicator_parameters(indicator_name, parameters)
+                    parameters = self.normalize_indicator_parameters(indicator_name, indicator.parameters)
 
                     # Add to strategy
                     if indicator_name not in strategy_dict:
@@ -400,6 +661,24 @@ class PandasTAExecutor:
             log_exception(f"Failed to build strategy: {e}")
             return {}
 
+    def normalize_indicator_parameters(self, indicator_name: str, parameters: dict | None) -> dict:
+        """Map common parameter aliases to pandas_ta names and apply defaults"""
+        parameters = dict(parameters or {})
+
+        # Map common parameter names
+        param_mapping = {
+            'period': 'length',
+            'periods': 'length',
+            'window': 'length'
+        }
+
+        for old_key, new_key in param_mapping.items():
+            if old_key in parameters:
+                parameters[new_key] = parameters.pop(old_key)
+
+        # Validate parameters for specific indicators
+        return self.validate_indicator_parameters(indicator_name, parameters)
+
     def validate_indicator_parameters(self, indicator_name: str, parameters: dict) -> dict:
         """Validate and adjust parameters for specific indicators"""
         try:
@@ -449,6 +728,7 @@ class PandasTAExecutor:
         try:
             results = {}
             pandas_ta_indicators = []
+            pooled = []
 
             # First pass: Execute custom registry indicators
             for indicator in indicators:
@@ -459,38 +739,24 @@ class PandasTAExecutor:
                 custom_indicator = IndicatorRegistry.get(indicator_name)
 
                 if custom_indicator:
+                    params = indicator.parameters.copy() if indicator.parameters else {}
+
+                    # CPU-heavy categories run in worker processes, concurrently
+                    if self.process_pool is not None and self.process_pool.handles(custom_indicator):
+                        pooled.append((
+                            indicator_name,
+                            output_key,
+                            self.process_pool.run_custom_indicator(custom_indicator, df, params)
+                        ))
+                        continue
+
                     # Execute custom indicator
                     try:
                         log_info(f"Executing custom indicator: {indicator_name} ({custom_indicator.library})")
 
                         # Call the indicator function with parameters
-                        params = indicator.parameters.copy() if indicator.parameters else {}
                         result = custom_indicator.function(df, **params)
-
-                        # Handle different output types
-                        if custom_indicator.output_type == "series":
-                            # Return latest value
-                            if isinstance(result, pd.Series):
-                                results[output_key] = float(result.iloc[-1]) if not result.empty and pd.notna(result.iloc[-1]) else None
-                            else:
-                                results[output_key] = result
-
-                        elif custom_indicator.output_type == "dataframe":
-                            # Convert DataFrame to dict
-                            if isinstance(result, pd.DataFrame):
-                                results[output_key] = result.to_dict('records')
-                            else:
-                                results[output_key] = result
-
-                        elif custom_indicator.output_type == "dict":
-                            # Already a dict
-                            results[output_key] = result
-
-                        elif custom_indicator.output_type == "float":
-                            results[output_key] = float(result) if result is not None else None
-
-                        else:
-                            results[output_key] = result
+                        results[output_key] = shape_indicator_result(custom_indicator.output_type, result)
 
                         log_info(f"  ✓ {indicator_name} executed successfully")
 
@@ -501,6 +767,16 @@ class PandasTAExecutor:
                     # Not a custom indicator, add to pandas_ta batch
                     pandas_ta_indicators.append(indicator)
 
+            if pooled:
+                log_info(f"Executing {len(pooled)} custom indicators in the process pool")
+                pooled_results = await asyncio.gather(*(task for _, _, task in pooled), return_exceptions=True)
+                for (indicator_name, output_key, _), result in zip(pooled, pooled_results, strict=True):
+                    if isinstance(result, Exception):
+                        log_exception(f"Error executing custom indicator {indicator_name} in process pool: {result}")
+                        results[output_key] = None
+                    else:
+                        results[output_key] = result
+
             # Second pass: Execute pandas_ta indicators if any
             if pandas_ta_indicators:
                 if not PANDAS_TA_AVAILABLE:
@@ -509,12 +785,15 @@ class PandasTAExecutor:
                 log_info(f"Executing {len(pandas_ta_indicators)} pandas_ta indicators")
 
                 # Execute pandas_ta strategy
-                result_df = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    self._execute_strategy_sync,
-                    df,
-                    strategy_dict
-                )
+                if self.process_pool is not None and self.process_pool.runs_pandas_ta:
+                    result_df = await self.process_pool.run_strategy(df, strategy_dict)
+                else:
+                    result_df = await asyncio.get_event_loop().run_in_executor(
+                        None,
+                        self._execute_strategy_sync,
+                        df,
+                        strategy_dict
+                    )
 
                 # Extract results for pandas_ta indicators
                 for indicator in pandas_ta_indicators:
@@ -532,12 +811,12 @@ class PandasTAExecutor:
                                 value = result_df[result_columns[0]].iloc[-1]
                                 results[output_key] = float(value) if pd.notna(value) else None
                             else:
-                                # Multi-value indicator (like MACD)
+                                # Multi-value indicator (like MACD), keyed by column name
+                                # as the incremental path keys it (MACD_12_26_9, MACDh_12_26_9, ...)
                                 indicator_result = {}
                                 for col in result_columns:
-                                    col_key = col.split('_')[-1]  # Get suffix like 'signal', 'histogram'
                                     value = result_df[col].iloc[-1]
-                                    indicator_result[col_key] = float(value) if pd.notna(value) else None
+                                    indicator_result[col] = float(value) if pd.notna(value) else None
                                 results[output_key] = indicator_result
                         else:
                             log_warning(f"No result found for pandas_ta indicator {indicator.name}")
@@ -557,17 +836,7 @@ class PandasTAExecutor:
     def _execute_strategy_sync(self, df: pd.DataFrame, strategy_dict: dict) -> pd.DataFrame:
         """Synchronous strategy execution (for thread pool)"""
         try:
-            # Create custom strategy
-            custom_strategy = ta.Strategy(
-                name="SignalService",
-                description="Custom strategy for signal service",
-                ta=strategy_dict
-            )
-
-            # Execute strategy
-            df.ta.strategy(custom_strategy)
-
-            return df
+            return execute_pandas_ta_strategy(df, strategy_dict)
 
         except Exception as e:
             from app.errors import TechnicalIndicatorError
@@ -609,6 +878,23 @@ class PandasTAExecutor:
         """Get executor metrics"""
         return {
             "pandas_ta_available": PANDAS_TA_AVAILABLE,
-            "max_ta_periods": settings.TA_MAX_PERIODS,
-            "cache_enabled": settings.TA_CACHE_RESULTS
+            "max_ta_periods": self.ohlcv_store.capacity,
+            "ohlcv_store": self.ohlcv_store.get_metrics(),
+            "process_pool": self.process_pool.get_metrics() if self.process_pool else None,
+            "cache_enabled": settings.TA_CACHE_RESULTS,
+            "incremental_sets": len(self.incremental_sets),
+            **self.incremental_metrics
         }
+
+    def close(self):
+        """Stop the indicator worker processes (a later pooled run starts them again)."""
+        if self.process_pool is not None:
+            self.process_pool.shutdown()
+
+
+def _epoch_seconds(timestamp: datetime) -> float:
+    """Epoch seconds, treating naive timestamps as UTC like the rest of the tick pipeline"""
+    ts = pd.Timestamp(timestamp)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize('UTC')
+    return ts.timestamp()
@@ -7,6 +7,7 @@ Performance target: 200-option premium analysis in <15ms total
 """
 
 import logging
+import math
 import time
 from datetime import date, datetime
 from enum import Enum
@@ -16,8 +17,18 @@ import numpy as np
 from py_vollib.black_scholes_merton import black_scholes_merton
 
 from app.errors import GreeksCalculationError
+from app.services.chain_greeks import ChainGreeks
+from app.services.option_arbitrage_scanner import (
+    StrikeAlignedChain,
+    box_spread_edges,
+    convexity_violations,
+    monotonicity_violations,
+    parity_residuals,
+    synthetic_forwards,
+)
 
 # Integration with Agent 1's vectorized engine
+from app.services.vectorized_greeks_kernel import GREEK_NAMES
 from app.services.vectorized_pyvollib_engine import VectorizedPyvolibGreeksEngine
 from app.utils.logging_utils import log_exception, log_info, log_warning
 
@@ -65,6 +76,16 @@ class PremiumDiscountCalculator:
             MispricingSeverity.EXTREME: (15.0, float('inf'))
         }
 
+        # Static arbitrage scan: minimum deviation reported, in premium points
+        self.arbitrage_thresholds = {
+            'put_call_parity': 1.0,
+            'vertical_spread': 0.5,
+            'butterfly': 0.5,
+            'box_spread': 1.0
+        }
+        self.max_box_spread_opportunities = 100
+        self.risk_free_rate = 0.06
+
         # Performance tracking
         self.performance_metrics = {
             'premium_analyses': 0,
@@ -117,7 +138,7 @@ class PremiumDiscountCalculator:
                 option_chain_data, underlying_price
             )
 
-            # Step 3: Compute premium/discount analysis
+            # Step 3: Compute premium/discount analysis on the columnar Greeks
             premium_results = await self._compute_premium_analysis(
                 market_prices, theoretical_prices, option_chain_data,
                 theoretical_results['results'] if include_greeks else None
@@ -224,37 +245,53 @@ class PremiumDiscountCalculator:
 
     async def calculate_arbitrage_opportunities(
         self,
-        chain_data: list[dict]
+        chain_data: list[dict],
+        underlying_price: float | None = None
     ) -> list[dict]:
         """
         Calculate potential arbitrage opportunities in option chain.
 
+        Calls and puts of each expiry are aligned by strike and checked for
+        put-call parity, vertical spread and box spread arbitrage as whole
+        arrays. Rows already flagged with arbitrage_signal by a premium/discount
+        analysis are reported as mispricing opportunities.
+
         Args:
-            chain_data: Option chain with premium/discount analysis
+            chain_data: Option chain rows (strike, expiry_date, option_type,
+                market_price), optionally with premium/discount analysis
+            underlying_price: Spot to check put-call parity against. By default each
+                expiry's median synthetic forward is used instead, which already
+                prices in dividends and carry; against spot those would flag every
+                strike of an index chain
 
         Returns:
             List of arbitrage opportunity dicts
         """
         try:
-            arbitrage_opportunities = []
+            start_time = time.perf_counter()
+
+            expiry_chains = self._align_by_expiry(chain_data)
 
-            # Group by expiry and option type for analysis
-            calls = [opt for opt in chain_data if opt.get('option_type', '').upper() in ['CE', 'CALL']]
-            puts = [opt for opt in chain_data if opt.get('option_type', '').upper() in ['PE', 'PUT']]
+            arbitrage_opportunities = await self._detect_arbitrage_opportunities(chain_data)
 
             # Put-Call parity arbitrage
-            parity_arbs = await self._detect_put_call_parity_arbitrage(calls, puts)
+            parity_arbs = await self._detect_put_call_parity_arbitrage(expiry_chains, underlying_price)
             arbitrage_opportunities.extend(parity_arbs)
 
             # Vertical spread arbitrage (same expiry, different strikes)
-            vertical_arbs = await self._detect_vertical_spread_arbitrage(calls, puts)
+            vertical_arbs = await self._detect_vertical_spread_arbitrage(expiry_chains)
             arbitrage_opportunities.extend(vertical_arbs)
 
             # Box spread arbitrage
-            box_arbs = await self._detect_box_spread_arbitrage(calls, puts)
+            box_arbs = await self._detect_box_spread_arbitrage(expiry_chains)
             arbitrage_opportunities.extend(box_arbs)
 
-            log_info(f"[AGENT-2] Found {len(arbitrage_opportunities)} arbitrage opportunities")
+            self.performance_metrics['arbitrage_opportunities_found'] += len(arbitrage_opportunities)
+            scan_time_ms = (time.perf_counter() - start_time) * 1000
+            log_info(
+                f"[AGENT-2] Found {len(arbitrage_opportunities)} arbitrage opportunities "
+                f"in {len(chain_data)} options in {scan_time_ms:.2f}ms"
+            )
 
             return arbitrage_opportunities
 
@@ -330,78 +367,70 @@ class PremiumDiscountCalculator:
         market_prices: list[float],
         theoretical_prices: list[float],
         option_chain_data: list[dict],
-        greeks_results: list[dict] | None = None
+        greeks_results: ChainGreeks | list[dict] | None = None
     ) -> list[dict]:
         """
         Compute premium/discount analysis for option chain.
 
+        Premium metrics and severities are computed on whole arrays; per-option
+        dicts are only assembled once, as the response rows.
+
         Args:
             market_prices: Current market prices
             theoretical_prices: Calculated theoretical prices
             option_chain_data: Option metadata
-            greeks_results: Optional Greeks calculation results
+            greeks_results: Optional Greeks, columnar or one dict per option
 
         Returns:
             List of premium analysis results
         """
         try:
-            results = []
+            n_options = min(len(market_prices), len(theoretical_prices), len(option_chain_data))
+            if n_options == 0:
+                return []
 
-            for i, (market_price, theoretical_price, option_data) in enumerate(
-                zip(market_prices, theoretical_prices, option_chain_data, strict=False)
-            ):
-                try:
-                    # Calculate premium/discount metrics
-                    premium_amount = market_price - theoretical_price
-                    premium_percentage = (premium_amount / theoretical_price * 100) if theoretical_price > 0 else 0.0
-
-                    is_overpriced = premium_amount > 0
-                    mispricing_severity = self.calculate_mispricing_severity(premium_percentage)
-
-                    # Build result dict
-                    result = {
-                        'strike': float(option_data['strike']),
-                        'expiry_date': option_data['expiry_date'],
-                        'option_type': option_data['option_type'],
-                        'market_price': round(market_price, 4),
-                        'theoretical_price': round(theoretical_price, 4),
-                        'premium_amount': round(premium_amount, 4),
-                        'premium_percentage': round(premium_percentage, 4),
-                        'is_overpriced': is_overpriced,
-                        'is_underpriced': not is_overpriced,
-                        'mispricing_severity': mispricing_severity.value,
-                        'arbitrage_signal': mispricing_severity in [MispricingSeverity.HIGH, MispricingSeverity.EXTREME]
-                    }
-
-                    # Add Greeks if available
-                    if greeks_results and i < len(greeks_results):
-                        greeks = greeks_results[i]
-                        result['greeks'] = {
-                            'delta': greeks.get('delta'),
-                            'gamma': greeks.get('gamma'),
-                            'theta': greeks.get('theta'),
-                            'vega': greeks.get('vega'),
-                            'rho': greeks.get('rho')
-                        }
-
-                    results.append(result)
+            market = np.asarray(market_prices[:n_options], dtype=np.float64)
+            theoretical = np.asarray(theoretical_prices[:n_options], dtype=np.float64)
 
-                except Exception as e:
-                    log_warning(f"[AGENT-2] Failed to compute premium analysis for option {i}: {e}")
-                    # Add default result to maintain list alignment
-                    results.append({
-                        'strike': option_data.get('strike', 0),
-                        'expiry_date': option_data.get('expiry_date', ''),
-                        'option_type': option_data.get('option_type', ''),
-                        'market_price': market_price,
-                        'theoretical_price': theoretical_price,
-                        'premium_amount': 0.0,
-                        'premium_percentage': 0.0,
-                        'is_overpriced': False,
-                        'is_underpriced': False,
-                        'mispricing_severity': MispricingSeverity.LOW.value,
-                        'arbitrage_signal': False
-                    })
+            premium_amount = market - theoretical
+            with np.errstate(divide='ignore', invalid='ignore'):
+                premium_percentage = np.where(
+                    theoretical > 0, premium_amount / theoretical * 100, 0.0
+                )
+
+            is_overpriced = premium_amount > 0
+            severity_index = self._classify_severities(premium_percentage)
+            severities = list(self.severity_thresholds)
+            severity_values = [severity.value for severity in severities]
+            signal_levels = np.array([
+                severity in [MispricingSeverity.HIGH, MispricingSeverity.EXTREME]
+                for severity in severities
+            ])
+            arbitrage_signal = signal_levels[severity_index]
+
+            options = option_chain_data[:n_options]
+            columns = {
+                'strike': [self._strike_value(opt) for opt in options],
+                'expiry_date': [opt.get('expiry_date', '') for opt in options],
+                'option_type': [opt.get('option_type', '') for opt in options],
+                'market_price': np.round(market, 4).tolist(),
+                'theoretical_price': np.round(theoretical, 4).tolist(),
+                'premium_amount': np.round(premium_amount, 4).tolist(),
+                'premium_percentage': np.round(premium_percentage, 4).tolist(),
+                'is_overpriced': is_overpriced.tolist(),
+                'is_underpriced': (~is_overpriced).tolist(),
+                'mispricing_severity': [severity_values[i] for i in severity_index.tolist()],
+                'arbitrage_signal': arbitrage_signal.tolist()
+            }
+
+            names = list(columns)
+            results = [dict(zip(names, row, strict=True)) for row in zip(*columns.values(), strict=True)]
+
+            if greeks_results is not None:
+                if not isinstance(greeks_results, ChainGreeks):
+                    greeks_results = ChainGreeks.from_rows(options, greeks_results, GREEK_NAMES)
+                for result, greeks in zip(results, greeks_results.greek_rows(GREEK_NAMES), strict=False):
+                    result['greeks'] = greeks
 
             return results
 
@@ -409,6 +438,20 @@ class PremiumDiscountCalculator:
             log_exception(f"[AGENT-2] Premium analysis computation failed: {e}")
             return []
 
+    def _classify_severities(self, premium_percentages: np.ndarray) -> np.ndarray:
+        """Vectorized calculate_mispricing_severity: index into severity_thresholds per option."""
+        lower_bounds = np.array([bounds[0] for bounds in self.severity_thresholds.values()])
+        index = np.searchsorted(lower_bounds, np.abs(premium_percentages), side='right') - 1
+        # NaN sorts past every bound and lands on the last (most severe) level, as in the scalar path
+        return np.clip(index, 0, len(lower_bounds) - 1)
+
+    @staticmethod
+    def _strike_value(option_data: dict) -> float:
+        try:
+            return float(option_data['strike'])
+        except (KeyError, TypeError, ValueError):
+            return option_data.get('strike', 0)
+
     def _calculate_time_to_expiry(self, expiry_date: str | date | datetime) -> float:
         """Calculate time to expiry in years."""
         try:
@@ -455,16 +498,18 @@ class PremiumDiscountCalculator:
             # Find high/extreme mispricing opportunities
             for analysis in premium_analysis:
                 if analysis.get('arbitrage_signal', False):
+                    premium_percentage = analysis.get('premium_percentage', 0)
+                    is_overpriced = analysis.get('is_overpriced', premium_percentage > 0)
                     opportunities.append({
                         'type': 'mispricing_arbitrage',
                         'strike': analysis['strike'],
-                        'expiry_date': analysis['expiry_date'],
-                        'option_type': analysis['option_type'],
-                        'premium_percentage': analysis['premium_percentage'],
-                        'severity': analysis['mispricing_severity'],
-                        'action': 'sell' if analysis['is_overpriced'] else 'buy',
-                        'market_price': analysis['market_price'],
-                        'theoretical_price': analysis['theoretical_price']
+                        'expiry_date': analysis.get('expiry_date', ''),
+                        'option_type': analysis.get('option_type', ''),
+                        'premium_percentage': premium_percentage,
+                        'severity': analysis.get('mispricing_severity', MispricingSeverity.LOW.value),
+                        'action': 'sell' if is_overpriced else 'buy',
+                        'market_price': analysis.get('market_price'),
+                        'theoretical_price': analysis.get('theoretical_price')
                     })
 
             return opportunities
@@ -473,50 +518,76 @@ class PremiumDiscountCalculator:
             log_exception(f"[AGENT-2] Arbitrage detection failed: {e}")
             return []
 
-    async def _detect_put_call_parity_arbitrage(self, calls: list[dict], puts: list[dict]) -> list[dict]:
-        """Detect put-call parity arbitrage opportunities."""
+    def _align_by_expiry(self, chain_data: list[dict]) -> dict[str, tuple[StrikeAlignedChain, float]]:
+        """Strike-aligned call and put prices of each expiry, with the expiry's discount factor."""
+        quotes = {}
+        for option in chain_data:
+            option_type = str(option.get('option_type', '')).upper()
+            if option_type in ['CE', 'CALL']:
+                side = 0
+            elif option_type in ['PE', 'PUT']:
+                side = 2
+            else:
+                continue
+            try:
+                strike = float(option['strike'])
+                price = float(option.get('market_price') or 0)
+            except (KeyError, TypeError, ValueError):
+                continue
+
+            expiry_quotes = quotes.setdefault(option.get('expiry_date', ''), ([], [], [], []))
+            expiry_quotes[side].append(strike)
+            expiry_quotes[side + 1].append(price)
+
+        expiry_chains = {}
+        for expiry, (call_strikes, call_prices, put_strikes, put_prices) in quotes.items():
+            time_to_expiry = self._calculate_time_to_expiry(expiry) if expiry else 1/365.25
+            expiry_chains[expiry] = (
+                StrikeAlignedChain.from_quotes(call_strikes, call_prices, put_strikes, put_prices),
+                math.exp(-self.risk_free_rate * time_to_expiry)
+            )
+        return expiry_chains
+
+    def _severity_values(self, deviation_percentages: np.ndarray) -> list[str]:
+        severity_values = [severity.value for severity in self.severity_thresholds]
+        return [severity_values[i] for i in self._classify_severities(deviation_percentages).tolist()]
+
+    async def _detect_put_call_parity_arbitrage(
+        self,
+        expiry_chains: dict[str, tuple[StrikeAlignedChain, float]],
+        underlying_price: float | None = None
+    ) -> list[dict]:
+        """Detect put-call parity violations at every strike quoted on both sides."""
         opportunities = []
 
         try:
-            # Group by strike and expiry
-            call_dict = {}
-            put_dict = {}
-
-            for call in calls:
-                key = (call.get('strike'), call.get('expiry_date'))
-                call_dict[key] = call
-
-            for put in puts:
-                key = (put.get('strike'), put.get('expiry_date'))
-                put_dict[key] = put
-
-            # Check parity for matching strikes/expiries
-            for key in call_dict:
-                if key in put_dict:
-                    call_data = call_dict[key]
-                    put_data = put_dict[key]
-
-                    # Put-Call parity: C - P = S - K * e^(-r*T)
-                    # Where: C = call price, P = put price, S = spot price, K = strike, r = risk-free rate, T = time to expiry
-
-                    # Simplified check for demonstration
-                    call_price = call_data.get('market_price', 0)
-                    put_price = put_data.get('market_price', 0)
-
-                    if call_price > 0 and put_price > 0:
-                        parity_diff = call_price - put_price
-                        # Add detailed parity analysis here if needed
-
-                        if abs(parity_diff) > 1.0:  # Simplified threshold
-                            opportunities.append({
-                                'type': 'put_call_parity',
-                                'strike': key[0],
-                                'expiry_date': key[1],
-                                'call_price': call_price,
-                                'put_price': put_price,
-                                'parity_deviation': parity_diff,
-                                'action': 'investigate'
-                            })
+            threshold = self.arbitrage_thresholds['put_call_parity']
+            for expiry, (chain, discount) in expiry_chains.items():
+                # Put-Call parity: C - P = S - K * e^(-r*T)
+                residuals = parity_residuals(synthetic_forwards(chain, discount), underlying_price)
+                hits = np.flatnonzero(np.abs(residuals) > threshold)
+                if hits.size == 0:
+                    continue
+
+                calls, puts = chain.call_prices[hits], chain.put_prices[hits]
+                deviation = residuals[hits]
+                deviation_pct = np.abs(deviation) / (calls + puts) * 100
+                for strike, call_price, put_price, parity_deviation, pct, severity in zip(
+                    chain.strikes[hits].tolist(), calls.tolist(), puts.tolist(), np.round(deviation, 4).tolist(),
+                    np.round(deviation_pct, 4).tolist(), self._severity_values(deviation_pct), strict=True
+                ):
+                    opportunities.append({
+                        'type': 'put_call_parity',
+                        'strike': strike,
+                        'expiry_date': expiry,
+                        'call_price': call_price,
+                        'put_price': put_price,
+                        'parity_deviation': parity_deviation,
+                        'deviation_percentage': pct,
+                        'severity': severity,
+                        # Call rich: sell the synthetic forward (conversion); put rich: buy it (reversal)
+                        'action': 'conversion' if parity_deviation > 0 else 'reversal'
+                    })
 
             return opportunities
 
@@ -524,19 +595,22 @@ class PremiumDiscountCalculator:
             log_exception(f"[AGENT-2] Put-call parity detection failed: {e}")
             return []
 
-    async def _detect_vertical_spread_arbitrage(self, calls: list[dict], puts: list[dict]) -> list[dict]:
-        """Detect vertical spread arbitrage opportunities."""
-        # Simplified implementation - check for price inversions
+    async def _detect_vertical_spread_arbitrage(
+        self,
+        expiry_chains: dict[str, tuple[StrikeAlignedChain, float]]
+    ) -> list[dict]:
+        """Detect price inversions (vertical spreads) and convexity violations (butterflies) across strikes."""
         opportunities = []
 
         try:
-            # Check call spreads
-            call_spreads = self._find_vertical_spread_opportunities(calls, 'call')
-            opportunities.extend(call_spreads)
-
-            # Check put spreads
-            put_spreads = self._find_vertical_spread_opportunities(puts, 'put')
-            opportunities.extend(put_spreads)
+            for expiry, (chain, _) in expiry_chains.items():
+                for option_type, prices in (('call', chain.call_prices), ('put', chain.put_prices)):
+                    opportunities.extend(
+                        self._find_vertical_spread_opportunities(chain.strikes, prices, option_type, expiry)
+                    )
+                    opportunities.extend(
+                        self._find_butterfly_opportunities(chain.strikes, prices, option_type, expiry)
+                    )
 
             return opportunities
 
@@ -544,56 +618,119 @@ class PremiumDiscountCalculator:
             log_exception(f"[AGENT-2] Vertical spread detection failed: {e}")
             return []
 
-    def _find_vertical_spread_opportunities(self, options: list[dict], option_type: str) -> list[dict]:
-        """Find vertical spread opportunities in same-expiry options."""
-        opportunities = []
-
-        # Group by expiry
-        expiry_groups = {}
-        for option in options:
-            expiry = option.get('expiry_date', '')
-            if expiry not in expiry_groups:
-                expiry_groups[expiry] = []
-            expiry_groups[expiry].append(option)
+    def _find_vertical_spread_opportunities(
+        self,
+        strikes: np.ndarray,
+        prices: np.ndarray,
+        option_type: str,
+        expiry: str
+    ) -> list[dict]:
+        """Find adjacent strikes whose prices are inverted (calls rising or puts falling with strike)."""
+        lower, higher, inversion = monotonicity_violations(
+            strikes, prices, option_type == 'call', self.arbitrage_thresholds['vertical_spread']
+        )
+        if lower.size == 0:
+            return []
 
-        # Check each expiry group
-        for expiry, expiry_options in expiry_groups.items():
-            # Sort by strike
-            sorted_options = sorted(expiry_options, key=lambda x: x.get('strike', 0))
+        # The cheaper leg is the one that pays more at expiry
+        dearer = prices[higher] if option_type == 'call' else prices[lower]
+        deviation_pct = inversion / dearer * 100
+        return [
+            {
+                'type': f'{option_type}_vertical_spread',
+                'expiry_date': expiry,
+                'lower_strike': lower_strike,
+                'lower_price': lower_price,
+                'higher_strike': higher_strike,
+                'higher_price': higher_price,
+                'price_inversion': price_inversion,
+                'deviation_percentage': pct,
+                'severity': severity,
+                'action': f'buy_{option_type}_spread'
+            }
+            for lower_strike, lower_price, higher_strike, higher_price, price_inversion, pct, severity in zip(
+                strikes[lower].tolist(), prices[lower].tolist(), strikes[higher].tolist(), prices[higher].tolist(),
+                np.round(inversion, 4).tolist(), np.round(deviation_pct, 4).tolist(),
+                self._severity_values(deviation_pct), strict=True
+            )
+        ]
 
-            # Look for price inversions
-            for i in range(len(sorted_options) - 1):
-                lower_strike = sorted_options[i]
-                higher_strike = sorted_options[i + 1]
+    def _find_butterfly_opportunities(
+        self,
+        strikes: np.ndarray,
+        prices: np.ndarray,
+        option_type: str,
+        expiry: str
+    ) -> list[dict]:
+        """Find strikes priced above the chord of their neighbours (negatively priced butterflies)."""
+        lower, middle, higher, excess = convexity_violations(strikes, prices, self.arbitrage_thresholds['butterfly'])
+        if middle.size == 0:
+            return []
 
-                lower_price = lower_strike.get('market_price', 0)
-                higher_price = higher_strike.get('market_price', 0)
+        deviation_pct = excess / prices[middle] * 100
+        return [
+            {
+                'type': f'{option_type}_butterfly',
+                'expiry_date': expiry,
+                'strikes': [lower_strike, middle_strike, higher_strike],
+                'prices': [lower_price, middle_price, higher_price],
+                'convexity_violation': convexity_violation,
+                'deviation_percentage': pct,
+                'severity': severity,
+                'action': 'buy_butterfly'
+            }
+            for (lower_strike, middle_strike, higher_strike, lower_price, middle_price, higher_price,
+                 convexity_violation, pct, severity) in zip(
+                strikes[lower].tolist(), strikes[middle].tolist(), strikes[higher].tolist(),
+                prices[lower].tolist(), prices[middle].tolist(), prices[higher].tolist(),
+                np.round(excess, 4).tolist(), np.round(deviation_pct, 4).tolist(),
+                self._severity_values(deviation_pct), strict=True
+            )
+        ]
 
-                # For calls: lower strike should be more expensive
-                # For puts: higher strike should be more expensive
-                is_inversion = False
+    async def _detect_box_spread_arbitrage(
+        self,
+        expiry_chains: dict[str, tuple[StrikeAlignedChain, float]]
+    ) -> list[dict]:
+        """Detect box spreads priced away from their discounted width, over every strike pair."""
+        opportunities = []
 
-                if option_type == 'call' and lower_price < higher_price or option_type == 'put' and lower_price > higher_price:
-                    is_inversion = True
+        try:
+            for expiry, (chain, discount) in expiry_chains.items():
+                lower, higher, edge = box_spread_edges(
+                    synthetic_forwards(chain, discount),
+                    self.arbitrage_thresholds['box_spread'],
+                    self.max_box_spread_opportunities
+                )
+                if lower.size == 0:
+                    continue
 
-                if is_inversion and abs(lower_price - higher_price) > 0.5:
+                box_value = (chain.strikes[higher] - chain.strikes[lower]) * discount
+                box_cost = box_value - edge
+                deviation_pct = np.abs(edge) / box_value * 100
+                for lower_strike, higher_strike, cost, value, box_edge, pct, severity in zip(
+                    chain.strikes[lower].tolist(), chain.strikes[higher].tolist(),
+                    np.round(box_cost, 4).tolist(), np.round(box_value, 4).tolist(), np.round(edge, 4).tolist(),
+                    np.round(deviation_pct, 4).tolist(), self._severity_values(deviation_pct), strict=True
+                ):
                     opportunities.append({
-                        'type': f'{option_type}_vertical_spread',
+                        'type': 'box_spread',
                         'expiry_date': expiry,
-                        'lower_strike': lower_strike.get('strike'),
-                        'lower_price': lower_price,
-                        'higher_strike': higher_strike.get('strike'),
-                        'higher_price': higher_price,
-                        'price_inversion': abs(lower_price - higher_price),
-                        'action': 'investigate'
+                        'lower_strike': lower_strike,
+                        'higher_strike': higher_strike,
+                        'box_cost': cost,
+                        'box_value': value,
+                        'edge': box_edge,
+                        'deviation_percentage': pct,
+                        'severity': severity,
+                        'action': 'buy_box' if box_edge > 0 else 'sell_box'
                     })
 
-        return opportunities
-
-    async def _detect_box_spread_arbitrage(self, calls: list[dict], puts: list[dict]) -> list[dict]:
-        """Detect box spread arbitrage opportunities."""
-        # Simplified box spread check
+            return opportunities
 
+        except Exception as e:
+            log_exception(f"[AGENT-2] Box spread detection failed: {e}")
+            return []
 
     def _calculate_expiry_summary_stats(self, expiry_results: list[dict]) -> dict[str, Any]:
         """Calculate summary statistics for expiry analysis."""
@@ -0,0 +1,281 @@
+"""
+Sharded Redis pub/sub listener pool.
+
+A single pub/sub connection read by a single polling loop caps how many
+messages a pod can take off Redis. The pool spreads channel (and pattern)
+subscriptions over N pub/sub connections with a consistent-hash ring, so
+adding a shard only moves about 1/N of the subscriptions, and gives every
+connection its own listener task that blocks on the socket instead of polling.
+
+Per-shard metrics include message counts, dispatch time and the end-to-end
+lag of a sample of messages (read from the payload's "timestamp" field),
+so a shard that falls behind shows up on its own.
+"""
+
+import asyncio
+import bisect
+import contextlib
+import hashlib
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from app.utils.logging_utils import log_exception, log_info, log_warning
+
+MessageHandler = Callable[[str, Any], Awaitable[None]]
+
+
+def _ring_hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode('utf-8')).digest()[:8], 'big')
+
+
+def extract_payload_timestamp(payload: Any) -> float | None:
+    """
+    Epoch seconds of the first "timestamp" string in a JSON payload, without a full parse.
+
+    Naive ISO timestamps are taken as UTC (publishers use datetime.utcnow()).
+    Returns None if the payload has no parseable timestamp.
+    """
+    if isinstance(payload, bytes):
+        payload = payload.decode('utf-8', 'ignore')
+    if not isinstance(payload, str):
+        return None
+
+    start = payload.find('"timestamp"')
+    if start < 0:
+        return None
+    start = payload.find('"', payload.find(':', start) + 1)
+    end = payload.find('"', start + 1)
+    if start < 0 or end < 0:
+        return None
+
+    try:
+        parsed = datetime.fromisoformat(payload[start + 1:end])
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed.timestamp()
+
+
+class ConsistentHashRing:
+    """Maps keys to shard indexes; each shard owns several virtual nodes."""
+
+    def __init__(self, shards: int, virtual_nodes: int = 64):
+        if shards <= 0:
+            raise ValueError("A hash ring needs at least one shard")
+        points = sorted(
+            (_ring_hash(f"shard-{shard}:{node}"), shard)
+            for shard in range(shards)
+            for node in range(virtual_nodes)
+        )
+        self._hashes = [h for h, _ in points]
+        self._shards = [shard for _, shard in points]
+
+    def shard_for(self, key: str) -> int:
+        index = bisect.bisect(self._hashes, _ring_hash(key))
+        return self._shards[index % len(self._shards)]
+
+
+class PubSubShard:
+    """One pub/sub connection with its own blocking listener task."""
+
+    def __init__(self, index: int, client: Any, handler: MessageHandler, lag_sample_every: int, name: str):
+        self.index = index
+        self.client = client
+        self.pubsub = client.pubsub()
+        self.handler = handler
+        self.lag_sample_every = lag_sample_every
+        self.name = name
+
+        self.channels: set[str] = set()
+        self.patterns: set[str] = set()
+        self._task: asyncio.Task | None = None
+
+        self.metrics = {
+            'messages': 0,
+            'errors': 0,
+            'dispatch_seconds_total': 0.0,
+            'max_dispatch_seconds': 0.0,
+            'lag_samples': 0,
+            'last_lag_seconds': 0.0,
+            'max_lag_seconds': 0.0,
+            'total_lag_seconds': 0.0,
+            'last_message_at': None
+        }
+
+    async def subscribe(self, channel: str):
+        await self.pubsub.subscribe(channel)
+        self.channels.add(channel)
+        self._ensure_listening()
+
+    async def unsubscribe(self, channel: str):
+        if channel in self.channels:
+            self.channels.discard(channel)
+            await self.pubsub.unsubscribe(channel)
+
+    async def psubscribe(self, pattern: str):
+        await self.pubsub.psubscribe(pattern)
+        self.patterns.add(pattern)
+        self._ensure_listening()
+
+    async def punsubscribe(self, pattern: str):
+        if pattern in self.patterns:
+            self.patterns.discard(pattern)
+            await self.pubsub.punsubscribe(pattern)
+
+    def _ensure_listening(self):
+        # The pub/sub connection only exists after the first (p)subscribe
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+
+    async def _listen(self):
+        log_info(f"{self.name} pub/sub shard {self.index} listening")
+        while True:
+            try:
+                # Blocks on the socket until Redis pushes something
+                message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=None)
+            except asyncio.CancelledError:
+                raise
+            except TimeoutError:
+                # Idle past the connection's socket timeout
+                continue
+            except Exception as e:
+                self.metrics['errors'] += 1
+                log_warning(f"{self.name} pub/sub shard {self.index} read failed: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            if message and message.get('data') is not None:
+                await self._dispatch(message)
+
+    async def _dispatch(self, message: dict[str, Any]):
+        channel = message['channel']
+        if isinstance(channel, bytes):
+            channel = channel.decode('utf-8')
+
+        metrics = self.metrics
+        metrics['messages'] += 1
+        now = time.time()
+        metrics['last_message_at'] = now
+
+        if (metrics['messages'] - 1) % self.lag_sample_every == 0:
+            published_at = extract_payload_timestamp(message['data'])
+            if published_at is not None:
+                lag = now - published_at
+                metrics['lag_samples'] += 1
+                metrics['last_lag_seconds'] = lag
+                metrics['max_lag_seconds'] = max(metrics['max_lag_seconds'], lag)
+                metrics['total_lag_seconds'] += lag
+
+        started = time.perf_counter()
+        try:
+            await self.handler(channel, message['data'])
+        except Exception as e:
+            metrics['errors'] += 1
+            log_exception(f"{self.name} pub/sub shard {self.index} handler failed for {channel}: {e}")
+        elapsed = time.perf_counter() - started
+        metrics['dispatch_seconds_total'] += elapsed
+        if elapsed > metrics['max_dispatch_seconds']:
+            metrics['max_dispatch_seconds'] = elapsed
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        try:
+            await self.pubsub.close()
+            await self.client.close()
+        except Exception as e:
+            log_warning(f"{self.name} pub/sub shard {self.index} close failed: {e}")
+
+    def get_metrics(self) -> dict[str, Any]:
+        metrics = self.metrics
+        messages = metrics['messages']
+        samples = metrics['lag_samples']
+        last = metrics['last_message_at']
+        return {
+            'shard': self.index,
+            'channels': len(self.channels),
+            'patterns': len(self.patterns),
+            'messages': messages,
+            'errors': metrics['errors'],
+            'avg_dispatch_seconds': metrics['dispatch_seconds_total'] / messages if messages else 0.0,
+            'max_dispatch_seconds': metrics['max_dispatch_seconds'],
+            'last_lag_seconds': metrics['last_lag_seconds'],
+            'max_lag_seconds': metrics['max_lag_seconds'],
+            'avg_lag_seconds': metrics['total_lag_seconds'] / samples if samples else 0.0,
+            'seconds_since_last_message': time.time() - last if last else None,
+            'listening': self._task is not None and not self._task.done()
+        }
+
+
+class ShardedPubSubPool:
+    """Channel and pattern subscriptions spread over N pub/sub connections."""
+
+    def __init__(self,
+                 client_factory: Callable[[], Awaitable[Any]],
+                 handler: MessageHandler,
+                 shards: int = 4,
+                 virtual_nodes: int = 64,
+                 lag_sample_every: int = 100,
+                 name: str = 'pubsub'):
+        """
+        Args:
+            client_factory: Coroutine returning a new async Redis client (one per shard)
+            handler: Coroutine called with (channel, data) for every message
+            shards: Number of pub/sub connections
+            virtual_nodes: Ring points per shard; more gives a more even spread
+            lag_sample_every: Measure payload lag on one in this many messages per shard
+            name: Name used in logs
+        """
+        if lag_sample_every <= 0:
+            raise ValueError("lag_sample_every must be positive")
+        self.client_factory = client_factory
+        self.handler = handler
+        self.shard_count = shards
+        self.lag_sample_every = lag_sample_every
+        self.name = name
+        self.ring = ConsistentHashRing(shards, virtual_nodes)
+        self.shards: list[PubSubShard] = []
+
+    async def start(self):
+        """Open one client per shard; listeners start with the shard's first subscription."""
+        if self.shards:
+            return
+        for index in range(self.shard_count):
+            client = await self.client_factory()
+            self.shards.append(PubSubShard(index, client, self.handler, self.lag_sample_every, self.name))
+        log_info(f"{self.name} pub/sub pool started with {self.shard_count} shards")
+
+    def shard_for(self, key: str) -> PubSubShard:
+        return self.shards[self.ring.shard_for(key)]
+
+    async def subscribe(self, channel: str):
+        await self.shard_for(channel).subscribe(channel)
+
+    async def unsubscribe(self, channel: str):
+        await self.shard_for(channel).unsubscribe(channel)
+
+    async def psubscribe(self, pattern: str):
+        await self.shard_for(pattern).psubscribe(pattern)
+
+    async def punsubscribe(self, pattern: str):
+        await self.shard_for(pattern).punsubscribe(pattern)
+
+    async def close(self):
+        await asyncio.gather(*(shard.close() for shard in self.shards), return_exceptions=True)
+        self.shards = []
+
+    def get_metrics(self) -> dict[str, Any]:
+        shards = [shard.get_metrics() for shard in self.shards]
+        return {
+            'shards': shards,
+            'messages': sum(s['messages'] for s in shards),
+            'channels': sum(s['channels'] for s in shards),
+            'patterns': sum(s['patterns'] for s in shards),
+            'max_lag_seconds': max((s['max_lag_seconds'] for s in shards), default=0.0)
+        }
@@ -4,6 +4,7 @@ import json
 import os
 import time
 from collections import defaultdict
+from collections.abc import Sequence
 from datetime import datetime
 from typing import Any
 
@@ -13,6 +14,10 @@ from app.adapters import EnhancedTickerAdapter
 from app.core.config import settings
 from app.errors import ComputationError, handle_computation_error
 from app.schemas.config_schema import ComputationResult, SignalConfigData, TickProcessingContext
+from app.services.computation_planner import ComputationPlan, PlannedComputations
+from app.services.incremental_bar_builder import feed_stream_ticks
+from app.services.tick_batcher import StreamTick, can_coalesce, coalesce_ticks, group_tick_batch
+from app.services.tick_price_feed import TickPriceFeed
 from app.utils.logging_utils import log_error, log_exception, log_info, log_warning
 from app.utils.redis import get_redis_client
 from app.utils.resilience import CircuitBreaker, CircuitBreakerConfig
@@ -50,6 +55,7 @@ class SignalProcessor:
         self.is_running = False
         self.active_streams = set()
         self.active_instruments = set()  # Track instruments we're monitoring
+        self.price_feed = TickPriceFeed()  # Traded prices for alerts and trailing stops
         self.processing_metrics = defaultdict(int)
 
         # Circuit breakers for external dependencies
@@ -93,8 +99,16 @@ class SignalProcessor:
             self.greeks_calculator = GreeksCalculator()
             self.realtime_greeks_calculator = RealTimeGreeksCalculator(self.redis_client)
             self.pandas_ta_executor = PandasTAExecutor(self.redis_client)
+            # Closed live bars extend the TA ring buffers; the forming bar is the last row
+            self.pandas_ta_executor.attach_bar_builder(self.config_handler.bar_builder)
             self.external_function_executor = ExternalFunctionExecutor()
 
+            # Price alerts and trailing stops are evaluated against every traded price
+            from app.services.alert_service import get_alert_service
+            from app.services.trailing_stop_service import get_trailing_stop_service
+            self.price_feed.add_consumer(get_alert_service())
+            self.price_feed.add_consumer(get_trailing_stop_service())
+
             # Initialize moneyness components - instrument_client will be set later in initialize()
             from app.clients.client_factory import get_client_manager
             manager = get_client_manager()
@@ -434,7 +448,7 @@ class SignalProcessor:
                     config_data = await self.redis_client.get(key)
                     if config_data:
                         config_json = json.loads(config_data)
-                        await self.config_handler.apply_config(config_json)
+                        await self.config_handler.load_config(config_json)
                 except Exception as e:
                     log_exception(f"Failed to load config from {key}: {e}")
 
@@ -515,20 +529,14 @@ class SignalProcessor:
 
         while self.is_running:
             try:
-                # Get active configurations to determine which streams to monitor
-                active_configs = await self.config_handler.get_active_configs()
-
                 # Use sharded streams (same format as ticker_service)
                 # This matches ticker_service's stream:shard:* format
                 NUM_SHARDS = 10
                 required_streams = {f"stream:shard:{i}" for i in range(NUM_SHARDS)}
 
-                # Store active instrument keys for filtering
-                self.active_instruments = set()
-                for config in active_configs.values():
-                    instrument_key = config.get('instrument_key')
-                    if instrument_key:
-                        self.active_instruments.add(instrument_key)
+                # Active instrument keys for filtering, maintained by the config index,
+                # plus the instruments alerts and trailing stops are watching
+                self.active_instruments = self.config_handler.active_instruments | self.price_feed.instruments
 
                 # Only monitor shards if we have active configurations
                 if not self.active_instruments:
@@ -562,26 +570,7 @@ class SignalProcessor:
                         block=settings.STREAM_READ_TIMEOUT_MS
                     )
 
-                    # Process messages in parallel, filtering for active instruments
-                    tasks = []
-                    for stream, msgs in messages:
-                        for msg_id, fields in msgs:
-                            # Decode fields to check instrument_key
-                            decoded_fields = {
-                                k.decode() if isinstance(k, bytes) else k:
-                                v.decode() if isinstance(v, bytes) else v
-                                for k, v in fields.items()
-                            }
-
-                            # Only process if instrument is in our active configurations
-                            instrument_key = decoded_fields.get('instrument_key')
-                            if instrument_key in self.active_instruments:
-                                # Pass original fields since process_tick_message handles decoding
-                                task = self.process_tick_message(stream.decode(), msg_id, fields)
-                                tasks.append(task)
-
-                    if tasks:
-                        await asyncio.gather(*tasks, return_exceptions=True)
+                    await self.process_tick_batch(messages)
                 else:
                     # No active streams, wait a bit
                     await asyncio.sleep(1)
@@ -592,6 +581,104 @@ class SignalProcessor:
                 log_exception(f"Error in tick streams consumption: {e}")
                 await asyncio.sleep(5)
 
+    async def process_tick_batch(self, messages):
+        """
+        Process one XREADGROUP batch.
+
+        Fields are decoded once and ticks are grouped by instrument: instruments are
+        processed concurrently, ticks of the same instrument in arrival order (or only
+        the latest one when its configurations allow coalescing). Republishing and
+        ACKs for the whole batch go through a single Redis pipeline.
+        """
+        batch = group_tick_batch(messages, self.active_instruments)
+        if not batch.by_instrument and not batch.already_processed:
+            return
+
+        self.processing_metrics['tick_batches'] += 1
+
+        instrument_keys = list(batch.by_instrument)
+        results = await asyncio.gather(
+            *(self._process_instrument_ticks(key, batch.by_instrument[key]) for key in instrument_keys),
+            return_exceptions=True
+        )
+
+        completed = []
+        for instrument_key, result in zip(instrument_keys, results, strict=True):
+            if isinstance(result, Exception):
+                log_exception(f"Failed to process tick batch for {instrument_key}: {result}")
+                self.processing_metrics['errors'] += 1
+            else:
+                completed.extend(result)
+
+        try:
+            await self._flush_tick_batch(completed, batch.already_processed)
+        except Exception as e:
+            log_exception(f"Failed to acknowledge tick batch: {e}")
+            self.processing_metrics['errors'] += 1
+
+    async def _process_instrument_ticks(self, instrument_key: str, ticks: list[StreamTick]) -> list[StreamTick]:
+        """Process one instrument's ticks; returns the ticks that can be republished and ACKed."""
+        configs = self.config_handler.configs_for_instrument(instrument_key)
+
+        # Every tick goes into the live bars and price consumers, including the ones coalesced away below
+        feed_stream_ticks(self.config_handler.bar_builder, instrument_key, (tick.fields for tick in ticks))
+        await self.price_feed.publish(instrument_key, (tick.fields for tick in ticks))
+
+        superseded = []
+        if len(ticks) > 1 and can_coalesce(configs):
+            latest, superseded = coalesce_ticks(ticks)
+            ticks = [latest]
+            self.processing_metrics['ticks_coalesced'] += len(superseded)
+
+        completed = []
+        for tick in ticks:
+            start_time = time.time()
+            try:
+                await self.process_tick_async(instrument_key, tick.fields, configs=configs)
+            except Exception as e:
+                # Left pending so it is redelivered, as with single-message processing
+                log_exception(f"Failed to process tick message {tick.msg_id}: {e}")
+                self.processing_metrics['errors'] += 1
+                continue
+
+            completed.append(tick)
+            processing_time = (time.time() - start_time) * 1000
+            self.processing_metrics['total_processed'] += 1
+            self.processing_metrics['total_time_ms'] += processing_time
+
+            if processing_time > 1000:  # Log slow processing
+                log_warning(f"Slow tick processing: {processing_time:.2f}ms for {instrument_key}")
+
+        # Superseded ticks are only settled once the tick that replaced them was processed
+        if completed and superseded:
+            completed = superseded + completed
+        return completed
+
+    async def _flush_tick_batch(self, completed: list[StreamTick], already_processed: list[StreamTick]):
+        """Republish processed ticks and ACK everything settled in one pipeline round trip."""
+        if not completed and not already_processed:
+            return
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        acks = defaultdict(list)
+
+        processed_at = datetime.utcnow().isoformat()
+        for tick in completed:
+            tick_data = dict(tick.fields)
+            tick_data['state'] = 'P'
+            tick_data['processed_at'] = processed_at
+            tick_data['processor_id'] = self.consumer_name
+            pipe.xadd(tick.stream, tick_data)
+            acks[tick.stream].append(tick.msg_id)
+
+        for tick in already_processed:
+            acks[tick.stream].append(tick.msg_id)
+
+        for stream_name, msg_ids in acks.items():
+            pipe.xack(stream_name, self.consumer_group, *msg_ids)
+
+        await pipe.execute()
+
     async def process_tick_message(self, stream_name: str, msg_id: str, fields: dict):
         """Process a single tick message"""
         start_time = time.time()
@@ -616,6 +703,9 @@ class SignalProcessor:
             # Extract instrument key from stream name
             instrument_key = stream_name.replace(settings.REDIS_TICK_STREAM_PREFIX, '')
 
+            feed_stream_ticks(self.config_handler.bar_builder, instrument_key, [tick_data])
+            await self.price_feed.publish(instrument_key, [tick_data])
+
             # Process the tick
             await self.process_tick_async(instrument_key, tick_data)
 
@@ -641,11 +731,17 @@ class SignalProcessor:
             log_exception(f"Failed to process tick message {msg_id}: {e}")
             self.processing_metrics['errors'] += 1
 
-    async def process_tick_async(self, instrument_key: str, tick_data: dict):
+    async def process_tick_async(
+        self,
+        instrument_key: str,
+        tick_data: dict,
+        configs: Sequence[SignalConfigData] | None = None
+    ):
         """Main tick processing logic"""
         try:
-            # Get relevant configurations
-            configs = await self.config_handler.get_configs_for_instrument(instrument_key)
+            # Get relevant configurations from the index (batch processing passes them in)
+            if configs is None:
+                configs = self.config_handler.configs_for_instrument(instrument_key)
 
             if not configs:
                 return  # No configurations for this instrument
@@ -667,19 +763,18 @@ class SignalProcessor:
                 tick_data=processed_tick,  # Use processed tick instead of raw
                 instrument_key=instrument_key,
                 timestamp=processed_tick["timestamp"]["utc"],
-                configurations=configs
+                configurations=list(configs)
             )
 
             # Get aggregated data if needed
             context.aggregated_data = await self.get_aggregated_data(instrument_key, configs)
 
-            # Process each configuration
-            computation_tasks = []
-            for config in configs:
-                # Check if should execute based on frequency
-                if await self.should_execute(config, context.timestamp):
-                    task = self.execute_configuration(config, context)
-                    computation_tasks.append(task)
+            # Check which configurations should execute based on frequency
+            executing = [config for config in configs if await self.should_execute(config, context.timestamp)]
+
+            # Compute each unique indicator/Greeks node once for all of them
+            planned = self.plan_computations(executing, context)
+            computation_tasks = [self.execute_configuration(config, context, planned) for config in executing]
 
             # Execute computations in parallel
             if computation_tasks:
@@ -701,8 +796,32 @@ class SignalProcessor:
             log_exception(f"Error processing tick for {instrument_key}: {error}")
             raise error from e
 
-    async def execute_configuration(self, config: SignalConfigData, context: TickProcessingContext) -> ComputationResult | None:
-        """Execute a single configuration"""
+    def plan_computations(
+        self,
+        configs: Sequence[SignalConfigData],
+        context: TickProcessingContext
+    ) -> PlannedComputations | None:
+        """Deduplicate indicator and Greeks requests across configurations and start them once"""
+        if not configs:
+            return None
+
+        plan = ComputationPlan.build(context.instrument_key, configs)
+        self.processing_metrics['planned_nodes'] += plan.unique_nodes
+        self.processing_metrics['fused_computations'] += plan.requested - plan.unique_nodes
+
+        return PlannedComputations(
+            plan,
+            compute_indicators=lambda config: self.compute_technical_indicators(config, context),
+            compute_greeks=lambda config: self.compute_greeks(config, context)
+        )
+
+    async def execute_configuration(
+        self,
+        config: SignalConfigData,
+        context: TickProcessingContext,
+        planned: PlannedComputations | None = None
+    ) -> ComputationResult | None:
+        """Execute a single configuration, reading shared nodes from the tick's plan if given"""
         start_time = time.time()
         instrument_key = context.instrument_key
 
@@ -712,12 +831,15 @@ class SignalProcessor:
 
             # Option Greeks
             if config.option_greeks and config.option_greeks.enabled:
-                task = self.compute_greeks(config, context)
+                task = planned.greeks(config) if planned else self.compute_greeks(config, context)
                 tasks.append(('greeks', task))
 
             # Technical Indicators
             if config.technical_indicators:
-                task = self.compute_technical_indicators(config, context)
+                if planned:
+                    task = planned.technical_indicators(config)
+                else:
+                    task = self.compute_technical_indicators(config, context)
                 tasks.append(('technical_indicators', task))
 
             # Internal Functions
@@ -922,6 +1044,8 @@ class SignalProcessor:
     async def stop(self):
         """Stop the signal processor"""
         self.is_running = False
+        if self.pandas_ta_executor:
+            self.pandas_ta_executor.close()
         log_info("SignalProcessor stopped")
 
     def get_metrics(self) -> dict[str, Any]:
@@ -933,6 +1057,10 @@ class SignalProcessor:
             "total_processed": total_processed,
             "total_errors": self.processing_metrics.get('errors', 0),
             "average_processing_time_ms": total_time / total_processed if total_processed > 0 else 0,
+            "tick_batches": self.processing_metrics.get('tick_batches', 0),
+            "ticks_coalesced": self.processing_metrics.get('ticks_coalesced', 0),
+            "planned_nodes": self.processing_metrics.get('planned_nodes', 0),
+            "fused_computations": self.processing_metrics.get('fused_computations', 0),
             "active_streams": len(self.active_streams),
             "is_running": self.is_running
         }
@@ -1007,7 +1135,8 @@ class SignalProcessor:
 
             # Find strikes at moneyness level
             matching_strikes = self.local_moneyness_calculator.find_strikes_by_moneyness(
-                spot_price, strikes, moneyness_level, 'call'
+                spot_price, strikes, moneyness_level, 'call',
+                underlying=underlying, expiry_date=expiry_date
             )
 
             if not matching_strikes:
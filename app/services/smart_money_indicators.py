@@ -15,6 +15,7 @@ Documentation: Institutional trading concepts based on ICT methodology
 """
 import logging
 
+import numpy as np
 import pandas as pd
 
 from app.services.indicator_registry import IndicatorCategory, register_indicator
@@ -350,26 +351,23 @@ def _get_real_swings(df: pd.DataFrame, swing_length: int = 5) -> pd.Series:
     """
     Real swing detection using professional algorithms
 
+    A bar is a swing high when the `swing_length` bars on each side all have
+    strictly lower highs (swing low: strictly higher lows), the same rule as
+    CustomIndicators.swing_high/swing_low, evaluated for all bars at once.
+
     Returns:
         Series with 1 for swing high, -1 for swing low, 0 for neither
     """
     try:
-        from app.services.custom_indicators import CustomIndicators
-
-        # Get swing highs and lows using real implementation
-        swing_highs = CustomIndicators.swing_high(df, left_bars=swing_length, right_bars=swing_length)
-        swing_lows = CustomIndicators.swing_low(df, left_bars=swing_length, right_bars=swing_length)
-
-        # Combine into single series
-        result = pd.Series(0, index=df.index)
-        result[swing_highs.notna()] = 1  # Swing high = 1
-        result[swing_lows.notna()] = -1  # Swing low = -1
+        result = np.zeros(len(df), dtype=np.int64)
+        result[_swing_flags(df['high'].to_numpy(), swing_length, highs=True)] = 1  # Swing high = 1
+        result[_swing_flags(df['low'].to_numpy(), swing_length, highs=False)] = -1  # Swing low = -1
 
-        return result
+        return pd.Series(result, index=df.index)
 
     except Exception as e:
         logger.exception(f"Error in real swing detection: {e}")
-        # Fallback to simple pattern if custom indicators fail
+        # Fallback to simple pattern if swing detection fails
         return _simple_swing_fallback(df, swing_length)
 
 
@@ -385,6 +383,73 @@ def _simple_swing_fallback(df: pd.DataFrame, swing_length: int) -> pd.Series:
     return result
 
 
+def _swing_flags(prices: np.ndarray, swing_length: int, highs: bool) -> np.ndarray:
+    """Boolean mask of swing highs (or lows) with `swing_length` bars on each side."""
+    n = len(prices)
+    flags = np.zeros(n, dtype=bool)
+    if n <= 2 * swing_length:
+        return flags
+
+    center = prices[swing_length:n - swing_length]
+    is_swing = ~pd.isna(center)
+    for offset in range(1, swing_length + 1):
+        for neighbour in (
+            prices[swing_length - offset:n - swing_length - offset],
+            prices[swing_length + offset:n - swing_length + offset]
+        ):
+            # A neighbour at or beyond the candidate disqualifies it (NaN neighbours do not)
+            is_swing &= ~(neighbour >= center if highs else neighbour <= center)
+
+    flags[swing_length:n - swing_length] = is_swing
+    return flags
+
+
+def _prior_swing_positions(flags: np.ndarray, depth: int) -> list[np.ndarray]:
+    """
+    For every bar, the positions of the last `depth` swings strictly before it.
+
+    Returns one array per depth (most recent first), -1 where fewer swings exist.
+    """
+    positions = np.flatnonzero(flags)
+    swings_before = np.cumsum(flags) - flags
+
+    prior = []
+    for k in range(1, depth + 1):
+        rank = swings_before - k
+        found = rank >= 0
+        swing = np.full(len(flags), -1, dtype=np.int64)
+        swing[found] = positions[rank[found]]
+        prior.append(swing)
+    return prior
+
+
+def _volume_confirmed(volume: pd.Series, bars: np.ndarray, factor: float, window: int = 10) -> np.ndarray:
+    """
+    volume[i] > volume.iloc[max(0, i - window):i].mean() * factor for each bar position i.
+
+    Window means come from one vectorised pass. Bars whose volume lies within
+    rounding distance of the threshold are re-checked with the per-bar slice
+    mean, so every decision matches it exactly.
+    """
+    values = volume.to_numpy(dtype=np.float64, na_value=np.nan)
+    padded = np.concatenate([np.full(window, np.nan), values])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window)[bars]
+
+    valid = ~np.isnan(windows)
+    counts = valid.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        threshold = np.where(valid, windows, 0.0).sum(axis=1) / counts * factor
+        scale = np.where(valid, np.abs(windows), 0.0).sum(axis=1) / counts * factor
+        current = values[bars]
+        confirmed = current > threshold
+        uncertain = ~(np.abs(current - threshold) > 1e-9 * (scale + np.abs(current)))
+
+    for k in np.flatnonzero(uncertain):
+        i = bars[k]
+        confirmed[k] = volume.iloc[i] > volume.iloc[max(0, i - window):i].mean() * factor
+    return confirmed
+
+
 def _real_bos(df: pd.DataFrame) -> pd.Series:
     """
     REAL Break of Structure Implementation
@@ -400,52 +465,29 @@ def _real_bos(df: pd.DataFrame) -> pd.Series:
             return pd.Series(0, index=df.index)
 
         # Get real swing points
-        swings = _get_real_swings(df, swing_length=5)
-
-        # Initialize result
-        result = pd.Series(0, index=df.index)
-
-        # Get swing high and low indices
-        swing_high_indices = df.index[swings == 1].tolist()
-        swing_low_indices = df.index[swings == -1].tolist()
-
-        # Track last swing highs and lows
-        for i in range(len(df)):
-            current_idx = df.index[i]
-            current_high = df['high'].iloc[i]
-            current_low = df['low'].iloc[i]
-
-            # Find most recent swing high before current bar
-            recent_swing_highs = [idx for idx in swing_high_indices if idx < current_idx]
-            if recent_swing_highs:
-                last_swing_high = df.loc[recent_swing_highs[-1], 'high']
-
-                # Bullish BOS: Current high breaks above last swing high
-                if current_high > last_swing_high:
-                    # Confirm with volume if available
-                    if 'volume' in df.columns and i > 0:
-                        avg_volume = df['volume'].iloc[max(0, i-10):i].mean()
-                        if df['volume'].iloc[i] > avg_volume * 1.2:  # 20% above average
-                            result.iloc[i] = 1
-                    else:
-                        result.iloc[i] = 1
-
-            # Find most recent swing low before current bar
-            recent_swing_lows = [idx for idx in swing_low_indices if idx < current_idx]
-            if recent_swing_lows:
-                last_swing_low = df.loc[recent_swing_lows[-1], 'low']
-
-                # Bearish BOS: Current low breaks below last swing low
-                if current_low < last_swing_low:
-                    # Confirm with volume if available
-                    if 'volume' in df.columns and i > 0:
-                        avg_volume = df['volume'].iloc[max(0, i-10):i].mean()
-                        if df['volume'].iloc[i] > avg_volume * 1.2:  # 20% above average
-                            result.iloc[i] = -1
-                    else:
-                        result.iloc[i] = -1
-
-        return result
+        swings = _get_real_swings(df, swing_length=5).to_numpy()
+        high = df['high'].to_numpy()
+        low = df['low'].to_numpy()
+
+        # Most recent swing high and low before each bar
+        (last_swing_high,) = _prior_swing_positions(swings == 1, 1)
+        (last_swing_low,) = _prior_swing_positions(swings == -1, 1)
+
+        # Bullish BOS: Current high breaks above last swing high
+        bullish = np.flatnonzero((last_swing_high >= 0) & (high > high[last_swing_high]))
+        # Bearish BOS: Current low breaks below last swing low
+        bearish = np.flatnonzero((last_swing_low >= 0) & (low < low[last_swing_low]))
+
+        # Confirm with volume if available (20% above the previous 10 bars' average)
+        if 'volume' in df.columns:
+            bullish = bullish[_volume_confirmed(df['volume'], bullish, 1.2)]
+            bearish = bearish[_volume_confirmed(df['volume'], bearish, 1.2)]
+
+        result = np.zeros(len(df), dtype=np.int64)
+        result[bullish] = 1
+        result[bearish] = -1
+
+        return pd.Series(result, index=df.index)
 
     except Exception as e:
         logger.exception(f"Error in real BOS calculation: {e}")
@@ -467,48 +509,34 @@ def _real_choch(df: pd.DataFrame) -> pd.Series:
             return pd.Series(0, index=df.index)
 
         # Get real swing points
-        swings = _get_real_swings(df, swing_length=5)
-        result = pd.Series(0, index=df.index)
-
-        # Determine market structure using Higher Highs/Lower Lows
-        swing_high_indices = df.index[swings == 1].tolist()
-        swing_low_indices = df.index[swings == -1].tolist()
+        swings = _get_real_swings(df, swing_length=5).to_numpy()
+        high = df['high'].to_numpy()
+        low = df['low'].to_numpy()
 
-        for i in range(20, len(df)):  # Start after enough data
-            current_idx = df.index[i]
-            current_high = df['high'].iloc[i]
-            current_low = df['low'].iloc[i]
+        # Last two swing highs/lows before each bar
+        last_high, prev_high = _prior_swing_positions(swings == 1, 2)
+        last_low, prev_low = _prior_swing_positions(swings == -1, 2)
 
-            # Get recent swing structure (last 3 swings)
-            recent_highs = [idx for idx in swing_high_indices if idx < current_idx][-3:]
-            recent_lows = [idx for idx in swing_low_indices if idx < current_idx][-3:]
+        has_structure = (prev_high >= 0) & (prev_low >= 0)
+        has_structure[:20] = False  # Start after enough data
 
-            if len(recent_highs) >= 2 and len(recent_lows) >= 2:
-                # Determine trend based on swing structure
-                high_values = [df.loc[idx, 'high'] for idx in recent_highs]
-                low_values = [df.loc[idx, 'low'] for idx in recent_lows]
+        # Bearish trend: Lower Highs and Lower Lows
+        is_bearish_trend = (has_structure &
+                            (high[last_high] < high[prev_high]) & (low[last_low] < low[prev_low]))
 
-                # Bearish trend: Lower Highs and Lower Lows
-                is_bearish_trend = (len(high_values) >= 2 and high_values[-1] < high_values[-2] and
-                                  len(low_values) >= 2 and low_values[-1] < low_values[-2])
+        # Bullish trend: Higher Highs and Higher Lows
+        is_bullish_trend = (has_structure &
+                            (high[last_high] > high[prev_high]) & (low[last_low] > low[prev_low]))
 
-                # Bullish trend: Higher Highs and Higher Lows
-                is_bullish_trend = (len(high_values) >= 2 and high_values[-1] > high_values[-2] and
-                                  len(low_values) >= 2 and low_values[-1] > low_values[-2])
+        result = np.zeros(len(df), dtype=np.int64)
 
-                # Bullish CHoCH: In bearish trend, break above recent swing high
-                if is_bearish_trend and recent_highs:
-                    last_swing_high = df.loc[recent_highs[-1], 'high']
-                    if current_high > last_swing_high:
-                        result.iloc[i] = 1
+        # Bullish CHoCH: In bearish trend, break above recent swing high
+        result[is_bearish_trend & (high > high[last_high])] = 1
 
-                # Bearish CHoCH: In bullish trend, break below recent swing low
-                elif is_bullish_trend and recent_lows:
-                    last_swing_low = df.loc[recent_lows[-1], 'low']
-                    if current_low < last_swing_low:
-                        result.iloc[i] = -1
+        # Bearish CHoCH: In bullish trend, break below recent swing low
+        result[~is_bearish_trend & is_bullish_trend & (low < low[last_low])] = -1
 
-        return result
+        return pd.Series(result, index=df.index)
 
     except Exception as e:
         logger.exception(f"Error in real CHoCH calculation: {e}")
@@ -529,53 +557,46 @@ def _real_order_blocks(df: pd.DataFrame) -> pd.DataFrame:
         if len(df) < 20:
             return pd.DataFrame(columns=['top', 'bottom', 'type', 'timestamp', 'strength'])
 
-        # Get swing points
-        _get_real_swings(df, swing_length=3)
-        order_blocks = []
-
         # Find displacement moves (strong price movements)
         price_change = df['close'].pct_change().abs()
         avg_change = price_change.rolling(window=20).mean()
         displacement_threshold = avg_change * 2  # 2x average move
 
-        for i in range(10, len(df) - 5):
-            # Check if this bar created displacement
-            if price_change.iloc[i] > displacement_threshold.iloc[i]:
-
-                # Volume confirmation if available
-                volume_confirmed = True
-                if 'volume' in df.columns:
-                    avg_volume = df['volume'].iloc[i-10:i].mean()
-                    volume_confirmed = df['volume'].iloc[i] > avg_volume * 1.5
-
-                if volume_confirmed:
-                    # Bullish displacement (strong up move)
-                    if df['close'].iloc[i] > df['open'].iloc[i]:
-                        # Look for the last bearish candle before displacement
-                        for j in range(i-1, max(0, i-5), -1):
-                            if df['close'].iloc[j] < df['open'].iloc[j]:  # Bearish candle
-                                order_blocks.append({
-                                    'top': float(df['high'].iloc[j]),
-                                    'bottom': float(df['low'].iloc[j]),
-                                    'type': 'bullish',
-                                    'timestamp': df.index[j],
-                                    'strength': float(price_change.iloc[i])
-                                })
-                                break
-
-                    # Bearish displacement (strong down move)
-                    elif df['close'].iloc[i] < df['open'].iloc[i]:
-                        # Look for the last bullish candle before displacement
-                        for j in range(i-1, max(0, i-5), -1):
-                            if df['close'].iloc[j] > df['open'].iloc[j]:  # Bullish candle
-                                order_blocks.append({
-                                    'top': float(df['high'].iloc[j]),
-                                    'bottom': float(df['low'].iloc[j]),
-                                    'type': 'bearish',
-                                    'timestamp': df.index[j],
-                                    'strength': float(price_change.iloc[i])
-                                })
-                                break
+        change = price_change.to_numpy()
+        bars = np.arange(10, max(len(df) - 5, 10))
+        bars = bars[change[bars] > displacement_threshold.to_numpy()[bars]]
+
+        # Volume confirmation if available
+        if 'volume' in df.columns:
+            bars = bars[_volume_confirmed(df['volume'], bars, 1.5)]
+
+        open_ = df['open'].to_numpy()
+        close = df['close'].to_numpy()
+        bullish_move = close[bars] > open_[bars]  # Strong up move
+        bearish_move = ~bullish_move & (close[bars] < open_[bars])  # Strong down move
+
+        # Last opposite candle among the 4 bars before the displacement, nearest first
+        before = bars[:, None] - np.arange(1, 5)
+        opposite = np.where(
+            bullish_move[:, None],
+            close[before] < open_[before],  # Bearish candle
+            close[before] > open_[before]  # Bullish candle
+        )
+        found = np.flatnonzero((bullish_move | bearish_move) & opposite.any(axis=1))
+        candles = before[found, opposite[found].argmax(axis=1)]
+
+        high = df['high'].to_numpy()
+        low = df['low'].to_numpy()
+        order_blocks = [
+            {
+                'top': float(high[j]),
+                'bottom': float(low[j]),
+                'type': 'bullish' if is_bullish else 'bearish',
+                'timestamp': df.index[j],
+                'strength': float(change[i])
+            }
+            for i, j, is_bullish in zip(bars[found], candles, bullish_move[found], strict=True)
+        ]
 
         # Return top 10 strongest order blocks
         if order_blocks:
@@ -599,73 +620,31 @@ def _real_fvg(df: pd.DataFrame) -> pd.DataFrame:
     2. Bullish FVG: Gap between candle 1 high and candle 3 low
     3. Bearish FVG: Gap between candle 1 low and candle 3 high
     4. Must have displacement (strong move) to be valid
+
+    The per-bar implementation filtered the gaps with `not` on a Series, which
+    raised, so it always returned the empty frame. That output is kept without
+    detecting gaps nobody receives; returning them needs its own change.
     """
-    try:
-        if len(df) < 10:
-            return pd.DataFrame(columns=['top', 'bottom', 'type', 'timestamp', 'filled'])
-
-        fvg_list = []
-
-        for i in range(2, len(df)):  # Need at least 3 candles
-            # Get 3-candle pattern
-            candle1 = df.iloc[i-2]
-            df.iloc[i-1]
-            candle3 = df.iloc[i]
-
-            # Bullish FVG: Gap up pattern
-            # Candle 1 high < Candle 3 low (gap between them)
-            if candle1['high'] < candle3['low']:
-                # Confirm it's a strong bullish move
-                if candle3['close'] > candle1['close'] * 1.005:  # At least 0.5% move
-                    gap_top = candle3['low']
-                    gap_bottom = candle1['high']
-
-                    # Check if gap is significant (> 0.1% of price)
-                    if (gap_top - gap_bottom) / candle1['close'] > 0.001:
-                        fvg_list.append({
-                            'top': float(gap_top),
-                            'bottom': float(gap_bottom),
-                            'type': 'bullish',
-                            'timestamp': df.index[i],
-                            'filled': False
-                        })
-
-            # Bearish FVG: Gap down pattern
-            # Candle 1 low > Candle 3 high (gap between them)
-            elif candle1['low'] > candle3['high']:
-                # Confirm it's a strong bearish move
-                if candle3['close'] < candle1['close'] * 0.995:  # At least 0.5% move
-                    gap_top = candle1['low']
-                    gap_bottom = candle3['high']
-
-                    # Check if gap is significant (> 0.1% of price)
-                    if (gap_top - gap_bottom) / candle1['close'] > 0.001:
-                        fvg_list.append({
-                            'top': float(gap_top),
-                            'bottom': float(gap_bottom),
-                            'type': 'bearish',
-                            'timestamp': df.index[i],
-                            'filled': False
-                        })
-
-        # Check if any FVGs have been filled by subsequent price action
-        if fvg_list:
-            fvg_df = pd.DataFrame(fvg_list)
-            current_price = df['close'].iloc[-1]
-
-            for idx, row in fvg_df.iterrows():
-                # FVG is filled if price has traded through the gap
-                if row['bottom'] <= current_price <= row['top']:
-                    fvg_df.loc[idx, 'filled'] = True
-
-            # Return unfilled FVGs (most relevant)
-            return fvg_df[not fvg_df['filled']].reset_index(drop=True)
-
-        return pd.DataFrame(columns=['top', 'bottom', 'type', 'timestamp', 'filled'])
+    return pd.DataFrame(columns=['top', 'bottom', 'type', 'timestamp', 'filled'])
 
-    except Exception as e:
-        logger.exception(f"Error in real FVG calculation: {e}")
-        return pd.DataFrame(columns=['top', 'bottom', 'type', 'timestamp', 'filled'])
+
+def _round_level_touches(high: np.ndarray, low: np.ndarray, level: int, sorted_bars: tuple) -> int:
+    """
+    Bars whose high or low lies within 0.1% of a round level.
+
+    Candidates come from binary searches over the sorted highs and lows; the
+    0.1% test itself is applied to the candidates exactly as a full scan would.
+    """
+    tolerance = level * 0.001
+    candidates = []
+    for order, values in sorted_bars:
+        start = np.searchsorted(values, level - 2 * tolerance, side='left')
+        end = np.searchsorted(values, level + 2 * tolerance, side='right')
+        candidates.append(order[start:end])
+    bars = np.union1d(*candidates)
+
+    near = (np.abs(high[bars] - level) < tolerance) | (np.abs(low[bars] - level) < tolerance)
+    return int(np.count_nonzero(near))
 
 
 def _real_liquidity(df: pd.DataFrame) -> pd.DataFrame:
@@ -683,16 +662,16 @@ def _real_liquidity(df: pd.DataFrame) -> pd.DataFrame:
             return pd.DataFrame(columns=['level', 'type', 'strength', 'touches'])
 
         liquidity_levels = []
+        high = df['high'].to_numpy()
+        low = df['low'].to_numpy()
 
         # Get swing points
-        swings = _get_real_swings(df, swing_length=5)
-        swing_high_indices = df.index[swings == 1].tolist()
-        swing_low_indices = df.index[swings == -1].tolist()
+        swings = _get_real_swings(df, swing_length=5).to_numpy()
 
         # 1. Swing High Liquidity (Sell-side liquidity)
-        swing_highs = [df.loc[idx, 'high'] for idx in swing_high_indices]
+        swing_highs = high[swings == 1]
         for high_level in swing_highs[-10:]:  # Last 10 swing highs
-            touches = sum(1 for h in swing_highs if abs(h - high_level) < high_level * 0.002)  # Within 0.2%
+            touches = int(np.count_nonzero(np.abs(swing_highs - high_level) < high_level * 0.002))  # Within 0.2%
             if touches >= 2:  # Multiple touches = stronger level
                 liquidity_levels.append({
                     'level': float(high_level),
@@ -702,9 +681,9 @@ def _real_liquidity(df: pd.DataFrame) -> pd.DataFrame:
                 })
 
         # 2. Swing Low Liquidity (Buy-side liquidity)
-        swing_lows = [df.loc[idx, 'low'] for idx in swing_low_indices]
+        swing_lows = low[swings == -1]
         for low_level in swing_lows[-10:]:  # Last 10 swing lows
-            touches = sum(1 for l in swing_lows if abs(l - low_level) < low_level * 0.002)  # Within 0.2%
+            touches = int(np.count_nonzero(np.abs(swing_lows - low_level) < low_level * 0.002))  # Within 0.2%
             if touches >= 2:  # Multiple touches = stronger level
                 liquidity_levels.append({
                     'level': float(low_level),
@@ -746,12 +725,14 @@ def _real_liquidity(df: pd.DataFrame) -> pd.DataFrame:
         price_min = int((current_price - price_range/2) / step) * step
         price_max = int((current_price + price_range/2) / step) * step
 
+        high_order = np.argsort(high, kind='stable')
+        low_order = np.argsort(low, kind='stable')
+        sorted_bars = ((high_order, high[high_order]), (low_order, low[low_order]))
+
         for round_level in range(price_min, price_max + step, step):
             if round_level > 0:  # Valid price
                 # Check if price has interacted with this level
-                interaction_count = sum(1 for i in range(len(df))
-                                     if abs(df['high'].iloc[i] - round_level) < round_level * 0.001 or
-                                        abs(df['low'].iloc[i] - round_level) < round_level * 0.001)
+                interaction_count = _round_level_touches(high, low, round_level, sorted_bars)
 
                 if interaction_count > 0:
                     liq_type = 'sell-side' if round_level > current_price else 'buy-side'
@@ -45,6 +45,9 @@ class ConnectionLimits:
     rapid_subscription_threshold: int  # Max subscriptions in 10 seconds
     burst_message_threshold: int      # Max messages in 5 seconds
 
+    # Delivery pacing for conflated subscriptions (None = derive from burst limit)
+    conflation_window_ms: int | None = None
+
 
 @dataclass
 class AbuseEvent:
@@ -65,6 +68,10 @@ class StreamAbuseProtectionService:
     # NO FALLBACK LIMITS - All limits must come from marketplace service
     # This ensures proper entitlement verification and prevents misconfiguration masking
 
+    # Bounds on the flush interval of conflated WebSocket subscriptions
+    MIN_CONFLATION_WINDOW_SECONDS = 0.05
+    MAX_CONFLATION_WINDOW_SECONDS = 5.0
+
     def __init__(self):
         self.redis_client = None
         self.marketplace_client = None
@@ -121,7 +128,8 @@ class StreamAbuseProtectionService:
                 max_subscription_requests=limits_data.get('max_subscription_requests'),
                 max_messages_sent=limits_data.get('max_messages_sent'),
                 rapid_subscription_threshold=limits_data.get('rapid_subscription_threshold'),
-                burst_message_threshold=limits_data.get('burst_message_threshold')
+                burst_message_threshold=limits_data.get('burst_message_threshold'),
+                conflation_window_ms=limits_data.get('conflation_window_ms')
             )
 
         except Exception as e:
@@ -131,6 +139,44 @@ class StreamAbuseProtectionService:
             ) from e
 
 
+    def conflation_window_seconds(self, limits: ConnectionLimits) -> float:
+        """
+        Flush interval for a client's conflated subscriptions under its tier limits.
+
+        An explicit conflation_window_ms from the marketplace wins. Otherwise the
+        window spaces flushes so they stay within the tier's burst allowance
+        (burst_message_threshold messages per burst window).
+
+        Args:
+            limits: Tier limits of the client
+
+        Returns:
+            float: Window in seconds, clamped to the MIN/MAX bounds
+        """
+        if limits.conflation_window_ms:
+            window = limits.conflation_window_ms / 1000.0
+        elif limits.burst_message_threshold:
+            window = self.burst_message_window / limits.burst_message_threshold
+        else:
+            window = self.MAX_CONFLATION_WINDOW_SECONDS
+
+        return min(max(window, self.MIN_CONFLATION_WINDOW_SECONDS), self.MAX_CONFLATION_WINDOW_SECONDS)
+
+    async def get_conflation_window(self, user_id: str, stream_type: StreamType) -> float:
+        """
+        Conflation window for a user's subscriptions of a stream type, from their tier.
+
+        Raises:
+            RuntimeError: If the user's entitlements or tier limits are unavailable
+        """
+        entitlement_service = await get_unified_entitlement_service()
+        user_data = await entitlement_service._get_user_entitlements(user_id)
+        if not user_data:
+            raise RuntimeError(f"Unable to verify user entitlements for {user_id}")
+
+        limits = await self._get_tier_limits_from_unified_tier(user_data.get("tier", "free"), stream_type)
+        return self.conflation_window_seconds(limits)
+
     async def check_connection_allowed(
         self,
         client_id: str,
@@ -0,0 +1,162 @@
+"""
+Grouping of threshold monitoring jobs by shared indicator computation.
+
+Many thresholds watch the same indicator: (symbol, timeframe, indicator,
+params) identical, only the threshold differs. ThresholdMonitor groups jobs
+under that computation key so the indicator value is computed once per cycle.
+Each group keeps its thresholds in arrays so all of them are compared to the
+value in one vectorized step.
+"""
+
+import json
+from collections.abc import Iterator
+from typing import Any
+
+import numpy as np
+
+# ThresholdType values that can be compared against a single indicator value
+_COMPARISON_CODES = {
+    'gt': 1,
+    'lt': 2,
+    'eq': 3,
+    'between': 4,
+    'outside': 5
+}
+
+
+def threshold_computation_key(indicator_name: str,
+                              params: dict[str, Any],
+                              symbol: str,
+                              timeframe: str) -> str:
+    """Key identifying one indicator computation shared by all thresholds on it."""
+    params_str = json.dumps(params or {}, sort_keys=True, default=str)
+    return f"{symbol}:{timeframe}:{indicator_name}:{params_str}"
+
+
+def evaluate_thresholds(value: float,
+                        codes: np.ndarray,
+                        primary: np.ndarray,
+                        secondary: np.ndarray) -> np.ndarray:
+    """
+    Compare one indicator value against many thresholds at once.
+
+    Matches ThresholdMonitor._evaluate_threshold_condition element-wise:
+    EQUALS allows a 0.1% tolerance, BETWEEN/OUTSIDE without a secondary value
+    (NaN) never breach, and types without a single-value comparison never breach.
+
+    Args:
+        value: Current indicator value
+        codes: Comparison code per threshold (see _COMPARISON_CODES, 0 = not comparable)
+        primary: Threshold values
+        secondary: Secondary values for BETWEEN/OUTSIDE, NaN when absent
+
+    Returns:
+        np.ndarray: Boolean breach mask aligned with the inputs
+    """
+    low = np.minimum(primary, secondary)
+    high = np.maximum(primary, secondary)
+
+    return (
+        ((codes == 1) & (value > primary)) |
+        ((codes == 2) & (value < primary)) |
+        ((codes == 3) & (np.abs(value - primary) <= np.abs(primary) * 0.001)) |
+        ((codes == 4) & (low <= value) & (value <= high)) |
+        ((codes == 5) & ((value < low) | (value > high)))
+    )
+
+
+class ThresholdGroup:
+    """Monitoring jobs that share one indicator computation."""
+
+    def __init__(self, key: str, threshold_config: Any):
+        self.key = key
+        self.indicator_name = threshold_config.indicator_name
+        self.indicator_params = threshold_config.indicator_params
+        self.symbol = threshold_config.symbol
+        self.timeframe = threshold_config.timeframe
+        self.jobs: dict[str, Any] = {}
+        self.is_running = False
+        self._arrays: tuple | None = None
+
+    def add(self, job_id: str, job: Any):
+        self.jobs[job_id] = job
+        self._arrays = None
+
+    def remove(self, job_id: str) -> bool:
+        if self.jobs.pop(job_id, None) is None:
+            return False
+        self._arrays = None
+        return True
+
+    def evaluate(self, value: float) -> list[tuple[str, Any, bool]]:
+        """
+        Check every job's threshold against the group's indicator value.
+
+        Returns:
+            List: (job_id, job, breach_detected) for every job in the group
+        """
+        job_ids, jobs, codes, primary, secondary = self._threshold_arrays()
+        breaches = evaluate_thresholds(value, codes, primary, secondary)
+        return list(zip(job_ids, jobs, breaches.tolist(), strict=True))
+
+    def _threshold_arrays(self) -> tuple:
+        if self._arrays is None:
+            configs = [job.threshold_config for job in self.jobs.values()]
+            self._arrays = (
+                list(self.jobs),
+                list(self.jobs.values()),
+                np.array([_COMPARISON_CODES.get(c.threshold_type.value, 0) for c in configs], dtype=np.int8),
+                np.array([c.threshold_value for c in configs], dtype=float),
+                np.array([np.nan if c.secondary_value is None else c.secondary_value for c in configs], dtype=float)
+            )
+        return self._arrays
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+
+class ThresholdGroupIndex:
+    """Monitoring jobs grouped by computation key."""
+
+    def __init__(self):
+        self._groups: dict[str, ThresholdGroup] = {}
+        self._job_keys: dict[str, str] = {}
+
+    @classmethod
+    def from_jobs(cls, jobs: dict[str, Any]) -> 'ThresholdGroupIndex':
+        index = cls()
+        for job_id, job in jobs.items():
+            index.add(job_id, job)
+        return index
+
+    def add(self, job_id: str, job: Any):
+        config = job.threshold_config
+        key = threshold_computation_key(config.indicator_name, config.indicator_params, config.symbol, config.timeframe)
+        if self._job_keys.get(job_id) not in (None, key):
+            self.remove(job_id)
+
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = ThresholdGroup(key, config)
+        group.add(job_id, job)
+        self._job_keys[job_id] = key
+
+    def remove(self, job_id: str) -> bool:
+        key = self._job_keys.pop(job_id, None)
+        if key is None:
+            return False
+        group = self._groups[key]
+        group.remove(job_id)
+        if not group:
+            del self._groups[key]
+        return True
+
+    def __iter__(self) -> Iterator[ThresholdGroup]:
+        return iter(list(self._groups.values()))
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    @property
+    def job_count(self) -> int:
+        return len(self._job_keys)
@@ -2,7 +2,8 @@
 import asyncio
 import json
 import time
-from collections.abc import Callable
+from collections import Counter
+from collections.abc import Callable, Iterable
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from enum import Enum
@@ -28,6 +29,7 @@ from .dynamic_indicator_classifier import (
     TimeSensitivity,
     UserIntent,
 )
+from .threshold_groups import ThresholdGroup, ThresholdGroupIndex
 
 logger = get_logger(__name__)
 
@@ -69,12 +71,12 @@ class ThresholdConfig:
     # Threshold specification
     threshold_type: ThresholdType
     threshold_value: float
-    secondary_value: float | None = None  # For BETWEEN/OUTSIDE
 
     # Classification context
     user_priority: UserIntent
     financial_impact: FinancialImpact
     time_sensitivity: TimeSensitivity
+    secondary_value: float | None = None  # For BETWEEN/OUTSIDE; after the required fields
     position_size: float = 0.0
     portfolio_percentage: float = 0.0
 
@@ -134,6 +136,13 @@ class ThresholdMonitor:
         self.periodic_jobs: dict[str, MonitoringJob] = {}
         self.on_demand_jobs: dict[str, MonitoringJob] = {}
 
+        # Real-time jobs grouped by shared indicator computation
+        self.real_time_groups = ThresholdGroupIndex()
+
+        # Loop cadence; loops run against deadlines so work time is not added to the period
+        self.real_time_interval = 0.1      # 100ms
+        self.periodic_poll_interval = 1.0  # upper bound between periodic due-checks
+
         # Custom indicators and functions
         self.custom_indicators: dict[str, Callable] = {}
         self.builtin_indicators: dict[str, Callable] = {}
@@ -144,7 +153,10 @@ class ThresholdMonitor:
             'active_real_time': 0,
             'active_periodic': 0,
             'breaches_today': 0,
-            'avg_computation_time': 0.0
+            'avg_computation_time': 0.0,
+            'indicator_computations': 0,
+            'threshold_checks': 0,
+            'missed_deadlines': 0
         }
 
         # Prometheus metrics collector
@@ -217,6 +229,7 @@ class ThresholdMonitor:
 
         if monitoring_strategy.tier == MonitoringTier.REAL_TIME:
             self.real_time_jobs[job_id] = job
+            self.real_time_groups.add(job_id, job)
             logger.info(f"Added real-time threshold: {threshold_config.indicator_name} for {threshold_config.symbol}")
         elif monitoring_strategy.tier == MonitoringTier.HIGH_FREQUENCY_PERIODIC:
             self.periodic_jobs[job_id] = job
@@ -264,6 +277,7 @@ class ThresholdMonitor:
 
         # Remove from tier-specific collections
         self.real_time_jobs.pop(job_id, None)
+        self.real_time_groups.remove(job_id)
         self.periodic_jobs.pop(job_id, None)
         self.on_demand_jobs.pop(job_id, None)
 
@@ -308,26 +322,20 @@ class ThresholdMonitor:
     async def _real_time_monitoring_loop(self):
         """Main loop for real-time threshold monitoring"""
 
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+
         while self.running:
             try:
-                # Check all real-time thresholds
-                tasks = []
-                for job_id, job in self.real_time_jobs.items():
-                    if job.is_running:
-                        continue
+                # Check all real-time thresholds, one indicator computation per group
+                await self._check_threshold_groups(self.real_time_groups)
 
-                    task = self._check_single_threshold(job_id, job)
-                    tasks.append(task)
-
-                if tasks:
-                    await asyncio.gather(*tasks, return_exceptions=True)
-
-                # Short sleep for real-time monitoring
-                await asyncio.sleep(0.1)  # 100ms
+                deadline = await self._sleep_until_next_deadline(deadline, self.real_time_interval)
 
             except Exception as e:
                 logger.error(f"Real-time monitoring loop error: {e}")
                 await asyncio.sleep(1)
+                deadline = loop.time()
 
     async def _periodic_monitoring_loop(self):
         """Main loop for periodic threshold monitoring"""
@@ -336,28 +344,166 @@ class ThresholdMonitor:
             try:
                 current_time = datetime.utcnow()
 
-                # Check periodic thresholds that are due
-                tasks = []
+                # Collect periodic thresholds that are due
+                due_jobs = {}
                 for job_id, job in self.periodic_jobs.items():
-                    if job.is_running:
-                        continue
+                    if job.next_check is None or current_time >= job.next_check:
+                        due_jobs[job_id] = job
+
+                if due_jobs:
+                    await self._check_threshold_groups(ThresholdGroupIndex.from_jobs(due_jobs))
+
+                # Sleep until the earliest upcoming check, polling at least every periodic_poll_interval
+                now = datetime.utcnow()
+                upcoming = [
+                    job.next_check for job in self.periodic_jobs.values()
+                    if job.next_check is not None and job.next_check > now
+                ]
+                delay = self.periodic_poll_interval
+                if upcoming:
+                    delay = min(delay, (min(upcoming) - now).total_seconds())
+                await asyncio.sleep(delay)
 
-                    # Check if it's time for next check
-                    if (job.next_check is None or
-                        current_time >= job.next_check):
+            except Exception as e:
+                logger.error(f"Periodic monitoring loop error: {e}")
+                await asyncio.sleep(5)
 
-                        task = self._check_single_threshold(job_id, job)
-                        tasks.append(task)
+    async def _sleep_until_next_deadline(self, deadline: float, interval: float) -> float:
+        """
+        Sleep until the next cycle deadline and return it
 
-                if tasks:
-                    await asyncio.gather(*tasks, return_exceptions=True)
+        A cycle that overruns skips the deadlines it missed instead of running
+        back-to-back to catch up.
 
-                # Sleep for periodic monitoring
-                await asyncio.sleep(1)  # 1 second
+        Args:
+            deadline: Loop-clock time the current cycle was due to start
+            interval: Cycle period in seconds
 
-            except Exception as e:
-                logger.error(f"Periodic monitoring loop error: {e}")
-                await asyncio.sleep(5)
+        Returns:
+            float: Loop-clock time the next cycle is due to start
+        """
+        now = asyncio.get_running_loop().time()
+        deadline += interval
+        if now > deadline:
+            missed = int((now - deadline) // interval) + 1
+            self.metrics['missed_deadlines'] += missed
+            deadline += missed * interval
+
+        await asyncio.sleep(deadline - now)
+        return deadline
+
+    async def _check_threshold_groups(self, groups: Iterable[ThresholdGroup]) -> list[dict[str, Any]]:
+        """Check groups of thresholds concurrently, one indicator computation per group"""
+        tasks = [self._check_threshold_group(group) for group in groups if not group.is_running]
+        if not tasks:
+            return []
+
+        results = []
+        for group_results in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(group_results, list):
+                results.extend(group_results)
+        return results
+
+    async def _check_threshold_group(self, group: ThresholdGroup) -> list[dict[str, Any]]:
+        """Compute a group's indicator once and check every threshold in the group against it"""
+
+        group.is_running = True
+        start_time = time.time()
+
+        try:
+            current_value = await self._compute_indicator_value(
+                group.indicator_name,
+                group.indicator_params,
+                group.symbol,
+                group.timeframe
+            )
+
+            if current_value is None:
+                logger.warning(f"Could not compute indicator {group.indicator_name} for {group.symbol}")
+                return []
+
+            # One vectorized comparison for every threshold on this computation
+            evaluations = group.evaluate(current_value)
+
+            computation_time = (time.time() - start_time) * 1000
+            last_check = datetime.utcnow()
+            timestamp = last_check.isoformat()
+            tiers = Counter()
+            results = []
+            breached = []
+
+            for job_id, job, breach_detected in evaluations:
+                threshold_config = job.threshold_config
+
+                # Update job tracking
+                job.last_check = last_check
+                job.next_check = last_check + timedelta(seconds=job.check_interval_seconds)
+                job.total_checks += 1
+                job.last_value = current_value
+                job.computation_time_ms = computation_time
+                tiers[job.monitoring_strategy.tier.value] += 1
+
+                result = {
+                    'job_id': job_id,
+                    'threshold_id': threshold_config.threshold_id,
+                    'symbol': threshold_config.symbol,
+                    'indicator': threshold_config.indicator_name,
+                    'current_value': current_value,
+                    'threshold_value': threshold_config.threshold_value,
+                    'breach_detected': breach_detected,
+                    'computation_time_ms': computation_time,
+                    'timestamp': timestamp
+                }
+                results.append(result)
+
+                if breach_detected:
+                    breached.append((job_id, job, result))
+
+            if breached:
+                await asyncio.gather(
+                    *(self._handle_group_breach(job_id, job, current_value, result) for job_id, job, result in breached),
+                    return_exceptions=True
+                )
+
+            self.metrics['indicator_computations'] += 1
+            self.metrics['threshold_checks'] += len(evaluations)
+
+            # Record Prometheus metrics for checks
+            for tier, count in tiers.items():
+                self.metrics_collector.record_threshold_check(
+                    group.indicator_name,
+                    tier,
+                    group.symbol,
+                    computation_time,
+                    count=count
+                )
+
+            return results
+
+        except Exception as e:
+            logger.error(f"Error checking threshold group {group.key}: {e}")
+            return []
+        finally:
+            group.is_running = False
+
+    async def _handle_group_breach(self, job_id: str, job: MonitoringJob, current_value: float, result: dict[str, Any]):
+        """Handle a breach found by a group check"""
+        threshold_config = job.threshold_config
+        try:
+            await self._handle_threshold_breach(job_id, job, current_value)
+            job.breach_count += 1
+            self.metrics['breaches_today'] += 1
+            result['breach_handled'] = True
+
+            # Record Prometheus metrics for breach
+            self.metrics_collector.record_threshold_breach(
+                threshold_config.user_id,
+                threshold_config.indicator_name,
+                threshold_config.symbol,
+                threshold_config.user_priority.value
+            )
+        except Exception as e:
+            logger.error(f"Error checking threshold {job_id}: {e}")
 
     async def _check_single_threshold(self, job_id: str, job: MonitoringJob) -> dict[str, Any] | None:
         """Check a single threshold and trigger alerts if needed"""
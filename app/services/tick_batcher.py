@@ -0,0 +1,94 @@
+"""
+Batch planning for ticks read from the sharded tick streams.
+
+An XREADGROUP batch is decoded once and split into:
+- ticks already marked processed (state != 'U'), which are only ACKed
+- ticks for active instruments, grouped by instrument in arrival order
+- ticks for instruments nobody subscribes to, which are left pending
+
+When every configuration for an instrument allows it, a group is coalesced to
+its latest tick: only that tick is computed, while the superseded ones are
+still republished and ACKed with it.
+"""
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class StreamTick:
+    """A single decoded stream entry."""
+    stream: str
+    msg_id: Any                 # kept as returned by Redis for XACK
+    fields: dict[str, str]
+
+    @property
+    def instrument_key(self) -> str | None:
+        return self.fields.get('instrument_key')
+
+    @property
+    def is_unprocessed(self) -> bool:
+        return self.fields.get('state', 'U') == 'U'
+
+
+@dataclass
+class TickBatch:
+    """Decoded and grouped XREADGROUP result."""
+    by_instrument: dict[str, list[StreamTick]] = field(default_factory=dict)
+    already_processed: list[StreamTick] = field(default_factory=list)
+    ignored: int = 0
+
+    @property
+    def tick_count(self) -> int:
+        return sum(len(ticks) for ticks in self.by_instrument.values())
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def decode_stream_fields(fields: dict) -> dict[str, str]:
+    """Decode the bytes keys/values of a stream entry."""
+    return {_decode(key): _decode(value) for key, value in fields.items()}
+
+
+def group_tick_batch(messages: Iterable | None, active_instruments: set[str]) -> TickBatch:
+    """
+    Decode an XREADGROUP result once and group unprocessed ticks by instrument.
+
+    Args:
+        messages: [(stream, [(msg_id, fields), ...]), ...] as returned by xreadgroup
+        active_instruments: Instrument keys with at least one active configuration
+
+    Returns:
+        TickBatch with per-instrument tick lists in arrival order
+    """
+    batch = TickBatch()
+    for stream, entries in messages or ():
+        stream_name = _decode(stream)
+        for msg_id, fields in entries:
+            tick = StreamTick(stream_name, msg_id, decode_stream_fields(fields))
+
+            if not tick.is_unprocessed:
+                batch.already_processed.append(tick)
+                continue
+
+            instrument_key = tick.instrument_key
+            if instrument_key not in active_instruments:
+                batch.ignored += 1
+                continue
+
+            batch.by_instrument.setdefault(instrument_key, []).append(tick)
+
+    return batch
+
+
+def can_coalesce(configs: Sequence[Any]) -> bool:
+    """True when every configuration for the instrument accepts latest-tick coalescing."""
+    return bool(configs) and all(getattr(config, 'coalesce_ticks', False) for config in configs)
+
+
+def coalesce_ticks(ticks: list[StreamTick]) -> tuple[StreamTick, list[StreamTick]]:
+    """Split an instrument's ticks into the latest one and the ones it supersedes."""
+    return ticks[-1], ticks[:-1]
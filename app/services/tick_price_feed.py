@@ -0,0 +1,78 @@
+"""
+Fan-out of traded prices from the tick streams to price-driven services.
+
+Price alerts and trailing stops react to every trade rather than to polled
+quotes. The tick consumer hands each instrument's ticks here, in arrival
+order and before they are coalesced, and every registered consumer gets
+the traded price of each one.
+
+A consumer implements:
+- on_price_update(instrument_key, price): awaited once per traded price
+- watched_instruments(): instrument keys it needs ticks for, so the consumer
+  reads them even when no signal configuration subscribes to the instrument
+"""
+
+import logging
+from collections.abc import Iterable
+from typing import Any
+
+from app.services.incremental_bar_builder import tick_trade
+
+logger = logging.getLogger(__name__)
+
+
+class TickPriceFeed:
+    """Delivers the traded price of each stream tick to the registered consumers."""
+
+    def __init__(self):
+        self._consumers: list[Any] = []
+        self.prices_published = 0
+        self.consumer_errors = 0
+
+    def add_consumer(self, consumer: Any):
+        if consumer not in self._consumers:
+            self._consumers.append(consumer)
+
+    @property
+    def instruments(self) -> frozenset[str]:
+        """Instruments any consumer is watching."""
+        if len(self._consumers) == 1:
+            return self._consumers[0].watched_instruments()
+        return frozenset().union(*(consumer.watched_instruments() for consumer in self._consumers))
+
+    async def publish(self, instrument_key: str, ticks: Iterable[dict[str, Any]]) -> int:
+        """
+        Hand every traded price in ticks to the consumers, in order.
+
+        A consumer that raises is logged and skipped for that price; it does not
+        stop the other consumers or the tick's own processing.
+
+        Returns:
+            Number of prices published
+        """
+        if not self._consumers:
+            return 0
+
+        published = 0
+        for fields in ticks:
+            trade = tick_trade(fields)
+            if trade is None:
+                continue
+            price = trade[1]
+            for consumer in self._consumers:
+                try:
+                    await consumer.on_price_update(instrument_key, price)
+                except Exception as e:
+                    self.consumer_errors += 1
+                    logger.error(f"Price consumer {type(consumer).__name__} failed for {instrument_key}: {e}")
+            published += 1
+
+        self.prices_published += published
+        return published
+
+    def get_metrics(self) -> dict[str, int]:
+        return {
+            'consumers': len(self._consumers),
+            'prices_published': self.prices_published,
+            'consumer_errors': self.consumer_errors
+        }
@@ -2,75 +2,77 @@
 import asyncio
 import json
 import logging
+from collections.abc import Mapping
 from datetime import datetime, timedelta
 from typing import Any
 
 from app.utils.logging_utils import log_info
+from app.utils.lru_cache import LRUCache, read_only
 from app.utils.redis import get_redis_client
 
 logger = logging.getLogger(__name__)
 
 
 class TimeframeCache:
-    """Cache for a specific instrument and timeframe"""
+    """
+    Cache for a specific instrument and timeframe
 
-    def __init__(self, instrument_key: str, timeframe: str):
+    Entries live in a bounded LRUCache with per-entry TTL; expired entries
+    are dropped when read, so clear_expired() is only housekeeping.
+    """
+
+    def __init__(self, instrument_key: str, timeframe: str, max_size: int = 128):
         self.instrument_key = instrument_key
         self.timeframe = timeframe
         self.last_access = datetime.now()
         self.subscriber_count = 0
-        self.local_cache = {}  # In-memory cache
-        self.cache_size = 0
-        self.hit_count = 0
-        self.miss_count = 0
+        self.local_cache = LRUCache(max_size=max_size, ttl_seconds=300)
 
-    async def get(self, key: str) -> Any | None:
-        """Get from cache"""
-        self.last_access = datetime.now()
+    @property
+    def cache_size(self) -> int:
+        return len(self.local_cache)
 
-        if key in self.local_cache:
-            self.hit_count += 1
-            return self.local_cache[key]
+    @property
+    def hit_count(self) -> int:
+        return self.local_cache.hits
 
-        self.miss_count += 1
-        return None
+    @property
+    def miss_count(self) -> int:
+        return self.local_cache.misses
+
+    async def get(self, key: str) -> Mapping[str, Any] | None:
+        """Get from cache: a read-only {'value', 'expires'} entry"""
+        self.last_access = datetime.now()
+        return self.local_cache.get(key)
 
     async def set(self, key: str, value: Any, ttl: int = 300):
         """Set in cache"""
-        self.local_cache[key] = {
+        self.local_cache.set(key, read_only({
             'value': value,
             'expires': datetime.now() + timedelta(seconds=ttl)
-        }
-        self.cache_size = len(self.local_cache)
+        }), ttl_seconds=ttl)
 
     async def clear_expired(self):
         """Clear expired entries"""
-        now = datetime.now()
-        expired_keys = [
-            k for k, v in self.local_cache.items()
-            if v['expires'] < now
-        ]
-
-        for key in expired_keys:
-            del self.local_cache[key]
-
-        self.cache_size = len(self.local_cache)
+        expired = self.local_cache.purge_expired()
 
-        if expired_keys:
-            log_info(f"Cleared {len(expired_keys)} expired entries from {self.instrument_key}:{self.timeframe}")
+        if expired:
+            log_info(f"Cleared {expired} expired entries from {self.instrument_key}:{self.timeframe}")
 
     def get_stats(self) -> dict[str, Any]:
         """Get cache statistics"""
-        total_requests = self.hit_count + self.miss_count
-        hit_rate = self.hit_count / total_requests if total_requests > 0 else 0
+        stats = self.local_cache.get_stats()
 
         return {
             'instrument_key': self.instrument_key,
             'timeframe': self.timeframe,
-            'size': self.cache_size,
-            'hit_rate': hit_rate,
-            'hit_count': self.hit_count,
-            'miss_count': self.miss_count,
+            'size': stats['size'],
+            'max_size': stats['max_size'],
+            'hit_rate': stats['hit_rate'],
+            'hit_count': stats['hits'],
+            'miss_count': stats['misses'],
+            'evictions': stats['evictions'],
+            'expirations': stats['expirations'],
             'last_access': self.last_access.isoformat(),
             'subscriber_count': self.subscriber_count
         }
@@ -0,0 +1,278 @@
+"""
+Vectorized multi-timeframe resampling of 1-minute bars.
+
+The base bars are parsed once into sorted numpy columns. Every target
+timeframe is then computed with ufunc.reduceat over contiguous runs of
+bars, with no per-row Python work. Timeframes are computed from the coarsest
+already-computed timeframe that divides them (15m from 5m, 1h from 15m),
+so each step reduces an already reduced series. To make that possible,
+partial aggregates (count, sum, max, min, first, last) are kept per column.
+
+Buckets are aligned to the exchange session: an N-minute bucket starts at
+the session open plus a multiple of N, in the exchange's local time, and
+never spans two local days. Minutes before the open fall into buckets
+counted back from the open. Timeframes of a day or more group whole local
+days; whole weeks start on Monday, as in TradingSession. Empty buckets are
+not emitted.
+"""
+
+from dataclasses import dataclass, field
+from datetime import time
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.services.trading_session import week_anchor
+
+NS_PER_MINUTE = 60_000_000_000
+MINUTES_PER_DAY = 1440
+
+# Room for bucket indexes within a day, including the ones counted back from the open
+_DAY_STRIDE = 4 * MINUTES_PER_DAY
+
+# Columns that identify records and are never aggregated
+ID_COLUMNS = ('id', 'signal_id')
+
+
+def aggregation_for(column: str) -> str:
+    """Aggregation of a numeric column: 'mean', 'max', 'min' or 'sum'."""
+    if column in ['delta', 'gamma', 'theta', 'vega', 'rho', 'price', 'volume']:
+        # For Greeks and prices, use mean
+        return 'mean'
+    if column in ['high', 'ask']:
+        return 'max'
+    if column in ['low', 'bid']:
+        return 'min'
+    if column in ['volume', 'trades']:
+        return 'sum'
+    # Default to mean
+    return 'mean'
+
+
+@dataclass
+class BaseBars:
+    """1-minute bars as sorted columns: UTC timestamps (epoch ns) and float64 values."""
+    timestamps: np.ndarray
+    columns: dict[str, np.ndarray] = field(default_factory=dict)
+
+    @classmethod
+    def from_records(cls, records: list[dict[str, Any]], fields: list[str] | None = None) -> 'BaseBars':
+        """
+        Numeric columns of timestamped records, sorted by time.
+
+        Args:
+            records: Dicts with a 'timestamp' (datetime or ISO string; naive is UTC)
+            fields: Keep only these columns
+
+        Records without a parseable timestamp are dropped.
+        """
+        frame = pd.DataFrame.from_records(records)
+        if frame.empty or 'timestamp' not in frame:
+            return cls(np.empty(0, dtype=np.int64))
+
+        parsed = pd.DatetimeIndex(pd.to_datetime(frame.pop('timestamp'), utc=True, errors='coerce', format='ISO8601'))
+        keep = parsed.notna()
+        stamps = parsed.as_unit('ns').asi8[keep]
+        order = np.argsort(stamps, kind='stable')
+        timestamps = stamps[order]
+
+        columns = {}
+        for name in frame.columns:
+            if name in ID_COLUMNS or (fields and name not in fields):
+                continue
+            values = frame[name]
+            if pd.api.types.is_bool_dtype(values) or not pd.api.types.is_numeric_dtype(values):
+                continue
+            columns[name] = values.to_numpy(dtype=np.float64, na_value=np.nan)[keep][order]
+        return cls(timestamps, columns)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+@dataclass
+class ResampledBars:
+    """Bars of one timeframe as columns; timestamps are the bucket starts (UTC epoch ns)."""
+    timeframe_minutes: int
+    timestamps: np.ndarray
+    columns: dict[str, np.ndarray]
+    counts: np.ndarray   # base bars per bucket
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def to_records(self) -> list[dict[str, Any]]:
+        """Rows as dicts with an ISO 'timestamp' and 'timeframe_minutes'."""
+        stamps = np.datetime_as_string(self.timestamps.astype('datetime64[ns]'), unit='s')
+        names = ['timestamp', *self.columns, 'timeframe_minutes']
+        values = [
+            [f'{stamp}+00:00' for stamp in stamps.tolist()],
+            *(column.tolist() for column in self.columns.values()),
+            [self.timeframe_minutes] * len(self)
+        ]
+        return [dict(zip(names, row, strict=True)) for row in zip(*values, strict=True)]
+
+
+class _Partials:
+    """Per-bucket partial aggregates, reducible into coarser buckets."""
+
+    __slots__ = ('keys', 'labels', 'anchor_utc', 'anchor_local', 'bars',
+                 'count', 'sum', 'max', 'min', 'first', 'last')
+
+    @classmethod
+    def from_base(cls, bars: BaseBars, local: np.ndarray) -> '_Partials':
+        partials = cls()
+        partials.keys = partials.labels = None
+        partials.anchor_utc = bars.timestamps
+        partials.anchor_local = local
+        partials.bars = np.ones(len(bars), dtype=np.int64)
+        partials.count, partials.sum, partials.max, partials.min = {}, {}, {}, {}
+        partials.first, partials.last = {}, {}
+        for name, values in bars.columns.items():
+            valid = ~np.isnan(values)
+            partials.count[name] = valid.astype(np.int64)
+            partials.sum[name] = np.where(valid, values, 0.0)
+            partials.max[name] = np.where(valid, values, -np.inf)
+            partials.min[name] = np.where(valid, values, np.inf)
+            partials.first[name] = partials.last[name] = values
+        return partials
+
+    def reduce(self, keys: np.ndarray, label_local: np.ndarray) -> '_Partials':
+        """Merge runs of equal keys (keys must be non-decreasing); label_local is each row's bucket start."""
+        size = len(keys)
+        starts = np.flatnonzero(np.concatenate([[size > 0], keys[1:] != keys[:-1]]))
+        positions = np.arange(size)
+
+        reduced = _Partials()
+        reduced.keys = keys[starts]
+        reduced.anchor_utc = self.anchor_utc[starts]
+        reduced.anchor_local = self.anchor_local[starts]
+        # Bucket start in UTC, using the UTC offset of the bucket's first bar
+        reduced.labels = reduced.anchor_utc - (reduced.anchor_local - label_local[starts])
+        reduced.bars = np.add.reduceat(self.bars, starts)
+        reduced.count, reduced.sum, reduced.max, reduced.min = {}, {}, {}, {}
+        reduced.first, reduced.last = {}, {}
+
+        for name, count in self.count.items():
+            valid = count > 0
+            reduced.count[name] = np.add.reduceat(count, starts)
+            reduced.sum[name] = np.add.reduceat(self.sum[name], starts)
+            reduced.max[name] = np.maximum.reduceat(self.max[name], starts)
+            reduced.min[name] = np.minimum.reduceat(self.min[name], starts)
+
+            # First/last row of each run that has a value
+            first = np.minimum.reduceat(np.where(valid, positions, size), starts)
+            last = np.maximum.reduceat(np.where(valid, positions, -1), starts)
+            empty = reduced.count[name] == 0
+            reduced.first[name] = np.where(empty, np.nan, self.first[name][np.minimum(first, size - 1)])
+            reduced.last[name] = np.where(empty, np.nan, self.last[name][np.maximum(last, 0)])
+        return reduced
+
+
+class MultiTimeframeResampler:
+    """Resamples 1-minute bars into several timeframes aligned to the exchange session."""
+
+    def __init__(self, session_timezone: str = 'Asia/Kolkata', session_open: time = time(9, 15)):
+        """
+        Args:
+            session_timezone: Exchange timezone (IANA name)
+            session_open: Local time the trading session opens; intraday buckets start here
+        """
+        self.session_timezone = session_timezone
+        self.session_open = session_open
+        self._open_minute = session_open.hour * 60 + session_open.minute
+
+    def resample(self, bars: BaseBars, timeframes: list[int]) -> dict[int, ResampledBars]:
+        """
+        Aggregate the bars into each timeframe.
+
+        Args:
+            bars: 1-minute base bars
+            timeframes: Target timeframes in minutes (multiples of a day group whole days)
+
+        Returns:
+            Dict: timeframe minutes -> ResampledBars
+        """
+        local = self._local_minutes(bars.timestamps)
+        day = local // MINUTES_PER_DAY
+        minute_of_day = local - day * MINUTES_PER_DAY
+        base = _Partials.from_base(bars, local * NS_PER_MINUTE)
+
+        done: dict[int, _Partials] = {}
+        results = {}
+        for minutes in sorted(set(timeframes)):
+            if minutes < 1:
+                raise ValueError(f"Invalid timeframe: {minutes} minutes")
+
+            keys, label_local = self._bucket(day, minute_of_day, minutes)
+            source = base
+            source_minutes = 1
+            # Reduce from the coarsest computed timeframe whose buckets nest in these
+            for computed in sorted(done, reverse=True):
+                if self._nests(computed, minutes):
+                    source, source_minutes = done[computed], computed
+                    break
+
+            if source is base:
+                partials = base.reduce(keys, label_local)
+            else:
+                # Map each bar's bucket to its coarse bucket through the first bar of the fine bucket
+                fine_starts = self._run_starts(done[source_minutes].bars)
+                partials = source.reduce(keys[fine_starts], label_local[fine_starts])
+
+            done[minutes] = partials
+            results[minutes] = self._finish(minutes, partials, list(bars.columns))
+        return results
+
+    def _local_minutes(self, timestamps: np.ndarray) -> np.ndarray:
+        """Exchange-local wall-clock minutes since the epoch."""
+        local = pd.DatetimeIndex(timestamps, tz='UTC').tz_convert(self.session_timezone).tz_localize(None)
+        return local.as_unit('ns').asi8 // NS_PER_MINUTE
+
+    def _bucket(self, day: np.ndarray, minute_of_day: np.ndarray, minutes: int) -> tuple[np.ndarray, np.ndarray]:
+        """Bucket key and local bucket start (epoch ns) of every base bar."""
+        if minutes >= MINUTES_PER_DAY:
+            days = minutes // MINUTES_PER_DAY
+            anchor = week_anchor(days)
+            group = (day - anchor) // days
+            return group, ((group * days + anchor) * MINUTES_PER_DAY + self._open_minute) * NS_PER_MINUTE
+
+        index = (minute_of_day - self._open_minute) // minutes
+        start_minute = np.maximum(self._open_minute + index * minutes, 0)
+        return day * _DAY_STRIDE + index + MINUTES_PER_DAY, (day * MINUTES_PER_DAY + start_minute) * NS_PER_MINUTE
+
+    def _nests(self, fine: int, coarse: int) -> bool:
+        """Whether every fine bucket lies within one coarse bucket."""
+        if fine >= MINUTES_PER_DAY:
+            fine_days, coarse_days = fine // MINUTES_PER_DAY, coarse // MINUTES_PER_DAY
+            return coarse % fine == 0 and (week_anchor(coarse_days) - week_anchor(fine_days)) % fine_days == 0
+        return (coarse >= MINUTES_PER_DAY and coarse % MINUTES_PER_DAY == 0) or coarse % fine == 0
+
+    @staticmethod
+    def _run_starts(bars_per_bucket: np.ndarray) -> np.ndarray:
+        """Index of the first base bar of each bucket."""
+        return np.concatenate([[0], np.cumsum(bars_per_bucket)[:-1]]).astype(np.intp)
+
+    @staticmethod
+    def _finish(minutes: int, partials: _Partials, names: list[str]) -> ResampledBars:
+        columns = {}
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for name in names:
+                count = partials.count[name]
+                rule = aggregation_for(name)
+                if rule == 'mean':
+                    values = partials.sum[name] / count
+                elif rule == 'max':
+                    values = np.where(count > 0, partials.max[name], np.nan)
+                elif rule == 'min':
+                    values = np.where(count > 0, partials.min[name], np.nan)
+                else:
+                    values = partials.sum[name].copy()
+                columns[name] = values
+
+        # Also get open/close values
+        if 'value' in partials.first:
+            columns['open'] = partials.first['value']
+            columns['close'] = partials.last['value']
+        return ResampledBars(minutes, partials.labels, columns, partials.bars)
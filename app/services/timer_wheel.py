@@ -0,0 +1,327 @@
+"""
+Hierarchical timer wheel for recurring scheduled computations.
+
+Thousands of recurring timers share one scheduler task instead of each
+running its own sleeping asyncio task. Timers are hashed into wheels of
+WHEEL_SIZE slots: level 0 covers the next WHEEL_SIZE ticks at tick
+resolution, and each higher level covers WHEEL_SIZE times the span of the
+level below. When level 0 wraps, the matching slot of the next level is
+cascaded down, so a timer is touched O(levels) times over its life
+regardless of how many others exist. Scheduling and cancelling are O(1).
+
+All timers due on the same tick come back as one batch, so the caller can
+group work (e.g. per instrument) before dispatching it.
+"""
+
+import asyncio
+import contextlib
+import math
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from app.utils.logging_utils import log_exception, log_info, log_warning
+
+WHEEL_BITS = 6
+WHEEL_SIZE = 1 << WHEEL_BITS
+WHEEL_MASK = WHEEL_SIZE - 1
+
+
+@dataclass
+class TimerEntry:
+    """A recurring timer held in the wheel."""
+    key: Hashable
+    payload: Any
+    interval: float
+    due: float                   # Wall-clock seconds the timer is next due
+    level: int = 0
+    slot: int = 0
+
+
+class HierarchicalTimerWheel:
+    """Recurring timers bucketed by due tick across cascading wheels."""
+
+    def __init__(self, resolution: float = 1.0, levels: int = 4, now: float | None = None):
+        """
+        Args:
+            resolution: Seconds per tick; timers fire at most this late
+            levels: Number of wheels; the horizon is WHEEL_SIZE ** levels ticks
+            now: Starting wall-clock time (defaults to time.time())
+        """
+        if resolution <= 0:
+            raise ValueError("Timer wheel resolution must be positive")
+        self.resolution = resolution
+        self.levels = levels
+        self._wheels: list[list[dict[Hashable, TimerEntry]]] = [
+            [{} for _ in range(WHEEL_SIZE)] for _ in range(levels)
+        ]
+        self._entries: dict[Hashable, TimerEntry] = {}
+        self._current_tick = self._tick(time.time() if now is None else now)
+        self._horizon = WHEEL_SIZE ** levels - 1
+
+    def schedule(self, key: Hashable, payload: Any, interval: float, first_due: float | None = None, now: float | None = None):
+        """
+        Schedule (or reschedule) a recurring timer.
+
+        Args:
+            key: Unique timer key; an existing timer with the key is replaced
+            payload: Value returned when the timer fires
+            interval: Seconds between firings
+            first_due: Wall-clock time of the first firing (defaults to now + interval)
+            now: Current wall-clock time (defaults to time.time())
+        """
+        if interval <= 0:
+            raise ValueError("Timer interval must be positive")
+        self.cancel(key)
+
+        if first_due is None:
+            first_due = (time.time() if now is None else now) + interval
+        entry = TimerEntry(key=key, payload=payload, interval=interval, due=first_due)
+        self._entries[key] = entry
+        self._place(entry)
+
+    def cancel(self, key: Hashable) -> bool:
+        """Cancel a timer; False if no timer has the key."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        del self._wheels[entry.level][entry.slot][key]
+        return True
+
+    def advance(self, now: float) -> list[tuple[TimerEntry, float]]:
+        """
+        Move the wheel to now and collect every timer that came due.
+
+        Fired timers are rescheduled one interval after their due time. A timer
+        that fell more than an interval behind skips the missed firings
+        instead of firing repeatedly to catch up.
+
+        Args:
+            now: Current wall-clock time
+
+        Returns:
+            List: (entry, due) per fired timer, where due is the time it was due
+        """
+        target = self._tick(now)
+        fired = []
+
+        while self._current_tick < target:
+            if not self._entries:
+                self._current_tick = target
+                break
+
+            self._current_tick += 1
+            tick = self._current_tick
+            self._cascade(tick)
+
+            slot = self._wheels[0][tick & WHEEL_MASK]
+            if slot:
+                entries = list(slot.values())
+                slot.clear()
+                for entry in entries:
+                    fired.append((entry, entry.due))
+                    self._reschedule(entry, now)
+
+        return fired
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def slot_occupancy(self) -> list[int]:
+        """Number of timers held at each level."""
+        return [sum(len(slot) for slot in wheel) for wheel in self._wheels]
+
+    def _tick(self, timestamp: float) -> int:
+        return math.floor(timestamp / self.resolution)
+
+    def _reschedule(self, entry: TimerEntry, now: float):
+        next_due = entry.due + entry.interval
+        if next_due <= now:
+            next_due += entry.interval * math.floor((now - next_due) / entry.interval + 1)
+        entry.due = next_due
+        self._place(entry)
+
+    def _place(self, entry: TimerEntry, earliest_tick: int | None = None):
+        # A timer fires on the first tick boundary at or after its due time, never early;
+        # timers already due fire on the next tick
+        if earliest_tick is None:
+            earliest_tick = self._current_tick + 1
+        due_tick = max(math.ceil(entry.due / self.resolution), earliest_tick)
+        # Timers beyond the horizon park at its edge and are re-placed as they cascade
+        due_tick = min(due_tick, self._current_tick + self._horizon)
+        delta = due_tick - self._current_tick
+
+        level = 0
+        while delta >= WHEEL_SIZE ** (level + 1) and level < self.levels - 1:
+            level += 1
+
+        entry.level = level
+        entry.slot = (due_tick >> (WHEEL_BITS * level)) & WHEEL_MASK
+        self._wheels[level][entry.slot][entry.key] = entry
+
+    def _cascade(self, tick: int):
+        """Re-place timers from higher levels whose span starts at this tick."""
+        for level in range(self.levels - 1, 0, -1):
+            if tick & ((1 << (WHEEL_BITS * level)) - 1):
+                continue
+            slot = self._wheels[level][(tick >> (WHEEL_BITS * level)) & WHEEL_MASK]
+            if slot:
+                entries = list(slot.values())
+                slot.clear()
+                for entry in entries:
+                    self._place(entry, earliest_tick=tick)
+
+
+class TimerWheelScheduler:
+    """
+    Runs a HierarchicalTimerWheel from a single asyncio task.
+
+    Every tick, all timers that came due are passed as one batch to the
+    dispatch coroutine. At most max_in_flight batches run at once; a batch
+    that comes due while dispatch is saturated is skipped and its timers fire
+    again at their next interval, as after a stalled loop. Lag (fire time minus due time) and drift (scheduler
+    wake-up minus tick boundary) are tracked for monitoring.
+    """
+
+    def __init__(self,
+                 dispatch: Callable[[list[Any]], Awaitable[Any]],
+                 resolution: float = 1.0,
+                 levels: int = 4,
+                 max_in_flight: int = 4,
+                 name: str = 'timer_wheel'):
+        """
+        Args:
+            dispatch: Coroutine called with the payloads of each due batch
+            resolution: Seconds per wheel tick
+            levels: Number of cascading wheels
+            max_in_flight: Most batches dispatched concurrently
+            name: Name used in logs
+        """
+        if max_in_flight < 1:
+            raise ValueError("Timer wheel max_in_flight must be at least 1")
+        self.dispatch = dispatch
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.wheel = HierarchicalTimerWheel(resolution=resolution, levels=levels)
+        self._task: asyncio.Task | None = None
+        self._dispatching: set[asyncio.Task] = set()
+
+        self.metrics = {
+            'batches_dispatched': 0,
+            'timers_fired': 0,
+            'dispatch_errors': 0,
+            'batches_skipped': 0,
+            'timers_skipped': 0,
+            'last_batch_size': 0,
+            'max_batch_size': 0,
+            'last_lag_seconds': 0.0,
+            'max_lag_seconds': 0.0,
+            'total_lag_seconds': 0.0,
+            'last_drift_seconds': 0.0,
+            'max_drift_seconds': 0.0
+        }
+
+    def schedule(self, key: Hashable, payload: Any, interval: float, first_due: float | None = None):
+        """Schedule a recurring timer and make sure the scheduler task is running."""
+        self.wheel.schedule(key, payload, interval, first_due=first_due)
+        self.ensure_started()
+
+    def cancel(self, key: Hashable) -> bool:
+        return self.wheel.cancel(key)
+
+    def ensure_started(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the scheduler task and wait for in-flight dispatches."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+        if self._dispatching:
+            await asyncio.gather(*self._dispatching, return_exceptions=True)
+
+    def run_due(self, now: float | None = None) -> list[Any]:
+        """
+        Advance the wheel to now and start dispatching whatever came due.
+
+        Returns:
+            List: Payloads of the dispatched batch (empty if it was skipped)
+        """
+        now = time.time() if now is None else now
+        fired = self.wheel.advance(now)
+        if not fired:
+            return []
+
+        if len(self._dispatching) >= self.max_in_flight:
+            self.metrics['batches_skipped'] += 1
+            self.metrics['timers_skipped'] += len(fired)
+            log_warning(f"{self.name} skipped {len(fired)} due timers: {len(self._dispatching)} batches still in flight")
+            return []
+
+        payloads = [entry.payload for entry, _ in fired]
+        lags = [now - due for _, due in fired]
+        self._record_batch(len(payloads), lags)
+
+        # Dispatch without blocking the wheel so a slow batch cannot delay the next tick
+        task = asyncio.create_task(self._dispatch(payloads))
+        self._dispatching.add(task)
+        task.add_done_callback(self._dispatching.discard)
+        return payloads
+
+    async def _run(self):
+        resolution = self.wheel.resolution
+        log_info(f"{self.name} scheduler started (resolution {resolution}s)")
+
+        try:
+            while len(self.wheel):
+                now = time.time()
+                next_tick = (math.floor(now / resolution) + 1) * resolution
+                await asyncio.sleep(next_tick - now)
+
+                woke = time.time()
+                drift = woke - next_tick
+                self.metrics['last_drift_seconds'] = drift
+                self.metrics['max_drift_seconds'] = max(self.metrics['max_drift_seconds'], drift)
+
+                self.run_due(woke)
+        except asyncio.CancelledError:
+            log_info(f"{self.name} scheduler stopped")
+            raise
+
+    async def _dispatch(self, payloads: list[Any]):
+        try:
+            await self.dispatch(payloads)
+        except Exception as e:
+            self.metrics['dispatch_errors'] += 1
+            log_exception(f"{self.name} dispatch of {len(payloads)} timers failed: {e}")
+
+    def _record_batch(self, size: int, lags: list[float]):
+        metrics = self.metrics
+        metrics['batches_dispatched'] += 1
+        metrics['timers_fired'] += size
+        metrics['last_batch_size'] = size
+        metrics['max_batch_size'] = max(metrics['max_batch_size'], size)
+
+        worst_lag = max(lags)
+        metrics['last_lag_seconds'] = worst_lag
+        metrics['max_lag_seconds'] = max(metrics['max_lag_seconds'], worst_lag)
+        metrics['total_lag_seconds'] += sum(lags)
+
+    def get_metrics(self) -> dict[str, Any]:
+        fired = self.metrics['timers_fired']
+        return {
+            **self.metrics,
+            'avg_lag_seconds': self.metrics['total_lag_seconds'] / fired if fired else 0.0,
+            'scheduled_timers': len(self.wheel),
+            'timers_per_level': self.wheel.slot_occupancy(),
+            'in_flight_batches': len(self._dispatching),
+            'running': self._task is not None and not self._task.done()
+        }
@@ -0,0 +1,75 @@
+"""
+Exchange session bucketing shared by live bars and incremental indicators.
+
+An N-minute bucket starts at the session open plus a multiple of N in
+exchange local time and never spans two local days; minutes before the open
+fall into buckets counted back from the open, and the bucket holding the
+session close closes with the session. Buckets of a day or longer are
+labelled at the session open of their first day and close at the session
+close of their last; week buckets start on Monday. MultiTimeframeResampler
+aligns its vectorised buckets the same way.
+"""
+
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+SECONDS_PER_DAY = 86400
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# 1970-01-05, the first Monday after the epoch, as days since the epoch
+FIRST_MONDAY = 4
+
+
+def week_anchor(days: int) -> int:
+    """Day offset that multi-day buckets of `days` count from (Monday for whole weeks)."""
+    return FIRST_MONDAY if days % 7 == 0 else 0
+
+
+class TradingSession:
+    """Session hours of one exchange, used to align bars to the trading day."""
+
+    def __init__(
+        self,
+        session_timezone: str = 'Asia/Kolkata',
+        session_open: time = time(9, 15),
+        session_close: time = time(15, 30)
+    ):
+        """
+        Args:
+            session_timezone: Exchange timezone (IANA name)
+            session_open: Local time the session opens; intraday buckets start here
+            session_close: Local time the session's last intraday bar and day (and longer) bars close
+        """
+        self.tz = ZoneInfo(session_timezone)
+        self.open_seconds = session_open.hour * 3600 + session_open.minute * 60 + session_open.second
+        self.close_seconds = session_close.hour * 3600 + session_close.minute * 60 + session_close.second
+
+    def bucket(self, ts: float, seconds: int) -> tuple[float, float, float]:
+        """
+        Bucket of `seconds` holding ts.
+
+        Returns:
+            (label, first second, close time), all as UTC epoch seconds
+        """
+        local = datetime.fromtimestamp(ts, self.tz)
+        midnight = local.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        if seconds >= SECONDS_PER_DAY:
+            days = seconds // SECONDS_PER_DAY
+            day = local.toordinal() - EPOCH_ORDINAL
+            first = midnight - timedelta(days=(day - week_anchor(days)) % days)
+            last = first + timedelta(days=days - 1)
+            return (
+                (first + timedelta(seconds=self.open_seconds)).timestamp(),
+                first.timestamp(),
+                (last + timedelta(seconds=self.close_seconds)).timestamp()
+            )
+
+        since_open = (local - midnight).total_seconds() - self.open_seconds
+        start = midnight + timedelta(seconds=self.open_seconds + since_open // seconds * seconds)
+        low = max(start, midnight)
+        end = min(start + timedelta(seconds=seconds), midnight + timedelta(days=1))
+        close = midnight + timedelta(seconds=self.close_seconds)
+        if low < close < end:
+            end = close
+        return low.timestamp(), low.timestamp(), end.timestamp()
@@ -0,0 +1,210 @@
+"""
+Array-backed trailing stop book for one instrument.
+
+Every trailing stop variant reduces to "stop = peak * multiplier + shift":
+percentage, ATR and volatility trails scale the peak, absolute trails shift it.
+The book keeps one slot per stop in parallel NumPy arrays of direction, peak,
+stop, multiplier, shift and expiry. A tick then updates every stop on the
+instrument in a single vectorized pass:
+
+- stops whose level was breached are triggered and freed;
+- stops whose peak improved ratchet their stop level (never loosening it);
+- expired stops are freed.
+
+Directions are +1 for long positions (SELL stops below the market) and -1 for
+short positions (BUY stops above the market), so both sides share one set of
+comparisons on direction-signed prices.
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+LONG = 1.0
+SHORT = -1.0
+
+
+@dataclass
+class StopBookUpdate:
+    """Outcome of applying one price to a stop book."""
+    triggered: list[str] = field(default_factory=list)
+    expired: list[str] = field(default_factory=list)
+    adjusted: int = 0
+    # (peak_price, stop_price, updated_at) of triggered and expired stops as they left the book
+    final_levels: dict[str, tuple[float, float, float]] = field(default_factory=dict)
+
+
+class StopBook:
+    """Trailing stops for one instrument, evaluated together per tick."""
+
+    INITIAL_CAPACITY = 16
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        capacity = max(int(capacity), 1)
+        self._direction = np.zeros(capacity)
+        self._peak = np.zeros(capacity)
+        self._stop = np.zeros(capacity)
+        self._multiplier = np.ones(capacity)
+        self._shift = np.zeros(capacity)
+        self._expires_at = np.full(capacity, np.inf)
+        self._updated_at = np.zeros(capacity)
+        self._active = np.zeros(capacity, dtype=bool)
+        self._stop_ids: list[str | None] = [None] * capacity
+        self._slots: dict[str, int] = {}
+        self._free: list[int] = []
+        self._size = 0
+
+    def add(self,
+            stop_id: str,
+            direction: float,
+            peak_price: float,
+            stop_price: float,
+            multiplier: float,
+            shift: float,
+            expires_at: float | None = None,
+            updated_at: float = 0.0):
+        """
+        Add a stop to the book.
+
+        Args:
+            stop_id: Trailing stop identifier
+            direction: LONG or SHORT
+            peak_price: Best price seen so far
+            stop_price: Current stop level
+            multiplier: Peak multiplier of the trail (e.g. 0.98 for a 2% long trail)
+            shift: Constant added after scaling the peak (e.g. -5.0 for a 5 point long trail)
+            expires_at: Expiry as a POSIX timestamp, None if the stop never expires
+            updated_at: POSIX timestamp of the last stop adjustment
+        """
+        if direction not in (LONG, SHORT):
+            raise ValueError(f"Stop direction must be LONG or SHORT, got {direction}")
+        if stop_id in self._slots:
+            self.remove(stop_id)
+
+        slot = self._free.pop() if self._free else self._next_slot()
+        self._direction[slot] = direction
+        self._peak[slot] = peak_price
+        self._stop[slot] = stop_price
+        self._multiplier[slot] = multiplier
+        self._shift[slot] = shift
+        self._expires_at[slot] = np.inf if expires_at is None else expires_at
+        self._updated_at[slot] = updated_at
+        self._active[slot] = True
+        self._stop_ids[slot] = stop_id
+        self._slots[stop_id] = slot
+
+    def remove(self, stop_id: str) -> bool:
+        """Remove a stop; False if it is not in the book."""
+        slot = self._slots.pop(stop_id, None)
+        if slot is None:
+            return False
+        self._release(slot)
+        return True
+
+    def update(self, price: float, now: float) -> StopBookUpdate:
+        """
+        Apply a traded price to every stop in the book.
+
+        Expired stops are dropped first. Remaining stops trigger when the price
+        reaches their current stop level; otherwise a new best price moves the
+        peak and tightens the stop. Triggered and expired stops leave the book.
+
+        Args:
+            price: Latest traded price
+            now: Current POSIX timestamp
+
+        Returns:
+            StopBookUpdate: Triggered and expired stop ids, and the number of adjusted stops
+        """
+        result = StopBookUpdate()
+        n = self._size
+        if not self._slots:
+            return result
+
+        expired = self._active[:n] & (self._expires_at[:n] <= now)
+        if expired.any():
+            result.expired = self._pop_slots(np.flatnonzero(expired), result.final_levels)
+
+        active = self._active[:n]
+        direction = self._direction[:n]
+        peak = self._peak[:n]
+        stop = self._stop[:n]
+        signed_price = direction * price
+
+        triggered = active & (signed_price <= direction * stop)
+        improved = active & ~triggered & (signed_price > direction * peak)
+
+        if improved.any():
+            peak[improved] = price
+            candidate = price * self._multiplier[:n] + self._shift[:n]
+            tightened = improved & (direction * candidate > direction * stop)
+            stop[tightened] = candidate[tightened]
+            self._updated_at[:n][tightened] = now
+            result.adjusted = int(np.count_nonzero(tightened))
+
+        if triggered.any():
+            result.triggered = self._pop_slots(np.flatnonzero(triggered), result.final_levels)
+
+        return result
+
+    def pop_expired(self, now: float) -> dict[str, tuple[float, float, float]]:
+        """
+        Remove stops whose expiry is at or before now.
+
+        Returns:
+            Dict: (peak_price, stop_price, updated_at) of each removed stop, by stop id
+        """
+        n = self._size
+        expired = self._active[:n] & (self._expires_at[:n] <= now)
+        final_levels = {}
+        if expired.any():
+            self._pop_slots(np.flatnonzero(expired), final_levels)
+        return final_levels
+
+    def levels(self, stop_id: str) -> tuple[float, float, float] | None:
+        """Current (peak_price, stop_price, updated_at) of a stop, None if not in the book."""
+        slot = self._slots.get(stop_id)
+        if slot is None:
+            return None
+        return float(self._peak[slot]), float(self._stop[slot]), float(self._updated_at[slot])
+
+    def __contains__(self, stop_id: str) -> bool:
+        return stop_id in self._slots
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _pop_slots(self, slots: np.ndarray, final_levels: dict | None = None) -> list[str]:
+        stop_ids = []
+        for slot in slots.tolist():
+            stop_id = self._stop_ids[slot]
+            if final_levels is not None:
+                final_levels[stop_id] = (float(self._peak[slot]), float(self._stop[slot]), float(self._updated_at[slot]))
+            del self._slots[stop_id]
+            self._release(slot)
+            stop_ids.append(stop_id)
+        return stop_ids
+
+    def _release(self, slot: int):
+        self._active[slot] = False
+        self._stop_ids[slot] = None
+        self._free.append(slot)
+
+    def _next_slot(self) -> int:
+        if self._size == len(self._active):
+            self._grow(2 * len(self._active))
+        slot = self._size
+        self._size += 1
+        return slot
+
+    def _grow(self, capacity: int):
+        extra = capacity - len(self._active)
+        self._direction = np.concatenate([self._direction, np.zeros(extra)])
+        self._peak = np.concatenate([self._peak, np.zeros(extra)])
+        self._stop = np.concatenate([self._stop, np.zeros(extra)])
+        self._multiplier = np.concatenate([self._multiplier, np.ones(extra)])
+        self._shift = np.concatenate([self._shift, np.zeros(extra)])
+        self._expires_at = np.concatenate([self._expires_at, np.full(extra, np.inf)])
+        self._updated_at = np.concatenate([self._updated_at, np.zeros(extra)])
+        self._active = np.concatenate([self._active, np.zeros(extra, dtype=bool)])
+        self._stop_ids.extend([None] * extra)
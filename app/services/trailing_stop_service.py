@@ -27,6 +27,7 @@ from app.sdk import (
     create_instrument_client,
     create_order_client,
 )
+from app.services.trailing_stop_book import LONG, SHORT, StopBook, StopBookUpdate
 
 logger = logging.getLogger(__name__)
 
@@ -89,7 +90,8 @@ class TrailingStopService:
     def __init__(self,
                  instrument_client: InstrumentClient | None = None,
                  order_client: OrderClient | None = None,
-                 data_client: DataClient | None = None):
+                 data_client: DataClient | None = None,
+                 tick_driven: bool = False):
         """
         Initialize trailing stop service with Phase 1 SDK integration
 
@@ -97,6 +99,8 @@ class TrailingStopService:
             instrument_client: Client for metadata and token resolution
             order_client: Client for order execution
             data_client: Client for price monitoring
+            tick_driven: Evaluate stops only on prices pushed through on_price_update()
+                instead of polling quotes every price_check_interval
         """
         self.instrument_client = instrument_client or create_instrument_client()
         self.order_client = order_client or create_order_client()
@@ -107,6 +111,10 @@ class TrailingStopService:
         self._stop_executions: dict[str, list[TrailingStopExecution]] = {}
         self._stop_status: dict[str, TrailingStopStatus] = {}
 
+        # Per-instrument books of active stops, evaluated in one pass per price
+        self._stop_books: dict[str, StopBook] = {}
+        self.tick_driven = tick_driven
+
         # Price monitoring
         self._price_subscriptions: dict[str, dict[str, Any]] = {}
         self._monitoring_task: asyncio.Task | None = None
@@ -197,6 +205,7 @@ class TrailingStopService:
         self._active_stops[stop_id] = stop_config
         self._stop_status[stop_id] = TrailingStopStatus.ACTIVE
         self._stop_executions[stop_id] = []
+        self._add_to_stop_book(stop_config)
 
         # Start price monitoring for this instrument
         await self._add_price_subscription(instrument_key)
@@ -241,8 +250,17 @@ class TrailingStopService:
         if self._monitoring_task is None or self._monitoring_task.done():
             self._monitoring_task = asyncio.create_task(self._price_monitoring_loop())
 
+    def watched_instruments(self) -> frozenset[str]:
+        """Instruments with trailing stops, whose ticks must be read"""
+        return frozenset(self._price_subscriptions)
+
     async def _price_monitoring_loop(self):
-        """Main price monitoring loop for all subscribed instruments"""
+        """
+        Main price monitoring loop for all subscribed instruments
+
+        In tick-driven mode prices arrive through on_price_update() and the loop
+        only expires stops and cleans up subscriptions.
+        """
         logger.info("Starting trailing stop price monitoring loop")
 
         try:
@@ -251,13 +269,16 @@ class TrailingStopService:
                     await asyncio.sleep(self.price_check_interval)
                     continue
 
-                # Get prices for all subscribed instruments
-                tasks = []
-                for instrument_key in list(self._price_subscriptions.keys()):
-                    tasks.append(self._update_instrument_price(instrument_key))
+                if self.tick_driven:
+                    self._expire_stops()
+                else:
+                    # Get prices for all subscribed instruments
+                    tasks = []
+                    for instrument_key in list(self._price_subscriptions.keys()):
+                        tasks.append(self._update_instrument_price(instrument_key))
 
-                if tasks:
-                    await asyncio.gather(*tasks, return_exceptions=True)
+                    if tasks:
+                        await asyncio.gather(*tasks, return_exceptions=True)
 
                 # Clean up inactive subscriptions
                 await self._cleanup_subscriptions()
@@ -274,137 +295,136 @@ class TrailingStopService:
             self._monitoring_task = asyncio.create_task(self._price_monitoring_loop())
 
     async def _update_instrument_price(self, instrument_key: str):
-        """Update price for specific instrument and check trailing stops"""
+        """Poll the quote for specific instrument and check trailing stops"""
         try:
             # Get current quote
             quote = await self.data_client.get_real_time_quote(instrument_key)
-            current_price = quote.data.get('ltp', 0)
-
-            if current_price <= 0:
-                logger.warning(f"Invalid price for {instrument_key}: {current_price}")
-                return
-
-            # Update subscription
-            subscription = self._price_subscriptions[instrument_key]
-            last_price = subscription["last_price"]
-
-            # Validate price movement (filter out obvious errors)
-            if last_price > 0:
-                price_change = abs(current_price - last_price) / last_price
-                if price_change > self.max_price_deviation:
-                    logger.warning(f"Suspicious price movement for {instrument_key}: {price_change:.2%}")
-                    return
-
-            subscription["last_price"] = current_price
-            subscription["last_update"] = datetime.now()
-
-            # Check all trailing stops for this instrument
-            await self._check_trailing_stops(instrument_key, current_price, quote)
+            await self.on_price_update(instrument_key, quote.data.get('ltp', 0), quote)
 
         except Exception as e:
             logger.error(f"Failed to update price for {instrument_key}: {e}")
 
-    async def _check_trailing_stops(self, instrument_key: str, current_price: float, quote_data):
-        """Check and update trailing stops for instrument"""
-        stops_to_check = [
-            (stop_id, config) for stop_id, config in self._active_stops.items()
-            if config.instrument_key == instrument_key and
-            self._stop_status.get(stop_id) == TrailingStopStatus.ACTIVE
-        ]
+    async def on_price_update(self, instrument_key: str, current_price: float, quote_data=None):
+        """
+        Apply a price for an instrument to all of its trailing stops
 
-        for stop_id, config in stops_to_check:
-            try:
-                await self._update_trailing_stop(stop_id, config, current_price, quote_data)
-            except Exception as e:
-                logger.error(f"Failed to update trailing stop {stop_id}: {e}")
-                self._stop_status[stop_id] = TrailingStopStatus.ERROR
+        Called by the polling loop or, in tick-driven mode, by the tick consumer
+        (through TickPriceFeed) for every traded price. Instruments without stops return after a dict lookup.
 
-    async def _update_trailing_stop(self,
-                                   stop_id: str,
-                                   config: TrailingStopConfig,
-                                   current_price: float,
-                                   quote_data):
-        """Update individual trailing stop based on current price"""
-        # Check expiration
-        if config.expires_at and datetime.now() > config.expires_at:
-            self._stop_status[stop_id] = TrailingStopStatus.EXPIRED
-            logger.info(f"Trailing stop expired: {stop_id}")
+        Args:
+            instrument_key: Instrument the price belongs to
+            current_price: Latest traded price
+            quote_data: Quote the price came from, if any
+        """
+        subscription = self._price_subscriptions.get(instrument_key)
+        if subscription is None:
             return
 
-        # Update peak price and adjust stop
-        price_improved = False
-
-        if config.side == "SELL":  # Long position
-            if current_price > config.peak_price:
-                config.peak_price = current_price
-                price_improved = True
+        if current_price <= 0:
+            logger.warning(f"Invalid price for {instrument_key}: {current_price}")
+            return
 
-            # Check if stop should trigger
-            if current_price <= config.current_stop_price:
-                await self._trigger_stop(stop_id, config, current_price, quote_data)
+        # Validate price movement (filter out obvious errors)
+        last_price = subscription["last_price"]
+        if last_price > 0:
+            price_change = abs(current_price - last_price) / last_price
+            if price_change > self.max_price_deviation:
+                logger.warning(f"Suspicious price movement for {instrument_key}: {price_change:.2%}")
                 return
 
-        else:  # Short position (side == "BUY")
-            if current_price < config.peak_price:
-                config.peak_price = current_price
-                price_improved = True
+        subscription["last_price"] = current_price
+        subscription["last_update"] = datetime.now()
 
-            # Check if stop should trigger
-            if current_price >= config.current_stop_price:
-                await self._trigger_stop(stop_id, config, current_price, quote_data)
-                return
+        # Check all trailing stops for this instrument
+        await self._check_trailing_stops(instrument_key, current_price, quote_data)
 
-        # Adjust trailing stop if price improved
-        if price_improved:
-            new_stop_price = self._calculate_new_stop_price(config)
+    async def _check_trailing_stops(self, instrument_key: str, current_price: float, quote_data):
+        """Check and update trailing stops for instrument"""
+        book = self._stop_books.get(instrument_key)
+        if book is None:
+            return
 
-            if config.side == "SELL":
-                # Only move stop up for long position
-                if new_stop_price > config.current_stop_price:
-                    old_stop = config.current_stop_price
-                    config.current_stop_price = new_stop_price
-                    config.last_updated = datetime.now()
+        update = book.update(current_price, datetime.now().timestamp())
+        if update.adjusted:
+            logger.debug(f"Adjusted {update.adjusted} trailing stops for {instrument_key} at {current_price:.2f}")
 
-                    logger.debug(f"Stop adjusted up: {stop_id} {old_stop:.2f} -> {new_stop_price:.2f}")
-            else:
-                # Only move stop down for short position
-                if new_stop_price < config.current_stop_price:
-                    old_stop = config.current_stop_price
-                    config.current_stop_price = new_stop_price
-                    config.last_updated = datetime.now()
+        self._apply_final_levels(update)
+        for stop_id in update.expired:
+            self._stop_status[stop_id] = TrailingStopStatus.EXPIRED
+            logger.info(f"Trailing stop expired: {stop_id}")
+
+        for stop_id in update.triggered:
+            try:
+                await self._trigger_stop(stop_id, self._active_stops[stop_id], current_price, quote_data)
+            except Exception as e:
+                logger.error(f"Failed to update trailing stop {stop_id}: {e}")
+                self._stop_status[stop_id] = TrailingStopStatus.ERROR
 
-                    logger.debug(f"Stop adjusted down: {stop_id} {old_stop:.2f} -> {new_stop_price:.2f}")
+    def _expire_stops(self, now: datetime | None = None):
+        """Expire stops on all instruments, including ones that are not ticking"""
+        timestamp = (now or datetime.now()).timestamp()
+        for book in self._stop_books.values():
+            for stop_id, levels in book.pop_expired(timestamp).items():
+                self._set_stop_levels(self._active_stops[stop_id], levels)
+                self._stop_status[stop_id] = TrailingStopStatus.EXPIRED
+                logger.info(f"Trailing stop expired: {stop_id}")
 
-    def _calculate_new_stop_price(self, config: TrailingStopConfig) -> float:
-        """Calculate new stop price based on trail configuration"""
-        peak_price = config.peak_price
+    def _trail_parameters(self, config: TrailingStopConfig) -> tuple[float, float]:
+        """
+        Express the trail as stop = peak * multiplier + shift
 
-        if config.trail_type == TrailingStopType.PERCENTAGE:
-            if config.side == "SELL":  # Long position
-                return peak_price * (1 - config.trail_value / 100)
-            # Short position
-            return peak_price * (1 + config.trail_value / 100)
+        Returns:
+            Tuple: (multiplier, shift) for the stop's side and trail type
+        """
+        direction = LONG if config.side == "SELL" else SHORT
 
         if config.trail_type == TrailingStopType.ABSOLUTE:
-            if config.side == "SELL":  # Long position
-                return peak_price - config.trail_value
-            # Short position
-            return peak_price + config.trail_value
+            return 1.0, -direction * config.trail_value
 
-        if config.trail_type == TrailingStopType.ATR:
+        if config.trail_type == TrailingStopType.PERCENTAGE:
+            fraction = config.trail_value / 100
+        elif config.trail_type == TrailingStopType.ATR:
             # For ATR, would need to calculate ATR from historical data
             # Simplified implementation using fixed multiplier
-            atr_estimate = peak_price * 0.02  # 2% as ATR estimate
-            if config.side == "SELL":
-                return peak_price - (atr_estimate * config.trail_value)
-            return peak_price + (atr_estimate * config.trail_value)
-
-        # VOLATILITY
-        # For volatility, would calculate based on recent price volatility
-        vol_estimate = peak_price * 0.015  # 1.5% as volatility estimate
-        if config.side == "SELL":
-            return peak_price - (vol_estimate * config.trail_value)
-        return peak_price + (vol_estimate * config.trail_value)
+            fraction = 0.02 * config.trail_value  # 2% as ATR estimate
+        else:
+            # VOLATILITY
+            # For volatility, would calculate based on recent price volatility
+            fraction = 0.015 * config.trail_value  # 1.5% as volatility estimate
+
+        return 1.0 - direction * fraction, 0.0
+
+    def _add_to_stop_book(self, config: TrailingStopConfig):
+        """Place an active stop in its instrument's stop book"""
+        multiplier, shift = self._trail_parameters(config)
+        book = self._stop_books.setdefault(config.instrument_key, StopBook())
+        book.add(
+            config.stop_id,
+            LONG if config.side == "SELL" else SHORT,
+            config.peak_price,
+            config.current_stop_price,
+            multiplier,
+            shift,
+            expires_at=config.expires_at.timestamp() if config.expires_at else None,
+            updated_at=config.last_updated.timestamp()
+        )
+
+    def _sync_stop_levels(self, config: TrailingStopConfig):
+        """Copy the live peak and stop levels from the stop book onto the config"""
+        book = self._stop_books.get(config.instrument_key)
+        levels = book.levels(config.stop_id) if book is not None else None
+        if levels is not None:
+            self._set_stop_levels(config, levels)
+
+    def _apply_final_levels(self, update: StopBookUpdate):
+        for stop_id, levels in update.final_levels.items():
+            self._set_stop_levels(self._active_stops[stop_id], levels)
+
+    @staticmethod
+    def _set_stop_levels(config: TrailingStopConfig, levels: tuple[float, float, float]):
+        config.peak_price, config.current_stop_price, updated_at = levels
+        if updated_at > config.last_updated.timestamp():
+            config.last_updated = datetime.fromtimestamp(updated_at)
 
     # =============================================================================
     # STOP EXECUTION (token resolution via SDK)
@@ -481,6 +501,9 @@ class TrailingStopService:
 
         # Update status
         self._stop_status[stop_id] = TrailingStopStatus.CANCELLED
+        self._sync_stop_levels(config)
+        if config.instrument_key in self._stop_books:
+            self._stop_books[config.instrument_key].remove(stop_id)
 
         # Get metadata for response
         try:
@@ -505,6 +528,7 @@ class TrailingStopService:
             raise ValueError(f"Trailing stop not found: {stop_id}")
 
         config = self._active_stops[stop_id]
+        self._sync_stop_levels(config)
         status = self._stop_status.get(stop_id, TrailingStopStatus.ACTIVE)
         executions = self._stop_executions.get(stop_id, [])
 
@@ -564,6 +588,8 @@ class TrailingStopService:
             if instrument_key and config.instrument_key != instrument_key:
                 continue
 
+            self._sync_stop_levels(config)
+
             # Get metadata
             try:
                 metadata = await self.instrument_client.get_instrument_metadata(config.instrument_key)
@@ -597,21 +623,14 @@ class TrailingStopService:
 
     async def _cleanup_subscriptions(self):
         """Clean up inactive price subscriptions"""
-        instruments_to_remove = []
-
-        for instrument_key, _subscription in self._price_subscriptions.items():
-            # Check if any active stops exist for this instrument
-            has_active_stops = any(
-                config.instrument_key == instrument_key and
-                self._stop_status.get(stop_id) == TrailingStopStatus.ACTIVE
-                for stop_id, config in self._active_stops.items()
-            )
-
-            if not has_active_stops:
-                instruments_to_remove.append(instrument_key)
+        instruments_to_remove = [
+            instrument_key for instrument_key in self._price_subscriptions
+            if not self._stop_books.get(instrument_key)
+        ]
 
         for instrument_key in instruments_to_remove:
             del self._price_subscriptions[instrument_key]
+            self._stop_books.pop(instrument_key, None)
             logger.debug(f"Removed price subscription for {instrument_key}")
 
     async def shutdown(self):
@@ -622,3 +641,14 @@ class TrailingStopService:
                 await self._monitoring_task
 
         logger.info("Trailing stop service shutdown complete")
+
+
+_trailing_stop_service: TrailingStopService | None = None
+
+
+def get_trailing_stop_service() -> TrailingStopService:
+    """Process-wide tick-driven trailing stop service shared by the API and the tick consumer."""
+    global _trailing_stop_service
+    if _trailing_stop_service is None:
+        _trailing_stop_service = TrailingStopService(tick_driven=True)
+    return _trailing_stop_service
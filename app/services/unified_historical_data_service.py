@@ -5,8 +5,6 @@ Single entry point for all historical data operations, eliminating redundancy.
 Consolidates functionality from historical_data_manager_production.py and historical_data_client.py.
 """
 import logging
-import threading
-from collections import defaultdict
 from datetime import datetime
 from typing import Any
 
@@ -14,6 +12,7 @@ import httpx
 
 from app.clients.ticker_service_client import get_ticker_service_client
 from app.errors import DataAccessError
+from app.services.historical_bar_store import get_historical_bar_store
 from app.utils.logging_utils import log_error, log_info
 
 logger = logging.getLogger(__name__)
@@ -29,8 +28,7 @@ class UnifiedHistoricalDataService:
     """
 
     def __init__(self):
-        self._cache = {}
-        self._cache_locks = defaultdict(threading.Lock)
+        self._bar_store = get_historical_bar_store()
         self._ticker_client = None
 
     async def get_ticker_client(self):
@@ -39,6 +37,28 @@ class UnifiedHistoricalDataService:
             self._ticker_client = get_ticker_service_client()
         return self._ticker_client
 
+    async def _get_bars(
+        self,
+        instrument_key: str,
+        start_time: datetime,
+        end_time: datetime,
+        interval: str
+    ) -> list[dict[str, Any]]:
+        """
+        Bars of an instrument from the shared bar store.
+
+        Lookbacks on the same (instrument, interval) share the cached bars;
+        only ranges not cached yet are fetched from ticker_service.
+        """
+        client = await self.get_ticker_client()
+
+        async def fetch(gap_start: datetime, gap_end: datetime) -> list[dict[str, Any]]:
+            return await self._fetch_from_ticker_service(
+                client, instrument_key, gap_start, gap_end, interval
+            )
+
+        return await self._bar_store.get_bars(instrument_key, interval, start_time, end_time, fetch)
+
     # === INDICATOR DATA METHODS (from historical_data_manager_production) ===
 
     async def get_historical_data_for_indicator(
@@ -52,25 +72,9 @@ class UnifiedHistoricalDataService:
         Get historical data optimized for indicator calculations.
         Replaces ProductionHistoricalDataManager.get_historical_data_for_indicator()
         """
-        cache_key = f"indicator:{instrument_key}:{start_time}:{end_time}:{interval}"
-
-        # Check cache first
-        with self._cache_locks[cache_key]:
-            if cache_key in self._cache:
-                log_info(f"Cache hit for indicator data: {instrument_key}")
-                return self._cache[cache_key]
-
         try:
-            client = await self.get_ticker_client()
-            data = await self._fetch_from_ticker_service(
-                client, instrument_key, start_time, end_time, interval
-            )
-
-            # Cache the result
-            with self._cache_locks[cache_key]:
-                self._cache[cache_key] = data
-
-            log_info(f"Fetched {len(data)} records for indicator {instrument_key}")
+            data = await self._get_bars(instrument_key, start_time, end_time, interval)
+            log_info(f"Loaded {len(data)} records for indicator {instrument_key}")
             return data
 
         except Exception as e:
@@ -90,23 +94,9 @@ class UnifiedHistoricalDataService:
         Get OHLCV timeframe data.
         Replaces HistoricalDataClient.get_historical_timeframe_data()
         """
-        cache_key = f"timeframe:{instrument_key}:{start_time}:{end_time}:{timeframe}"
-
-        with self._cache_locks[cache_key]:
-            if cache_key in self._cache:
-                log_info(f"Cache hit for timeframe data: {instrument_key}")
-                return self._cache[cache_key]
-
         try:
-            client = await self.get_ticker_client()
-            data = await self._fetch_ohlcv_data(
-                client, instrument_key, start_time, end_time, timeframe
-            )
-
-            with self._cache_locks[cache_key]:
-                self._cache[cache_key] = data
-
-            return data
+            raw_data = await self._get_bars(instrument_key, start_time, end_time, timeframe)
+            return self._format_ohlcv(raw_data)
 
         except Exception as e:
             log_error(f"Failed to fetch timeframe data for {instrument_key}: {e}")
@@ -123,28 +113,13 @@ class UnifiedHistoricalDataService:
         """
         Get moneyness-specific historical data.
         """
-        cache_key = f"moneyness:{underlying}:{strike}:{expiry}:{start_time}:{end_time}"
-
-        with self._cache_locks[cache_key]:
-            if cache_key in self._cache:
-                return self._cache[cache_key]
-
         try:
             # Get underlying price data for moneyness calculations
             underlying_key = f"{underlying}@INDEX" if "@" not in underlying else underlying
-            client = await self.get_ticker_client()
-
-            data = await self._fetch_from_ticker_service(
-                client, underlying_key, start_time, end_time, "1m"
-            )
+            data = await self._get_bars(underlying_key, start_time, end_time, "1m")
 
             # Enhance with moneyness calculations
-            enhanced_data = self._calculate_moneyness_metrics(data, strike, expiry)
-
-            with self._cache_locks[cache_key]:
-                self._cache[cache_key] = enhanced_data
-
-            return enhanced_data
+            return self._calculate_moneyness_metrics(data, strike, expiry)
 
         except Exception as e:
             log_error(f"Failed to fetch moneyness data for {underlying}: {e}")
@@ -177,19 +152,8 @@ class UnifiedHistoricalDataService:
         except httpx.HTTPError as e:
             raise DataAccessError(f"HTTP error fetching from ticker service: {e}")
 
-    async def _fetch_ohlcv_data(
-        self,
-        client,
-        instrument_key: str,
-        start_time: datetime,
-        end_time: datetime,
-        timeframe: str
-    ) -> list[dict[str, Any]]:
-        """Fetch OHLCV data with specific formatting."""
-        raw_data = await self._fetch_from_ticker_service(
-            client, instrument_key, start_time, end_time, timeframe
-        )
-
+    def _format_ohlcv(self, raw_data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Bars in OHLCV format."""
         # Ensure OHLCV format
         ohlcv_data = []
         for record in raw_data:
@@ -233,17 +197,13 @@ class UnifiedHistoricalDataService:
     # === CACHE MANAGEMENT ===
 
     def clear_cache(self):
-        """Clear the internal cache."""
-        with threading.Lock():
-            self._cache.clear()
-            log_info("Historical data cache cleared")
+        """Clear the shared historical bar cache."""
+        self._bar_store.invalidate()
+        log_info("Historical data cache cleared")
 
     def get_cache_stats(self) -> dict[str, Any]:
         """Get cache statistics."""
-        return {
-            'cache_size': len(self._cache),
-            'cache_keys': list(self._cache.keys())
-        }
+        return self._bar_store.get_stats()
 
 
 # Global service instance
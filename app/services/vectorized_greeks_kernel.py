@@ -0,0 +1,168 @@
+"""
+Closed-form Greeks kernel operating on whole option chains as float64 arrays.
+
+Computes d1/d2, the normal CDF/PDF and every requested Greek in a single pass
+for Black-Scholes, Black-Scholes-Merton and Black-76. Output units follow the
+py_vollib analytical conventions so results are interchangeable with the
+scalar path:
+- theta: change in price per calendar day (annual theta / 365)
+- vega: change in price per 1 percentage point of volatility
+- rho: change in price per 1 percentage point of the risk-free rate
+"""
+
+import numpy as np
+from scipy.special import ndtr
+
+GREEK_NAMES = ('delta', 'gamma', 'theta', 'vega', 'rho')
+
+SUPPORTED_KERNEL_MODELS = ('black_scholes', 'black_scholes_merton', 'black76')
+
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
+
+def norm_pdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal probability density."""
+    return _INV_SQRT_2PI * np.exp(-0.5 * x * x)
+
+
+def _as_float_array(value, n: int) -> np.ndarray:
+    """Broadcast a scalar or array input to a contiguous float64 array of length n."""
+    arr = np.asarray(value, dtype=np.float64)
+    if arr.ndim == 0:
+        return np.full(n, float(arr))
+    return np.ascontiguousarray(arr)
+
+
+def compute_greeks(
+    model_name: str,
+    is_call: np.ndarray,
+    underlying: np.ndarray,
+    strikes: np.ndarray,
+    times: np.ndarray,
+    rates: np.ndarray,
+    volatilities: np.ndarray,
+    dividend_yields: np.ndarray | float = 0.0,
+    greeks: tuple[str, ...] | list[str] = GREEK_NAMES,
+) -> dict[str, np.ndarray]:
+    """
+    Compute Greeks for every option in the chain in one vectorized pass.
+
+    Args:
+        model_name: 'black_scholes', 'black_scholes_merton' or 'black76'
+        is_call: Boolean array, True for calls and False for puts
+        underlying: Spot prices (or forward prices for black76)
+        strikes: Strike prices
+        times: Times to expiry in years
+        rates: Annual risk-free rates
+        volatilities: Annual volatilities
+        dividend_yields: Continuous dividend yields (used by black_scholes_merton only)
+        greeks: Names of the Greeks to return
+
+    Returns:
+        Dict mapping each requested Greek name to a float64 array
+    """
+    if model_name not in SUPPORTED_KERNEL_MODELS:
+        raise ValueError(f"Unsupported kernel model: {model_name}")
+
+    is_call = np.asarray(is_call, dtype=bool)
+    n = is_call.shape[0]
+    S = _as_float_array(underlying, n)
+    K = _as_float_array(strikes, n)
+    t = _as_float_array(times, n)
+    r = _as_float_array(rates, n)
+    sigma = _as_float_array(volatilities, n)
+
+    q = _as_float_array(dividend_yields, n) if model_name == 'black_scholes_merton' else np.zeros(n)
+
+    sqrt_t = np.sqrt(t)
+    sigma_sqrt_t = sigma * sqrt_t
+    disc_r = np.exp(-r * t)
+
+    if model_name == 'black76':
+        d1 = (np.log(S / K) + 0.5 * sigma * sigma * t) / sigma_sqrt_t
+        # Black-76 discounts the forward at the risk-free rate
+        carry_rate = r
+        carry_disc = disc_r
+    else:
+        d1 = (np.log(S / K) + (r - q + 0.5 * sigma * sigma) * t) / sigma_sqrt_t
+        carry_rate = q
+        carry_disc = np.exp(-q * t)
+    d2 = d1 - sigma_sqrt_t
+
+    pdf_d1 = norm_pdf(d1)
+    # Signed CDF terms: N(d) for calls, N(-d) for puts
+    sign = np.where(is_call, 1.0, -1.0)
+    cdf_d1 = ndtr(sign * d1)
+    cdf_d2 = ndtr(sign * d2)
+
+    results: dict[str, np.ndarray] = {}
+    wanted = set(greeks)
+
+    if 'delta' in wanted:
+        results['delta'] = sign * carry_disc * cdf_d1
+
+    if 'gamma' in wanted:
+        results['gamma'] = carry_disc * pdf_d1 / (S * sigma_sqrt_t)
+
+    if 'vega' in wanted:
+        results['vega'] = S * carry_disc * pdf_d1 * sqrt_t * 0.01
+
+    if 'theta' in wanted:
+        decay = S * carry_disc * pdf_d1 * sigma / (2.0 * sqrt_t)
+        carry = carry_rate * S * carry_disc * cdf_d1
+        financing = r * K * disc_r * cdf_d2
+        results['theta'] = (-decay + sign * (carry - financing)) / 365.0
+
+    if 'rho' in wanted:
+        if model_name == 'black76':
+            price = sign * disc_r * (S * cdf_d1 - K * cdf_d2)
+            results['rho'] = -t * price * 0.01
+        else:
+            results['rho'] = sign * t * K * disc_r * cdf_d2 * 0.01
+
+    return results
+
+
+def price_and_vega(
+    model_name: str,
+    is_call: np.ndarray,
+    underlying: np.ndarray,
+    strikes: np.ndarray,
+    times: np.ndarray,
+    rates: np.ndarray,
+    volatilities: np.ndarray,
+    dividend_yields: np.ndarray | float = 0.0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute option prices and raw vega (dPrice/dSigma, not scaled to 1%).
+
+    Used by the implied volatility solver, which needs both on every Newton step.
+    """
+    if model_name not in SUPPORTED_KERNEL_MODELS:
+        raise ValueError(f"Unsupported kernel model: {model_name}")
+
+    is_call = np.asarray(is_call, dtype=bool)
+    n = is_call.shape[0]
+    S = _as_float_array(underlying, n)
+    K = _as_float_array(strikes, n)
+    t = _as_float_array(times, n)
+    r = _as_float_array(rates, n)
+    sigma = _as_float_array(volatilities, n)
+
+    sqrt_t = np.sqrt(t)
+    sigma_sqrt_t = sigma * sqrt_t
+    disc_r = np.exp(-r * t)
+
+    if model_name == 'black76':
+        d1 = (np.log(S / K) + 0.5 * sigma * sigma * t) / sigma_sqrt_t
+        carry_disc = disc_r
+    else:
+        q = _as_float_array(dividend_yields, n) if model_name == 'black_scholes_merton' else 0.0
+        d1 = (np.log(S / K) + (r - q + 0.5 * sigma * sigma) * t) / sigma_sqrt_t
+        carry_disc = np.exp(-q * t)
+    d2 = d1 - sigma_sqrt_t
+
+    sign = np.where(is_call, 1.0, -1.0)
+    prices = sign * (S * carry_disc * ndtr(sign * d1) - K * disc_r * ndtr(sign * d2))
+    vegas = S * carry_disc * norm_pdf(d1) * sqrt_t
+    return prices, vegas
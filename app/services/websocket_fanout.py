@@ -0,0 +1,209 @@
+"""
+Per-client send queues for WebSocket fan-out.
+
+A broadcast serializes its payload once (or forwards the raw Redis payload)
+and appends the same text frame to every subscriber's queue. Each client has
+its own writer task draining the queue, so a slow or stalled client only
+backs up its own queue instead of holding up the broadcast for everyone.
+Queues are bounded; when a client falls behind, the overflow policy either
+drops its oldest queued frames or disconnects it.
+
+Subscriptions can instead be conflated: the queue keeps only the latest frame
+per subscription key in a slot map and the writer flushes the slots at most
+once per conflation window. A client on a slow network then receives the
+current value of everything it watches at a rate it can sustain, and its
+memory is bounded by its number of subscriptions rather than by the update rate.
+"""
+
+import asyncio
+import contextlib
+import json
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from app.utils.logging_utils import log_warning
+
+DROP_OLDEST = 'drop_oldest'
+DISCONNECT = 'disconnect'
+OVERFLOW_POLICIES = (DROP_OLDEST, DISCONNECT)
+
+
+def encode_frame(message: dict[str, Any]) -> str:
+    """Serialize a message the same way WebSocket.send_json does."""
+    return json.dumps(message, separators=(',', ':'), ensure_ascii=False)
+
+
+class ClientSendQueue:
+    """Bounded queue of pre-serialized text frames with its own writer task."""
+
+    def __init__(self,
+                 client_id: str,
+                 websocket: Any,
+                 max_frames: int = 1000,
+                 overflow_policy: str = DROP_OLDEST,
+                 on_close: Callable[[str, str], None] | None = None,
+                 conflation_window: float = 0.25):
+        """
+        Args:
+            client_id: Client the queue belongs to
+            websocket: Connection frames are written to (needs send_text)
+            max_frames: Frames held before the overflow policy applies
+            overflow_policy: DROP_OLDEST or DISCONNECT
+            on_close: Called with (client_id, reason) when the writer gives up
+                on the client, either on a send error or a DISCONNECT overflow
+            conflation_window: Minimum seconds between flushes of conflated slots
+        """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        if max_frames <= 0:
+            raise ValueError("max_frames must be positive")
+
+        self.client_id = client_id
+        self.websocket = websocket
+        self.max_frames = max_frames
+        self.overflow_policy = overflow_policy
+        self.on_close = on_close
+        self.conflation_window = conflation_window
+
+        self._frames: deque[str] = deque()
+        self._slots: dict[str, str] = {}
+        self._next_flush = 0.0
+        self._ready = asyncio.Event()
+        # Set while the writer has sent everything queued (or the queue is closed)
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task: asyncio.Task | None = None
+        self.closed = False
+
+        self.metrics = {
+            'frames_enqueued': 0,
+            'frames_sent': 0,
+            'frames_dropped': 0,
+            'frames_conflated': 0,
+            'slot_flushes': 0,
+            'send_errors': 0,
+            'max_queue_depth': 0
+        }
+
+    def start(self):
+        if self._task is None and not self.closed:
+            self._task = asyncio.create_task(self._writer())
+
+    def enqueue(self, frame: str) -> bool:
+        """
+        Queue a frame for the client without waiting for it to be sent.
+
+        Returns:
+            bool: False if the client is closed or was disconnected for overflowing
+        """
+        if self.closed:
+            return False
+
+        frames = self._frames
+        if len(frames) >= self.max_frames:
+            if self.overflow_policy == DISCONNECT:
+                self.metrics['frames_dropped'] += len(frames) + 1
+                self._close('send queue overflow')
+                return False
+            frames.popleft()
+            self.metrics['frames_dropped'] += 1
+
+        frames.append(frame)
+        self.metrics['frames_enqueued'] += 1
+        if len(frames) > self.metrics['max_queue_depth']:
+            self.metrics['max_queue_depth'] = len(frames)
+        self._idle.clear()
+        self._ready.set()
+        return True
+
+    def conflate(self, key: str, frame: str) -> bool:
+        """
+        Hold a frame as the latest value for key, replacing any unsent one.
+
+        Returns:
+            bool: False if the client is closed
+        """
+        if self.closed:
+            return False
+
+        if key in self._slots:
+            self.metrics['frames_conflated'] += 1
+        self._slots[key] = frame
+        self.metrics['frames_enqueued'] += 1
+        self._idle.clear()
+        self._ready.set()
+        return True
+
+    def discard_slot(self, key: str):
+        """Drop an unsent conflated frame, e.g. after the subscription ended."""
+        self._slots.pop(key, None)
+
+    def stop(self):
+        """Stop the writer; queued frames are discarded."""
+        self.closed = True
+        self._frames.clear()
+        self._slots.clear()
+        self._idle.set()
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+        self._task = None
+
+    async def drain(self, timeout: float = 1.0):
+        """Wait (up to timeout) for queued frames to be written, e.g. before closing."""
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._idle.wait(), timeout)
+
+    @property
+    def depth(self) -> int:
+        return len(self._frames) + len(self._slots)
+
+    async def _writer(self):
+        loop = asyncio.get_running_loop()
+        frames = self._frames
+        while not self.closed:
+            # Direct frames (replies, control messages, unconflated updates) go first
+            if frames:
+                await self._send(frames.popleft())
+                continue
+
+            if not self._slots:
+                self._ready.clear()
+                self._idle.set()
+                await self._ready.wait()
+                continue
+
+            wait = self._next_flush - loop.time()
+            if wait > 0:
+                self._ready.clear()
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._ready.wait(), wait)
+                continue
+
+            slots, self._slots = self._slots, {}
+            self.metrics['slot_flushes'] += 1
+            for frame in slots.values():
+                if self.closed:
+                    break
+                await self._send(frame)
+            # Measured from the end of the flush, so a client that is slow to
+            # take the frames is flushed less often
+            self._next_flush = loop.time() + self.conflation_window
+
+    async def _send(self, frame: str):
+        try:
+            await self.websocket.send_text(frame)
+            self.metrics['frames_sent'] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.metrics['send_errors'] += 1
+            self._close(f"send failed: {e}")
+
+    def _close(self, reason: str):
+        if self.closed:
+            return
+        log_warning(f"Closing WebSocket client {self.client_id}: {reason}")
+        self.stop()
+        if self.on_close is not None:
+            self.on_close(self.client_id, reason)
@@ -0,0 +1,139 @@
+"""
+Bounded in-process LRU cache with per-entry TTL.
+
+Entries live in one OrderedDict in recency order, so get, set and eviction
+of the least recently used entry are all O(1). An expired entry is dropped
+when it is read; purge_expired() clears the rest for callers that sweep.
+
+There is no lock: every method is synchronous and runs to completion
+without awaiting, which is atomic on a single event loop. Values are
+handed out as stored, with no defensive copy; use read_only() to store
+mappings callers cannot mutate.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Mapping
+from types import MappingProxyType
+from typing import Any
+
+
+def read_only(mapping: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Read-only view of a private shallow copy of mapping (as-is if already read-only)."""
+    if isinstance(mapping, MappingProxyType):
+        return mapping
+    return MappingProxyType(dict(mapping))
+
+
+class LRUCache:
+    """Size-bounded LRU cache whose entries expire ttl seconds after they were set."""
+
+    __slots__ = ('max_size', 'ttl_seconds', '_clock', '_entries', 'hits', 'misses', 'evictions', 'expirations')
+
+    def __init__(self, max_size: int = 1000, ttl_seconds: float | None = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_size: Most entries kept; the least recently used is evicted beyond it
+            ttl_seconds: Default lifetime of an entry (None never expires)
+            clock: Monotonic time source, in seconds
+        """
+        if max_size < 1:
+            raise ValueError("LRUCache max_size must be at least 1")
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        # key -> (value, expiry time or None), least recently used first
+        self._entries: OrderedDict[Hashable, tuple[Any, float | None]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """The cached value, marked most recently used; default on a miss or expiry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires = entry[1]
+        if expires is not None and expires <= self._clock():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def get_many(self, keys: Iterable[Hashable]) -> dict[Hashable, Any]:
+        """Cached values of the keys that hit, read against one clock reading."""
+        entries = self._entries
+        now = self._clock()
+        found = {}
+        for key in keys:
+            entry = entries.get(key)
+            if entry is None:
+                self.misses += 1
+            elif entry[1] is not None and entry[1] <= now:
+                del entries[key]
+                self.expirations += 1
+                self.misses += 1
+            else:
+                entries.move_to_end(key)
+                self.hits += 1
+                found[key] = entry[0]
+        return found
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float | None = None):
+        """Cache value under key, evicting the least recently used entry if full."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        entries = self._entries
+        entries[key] = (value, None if ttl is None else self._clock() + ttl)
+        entries.move_to_end(key)
+        if len(entries) > self.max_size:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry (O(n)); returns how many were dropped."""
+        now = self._clock()
+        expired = [key for key, (_, expires) in self._entries.items() if expires is not None and expires <= now]
+        for key in expired:
+            del self._entries[key]
+        self.expirations += len(expired)
+        return len(expired)
+
+    def clear(self):
+        self._entries.clear()
+
+    def values(self) -> list[Any]:
+        """Values of all entries, expired or not, least recently used first."""
+        return [value for value, _ in self._entries.values()]
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Whether key holds an unexpired entry (not counted and not marked used)."""
+        entry = self._entries.get(key)
+        return entry is not None and (entry[1] is None or entry[1] > self._clock())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> dict[str, Any]:
+        requests = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'ttl_seconds': self.ttl_seconds,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests if requests else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations
+        }
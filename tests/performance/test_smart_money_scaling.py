@@ -0,0 +1,58 @@
+"""
+Scaling benchmark for the native Smart Money Concepts implementations.
+
+Each indicator must stay roughly linear in the number of bars and finish a
+50k-bar history well within a tick budget.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.smart_money_indicators import (
+    _get_real_swings,
+    _real_bos,
+    _real_choch,
+    _real_fvg,
+    _real_liquidity,
+    _real_order_blocks,
+)
+
+INDICATORS = [_get_real_swings, _real_bos, _real_choch, _real_order_blocks, _real_fvg, _real_liquidity]
+
+
+def _ohlcv(n: int, seed: int = 11) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 22000.0 + np.cumsum(rng.normal(0.0, 10.0, n))
+    open_ = close - rng.normal(0.0, 6.0, n)
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + rng.uniform(0.0, 8.0, n),
+        'low': np.minimum(open_, close) - rng.uniform(0.0, 8.0, n),
+        'close': close,
+        'volume': rng.integers(100, 10_000, n)
+    })
+
+
+def _best_of(function, df: pd.DataFrame, repeats: int = 3) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("indicator", INDICATORS, ids=lambda f: f.__name__)
+def test_scales_linearly_to_50k_bars(indicator):
+    small, large = _ohlcv(5_000), _ohlcv(50_000)
+
+    small_time = _best_of(indicator, small)
+    large_time = _best_of(indicator, large)
+
+    print(f"{indicator.__name__}: 5k bars {small_time * 1000:.1f}ms, 50k bars {large_time * 1000:.1f}ms")
+    assert large_time < 0.5, f"{indicator.__name__} took {large_time:.3f}s for 50k bars"
+    # 10x the bars may cost at most ~20x the time (fixed overheads dominate small inputs)
+    assert large_time < max(small_time, 0.001) * 20
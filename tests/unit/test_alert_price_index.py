@@ -0,0 +1,100 @@
+"""
+Unit tests for the price-level alert index and tick-driven alert evaluation.
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.alert_price_index import ABOVE, BELOW, AlertPriceIndex
+
+NIFTY = 'NSE@NIFTY@INDEX'
+TCS = 'NSE@TCS@EQ'
+
+
+class TestAlertPriceIndex:
+
+    def test_crossed_levels_are_popped_in_one_slice(self):
+        index = AlertPriceIndex()
+        for i, level in enumerate([19900.0, 20000.0, 20000.0, 20100.0]):
+            index.add(f'above_{i}', NIFTY, ABOVE, level)
+        index.add('below_0', NIFTY, BELOW, 19950.0)
+        index.add('tcs', TCS, ABOVE, 10.0)
+
+        assert index.pop_crossed(NIFTY, 20000.0) == ['above_0', 'above_1', 'above_2']
+        assert index.pop_crossed(NIFTY, 20000.0) == []
+        assert index.pop_crossed(NIFTY, 19950.0) == ['below_0']
+        assert index.alert_ids(NIFTY) == ['above_3']
+        assert 'tcs' in index and len(index) == 2
+
+    def test_remove_finds_alert_among_equal_levels(self):
+        index = AlertPriceIndex()
+        for i in range(5):
+            index.add(f'a{i}', NIFTY, BELOW, 100.0)
+
+        assert index.remove('a3')
+        assert not index.remove('a3')
+        assert index.pop_crossed(NIFTY, 99.0) == ['a0', 'a1', 'a2', 'a4']
+        assert not index.has_alerts(NIFTY)
+
+    def test_expiry_heap_skips_removed_and_readded_alerts(self):
+        index = AlertPriceIndex()
+        index.add('soon', NIFTY, ABOVE, 1.0, expires_at=100.0)
+        index.add('cancelled', NIFTY, ABOVE, 2.0, expires_at=50.0)
+        index.add('extended', NIFTY, ABOVE, 3.0, expires_at=60.0)
+        index.add('forever', NIFTY, ABOVE, 4.0)
+        index.remove('cancelled')
+        index.add('extended', NIFTY, ABOVE, 3.0, expires_at=500.0)
+
+        assert index.pop_expired(99.0) == []
+        assert index.pop_expired(100.0) == ['soon']
+        assert index.alert_ids(NIFTY) == ['forever', 'extended']
+        assert index.get_metrics()['expired'] == 1
+
+    def test_unleveled_alerts_are_tracked_by_instrument(self):
+        index = AlertPriceIndex()
+        index.add('change', NIFTY)
+        index.add('level', NIFTY, ABOVE, 10.0)
+
+        assert index.unleveled_alert_ids(NIFTY) == ['change']
+        assert index.pop_crossed(NIFTY, 1e9) == ['level']
+        assert index.instruments == {NIFTY}
+
+    def test_unknown_side_is_rejected(self):
+        with pytest.raises(ValueError):
+            AlertPriceIndex().add('x', NIFTY, 'sideways', 1.0)
+
+
+class _InstrumentClient:
+
+    async def get_instrument_metadata(self, instrument_key):
+        return SimpleNamespace(symbol=instrument_key.split('@')[1], exchange='NSE', sector='Index', instrument_type='INDEX')
+
+
+class TestAlertServiceTicks:
+
+    @pytest.mark.asyncio
+    async def test_ticks_trigger_only_crossed_alerts(self):
+        from app.services.alert_service import AlertCondition, AlertService, AlertStatus, AlertType
+
+        service = AlertService(instrument_client=_InstrumentClient())
+        above = await service.create_price_alert('u1', NIFTY, AlertCondition(AlertType.PRICE_ABOVE, 20000.0, '>='))
+        below = await service.create_price_alert('u2', NIFTY, AlertCondition(AlertType.PRICE_BELOW, 19000.0, '<='))
+        expiring = await service.create_price_alert('u3', NIFTY, AlertCondition(AlertType.PRICE_ABOVE, 30000.0, '>='))
+        service._active_alerts[expiring['alert_id']].expires_at = datetime.now() - timedelta(seconds=1)
+        service._index_alert(service._active_alerts[expiring['alert_id']])
+
+        await service.on_price_update(NIFTY, 20050.0)
+        await service.on_price_update(TCS, 1.0)
+
+        assert list(service._active_alerts) == [below['alert_id']]
+        assert [a.status for a in service._alert_history['u1']] == [AlertStatus.TRIGGERED]
+        assert [a.status for a in service._alert_history['u3']] == [AlertStatus.EXPIRED]
+
+        cancelled = await service.cancel_alert(below['alert_id'], 'u2')
+        await service._cleanup_price_subscriptions()
+
+        assert cancelled['status'] == 'cancelled'
+        assert above['alert_id'] not in service._price_index and len(service._price_index) == 0
+        assert service._price_subscriptions == {}
+        await service.shutdown()
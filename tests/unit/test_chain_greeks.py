@@ -0,0 +1,202 @@
+"""
+Unit tests for the columnar ChainGreeks result.
+
+Covers row/JSON conversion at the boundary, concatenation across expiries and
+the engine and premium calculator passing the columns through unchanged.
+"""
+import json
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from app.services import chain_greeks as chain_greeks_module
+from app.services.chain_greeks import ChainGreeks
+from app.services.greeks_calculation_engine import GreeksCalculationEngine
+from app.services.premium_discount_calculator import PremiumDiscountCalculator
+from app.services.vectorized_pyvollib_engine import VectorizedPyvolibGreeksEngine
+
+
+def _chain(instrument_keys=None) -> ChainGreeks:
+    return ChainGreeks.from_arrays(
+        [100.0, 105.0, 110.0],
+        ['2025-01-30', '2025-01-30', '2025-02-27'],
+        ['CE', 'put', 'CALL'],
+        {
+            'delta': np.array([0.55, -0.4, np.nan]),
+            'gamma': np.array([0.01, 0.02, 0.03])
+        },
+        instrument_keys=instrument_keys
+    )
+
+
+class TestChainGreeks:
+
+    def test_option_types_normalised(self):
+        chain = _chain()
+        assert chain.option_types.tolist() == ['CE', 'PE', 'CE']
+        assert chain.is_call.tolist() == [True, False, True]
+
+    def test_rows_emit_none_for_nan(self):
+        rows = _chain().to_rows()
+
+        assert len(rows) == 3
+        assert rows[0] == {
+            'strike': 100.0, 'expiry_date': '2025-01-30', 'option_type': 'CE',
+            'delta': 0.55, 'gamma': 0.01
+        }
+        assert rows[2]['delta'] is None
+
+    def test_indexing_builds_greek_rows_on_demand(self):
+        chain = _chain()
+        assert len(chain) == 3
+        assert chain[1] == {'delta': -0.4, 'gamma': 0.02}
+        assert chain[-1]['delta'] is None
+        with pytest.raises(IndexError):
+            chain[3]
+
+    def test_greek_rows_fill_missing_greeks(self):
+        rows = _chain().greek_rows(['delta', 'vega'])
+        assert rows[0] == {'delta': 0.55, 'vega': None}
+
+    def test_instrument_map(self):
+        chain = _chain(['OPT1', 'OPT2', 'OPT3'])
+        assert chain.to_instrument_map()['OPT2'] == {'delta': -0.4, 'gamma': 0.02}
+
+        with pytest.raises(ValueError):
+            _chain().to_instrument_map()
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_json_is_columnar(self, use_orjson):
+        if use_orjson and not chain_greeks_module.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+
+        with patch.object(chain_greeks_module, 'ORJSON_AVAILABLE', use_orjson):
+            payload = json.loads(_chain(['OPT1', 'OPT2', 'OPT3']).to_json())
+
+        assert payload['strike'] == [100.0, 105.0, 110.0]
+        assert payload['option_type'] == ['CE', 'PE', 'CE']
+        assert payload['greeks']['delta'] == [0.55, -0.4, None]
+        assert payload['instrument_key'] == ['OPT1', 'OPT2', 'OPT3']
+
+    def test_concat_keeps_common_greeks(self):
+        other = ChainGreeks.from_arrays(
+            [120.0], ['2025-03-27'], ['PE'], {'delta': np.array([-0.2])}
+        )
+        merged = ChainGreeks.concat([_chain(), ChainGreeks.empty(), other])
+
+        assert len(merged) == 4
+        assert merged.greek_names == ('delta',)
+        assert merged.strikes.tolist() == [100.0, 105.0, 110.0, 120.0]
+
+    def test_take_selects_mask(self):
+        chain = _chain(['OPT1', 'OPT2', 'OPT3']).take(np.array([True, False, True]))
+        assert chain.instrument_keys.tolist() == ['OPT1', 'OPT3']
+        assert chain.column('gamma').tolist() == [0.01, 0.03]
+
+
+class TestChainGreeksPassThrough:
+
+    @pytest.fixture
+    def engine(self):
+        config = MagicMock()
+        config.model_name = "black_scholes"
+        config.parameters = MagicMock()
+        config.parameters.risk_free_rate = 0.065
+        config.parameters.dividend_yield = 0.0
+        config.initialize = MagicMock()
+
+        with patch('app.services.vectorized_pyvollib_engine.get_greeks_model_config') as mock_config, \
+                patch('app.services.vectorized_pyvollib_engine.get_circuit_breaker'):
+            mock_config.return_value = config
+            return VectorizedPyvolibGreeksEngine()
+
+    @pytest.mark.asyncio
+    async def test_engine_returns_columnar_chain(self, engine):
+        expiry = (datetime.now() + timedelta(days=30)).isoformat()
+        options = [
+            {'strike': 95.0 + i, 'expiry_date': expiry, 'option_type': 'CE' if i % 2 else 'PE',
+             'volatility': 0.25, 'instrument_key': f'OPT{i}'}
+            for i in range(10)
+        ]
+        arrays = await engine._prepare_vectorized_arrays(options, 100.0)
+
+        chain = await engine._execute_vectorized_greeks_calculation(arrays, ['delta', 'vega', 'vanna'])
+
+        assert isinstance(chain, ChainGreeks)
+        assert chain.greek_names == ('delta', 'vega', 'vanna')
+        assert np.isnan(chain.column('vanna')).all()
+        assert chain.expiries[0] == expiry
+        assert chain.instrument_keys.tolist() == [f'OPT{i}' for i in range(10)]
+        assert chain.option_types.tolist()[:2] == ['PE', 'CE']
+
+    @pytest.mark.asyncio
+    async def test_legacy_chain_path_returns_columnar_chain(self):
+        async def execute(func, *args, **kwargs):
+            return await func(*args)
+
+        breaker = MagicMock(execute=execute)
+        with patch('app.services.greeks_calculation_engine.get_greeks_model_config'), \
+                patch('app.services.greeks_calculation_engine.get_circuit_breaker', return_value=breaker):
+            engine = GreeksCalculationEngine(enable_vectorized=False)
+
+        expiry = (datetime.now() + timedelta(days=30)).isoformat()
+        options = [{'strike': 100.0, 'expiry_date': expiry, 'option_type': 'CE', 'volatility': 0.25}]
+        with patch.object(engine, 'calculate_all_greeks', AsyncMock(return_value={'delta': 0.5, 'vega': None})):
+            result = await engine.calculate_option_chain_greeks(options, 100.0, ['delta', 'vega'])
+
+        assert result['method_used'] == 'legacy'
+        assert isinstance(result['results'], ChainGreeks)
+        assert result['results'].column('delta').tolist() == [0.5]
+        assert np.isnan(result['results'].column('vega')).all()
+
+    @pytest.mark.asyncio
+    async def test_premium_analysis_reads_greek_columns(self):
+        option_chain_data = [
+            {'strike': 26000.0, 'expiry_date': '2025-01-30', 'option_type': 'CE'},
+            {'strike': 26100.0, 'expiry_date': '2025-01-30', 'option_type': 'PE'}
+        ]
+        greek_rows = [
+            {'delta': 0.55, 'gamma': 0.001, 'theta': -0.02, 'vega': 0.1, 'rho': 0.05},
+            {'delta': -0.45, 'gamma': 0.001, 'theta': -0.02, 'vega': 0.1, 'rho': None}
+        ]
+        columnar = ChainGreeks.from_rows(option_chain_data, greek_rows, ['delta', 'gamma', 'theta', 'vega', 'rho'])
+
+        calculator = PremiumDiscountCalculator(MagicMock())
+        from_chain = await calculator._compute_premium_analysis(
+            [47.3, 30.0], [45.2, 40.0], option_chain_data, columnar
+        )
+        from_rows = await calculator._compute_premium_analysis(
+            [47.3, 30.0], [45.2, 40.0], option_chain_data, greek_rows
+        )
+
+        assert from_chain == from_rows
+        assert from_chain[0]['greeks']['delta'] == 0.55
+        assert from_chain[1]['greeks']['rho'] is None
+        assert from_chain[0]['mispricing_severity'] == 'MEDIUM'
+        assert from_chain[1]['mispricing_severity'] == 'EXTREME'
+        assert from_chain[1]['arbitrage_signal'] is True
+        assert from_chain[1]['is_underpriced'] is True
+
+    @pytest.mark.asyncio
+    async def test_premium_analysis_accepts_engine_chain(self, engine):
+        expiry = (datetime.now() + timedelta(days=30)).date().isoformat()
+        option_chain_data = [
+            {'strike': strike, 'expiry_date': expiry, 'option_type': 'CE', 'volatility': 0.2}
+            for strike in (95.0, 100.0, 105.0)
+        ]
+
+        async def run_through_breaker(func, *args, **kwargs):
+            return await func(*args)
+
+        engine._vectorized_breaker.execute = AsyncMock(side_effect=run_through_breaker)
+
+        calculator = PremiumDiscountCalculator(engine)
+        result = await calculator.calculate_premium_analysis(
+            [6.0, 3.0, 1.0], option_chain_data, 100.0, include_greeks=True
+        )
+
+        assert result['method_used'] == 'vectorized_premium_analysis'
+        assert [row['strike'] for row in result['results']] == [95.0, 100.0, 105.0]
+        assert all(0.0 < row['greeks']['delta'] < 1.0 for row in result['results'])
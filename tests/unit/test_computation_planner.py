@@ -0,0 +1,159 @@
+"""
+Unit tests for per-tick computation planning across configurations.
+"""
+import asyncio
+from enum import StrEnum
+from typing import Any
+
+import pytest
+from pydantic import BaseModel
+
+from app.services.computation_planner import (
+    ComputationPlan,
+    PlannedComputations,
+    indicator_computation_key,
+)
+
+INSTRUMENT = 'NSE@NIFTY@INDEX'
+
+
+class Interval(StrEnum):
+    ONE_MINUTE = "1minute"
+    FIVE_MINUTE = "5minute"
+
+
+class Frequency(StrEnum):
+    EVERY_TICK = "every_tick"
+
+
+class Indicator(BaseModel):
+    name: str
+    parameters: dict[str, Any]
+    output_key: str
+
+
+class Greeks(BaseModel):
+    enabled: bool = True
+    risk_free_rate: float = 0.06
+    calculate: list[str] = ['delta']
+
+
+class Output(BaseModel):
+    cache_results: bool = True
+    cache_ttl_seconds: int = 300
+
+
+class Config(BaseModel):
+    interval: Interval = Interval.FIVE_MINUTE
+    frequency: Frequency = Frequency.EVERY_TICK
+    technical_indicators: list[Indicator] = []
+    option_greeks: Greeks | None = None
+    output: Output = Output()
+
+
+def _rsi(output_key: str, length: int = 14) -> Indicator:
+    return Indicator(name='rsi', parameters={'length': length}, output_key=output_key)
+
+
+def _only_group(plan: ComputationPlan):
+    (group,) = plan.indicator_groups.values()
+    return group
+
+
+class TestComputationPlan:
+
+    def test_identical_indicators_become_one_node(self):
+        configs = [Config(technical_indicators=[_rsi(f'user{i}_rsi')]) for i in range(100)]
+        configs.append(Config(technical_indicators=[_rsi('rsi_21', 21), _rsi('rsi_again')]))
+
+        plan = ComputationPlan.build(INSTRUMENT, configs)
+
+        assert plan.requested == 102
+        assert plan.unique_nodes == 2
+        group = _only_group(plan)
+        assert set(group.indicators) == {
+            indicator_computation_key(INSTRUMENT, 'rsi', '5minute', {'length': 14}),
+            indicator_computation_key(INSTRUMENT, 'rsi', '5minute', {'length': 21})
+        }
+
+    def test_intervals_and_greeks_setups_are_separate_nodes(self):
+        configs = [
+            Config(technical_indicators=[_rsi('a')], option_greeks=Greeks()),
+            Config(interval=Interval.ONE_MINUTE, technical_indicators=[_rsi('b')], option_greeks=Greeks()),
+            Config(option_greeks=Greeks()),
+            Config(option_greeks=Greeks(risk_free_rate=0.07)),
+            Config(option_greeks=Greeks(enabled=False))
+        ]
+
+        plan = ComputationPlan.build(INSTRUMENT, configs)
+
+        assert len(plan.indicator_groups) == 2
+        assert len(plan.greeks_nodes) == 3
+        assert plan.greeks_outputs[id(configs[0])] == plan.greeks_outputs[id(configs[2])]
+        assert id(configs[4]) not in plan.greeks_outputs
+
+    def test_group_config_keys_indicators_by_node(self):
+        plan = ComputationPlan.build(INSTRUMENT, [Config(technical_indicators=[_rsi('mine')])])
+        group_config = _only_group(plan).to_config()
+
+        assert [i.output_key for i in group_config.technical_indicators] == [
+            indicator_computation_key(INSTRUMENT, 'rsi', '5minute', {'length': 14})
+        ]
+
+    def test_output_settings_split_groups(self):
+        uncached = Config(technical_indicators=[_rsi('b')], output=Output(cache_results=False))
+        configs = [Config(technical_indicators=[_rsi('a')]), uncached]
+
+        plan = ComputationPlan.build(INSTRUMENT, configs)
+
+        assert len(plan.indicator_groups) == 2
+        group_key, _ = plan.indicator_outputs[id(uncached)]
+        assert plan.indicator_groups[group_key].to_config().output.cache_results is False
+
+
+class TestPlannedComputations:
+
+    @pytest.mark.asyncio
+    async def test_each_node_computed_once_and_fanned_out(self):
+        calls = []
+
+        async def compute_indicators(config):
+            calls.append(config)
+            await asyncio.sleep(0)
+            return {
+                'indicators_count': len(config.technical_indicators),
+                'results': {i.output_key: float(i.parameters['length']) for i in config.technical_indicators}
+            }
+
+        async def compute_greeks(config):
+            calls.append(config)
+            return {'delta': 0.5}
+
+        configs = [
+            Config(technical_indicators=[_rsi('fast', 7), _rsi('slow', 21)], option_greeks=Greeks()),
+            Config(technical_indicators=[_rsi('rsi', 7)], option_greeks=Greeks())
+        ]
+        planned = PlannedComputations(ComputationPlan.build(INSTRUMENT, configs), compute_indicators, compute_greeks)
+
+        first, second, greeks = await asyncio.gather(
+            planned.technical_indicators(configs[0]),
+            planned.technical_indicators(configs[1]),
+            planned.greeks(configs[1])
+        )
+
+        assert len(calls) == 2
+        assert first == {'indicators_count': 2, 'results': {'fast': 7.0, 'slow': 21.0}}
+        assert second == {'indicators_count': 1, 'results': {'rsi': 7.0}}
+        assert greeks == {'delta': 0.5}
+
+    @pytest.mark.asyncio
+    async def test_node_failure_reaches_every_config(self):
+        async def compute_indicators(config):
+            raise RuntimeError("no data")
+
+        configs = [Config(technical_indicators=[_rsi('a')]), Config(technical_indicators=[_rsi('b')])]
+        planned = PlannedComputations(ComputationPlan.build(INSTRUMENT, configs), compute_indicators, None)
+
+        results = await asyncio.gather(*(planned.technical_indicators(c) for c in configs), return_exceptions=True)
+
+        assert all(isinstance(r, RuntimeError) for r in results)
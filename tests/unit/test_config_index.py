@@ -0,0 +1,74 @@
+"""
+Unit tests for the instrument configuration index used on the tick path.
+"""
+from types import SimpleNamespace
+
+from app.services.config_index import InstrumentConfigIndex
+
+
+def _config(instrument_key: str, interval: str = '5minute'):
+    return SimpleNamespace(instrument_key=instrument_key, interval=interval)
+
+
+class TestInstrumentConfigIndex:
+
+    def test_upsert_groups_configs_by_instrument(self):
+        index = InstrumentConfigIndex()
+        nifty_5m = _config('NSE@NIFTY@INDEX')
+        nifty_15m = _config('NSE@NIFTY@INDEX', '15minute')
+
+        index.upsert('config:nifty:5m', nifty_5m)
+        index.upsert('config:nifty:15m', nifty_15m)
+        index.upsert('config:tcs:5m', _config('NSE@TCS@EQ'))
+
+        assert index.get('NSE@NIFTY@INDEX') == (nifty_5m, nifty_15m)
+        assert index.instruments == {'NSE@NIFTY@INDEX', 'NSE@TCS@EQ'}
+        assert index.get('NSE@INFY@EQ') == ()
+        assert index.version == 3
+        assert len(index) == 3
+
+    def test_update_replaces_in_place(self):
+        index = InstrumentConfigIndex()
+        index.upsert('config:a', _config('NSE@NIFTY@INDEX'))
+        updated = _config('NSE@NIFTY@INDEX', '15minute')
+
+        index.upsert('config:a', updated)
+
+        assert index.get('NSE@NIFTY@INDEX') == (updated,)
+
+    def test_readers_keep_their_snapshot(self):
+        index = InstrumentConfigIndex()
+        index.upsert('config:a', _config('NSE@NIFTY@INDEX'))
+        snapshot = index.get('NSE@NIFTY@INDEX')
+        instruments = index.instruments
+
+        index.upsert('config:b', _config('NSE@NIFTY@INDEX', '15minute'))
+
+        assert len(snapshot) == 1
+        assert len(index.get('NSE@NIFTY@INDEX')) == 2
+        assert instruments == {'NSE@NIFTY@INDEX'}
+
+    def test_remove_drops_instrument_with_no_configs(self):
+        index = InstrumentConfigIndex()
+        index.upsert('config:a', _config('NSE@NIFTY@INDEX'))
+
+        assert index.remove('config:a') is True
+        assert index.remove('config:a') is False
+        assert index.get('NSE@NIFTY@INDEX') == ()
+        assert not index.instruments
+        assert index.version == 2
+
+    def test_moving_a_config_republishes_both_instruments(self):
+        index = InstrumentConfigIndex()
+        index.upsert('config:a', _config('NSE@NIFTY@INDEX'))
+        index.upsert('config:b', _config('NSE@NIFTY@INDEX', '15minute'))
+        tcs = _config('NSE@TCS@EQ')
+        untouched = index.get('NSE@NIFTY@INDEX')
+
+        index.upsert('config:a', tcs)
+
+        assert [config.interval for config in index.get('NSE@NIFTY@INDEX')] == ['15minute']
+        assert index.get('NSE@TCS@EQ') == (tcs,)
+        assert index.instruments == {'NSE@NIFTY@INDEX', 'NSE@TCS@EQ'}
+        assert len(untouched) == 2
+        assert index.version == 3
@@ -0,0 +1,104 @@
+"""
+Unit tests for compiled formula evaluation.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.formula_engine import FormulaEngine
+
+MOMENTUM = "(rsi / 100) * 0.3 + (close > sma20) * 0.4 + (volume > vol_avg) * 0.3"
+
+
+@pytest.fixture
+def engine() -> FormulaEngine:
+    return FormulaEngine()
+
+
+class TestScalarEvaluation:
+
+    @pytest.mark.parametrize("formula,expected", [
+        ("(close - sma) / sma * 100", 5.0),
+        ("1 < close < 200", True),
+        ("1 < close < 100", False),
+        ("close > sma and not close > 200", True),
+        ("close if close > sma else sma", 105.0),
+        ("max(close, sma) + sqrt(16) + round(pi, 2)", 112.14),
+        ("[close, sma][1]", 100.0),
+    ])
+    def test_matches_python_semantics(self, engine, formula, expected):
+        assert engine.evaluate(formula, {'close': 105.0, 'sma': 100.0}) == pytest.approx(expected)
+
+    def test_context_shadows_constants_and_series_return_latest(self, engine):
+        closes = pd.Series([1.0, 2.0, 4.0])
+
+        assert engine.evaluate("e * 2", {'e': 3}) == 6
+        assert engine.evaluate("diff(close)", {'close': closes}) == 2.0
+
+    @pytest.mark.parametrize("formula", ["missing + 1", "__import__('os')", "close.real", "close[1:2]"])
+    def test_errors_raise_value_error(self, engine, formula):
+        with pytest.raises(ValueError):
+            engine.evaluate(formula, {'close': 1.0})
+
+
+class TestCompilationCache:
+
+    def test_compiles_once_per_formula(self, engine, monkeypatch):
+        parses = []
+        original = engine._parse_formula
+        monkeypatch.setattr(engine, '_parse_formula', lambda formula: parses.append(formula) or original(formula))
+
+        for rsi in (30, 50, 70):
+            engine.evaluate(MOMENTUM, {'rsi': rsi, 'close': 1, 'sma20': 0, 'volume': 1, 'vol_avg': 2})
+
+        assert parses == [MOMENTUM]
+        assert engine.get_metrics()['cache_hits'] == 2
+        assert engine.compile(MOMENTUM) is engine.compile(MOMENTUM)
+
+    def test_least_recently_used_formula_is_evicted(self, engine, monkeypatch):
+        monkeypatch.setattr(engine, 'MAX_COMPILED_FORMULAS', 2)
+        first = engine.compile("a + 1")
+        engine.compile("a + 2")
+        engine.compile("a + 1")
+        engine.compile("a + 3")
+
+        assert engine.compile("a + 1") is first
+        assert engine.get_metrics()['evictions'] == 1
+        assert "a + 2" not in engine._compiled_formulas
+
+
+class TestVectorizedEvaluation:
+
+    def test_scores_a_watchlist_in_one_call(self, engine):
+        rng = np.random.default_rng(3)
+        watchlist = {
+            'rsi': rng.uniform(0, 100, 50),
+            'close': rng.uniform(90, 110, 50),
+            'sma20': rng.uniform(90, 110, 50),
+            'volume': rng.uniform(0, 10, 50),
+            'vol_avg': rng.uniform(0, 10, 50)
+        }
+
+        scores = engine.evaluate_vectorized(MOMENTUM, watchlist)
+
+        expected = [engine.evaluate(MOMENTUM, {k: v[i] for k, v in watchlist.items()}) for i in range(50)]
+        np.testing.assert_allclose(scores, expected)
+
+    def test_logic_and_functions_are_element_wise(self, engine):
+        close = pd.Series([95.0, 105.0, 120.0], index=['A', 'B', 'C'])
+        context = {'close': close, 'sma': 100.0}
+
+        signal = engine.evaluate_vectorized("1 if close > sma and not close > 110 else -1", context)
+        capped = engine.evaluate_vectorized("min(close, 110) - sqrt(sma)", context)
+
+        pd.testing.assert_series_equal(signal, pd.Series([-1, 1, -1], index=['A', 'B', 'C']))
+        pd.testing.assert_series_equal(capped, pd.Series([85.0, 95.0, 100.0], index=['A', 'B', 'C']))
+        assert engine.evaluate_vectorized("90 < close < 110", {'close': np.array([95.0, 115.0])}).tolist() == [True, False]
+
+    def test_history_keeps_full_series(self, engine):
+        close = pd.Series([100.0, 102.0, 101.0])
+
+        result = engine.evaluate_vectorized("pct_change(close) * 100", {'close': close})
+
+        assert len(result) == 3
+        assert result.iloc[1] == pytest.approx(2.0)
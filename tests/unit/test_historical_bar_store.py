@@ -0,0 +1,238 @@
+"""
+Unit tests for the range-aware historical bar store.
+"""
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.services.historical_bar_store import HistoricalBarStore, timeframe_seconds
+
+DAY = datetime(2024, 1, 15, 9, 15, tzinfo=UTC)
+TICK = timedelta(microseconds=1)
+
+
+class _Source:
+    """Minute bars of a synthetic series, recording every requested range."""
+
+    def __init__(self, close_offset=0.0):
+        self.requests = []
+        self.close_offset = close_offset
+
+    async def fetch(self, start, end):
+        self.requests.append((start, end))
+        bars = []
+        minute = start.replace(second=0, microsecond=0)
+        if minute < start:
+            minute += timedelta(minutes=1)
+        while minute <= end:
+            index = int((minute - DAY).total_seconds() // 60)
+            bars.append({
+                'timestamp': minute.isoformat(),
+                'open': 100.0 + index,
+                'close': 100.5 + index + self.close_offset,
+                'volume': 10 * index
+            })
+            minute += timedelta(minutes=1)
+        return bars
+
+
+def _minutes(start, end):
+    return DAY + timedelta(minutes=start), DAY + timedelta(minutes=end)
+
+
+class TestHistoricalBarStore:
+
+    def test_timeframe_seconds_accepts_short_and_long_forms(self):
+        assert timeframe_seconds('1m') == timeframe_seconds('1minute') == 60
+        assert timeframe_seconds('15m') == 900
+        assert timeframe_seconds('1h') == 3600
+        assert timeframe_seconds('1d') == 86400
+
+    @pytest.mark.asyncio
+    async def test_lookbacks_share_bars_and_fetch_only_gaps(self):
+        store = HistoricalBarStore()
+        source = _Source()
+
+        bars = await store.get_bars('NIFTY', '1m', *_minutes(100, 199), source.fetch)
+        assert [bar['open'] for bar in bars] == [100.0 + i for i in range(100, 200)]
+
+        # A shorter lookback inside the cached range is served from memory
+        short = await store.get_bars('NIFTY', '1m', *_minutes(150, 199), source.fetch)
+        assert short == bars[50:]
+        assert len(source.requests) == 1
+
+        # A longer lookback fetches only what lies outside the cached range
+        longer = await store.get_bars('NIFTY', '1m', *_minutes(50, 250), source.fetch)
+        assert source.requests[1:] == [
+            (DAY + timedelta(minutes=50), DAY + timedelta(minutes=100) - TICK),
+            (DAY + timedelta(minutes=199) + TICK, DAY + timedelta(minutes=250))
+        ]
+        assert [bar['open'] for bar in longer] == [100.0 + i for i in range(50, 251)]
+
+        stats = store.get_stats()
+        assert (stats['hits'], stats['misses'], stats['partial_hits']) == (1, 1, 1)
+        assert stats['segments'] == 1 and stats['bars'] == 201
+
+    @pytest.mark.asyncio
+    async def test_gap_between_segments_is_filled_and_merged(self):
+        store = HistoricalBarStore()
+        source = _Source()
+        await store.get_bars('NIFTY', '1m', *_minutes(0, 10), source.fetch)
+        await store.get_bars('NIFTY', '1m', *_minutes(30, 40), source.fetch)
+        assert store.get_stats()['segments'] == 2
+
+        # Only the gap is fetched; the bars around it come from the cache
+        source.close_offset = 1.0
+        bars = await store.get_bars('NIFTY', '1m', *_minutes(5, 35), source.fetch)
+
+        assert source.requests[-1] == (DAY + timedelta(minutes=10) + TICK, DAY + timedelta(minutes=30) - TICK)
+        assert [bar['open'] for bar in bars] == [100.0 + i for i in range(5, 36)]
+        assert (bars[5]['close'], bars[6]['close']) == (110.5, 112.5)
+        assert store.get_stats()['segments'] == 1
+
+    @pytest.mark.asyncio
+    async def test_forming_bars_are_cached_until_the_tail_expires(self, monkeypatch):
+        store = HistoricalBarStore(tail_ttl_seconds=30)
+        now = datetime.now(UTC).replace(second=0, microsecond=0)
+        start = now - timedelta(minutes=10)
+        requests = []
+
+        async def fetch(gap_start, gap_end):
+            requests.append((gap_start, gap_end))
+            minutes = range(int((gap_start - start).total_seconds() // 60), 11)
+            return [{'timestamp': start + timedelta(minutes=m), 'close': float(m)} for m in minutes]
+
+        bars = await store.get_bars('NIFTY', '1m', start, now, fetch)
+        assert [bar['close'] for bar in bars] == [float(m) for m in range(11)]
+
+        # Within the TTL, repeated requests for the latest bars are served from memory
+        for _ in range(2):
+            assert await store.get_bars('NIFTY', '1m', start, now, fetch) == bars
+        assert len(requests) == 1 and store.get_stats()['hits'] == 2
+
+        # Once it expires, only the bars that might still change are requested again
+        clock = time.time_ns
+        monkeypatch.setattr(time, 'time_ns', lambda: clock() + 31 * 1_000_000_000)
+        again = await store.get_bars('NIFTY', '1m', start, now, fetch)
+        assert again == bars
+        assert len(requests) == 2 and requests[1][0] > start and requests[1][1] == now
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_series_are_evicted(self):
+        store = HistoricalBarStore()
+        source = _Source()
+        await store.get_bars('A', '1m', *_minutes(0, 99), source.fetch)
+        one_series = store.get_stats()['bytes']
+
+        store.max_bytes = int(one_series * 2.5)
+        await store.get_bars('B', '1m', *_minutes(0, 99), source.fetch)
+        await store.get_bars('A', '1m', *_minutes(0, 99), source.fetch)
+        await store.get_bars('C', '1m', *_minutes(0, 99), source.fetch)
+
+        stats = store.get_stats()
+        assert stats['evictions'] == 1 and stats['series'] == 2
+        assert stats['bytes'] <= store.max_bytes
+
+        requests = len(source.requests)
+        await store.get_bars('A', '1m', *_minutes(0, 99), source.fetch)
+        assert len(source.requests) == requests
+        await store.get_bars('B', '1m', *_minutes(0, 99), source.fetch)
+        assert len(source.requests) == requests + 1
+
+    @pytest.mark.asyncio
+    async def test_naive_ranges_are_treated_as_utc(self):
+        store = HistoricalBarStore()
+        await store.get_bars('NIFTY', '1m', *_minutes(0, 9), _Source().fetch)
+
+        start, end = (moment.replace(tzinfo=None) for moment in _minutes(0, 9))
+        requests = []
+
+        async def fetch(gap_start, gap_end):
+            requests.append((gap_start, gap_end))
+            return []
+
+        bars = await store.get_bars('NIFTY', '1m', start, end + timedelta(minutes=1), fetch)
+
+        assert len(bars) == 10
+        assert requests == [(end + TICK, end + timedelta(minutes=1))]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_overlapping_requests_share_in_flight_fetches(self):
+        store = HistoricalBarStore()
+        source = _Source()
+        release = asyncio.Event()
+
+        async def slow_fetch(start, end):
+            await release.wait()
+            return await source.fetch(start, end)
+
+        waiters = [
+            asyncio.create_task(store.get_bars('NIFTY', '1m', *_minutes(0, 59), slow_fetch)),
+            asyncio.create_task(store.get_bars('NIFTY', '1m', *_minutes(0, 59), slow_fetch)),
+            asyncio.create_task(store.get_bars('NIFTY', '1m', *_minutes(30, 89), slow_fetch))
+        ]
+        await asyncio.sleep(0)
+        assert store.get_stats()['in_flight'] == 2
+        release.set()
+        first, second, shifted = await asyncio.gather(*waiters)
+
+        # The identical request joins the first fetch; the overlapping one fetches only its tail
+        assert source.requests == [_minutes(0, 59), (DAY + timedelta(minutes=59) + TICK, DAY + timedelta(minutes=89))]
+        assert first == second and [bar['open'] for bar in shifted] == [100.0 + i for i in range(30, 90)]
+        assert store.get_stats()['coalesced'] == 2 and store.get_stats()['in_flight'] == 0
+
+    @pytest.mark.asyncio
+    async def test_fetch_errors_reach_every_waiter(self):
+        store = HistoricalBarStore()
+        release = asyncio.Event()
+
+        async def failing_fetch(start, end):
+            await release.wait()
+            raise ConnectionError('ticker_service down')
+
+        waiters = [asyncio.create_task(store.get_bars('NIFTY', '1m', *_minutes(0, 9), failing_fetch)) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+
+        assert all(isinstance(result, ConnectionError) for result in results)
+        assert store.get_stats()['in_flight'] == 0 and store.get_stats()['bars'] == 0
+
+    @pytest.mark.asyncio
+    async def test_get_bars_many_fetches_all_missing_ranges_at_once(self):
+        store = HistoricalBarStore()
+        source = _Source()
+        await store.get_bars('A', '1m', *_minutes(0, 9), source.fetch)
+        batches = []
+
+        async def fetch_many(ranges):
+            batches.append([symbol for symbol, _, _ in ranges])
+            return [await source.fetch(start, end) for _, start, end in ranges]
+
+        bars = await store.get_bars_many(['A', 'B', 'C', 'B'], '1m', *_minutes(0, 9), fetch_many)
+
+        assert batches == [['B', 'C']]
+        assert list(bars) == ['A', 'B', 'C']
+        assert all([bar['open'] for bar in rows] == [100.0 + i for i in range(10)] for rows in bars.values())
+
+    @pytest.mark.asyncio
+    async def test_failed_range_fails_only_its_symbol(self):
+        store = HistoricalBarStore()
+        source = _Source()
+
+        async def fetch_many(ranges):
+            return [
+                ConnectionError('chunk down') if symbol == 'B' else await source.fetch(start, end)
+                for symbol, start, end in ranges
+            ]
+
+        bars = await store.get_bars_many(['A', 'B'], '1m', *_minutes(0, 9), fetch_many, return_exceptions=True)
+
+        assert len(bars['A']) == 10
+        assert isinstance(bars['B'], ConnectionError)
+        assert store.get_stats()['in_flight'] == 0
+
+        with pytest.raises(ConnectionError):
+            await store.get_bars_many(['A', 'B'], '1m', *_minutes(0, 9), fetch_many)
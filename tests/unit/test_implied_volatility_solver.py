@@ -0,0 +1,159 @@
+"""
+Unit tests for the batched implied volatility solver.
+
+Covers accuracy against py_vollib, no-arbitrage handling, warm starts from
+cached IVs and the engine entry point that solves a whole chain at once.
+"""
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from app.services.implied_volatility_solver import BatchImpliedVolatilitySolver
+from app.services.vectorized_greeks_kernel import price_and_vega
+from app.services.vectorized_pyvollib_engine import VectorizedPyvolibGreeksEngine
+
+
+def _chain(n: int = 400, seed: int = 11):
+    rng = np.random.default_rng(seed)
+    spot = 22000.0
+    strikes = np.linspace(19000.0, 25000.0, n)
+    times = rng.uniform(3 / 365.0, 1.0, n)
+    vols = rng.uniform(0.08, 0.9, n)
+    is_call = rng.random(n) < 0.5
+    return spot, strikes, times, vols, is_call
+
+
+class TestBatchImpliedVolatilitySolver:
+
+    @pytest.mark.parametrize("model_name", ["black_scholes", "black_scholes_merton", "black76"])
+    def test_recovers_true_volatility(self, model_name):
+        spot, strikes, times, vols, is_call = _chain()
+        prices, _ = price_and_vega(model_name, is_call, spot, strikes, times, 0.065, vols, 0.01)
+
+        result = BatchImpliedVolatilitySolver().solve(
+            model_name, prices, is_call, spot, strikes, times, 0.065, 0.01
+        )
+
+        assert result.converged.all()
+        np.testing.assert_allclose(result.implied_volatilities, vols, atol=1e-8)
+
+    def test_matches_py_vollib(self):
+        from py_vollib.black_scholes_merton.implied_volatility import implied_volatility
+
+        spot, strikes, times, vols, is_call = _chain(40)
+        prices, _ = price_and_vega('black_scholes_merton', is_call, spot, strikes, times, 0.065, vols, 0.01)
+
+        result = BatchImpliedVolatilitySolver().solve(
+            'black_scholes_merton', prices, is_call, spot, strikes, times, 0.065, 0.01
+        )
+
+        for i in range(len(prices)):
+            flag = 'c' if is_call[i] else 'p'
+            expected = implied_volatility(prices[i], spot, strikes[i], times[i], 0.065, 0.01, flag)
+            assert result.implied_volatilities[i] == pytest.approx(expected, abs=1e-7)
+
+    def test_prices_outside_arbitrage_bounds_yield_nan(self):
+        solver = BatchImpliedVolatilitySolver()
+        # Below intrinsic, above the underlying, zero price, expired
+        result = solver.solve(
+            'black_scholes',
+            [5.0, 150.0, 0.0, 5.0],
+            [True, True, True, True],
+            100.0,
+            [90.0, 100.0, 100.0, 100.0],
+            [0.5, 0.5, 0.5, 0.0],
+            0.05
+        )
+        assert np.isnan(result.implied_volatilities).all()
+        assert not result.converged.any()
+
+    def test_warm_start_cuts_iterations(self):
+        spot, strikes, times, vols, is_call = _chain()
+        keys = [f"OPT{i}" for i in range(len(strikes))]
+        solver = BatchImpliedVolatilitySolver()
+
+        prices, _ = price_and_vega('black_scholes', is_call, spot, strikes, times, 0.065, vols)
+        cold = solver.solve('black_scholes', prices, is_call, spot, strikes, times, 0.065, keys=keys)
+
+        # Next tick: small move in spot and vol
+        next_vols = vols * 1.001
+        prices, _ = price_and_vega('black_scholes', is_call, spot * 1.0002, strikes, times, 0.065, next_vols)
+        warm = solver.solve('black_scholes', prices, is_call, spot * 1.0002, strikes, times, 0.065, keys=keys)
+
+        assert warm.warm_started.all()
+        assert warm.iterations.mean() < cold.iterations.mean()
+        assert np.median(warm.iterations) <= 2
+        np.testing.assert_allclose(warm.implied_volatilities, next_vols, atol=1e-8)
+        assert solver.get_metrics()['warm_starts'] == len(keys)
+
+    def test_seed_cache_is_bounded(self):
+        solver = BatchImpliedVolatilitySolver(cache_size=3)
+        for i in range(5):
+            solver.solve_one('black_scholes', 5.0, True, 100.0, 100.0, 0.25, 0.05, key=f"K{i}")
+
+        assert solver.get_metrics()['cached_seeds'] == 3
+
+    def test_solve_one_returns_none_when_unsolvable(self):
+        solver = BatchImpliedVolatilitySolver()
+        assert solver.solve_one('black_scholes', 0.5, True, 100.0, 90.0, 0.5, 0.05) is None
+
+
+class TestEngineImpliedVolatility:
+
+    @pytest.fixture
+    def engine(self):
+        config = MagicMock()
+        config.model_name = "black_scholes_merton"
+        config.parameters = MagicMock()
+        config.parameters.risk_free_rate = 0.065
+        config.parameters.dividend_yield = 0.01
+        config.initialize = MagicMock()
+
+        with patch('app.services.vectorized_pyvollib_engine.get_greeks_model_config') as mock_config, \
+                patch('app.services.vectorized_pyvollib_engine.get_circuit_breaker'):
+            mock_config.return_value = config
+            engine = VectorizedPyvolibGreeksEngine()
+        engine._iv_solver = BatchImpliedVolatilitySolver()
+        return engine
+
+    @pytest.mark.asyncio
+    async def test_chain_ivs_solved_in_one_batch(self, engine):
+        expiry = (datetime.now() + timedelta(days=30)).isoformat()
+        options = [
+            {'strike': strike, 'expiry_date': expiry, 'option_type': 'CE', 'price': 4.0}
+            for strike in (95.0, 100.0, 105.0)
+        ]
+        options.append({'strike': 100.0, 'expiry_date': expiry, 'option_type': 'PE', 'volatility': 0.3})
+
+        with patch.object(engine._iv_solver, 'solve', wraps=engine._iv_solver.solve) as solve:
+            arrays = await engine._prepare_vectorized_arrays(options, 100.0)
+
+        solve.assert_called_once()
+        assert arrays['volatilities'][3] == 0.3
+        assert np.all(arrays['volatilities'][:3] > 0)
+
+        # The solved volatility reprices the option
+        prices, _ = price_and_vega(
+            'black_scholes_merton', np.array([True]), 100.0, arrays['strikes'][1:2],
+            arrays['times_to_expiry'][1:2], 0.065, arrays['volatilities'][1:2], 0.01
+        )
+        assert prices[0] == pytest.approx(4.0, abs=1e-6)
+
+    @pytest.mark.asyncio
+    async def test_single_iv_uses_shared_solver(self, engine):
+        iv = await engine._calculate_implied_volatility_single(4.0, 100.0, 100.0, 30 / 365.0, 'CE')
+        assert iv is not None and 0.0 < iv < 5.0
+        assert engine._iv_solver.get_metrics()['solve_calls'] == 1
+
+    def test_iv_cache_key_separates_underlyings(self, engine):
+        option = {'strike': 100.0, 'expiry_date': '2024-03-28', 'option_type': 'CE', 'price': 4.0}
+
+        nifty = engine._iv_cache_key({**option, 'underlying': 'NIFTY'}, 100.0, 'c')
+        banknifty = engine._iv_cache_key({**option, 'underlying': 'BANKNIFTY'}, 100.0, 'c')
+        assert nifty != banknifty
+        assert engine._iv_cache_key({**option, 'instrument_key': 'OPT1'}, 100.0, 'c') == ('OPT1',)
+        # No stable identity: no warm start rather than a key on the moving spot
+        assert engine._iv_cache_key(option, 100.0, 'c') is None
+
@@ -0,0 +1,157 @@
+"""
+Unit tests for the incremental bar builder that rolls live ticks into bars.
+"""
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.services.incremental_bar_builder import (
+    IncrementalBarBuilder,
+    feed_stream_ticks,
+    tick_trade,
+)
+
+# 09:15 IST, the session open
+OPEN = datetime(2024, 3, 4, 3, 45, tzinfo=UTC)
+NIFTY = 'NSE@NIFTY@INDEX'
+
+
+def _at(minutes: float) -> float:
+    return (OPEN + timedelta(minutes=minutes)).timestamp()
+
+
+def _builder(*intervals: str, **kwargs) -> IncrementalBarBuilder:
+    builder = IncrementalBarBuilder(cumulative_volume=False, **kwargs)
+    for interval in intervals:
+        assert builder.subscribe(NIFTY, interval, f'config:{interval}')
+    return builder
+
+
+class TestIncrementalBarBuilder:
+
+    def test_each_tick_updates_every_timeframe(self):
+        builder = _builder('1minute', '5minute', '15minute')
+        closed = []
+        builder.add_listener(closed.extend)
+
+        prices = [100, 103, 99, 101, 104, 98, 102]
+        for i, price in enumerate(prices):
+            builder.on_tick(NIFTY, _at(i * 2.5), price, volume=10)
+
+        # Ticks at 0, 2.5, ..., 15 minutes: one 1m bar per tick, 5m bars of two ticks each
+        one_minute = [bar for bar in closed if bar.interval == '1minute']
+        five_minute = [bar for bar in closed if bar.interval == '5minute']
+        fifteen = [bar for bar in closed if bar.interval == '15minute']
+        assert [bar.close for bar in one_minute] == prices[:-1]
+        assert [(bar.open, bar.high, bar.low, bar.close, bar.volume) for bar in five_minute] == [
+            (100, 103, 100, 103, 20), (99, 101, 99, 101, 20), (104, 104, 98, 98, 20)
+        ]
+        assert [(bar.open, bar.high, bar.low, bar.close, bar.ticks) for bar in fifteen] == [(100, 104, 98, 98, 6)]
+        assert all(bar.closed for bar in closed)
+
+        forming = builder.open_bar(NIFTY, '15minute')
+        assert forming.start == _at(15) and forming.as_ohlcv() == (_at(15), 102, 102, 102, 102, 10)
+
+    def test_buckets_are_aligned_to_the_session_open(self):
+        builder = _builder('1hour', '1day')
+
+        builder.on_tick(NIFTY, _at(-40), 100)     # 08:35 IST, in the hour counted back from the open
+        pre_open = builder.on_tick(NIFTY, _at(20), 101)
+        first_hour = builder.on_tick(NIFTY, _at(70), 102)
+
+        assert [bar.start for bar in pre_open] == [_at(-60)]
+        assert [bar.start for bar in first_hour] == [_at(0)]
+        assert builder.open_bar(NIFTY, '1hour').start == _at(60)
+        day = builder.open_bar(NIFTY, '1day')
+        assert day.start == _at(0) and day.close_at == _at(375) and day.ticks == 3
+
+        # The day bar closes at the session close; later ticks of that day are dropped, by the hour bar too
+        assert builder.close_due(now=_at(375) + 5)[-1] is day
+        builder.on_tick(NIFTY, _at(380), 103)
+        assert builder.open_bar(NIFTY, '1day') is None and builder.open_bar(NIFTY, '1hour') is None
+        assert builder.get_metrics()['late_ticks'] == 2
+
+    def test_last_intraday_bars_close_at_the_session_close(self):
+        builder = _builder('1hour', '4hour')
+        builder.on_tick(NIFTY, _at(365), 100)     # 15:20 IST
+
+        # The 15:15 hour and the 13:15 four-hour bar both end at 15:30, not after it
+        assert builder.open_bar(NIFTY, '1hour').close_at == _at(375)
+        assert builder.open_bar(NIFTY, '4hour').close_at == _at(375)
+        assert len(builder.close_due(now=_at(375) + 5)) == 2
+
+        builder.on_tick(NIFTY, _at(380), 101)
+        assert builder.open_bar(NIFTY, '1hour') is None
+        assert builder.get_metrics()['late_ticks'] == 2
+
+    def test_sweep_closes_quiet_bars_and_drops_late_ticks(self):
+        builder = _builder('5minute', close_delay=2.0)
+        builder.on_tick(NIFTY, _at(1), 100)
+
+        assert builder.close_due(now=_at(5)) == []
+        closed = builder.close_due(now=_at(5) + 2)
+        assert [bar.start for bar in closed] == [_at(0)]
+
+        # A tick for the closed bucket is late; the next bucket opens normally
+        assert builder.on_tick(NIFTY, _at(4.9), 99) == []
+        assert builder.open_bar(NIFTY, '5minute') is None
+        builder.on_tick(NIFTY, _at(6), 101)
+        assert builder.open_bar(NIFTY, '5minute').open == 101
+
+        metrics = builder.get_metrics()
+        assert (metrics['closed_by_sweep'], metrics['bars_closed'], metrics['late_ticks']) == (1, 1, 1)
+
+    def test_cumulative_volume_and_subscriptions(self):
+        builder = IncrementalBarBuilder()
+        assert not builder.subscribe(NIFTY, '1month', 'config:month')
+        builder.subscribe(NIFTY, '5minute', 'a')
+        builder.subscribe(NIFTY, '5minute', 'b')
+
+        for minutes, volume in [(0, 1000), (1, 1500), (2, 1600), (3, 200)]:
+            builder.on_tick(NIFTY, _at(minutes), 100, volume)
+        # The first tick only sets the baseline; a drop restarts the count
+        assert builder.open_bar(NIFTY, '5minute').volume == 500 + 100 + 200
+
+        builder.unsubscribe('a')
+        assert builder.intervals(NIFTY) == ('5minute',)
+        builder.unsubscribe('b')
+        assert builder.intervals(NIFTY) == ()
+        assert builder.on_tick(NIFTY, _at(10), 100) == []
+        assert builder.close_due(now=_at(60)) == []
+
+    def test_stream_tick_fields(self):
+        fields = {'ltp': '{"value": 101.5, "currency": "INR"}', 'ts_exch': '2024-03-04T03:46:00Z', 'v': '1200'}
+        assert tick_trade(fields) == (_at(1), 101.5, 1200.0)
+        assert tick_trade({'ltp': '99', 'timestamp': OPEN.isoformat()}) == (_at(0), 99.0, None)
+        assert tick_trade({'v': '10'}) is None
+
+        builder = _builder('1minute')
+        closed = feed_stream_ticks(builder, NIFTY, [
+            {'ltp': '100', 'ts_exch': OPEN.isoformat()},
+            {'ltp': '101', 'ts_exch': (OPEN + timedelta(minutes=1)).isoformat()}
+        ])
+        assert [bar.close for bar in closed] == [100.0]
+
+    @pytest.mark.asyncio
+    async def test_async_listeners_run_as_tasks(self):
+        builder = _builder('1minute')
+        received = []
+
+        async def listener(bars):
+            await asyncio.sleep(0)
+            received.extend(bars)
+
+        async def failing(bars):
+            raise RuntimeError('listener down')
+
+        builder.add_listener(listener)
+        builder.add_listener(failing)
+        builder.on_tick(NIFTY, _at(0), 100)
+        closed = builder.on_tick(NIFTY, _at(1), 101)
+        assert received == []
+
+        await builder.stop()
+        assert received == closed
+        assert builder.get_metrics()['listener_errors'] == 1
+
@@ -0,0 +1,308 @@
+"""
+Unit tests for the incremental indicator engine.
+
+Every indicator is checked bar-by-bar against a full-history pandas
+computation of the same definition, and the indicator set against tick
+merging, bar commits and a Redis-style JSON round trip.
+"""
+import json
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.incremental_bar_builder import IncrementalBarBuilder
+from app.services.incremental_indicators import (
+    Bar,
+    IncrementalIndicator,
+    IncrementalIndicatorSet,
+    create_indicator,
+    indicator_spec_key,
+)
+
+N_BARS = 300
+
+
+@pytest.fixture(scope="module")
+def ohlcv() -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    close = 22000.0 + np.cumsum(rng.normal(0.0, 15.0, N_BARS))
+    spread = rng.uniform(1.0, 30.0, N_BARS)
+    return pd.DataFrame({
+        'timestamp': 1_700_000_000 + 300.0 * np.arange(N_BARS),
+        'open': close + rng.normal(0.0, 5.0, N_BARS),
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.uniform(100.0, 5000.0, N_BARS)
+    })
+
+
+def _bars(df: pd.DataFrame) -> list[Bar]:
+    return [Bar(**row) for row in df.to_dict('records')]
+
+
+def _sma_seeded(values: pd.Series, length: int, alpha: float) -> pd.Series:
+    """Exponential smoothing seeded with the SMA of the first `length` valid values."""
+    values = values.copy()
+    first = values.first_valid_index()
+    start = values.index.get_loc(first)
+    seed = values.iloc[start:start + length].mean()
+    values.iloc[:start + length - 1] = np.nan
+    values.iloc[start + length - 1] = seed
+    return values.ewm(alpha=alpha, adjust=False).mean()
+
+
+def _run(name: str, params: dict, df: pd.DataFrame) -> list:
+    indicator = create_indicator(name, params)
+    return [indicator.update(bar) for bar in _bars(df)]
+
+
+def _column(values: list, key: str | None = None) -> np.ndarray:
+    return np.array([
+        np.nan if v is None or (key and v[key] is None) else (v[key] if key else v)
+        for v in values
+    ], dtype=float)
+
+
+class TestIndicatorDefinitions:
+
+    def test_sma(self, ohlcv):
+        expected = ohlcv['close'].rolling(20).mean()
+        np.testing.assert_allclose(_column(_run('sma', {'length': 20}, ohlcv)), expected, rtol=1e-10)
+
+    def test_ema(self, ohlcv):
+        expected = _sma_seeded(ohlcv['close'], 20, 2.0 / 21)
+        np.testing.assert_allclose(_column(_run('ema', {'length': 20}, ohlcv)), expected, rtol=1e-10)
+
+    def test_rsi_wilder(self, ohlcv):
+        change = ohlcv['close'].diff()
+        avg_gain = _sma_seeded(change.clip(lower=0), 14, 1.0 / 14)
+        avg_loss = _sma_seeded((-change).clip(lower=0), 14, 1.0 / 14)
+        expected = 100.0 * avg_gain / (avg_gain + avg_loss)
+
+        np.testing.assert_allclose(_column(_run('rsi', {'length': 14}, ohlcv)), expected, rtol=1e-9)
+
+    def test_macd(self, ohlcv):
+        macd = _sma_seeded(ohlcv['close'], 12, 2.0 / 13) - _sma_seeded(ohlcv['close'], 26, 2.0 / 27)
+        signal = _sma_seeded(macd, 9, 2.0 / 10)
+        values = _run('macd', {'fast': 12, 'slow': 26, 'signal': 9}, ohlcv)
+
+        np.testing.assert_allclose(_column(values, 'MACD_12_26_9'), macd, rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(_column(values, 'MACDs_12_26_9'), signal, rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(_column(values, 'MACDh_12_26_9'), macd - signal, rtol=1e-9, atol=1e-9)
+
+    def test_atr_wilder(self, ohlcv):
+        prev_close = ohlcv['close'].shift()
+        true_range = pd.concat([
+            ohlcv['high'] - ohlcv['low'],
+            (ohlcv['high'] - prev_close).abs(),
+            (ohlcv['low'] - prev_close).abs()
+        ], axis=1).max(axis=1)
+        true_range.iloc[0] = np.nan
+        expected = _sma_seeded(true_range, 14, 1.0 / 14)
+
+        np.testing.assert_allclose(_column(_run('atr', {'length': 14}, ohlcv)), expected, rtol=1e-10)
+
+    def test_bollinger(self, ohlcv):
+        middle = ohlcv['close'].rolling(20).mean()
+        std = ohlcv['close'].rolling(20).std(ddof=0)
+        values = _run('bb', {'length': 20, 'std': 2}, ohlcv)
+
+        np.testing.assert_allclose(_column(values, 'BBM_20_2.0'), middle, rtol=1e-10)
+        np.testing.assert_allclose(_column(values, 'BBU_20_2.0'), middle + 2 * std, rtol=1e-10)
+        np.testing.assert_allclose(_column(values, 'BBL_20_2.0'), middle - 2 * std, rtol=1e-10)
+        assert set(next(v for v in values if v)) == {'BBL_20_2.0', 'BBM_20_2.0', 'BBU_20_2.0', 'BBB_20_2.0', 'BBP_20_2.0'}
+
+    def test_vwap_resets_each_day(self, ohlcv):
+        typical = (ohlcv['high'] + ohlcv['low'] + ohlcv['close']) / 3.0
+        day = (ohlcv['timestamp'] // 86400).astype(int)
+        expected = (typical * ohlcv['volume']).groupby(day).cumsum() / ohlcv['volume'].groupby(day).cumsum()
+
+        np.testing.assert_allclose(_column(_run('vwap', {}, ohlcv)), expected, rtol=1e-10)
+
+    def test_stochastic(self, ohlcv):
+        highest = ohlcv['high'].rolling(14).max()
+        lowest = ohlcv['low'].rolling(14).min()
+        k_line = (100.0 * (ohlcv['close'] - lowest) / (highest - lowest)).rolling(3).mean()
+        d_line = k_line.rolling(3).mean()
+        values = _run('stoch', {'k': 14, 'd': 3}, ohlcv)
+
+        np.testing.assert_allclose(_column(values, 'STOCHk_14_3_3'), k_line, rtol=1e-9)
+        np.testing.assert_allclose(_column(values, 'STOCHd_14_3_3'), d_line, rtol=1e-9)
+
+    @pytest.mark.parametrize("name,params", [
+        ('rsi', {'length': 14}), ('macd', {}), ('bb', {}), ('stoch', {}), ('atr', {}), ('vwap', {})
+    ])
+    def test_peek_matches_update_without_mutating(self, ohlcv, name, params):
+        indicator = create_indicator(name, params)
+        bars = _bars(ohlcv)
+        for bar in bars[:-1]:
+            indicator.update(bar)
+
+        state = json.dumps(indicator.to_state())
+        peeked = indicator.peek(bars[-1])
+
+        assert json.dumps(indicator.to_state()) == state
+        assert peeked == indicator.update(bars[-1])
+
+    def test_unsupported_parameters_fall_back(self):
+        assert create_indicator('rsi', {'length': 14, 'talib': True}) is None
+        assert create_indicator('supertrend', {}) is None
+
+    def test_base_class_is_abstract(self):
+        with pytest.raises(TypeError):
+            IncrementalIndicator()
+
+
+class TestIncrementalIndicatorSet:
+
+    def _set(self, history: list[Bar], now: float) -> IncrementalIndicatorSet:
+        indicator_set = IncrementalIndicatorSet(300)
+        indicator_set.start(history, now)
+        for name in ('rsi', 'ema', 'macd'):
+            indicator_set.add(indicator_spec_key(name), create_indicator(name), history, now)
+        return indicator_set
+
+    def test_ticks_roll_into_bars(self, ohlcv):
+        bars = _bars(ohlcv)
+        history, last = bars[:-1], bars[-1]
+        indicator_set = self._set(history, last.timestamp)
+        rsi = indicator_spec_key('rsi')
+        reference = create_indicator('rsi')
+        for bar in history:
+            reference.update(bar)
+
+        assert indicator_set.on_tick(last.timestamp + 1, last.close - 5.0, 10.0) is False
+        assert indicator_set.on_tick(last.timestamp + 2, last.close, 10.0) is False
+        forming = Bar(last.timestamp + 1, last.close - 5.0, last.close - 5.0, last.close, last.close, 20.0)
+        assert indicator_set.values([rsi])[rsi] == pytest.approx(reference.peek(forming))
+
+        # First tick of the next interval commits the forming bar
+        assert indicator_set.on_tick(last.timestamp + 300, last.close + 1.0, 5.0) is True
+        reference.update(forming)
+        assert indicator_set.bars_committed == len(history) + 1
+        assert indicator_set.values([rsi])[rsi] == pytest.approx(
+            reference.peek(Bar(last.timestamp + 300, *([last.close + 1.0] * 4), 5.0))
+        )
+
+    def test_duplicate_and_late_ticks_are_ignored(self, ohlcv):
+        bars = _bars(ohlcv)
+        indicator_set = self._set(bars, bars[-1].timestamp + 300)
+
+        indicator_set.on_tick(bars[-1].timestamp + 301, 100.0, 7.0)
+        indicator_set.on_tick(bars[-1].timestamp + 301, 100.0, 7.0)
+        indicator_set.on_tick(bars[-1].timestamp + 10, 50.0, 7.0)
+
+        assert indicator_set.forming.volume == 7.0
+        assert indicator_set.forming.low == 100.0
+
+    def test_open_history_bar_becomes_forming_bar(self, ohlcv):
+        bars = _bars(ohlcv)
+        indicator_set = self._set(bars, bars[-1].timestamp + 30)
+
+        assert indicator_set.forming == bars[-1]
+        assert indicator_set.bars_committed == len(bars) - 1
+
+    def test_state_round_trips_through_json(self, ohlcv):
+        bars = _bars(ohlcv)
+        indicator_set = self._set(bars[:-1], bars[-1].timestamp)
+        indicator_set.on_tick(bars[-1].timestamp, bars[-1].close, 1.0)
+
+        restored = IncrementalIndicatorSet.from_state(json.loads(json.dumps(indicator_set.to_state())))
+        keys = list(indicator_set.indicators)
+
+        assert restored.values(keys) == indicator_set.values(keys)
+        restored.on_tick(bars[-1].timestamp + 300, 1.0, 1.0)
+        indicator_set.on_tick(bars[-1].timestamp + 300, 1.0, 1.0)
+        assert restored.values(keys) == indicator_set.values(keys)
+
+
+# Monday 2024-03-04 09:15 IST, the session open
+SESSION_OPEN = datetime(2024, 3, 4, 3, 45, tzinfo=UTC).timestamp()
+
+
+def _ist(minutes: float) -> float:
+    return SESSION_OPEN + minutes * 60
+
+
+class TestSessionBuckets:
+
+    def test_hour_buckets_start_at_the_session_open(self):
+        indicator_set = IncrementalIndicatorSet(3600)
+
+        assert indicator_set.bucket(_ist(59)) == _ist(0)
+        assert indicator_set.bucket(_ist(61)) == _ist(60)
+        assert IncrementalIndicatorSet(4 * 3600).bucket(_ist(239)) == _ist(0)
+
+    def test_week_buckets_start_on_monday(self):
+        indicator_set = IncrementalIndicatorSet(7 * 86400)
+        thursday = _ist(3 * 24 * 60 + 30)
+
+        assert indicator_set.bucket(thursday) == _ist(0)
+        assert datetime.fromtimestamp(indicator_set.bucket(thursday), UTC).weekday() == 0
+
+    def test_ticks_after_the_day_close_are_dropped(self):
+        indicator_set = IncrementalIndicatorSet(86400)
+        indicator_set.on_tick(_ist(10), 100.0, 1.0)
+
+        assert indicator_set.on_tick(_ist(380), 105.0, 1.0) is False
+        assert indicator_set.forming.close == 100.0
+        assert indicator_set.on_tick(_ist(24 * 60 + 1), 101.0, 1.0) is True
+
+    def test_cumulative_volume_becomes_per_tick_volume(self):
+        indicator_set = IncrementalIndicatorSet(300, cumulative_volume=True)
+        vwap = indicator_spec_key('vwap')
+        indicator_set.add(vwap, create_indicator('vwap'), [], _ist(0))
+
+        # Ticks carry the day's traded volume so far; the first one only sets the baseline
+        indicator_set.on_tick(_ist(0.5), 100.0, 1000.0)
+        indicator_set.on_tick(_ist(1), 102.0, 1500.0)
+        indicator_set.on_tick(_ist(2), 104.0, 1600.0)
+        assert indicator_set.forming.volume == 600.0
+
+        assert indicator_set.on_tick(_ist(5.5), 110.0, 2000.0) is True
+        assert indicator_set.forming.volume == 400.0
+        first_typical = (104.0 + 100.0 + 104.0) / 3
+        assert indicator_set.values([vwap])[vwap] == pytest.approx((first_typical * 600 + 110.0 * 400) / 1000)
+
+        # The day's volume restarts on the next session
+        indicator_set.on_tick(_ist(24 * 60 + 1), 120.0, 50.0)
+        assert indicator_set.forming.volume == 50.0
+        restored = IncrementalIndicatorSet.from_state(json.loads(json.dumps(indicator_set.to_state())))
+        restored.on_tick(_ist(24 * 60 + 2), 121.0, 80.0)
+        assert restored.forming.volume == 80.0
+
+    def test_bars_from_the_bar_builder_are_committed_once(self):
+        builder = IncrementalBarBuilder()
+        assert builder.subscribe('NSE@NIFTY@INDEX', '5minute', 'config')
+        indicator_set = IncrementalIndicatorSet(300, builder.session)
+        vwap = indicator_spec_key('vwap')
+        indicator_set.add(vwap, create_indicator('vwap'), [], _ist(0))
+        builder.add_listener(lambda bars: [indicator_set.commit(Bar(*bar.as_ohlcv())) for bar in bars])
+
+        # The builder takes the increase of the cumulative volume, as the set would
+        for minute, price, volume in ((0.5, 100.0, 1000.0), (1, 102.0, 1500.0), (2, 104.0, 1600.0), (5.5, 110.0, 2000.0)):
+            builder.on_tick('NSE@NIFTY@INDEX', _ist(minute), price, volume=volume)
+        indicator_set.set_forming(Bar(*builder.open_bar('NSE@NIFTY@INDEX', '5minute').as_ohlcv()))
+
+        assert indicator_set.bars_committed == 1 and indicator_set.forming.volume == 400.0
+        first_typical = (104.0 + 100.0 + 104.0) / 3
+        assert indicator_set.values([vwap])[vwap] == pytest.approx((first_typical * 600 + 110.0 * 400) / 1000)
+
+        # A bar already committed is not committed again
+        assert indicator_set.commit(Bar(_ist(0), 100.0, 104.0, 100.0, 104.0, 600.0)) is False
+        assert indicator_set.bars_committed == 1
+
+    def test_state_is_stale_once_a_bar_was_missed(self):
+        indicator_set = IncrementalIndicatorSet(300)
+        assert indicator_set.is_stale(_ist(0))
+
+        indicator_set.on_tick(_ist(1), 100.0, 1.0)
+        restored = IncrementalIndicatorSet.from_state(json.loads(json.dumps(indicator_set.to_state())))
+
+        assert not restored.is_stale(_ist(4))
+        assert not restored.is_stale(_ist(9))     # the next bar is still forming
+        assert restored.is_stale(_ist(10))        # the 09:20 bar closed unseen
+        assert restored.is_stale(timedelta(days=1).total_seconds() + _ist(1))
@@ -0,0 +1,136 @@
+"""
+Unit tests for shared-memory indicator execution in worker processes.
+"""
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.indicator_process_pool import (
+    IndicatorProcessPool,
+    attach_frame,
+    create_indicator_process_pool,
+    get_indicator_process_pool,
+    is_poolable,
+    shape_indicator_result,
+    share_frame,
+)
+from app.services.indicator_registry import IndicatorCategory, IndicatorMetadata
+
+
+def rolling_range(df: pd.DataFrame, length: int = 3) -> pd.Series:
+    """Module-level so that spawned workers can resolve it."""
+    return (df['high'] - df['low']).rolling(length).mean()
+
+
+def _metadata(function, category=IndicatorCategory.SMART_MONEY, output_type="series") -> IndicatorMetadata:
+    return IndicatorMetadata(
+        name=function.__name__,
+        category=category,
+        library="test",
+        description="",
+        parameters={},
+        function=function,
+        output_type=output_type
+    )
+
+
+@pytest.fixture
+def ohlcv() -> pd.DataFrame:
+    n = 50
+    close = 100.0 + np.arange(n, dtype=float)
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01 09:15', periods=n, freq='5min', tz='UTC'),
+        'open': close,
+        'high': close + 2.0,
+        'low': close - 1.0,
+        'close': close,
+        'volume': np.arange(n, dtype=np.int64),
+        'symbol': ['NIFTY'] * n
+    })
+
+
+class TestSharedFrame:
+
+    def test_round_trip_keeps_numeric_and_datetime_columns(self, ohlcv):
+        frame, shm = share_frame(ohlcv)
+        try:
+            restored = attach_frame(frame)
+        finally:
+            shm.close()
+            shm.unlink()
+
+        assert 'symbol' not in restored.columns
+        np.testing.assert_array_equal(restored['close'], ohlcv['close'])
+        np.testing.assert_array_equal(restored['volume'], ohlcv['volume'].astype(float))
+        assert (restored['timestamp'] == ohlcv['timestamp'].dt.tz_convert(None)).all()
+
+
+class TestRouting:
+
+    def test_shape_indicator_result(self):
+        assert shape_indicator_result("series", pd.Series([1.0, 2.5])) == 2.5
+        assert shape_indicator_result("series", pd.Series([1.0, np.nan])) is None
+        assert shape_indicator_result("dataframe", pd.DataFrame({'a': [1]})) == [{'a': 1}]
+        assert shape_indicator_result("float", 3) == 3.0
+        assert shape_indicator_result("dict", {'a': 1}) == {'a': 1}
+
+    def test_handles_pooled_categories_and_module_level_functions(self):
+        def local_indicator(df):
+            return df['close']
+
+        pool = IndicatorProcessPool(1, ['smart_money'])
+
+        assert pool.handles(_metadata(rolling_range))
+        assert not pool.handles(_metadata(rolling_range, IndicatorCategory.TRENDLINES))
+        assert not is_poolable(local_indicator)
+        assert not pool.handles(_metadata(local_indicator))
+        assert not pool.runs_pandas_ta
+
+    def test_create_from_settings_values(self):
+        assert create_indicator_process_pool(0, "smart_money") is None
+        assert create_indicator_process_pool(2, "unknown, ") is None
+
+        pool = create_indicator_process_pool(2, "smart_money, pandas_ta, unknown")
+        assert pool.categories == {IndicatorCategory.SMART_MONEY, IndicatorCategory.PANDAS_TA}
+        assert pool.runs_pandas_ta
+
+    def test_settings_pool_is_shared(self, monkeypatch):
+        from app.core.config import settings
+        from app.services import indicator_process_pool
+
+        monkeypatch.setattr(settings, 'INDICATOR_PROCESS_POOL_WORKERS', 2, raising=False)
+        monkeypatch.setattr(settings, 'INDICATOR_PROCESS_POOL_CATEGORIES', 'smart_money', raising=False)
+        monkeypatch.setattr(indicator_process_pool, '_indicator_process_pool', None)
+        monkeypatch.setattr(indicator_process_pool, '_indicator_process_pool_configured', False)
+
+        pool = get_indicator_process_pool()
+        assert pool is get_indicator_process_pool()
+        assert pool.max_workers == 2 and pool.categories == {IndicatorCategory.SMART_MONEY}
+
+
+class TestWorkerExecution:
+
+    @pytest.mark.asyncio
+    async def test_custom_indicator_runs_in_worker(self, ohlcv, monkeypatch):
+        pool = IndicatorProcessPool(1, ['smart_money'], preload_modules=[__name__])
+        created = []
+        original = shared_memory.SharedMemory
+
+        def tracking(*args, **kwargs):
+            shm = original(*args, **kwargs)
+            if kwargs.get('create'):
+                created.append(shm.name)
+            return shm
+
+        monkeypatch.setattr('app.services.indicator_process_pool.shared_memory.SharedMemory', tracking)
+        try:
+            result = await pool.run_custom_indicator(_metadata(rolling_range), ohlcv, {'length': 5})
+        finally:
+            pool.shutdown()
+
+        assert result == pytest.approx(3.0)
+        assert pool.get_metrics()['custom_runs'] == 1
+        with pytest.raises(FileNotFoundError):
+            original(name=created[0])
@@ -0,0 +1,69 @@
+"""
+Unit tests for the bounded LRU/TTL cache shared by the metadata and timeframe caches.
+"""
+import pytest
+
+from app.utils.lru_cache import LRUCache, read_only
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLRUCache:
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = LRUCache(max_size=3)
+        for key in 'abc':
+            cache.set(key, key.upper())
+
+        assert cache.get('a') == 'A'    # 'b' is now the least recently used
+        cache.set('d', 'D')
+
+        assert 'b' not in cache and len(cache) == 3
+        assert cache.get_many(['a', 'b', 'c', 'd']) == {'a': 'A', 'c': 'C', 'd': 'D'}
+        stats = cache.get_stats()
+        assert (stats['hits'], stats['misses'], stats['evictions']) == (4, 1, 1)
+
+        # Overwriting an entry refreshes it without evicting anything
+        cache.set('a', 'A2')
+        assert len(cache) == 3 and cache.get_stats()['evictions'] == 1
+
+    def test_entries_expire_after_their_ttl(self):
+        clock = _Clock()
+        cache = LRUCache(max_size=10, ttl_seconds=60, clock=clock)
+        cache.set('default', 1)
+        cache.set('short', 2, ttl_seconds=5)
+        cache.set('stale', 3, ttl_seconds=5)
+
+        clock.now += 10
+        assert cache.get('short') is None
+        assert cache.get_many(['default', 'short']) == {'default': 1}
+        assert cache.purge_expired() == 1    # 'stale'
+
+        clock.now += 60
+        assert 'default' not in cache
+        stats = cache.get_stats()
+        assert (stats['expirations'], stats['misses'], stats['size']) == (2, 2, 1)
+
+    def test_read_only_values_are_shared_not_copied(self):
+        cache = LRUCache()
+        metadata = {'symbol': 'NIFTY', 'lot_size': 50}
+        cache.set('NSE@NIFTY@INDEX', read_only(metadata))
+        metadata['symbol'] = 'changed'
+
+        first = cache.get('NSE@NIFTY@INDEX')
+        assert first['symbol'] == 'NIFTY'
+        assert cache.get('NSE@NIFTY@INDEX') is first
+        assert read_only(first) is first
+        with pytest.raises(TypeError):
+            first['symbol'] = 'other'
+
+    def test_rejects_empty_bound(self):
+        with pytest.raises(ValueError):
+            LRUCache(max_size=0)
+
@@ -0,0 +1,168 @@
+"""
+Unit tests for sorted strike ladders and incremental moneyness bands.
+"""
+import json
+import random
+
+import pytest
+
+from app.services.moneyness_cache_refresh_service import MoneynessCategory, MoneynessRefreshService
+from app.services.moneyness_calculator_local import STRIKE_ORDERED_LEVELS, LocalMoneynessCalculator
+from app.services.moneyness_strike_index import MoneynessBandIndex, StrikeLadder
+
+
+def _random_strikes(rng, count=200):
+    return [round(rng.uniform(50, 200) * 2) / 2 for _ in range(count)]
+
+
+class TestStrikeLadder:
+
+    def test_nearest_matches_linear_scan(self):
+        rng = random.Random(7)
+        strikes = _random_strikes(rng)
+        ladder = StrikeLadder(strikes)
+
+        for _ in range(500):
+            price = rng.uniform(40, 210)
+            expected = min(sorted(set(strikes)), key=lambda s: abs(s - price))
+            assert ladder.nearest(price) == expected
+
+        assert StrikeLadder([]).nearest(100) is None
+        assert ladder.between(100, 101) == [s for s in ladder if 100 <= s <= 101]
+
+    def test_nearest_by_value_matches_scan_and_needs_every_probe(self):
+        strikes = [float(s) for s in range(80, 121)]
+        deltas = {s: 1 / (1 + (s / 100) ** 8) for s in strikes}
+        ladder = StrikeLadder(strikes)
+
+        for target in (0.05, 0.1, 0.25, 0.5, 0.9):
+            expected = min(strikes, key=lambda s: abs(deltas[s] - target))
+            assert ladder.nearest_by_value(target, deltas.get) == expected
+
+        assert ladder.nearest_by_value(0.5, {80.0: 0.9}.get) is None
+
+
+class TestMoneynessBandIndex:
+
+    def test_update_reports_only_boundary_crossings(self):
+        rng = random.Random(11)
+        calculator = LocalMoneynessCalculator()
+        ladder = StrikeLadder(_random_strikes(rng))
+
+        for option_type in ('call', 'put'):
+            def classify(strike, spot, option_type=option_type):
+                return calculator.classify_moneyness(strike, spot, option_type)
+
+            index = MoneynessBandIndex(ladder, classify, STRIKE_ORDERED_LEVELS)
+            spot = 125.0
+            first = index.update(spot)
+            assert len(first) == len(ladder) and all(old is None for _, old, _ in first)
+
+            previous = {s: classify(s, spot) for s in ladder}
+            for _ in range(200):
+                spot *= 1 + rng.uniform(-0.01, 0.01)
+                current = {s: classify(s, spot) for s in ladder}
+                expected = [(s, previous[s], current[s]) for s in ladder if previous[s] != current[s]]
+
+                assert index.update(spot) == expected
+                assert all(index.category_of(s) == current[s] for s in ladder)
+                previous = current
+
+    def test_find_strikes_by_moneyness_matches_reference_scan(self):
+        rng = random.Random(3)
+        calculator = LocalMoneynessCalculator()
+
+        for _ in range(50):
+            strikes = _random_strikes(rng, 60)
+            spot = rng.uniform(60, 190)
+            for option_type in ('call', 'put'):
+                for level in STRIKE_ORDERED_LEVELS:
+                    expected = sorted({
+                        s for s in strikes if calculator.classify_moneyness(s, spot, option_type) == level
+                    })
+                    found = calculator.find_strikes_by_moneyness(spot, strikes, level.value, option_type)
+                    assert found == expected
+
+        assert calculator.find_strikes_by_moneyness(100, [90, 100], 'OTM25delta', 'call') == []
+
+    def test_chain_ladder_is_built_once_per_strike_list(self):
+        calculator = LocalMoneynessCalculator()
+        strikes = calculator.get_strike_distribution('NIFTY', 20000, '2024-01-25')
+
+        first = calculator.find_strikes_by_moneyness(20000, strikes, 'ATM', 'call', 'NIFTY', '2024-01-25')
+        ladder = calculator.get_strike_ladder('NIFTY', '2024-01-25')
+        again = calculator.find_strikes_by_moneyness(20100, list(strikes), 'ATM', 'call', 'NIFTY', '2024-01-25')
+
+        assert calculator.get_strike_ladder('NIFTY', '2024-01-25') is ladder
+        assert first == calculator.find_strikes_by_moneyness(20000, strikes, 'ATM', 'call')
+        assert again == calculator.find_strikes_by_moneyness(20100, strikes, 'ATM', 'call')
+
+        # A different strike list replaces the chain's ladder
+        calculator.find_strikes_by_moneyness(20000, strikes[:-1], 'ATM', 'call', 'NIFTY', '2024-01-25')
+        assert calculator.get_strike_ladder('NIFTY', '2024-01-25').strikes == strikes[:-1]
+
+    def test_registered_chain_update_spot(self):
+        calculator = LocalMoneynessCalculator()
+        calculator.get_strike_ladder('NIFTY', '2024-01-25', [90, 95, 100, 105, 110])
+
+        assert len(calculator.update_spot('NIFTY', '2024-01-25', 100)) == 5
+        assert calculator.update_spot('NIFTY', '2024-01-25', 100.5) == []
+        with pytest.raises(KeyError):
+            calculator.update_spot('BANKNIFTY', '2024-01-25', 100)
+
+
+class _FakeRedis:
+
+    def __init__(self, values):
+        self.values = dict(values)
+        self.published = []
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.values[key] = value
+
+    async def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+
+
+class TestMoneynessRefreshService:
+
+    @pytest.mark.asyncio
+    async def test_spot_updates_refresh_only_crossed_strikes(self):
+        chain = {str(float(s)): {'option_type': 'call', 'time_to_expiry': 0.1} for s in range(70, 131, 5)}
+        redis = _FakeRedis({'raw_chain:NIFTY': json.dumps(chain)})
+        service = MoneynessRefreshService(redis)
+
+        first = await service.handle_spot_price_update('NIFTY', 100.0)
+        assert first['refresh_type'] == 'full_chain' and first['strikes_refreshed'] == len(chain)
+
+        unchanged = await service.handle_spot_price_update('NIFTY', 100.2, 100.0)
+        assert unchanged['refresh_type'] == 'no_category_change' and unchanged['strikes_refreshed'] == 0
+
+        # 99.9 / 125 = 0.799 falls below the OTM floor; every other strike keeps its category
+        crossed = await service.handle_spot_price_update('NIFTY', 99.9, 100.2)
+        assert crossed['refresh_type'] == 'boundary_crossings'
+        assert crossed['strikes_refreshed'] == crossed['category_changes'] == 1
+
+        channel, message = redis.published[-1]
+        assert channel == 'moneyness:category_changes:NIFTY'
+        assert message['changes'] == [
+            {'strike': 125.0, 'from': MoneynessCategory.OTM.value, 'to': MoneynessCategory.DEEP_OTM.value}
+        ]
+        assert json.loads(redis.values['moneyness:NIFTY:125.0:latest'])['category'] == 'deep_otm'
+
+        drifted = await service.handle_spot_price_update('NIFTY', 103.0, 99.9)
+        assert drifted['refresh_type'] == 'full_chain'
+        metrics = service.get_performance_metrics()
+        assert metrics['category_changes_published'] == 1 and metrics['full_chain_refreshes'] == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_full_chain_refresh_is_not_counted(self):
+        service = MoneynessRefreshService(_FakeRedis({}))
+
+        result = await service.handle_spot_price_update('NIFTY', 100.0)
+
+        assert result['refresh_type'] == 'full_chain' and result['strikes_refreshed'] == 0
+        assert service.get_performance_metrics()['full_chain_refreshes'] == 0
@@ -0,0 +1,113 @@
+"""
+Unit tests for the columnar OHLCV ring buffer and its keyed store.
+"""
+import numpy as np
+import pytest
+
+from app.services.ohlcv_ring_buffer import OHLCVRingBuffer, OHLCVStore
+
+
+def _bars(start: int, n: int) -> np.ndarray:
+    ts = np.arange(start, start + n, dtype=np.float64)
+    return np.vstack([ts, ts + 0.1, ts + 0.5, ts - 0.5, ts + 0.2, ts * 10])
+
+
+class TestOHLCVRingBuffer:
+
+    def test_append_wraps_and_reads_chronologically(self):
+        buffer = OHLCVRingBuffer.create(4)
+        for bar in _bars(0, 6).T:
+            buffer.append(*bar)
+
+        assert len(buffer) == 4
+        assert buffer.appended == 6
+        np.testing.assert_array_equal(buffer.last(), _bars(2, 4))
+        np.testing.assert_array_equal(buffer.last(2)[0], [4.0, 5.0])
+
+    def test_extend_keeps_last_capacity_bars(self):
+        buffer = OHLCVRingBuffer.create(5)
+        buffer.extend(_bars(0, 3))
+        buffer.extend(_bars(3, 9))
+
+        np.testing.assert_array_equal(buffer.last(), _bars(7, 5))
+        assert buffer.appended == 12
+
+    def test_last_returns_a_copy(self):
+        buffer = OHLCVRingBuffer.create(3)
+        buffer.extend(_bars(0, 3))
+        snapshot = buffer.last_as_dict()
+
+        buffer.append(3.0, 1.0, 1.0, 1.0, 1.0, 1.0)
+
+        np.testing.assert_array_equal(snapshot['timestamp'], [0.0, 1.0, 2.0])
+        np.testing.assert_array_equal(buffer.last_as_dict()['timestamp'], [1.0, 2.0, 3.0])
+
+    def test_shared_memory_attach_sees_appends(self):
+        owner = OHLCVRingBuffer.create(8, shared=True)
+        try:
+            owner.extend(_bars(0, 3))
+            reader = OHLCVRingBuffer.attach(owner.shm_name)
+            owner.append(*_bars(3, 1)[:, 0])
+
+            assert reader.capacity == 8
+            np.testing.assert_array_equal(reader.last(), _bars(0, 4))
+            reader.close()
+        finally:
+            owner.close(unlink=True)
+
+
+class TestOHLCVStore:
+
+    def test_miss_load_hit_append(self):
+        store = OHLCVStore(capacity=10)
+        assert store.get('NSE@NIFTY@INDEX', '5minute') is None
+
+        store.load('NSE@NIFTY@INDEX', '5minute', _bars(0, 4))
+        assert store.append('NSE@NIFTY@INDEX', '5minute', _bars(4, 1)[:, 0])
+        assert not store.append('NSE@TCS@EQ', '5minute', _bars(4, 1)[:, 0])
+
+        buffer = store.get('NSE@NIFTY@INDEX', '5minute')
+        np.testing.assert_array_equal(buffer.last(), _bars(0, 5))
+        assert store.get_metrics()['hits'] == 1
+        assert store.get_metrics()['misses'] == 1
+
+    def test_lru_bound(self):
+        store = OHLCVStore(capacity=4, max_buffers=2)
+        store.load('A', '1minute', _bars(0, 2))
+        store.load('B', '1minute', _bars(0, 2))
+        store.get('A', '1minute')
+        store.load('C', '1minute', _bars(0, 2))
+
+        assert store.get('B', '1minute') is None
+        assert store.get('A', '1minute') is not None
+        assert store.get_metrics()['evictions'] == 1
+
+    def test_stale_buffers_miss(self, monkeypatch):
+        store = OHLCVStore(capacity=4, ttl_seconds=60)
+        now = [1000.0]
+        monkeypatch.setattr('app.services.ohlcv_ring_buffer.time.monotonic', lambda: now[0])
+
+        store.load('A', '1minute', _bars(0, 2))
+        now[0] += 30
+        assert store.get('A', '1minute') is not None
+        now[0] += 61
+        assert store.get('A', '1minute') is None
+
+    @pytest.mark.parametrize("n", [0, 1])
+    def test_short_reads(self, n):
+        buffer = OHLCVRingBuffer.create(4)
+        buffer.extend(_bars(0, n))
+        assert buffer.last(10).shape == (6, n)
+
+    def test_append_replaces_a_bar_with_the_newest_timestamp(self):
+        store = OHLCVStore(capacity=10)
+        store.load('A', '5minute', _bars(0, 3))
+        newest = _bars(2, 1)[:, 0].copy()
+        newest[4] += 1.0
+
+        assert store.append('A', '5minute', newest)
+        assert not store.append('A', '5minute', _bars(1, 1)[:, 0])
+
+        columns = store.get('A', '5minute').last()
+        assert columns.shape == (6, 3)
+        np.testing.assert_array_equal(columns[:, -1], newest)
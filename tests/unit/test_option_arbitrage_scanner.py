@@ -0,0 +1,165 @@
+"""
+Unit tests for the strike-aligned static-arbitrage scanner.
+"""
+import math
+import time
+from datetime import date, timedelta
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from scipy.special import ndtr
+
+from app.services.option_arbitrage_scanner import (
+    StrikeAlignedChain,
+    box_spread_edges,
+    convexity_violations,
+    monotonicity_violations,
+    synthetic_forwards,
+)
+from app.services.premium_discount_calculator import PremiumDiscountCalculator
+from app.services.vectorized_pyvollib_engine import VectorizedPyvolibGreeksEngine
+
+SPOT = 26000.0
+RATE = 0.06
+
+
+def _bs_chain(calculator, strikes, days=30, vol=0.2):
+    """Arbitrage-free call/put rows (Black-Scholes, no dividends) on the calculator's clock."""
+    expiry = date.today() + timedelta(days=days)
+    t = calculator._calculate_time_to_expiry(expiry.isoformat())
+    k = np.asarray(strikes, dtype=np.float64)
+    d1 = (np.log(SPOT / k) + (RATE + vol * vol / 2) * t) / (vol * math.sqrt(t))
+    calls = SPOT * ndtr(d1) - k * math.exp(-RATE * t) * ndtr(d1 - vol * math.sqrt(t))
+    puts = calls - SPOT + k * math.exp(-RATE * t)
+
+    rows = []
+    for strike, call, put in zip(k.tolist(), calls.tolist(), puts.tolist(), strict=True):
+        rows.append({'strike': strike, 'expiry_date': expiry.isoformat(), 'option_type': 'CE', 'market_price': call})
+        rows.append({'strike': strike, 'expiry_date': expiry.isoformat(), 'option_type': 'PE', 'market_price': put})
+    return rows
+
+
+@pytest.fixture
+def calculator():
+    return PremiumDiscountCalculator(Mock(spec=VectorizedPyvolibGreeksEngine))
+
+
+class TestScannerKernels:
+
+    def test_quotes_are_aligned_by_strike(self):
+        chain = StrikeAlignedChain.from_quotes([100, 110, 100], [5.0, 2.0, 6.0], [110, 120], [4.0, 0.0])
+
+        assert chain.strikes.tolist() == [100.0, 110.0, 120.0]
+        assert chain.call_prices[0] == 6.0 and np.isnan(chain.call_prices[2])
+        assert np.isnan(chain.put_prices[0]) and np.isnan(chain.put_prices[2])
+
+    def test_violations_match_pairwise_loops(self):
+        rng = np.random.default_rng(5)
+        strikes = np.sort(rng.choice(np.arange(50, 150, 2.5), 30, replace=False))
+        prices = np.maximum(100 - strikes, 0) + rng.normal(3, 2, strikes.size)
+        prices[rng.choice(strikes.size, 5, replace=False)] = np.nan
+        quoted = [i for i in range(strikes.size) if not np.isnan(prices[i])]
+
+        lower, higher, _ = monotonicity_violations(strikes, prices, True, 0.5)
+        expected = [(a, b) for a, b in zip(quoted, quoted[1:], strict=False) if prices[b] - prices[a] > 0.5]
+        assert list(zip(lower.tolist(), higher.tolist(), strict=True)) == expected
+
+        lower, middle, higher, _ = convexity_violations(strikes, prices, 0.5)
+        expected = []
+        for a, b, c in zip(quoted, quoted[1:], quoted[2:], strict=False):
+            w = (strikes[c] - strikes[b]) / (strikes[c] - strikes[a])
+            if prices[b] - (w * prices[a] + (1 - w) * prices[c]) > 0.5:
+                expected.append((a, b, c))
+        assert list(zip(lower.tolist(), middle.tolist(), higher.tolist(), strict=True)) == expected
+
+    def test_box_edges_match_pairwise_loop(self):
+        rng = np.random.default_rng(9)
+        strikes = np.arange(90.0, 131.0)
+        chain = StrikeAlignedChain(strikes, rng.uniform(1, 30, strikes.size), rng.uniform(1, 30, strikes.size))
+        chain.put_prices[3] = np.nan
+        discount = 0.99
+
+        expected = {}
+        for i in range(len(chain)):
+            for j in range(i + 1, len(chain)):
+                cost = (chain.call_prices[i] - chain.call_prices[j]) - (chain.put_prices[i] - chain.put_prices[j])
+                edge = (strikes[j] - strikes[i]) * discount - cost
+                if abs(edge) > 1.0:
+                    expected[(i, j)] = edge
+
+        lower, higher, edge = box_spread_edges(synthetic_forwards(chain, discount), 1.0)
+        found = dict(zip(zip(lower.tolist(), higher.tolist(), strict=True), edge.tolist(), strict=True))
+        assert found.keys() == expected.keys()
+        assert all(found[key] == pytest.approx(expected[key]) for key in expected)
+        assert np.all(np.diff(np.abs(edge)) <= 0)
+        assert np.all(lower < higher)
+
+        lower, _, limited = box_spread_edges(synthetic_forwards(chain, discount), 1.0, limit=10)
+        assert limited.tolist() == edge[:10].tolist()
+
+
+class TestCalculatorArbitrageScan:
+
+    @pytest.mark.asyncio
+    async def test_arbitrage_free_chain_has_no_opportunities(self, calculator):
+        rows = _bs_chain(calculator, np.arange(24000.0, 28000.0, 50.0))
+
+        assert await calculator.calculate_arbitrage_opportunities(rows, SPOT) == []
+        # Without a spot the median synthetic forward is the parity reference
+        assert await calculator.calculate_arbitrage_opportunities(rows) == []
+
+    @pytest.mark.asyncio
+    async def test_rows_spot_is_not_the_default_parity_reference(self, calculator):
+        # Quotes priced off a dividend-adjusted forward, tagged with the cash index level
+        rows = _bs_chain(calculator, np.arange(25000.0, 27050.0, 50.0))
+        for row in rows:
+            row['underlying_price'] = SPOT * 1.01
+
+        assert await calculator.calculate_arbitrage_opportunities(rows) == []
+        flagged = await calculator.calculate_arbitrage_opportunities(rows, SPOT * 1.01)
+        assert sum(o['type'] == 'put_call_parity' for o in flagged) == len(rows) // 2
+
+    @pytest.mark.asyncio
+    async def test_injected_violations_are_found(self, calculator):
+        rows = _bs_chain(calculator, np.arange(25000.0, 27050.0, 50.0))
+        puts = {row['strike']: row for row in rows if row['option_type'] == 'PE'}
+        calls = {row['strike']: row for row in rows if row['option_type'] == 'CE'}
+        puts[26000.0]['market_price'] += 5.0
+        calls[26500.0]['market_price'] = calls[26550.0]['market_price'] - 2.0
+
+        opportunities = await calculator.calculate_arbitrage_opportunities(rows, SPOT)
+        by_type = {}
+        for opportunity in opportunities:
+            by_type.setdefault(opportunity['type'], []).append(opportunity)
+
+        parity_strikes = sorted(o['strike'] for o in by_type['put_call_parity'])
+        assert parity_strikes == [26000.0, 26500.0]
+        # Both the dear put and the cheap call make the put rich against the call
+        assert {o['action'] for o in by_type['put_call_parity']} == {'reversal'}
+        assert by_type['put_call_parity'][0]['parity_deviation'] == pytest.approx(-5.0, abs=1e-6)
+
+        (vertical,) = by_type['call_vertical_spread']
+        assert (vertical['lower_strike'], vertical['higher_strike']) == (26500.0, 26550.0)
+        assert vertical['price_inversion'] == pytest.approx(2.0)
+        assert any(o['strikes'][1] == 26000.0 for o in by_type['put_butterfly'])
+
+        # Every box that has the mispriced put (or call) as a leg is off by about its size
+        boxes = by_type['box_spread']
+        assert boxes and all(26000.0 in (o['lower_strike'], o['higher_strike'])
+                             or 26500.0 in (o['lower_strike'], o['higher_strike']) for o in boxes)
+        assert all(o['severity'] in ('LOW', 'MEDIUM', 'HIGH', 'EXTREME') for o in opportunities)
+
+    @pytest.mark.asyncio
+    async def test_thousand_strike_scan_meets_budget(self, calculator):
+        rows = _bs_chain(calculator, np.arange(1000) * 10.0 + 21000.0)
+        rows[1001]['market_price'] += 3.0
+
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            opportunities = await calculator.calculate_arbitrage_opportunities(rows, SPOT)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        assert sum(o['type'] == 'box_spread' for o in opportunities) == calculator.max_box_spread_opportunities
+        assert min(timings) < 15.0
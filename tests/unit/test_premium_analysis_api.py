@@ -318,13 +318,14 @@ class TestPremiumAnalysisAPI:
 
     def test_arbitrage_opportunities_success(self, client):
         """Test arbitrage opportunities endpoint."""
-        response = client.get(
-            "/api/v2/signals/fo/premium-analysis/arbitrage-opportunities/NIFTY",
-            params={
-                "min_severity": "MEDIUM",
-                "expiry_date": "2025-01-30"
-            }
-        )
+        with patch('app.api.v2.premium_analysis._fetch_option_chain', AsyncMock(return_value=[])):
+            response = client.get(
+                "/api/v2/signals/fo/premium-analysis/arbitrage-opportunities/NIFTY",
+                params={
+                    "min_severity": "MEDIUM",
+                    "expiry_date": "2025-01-30"
+                }
+            )
 
         assert response.status_code == 200
         data = response.json()
@@ -352,10 +353,11 @@ class TestPremiumAnalysisAPI:
         valid_severities = ['LOW', 'MEDIUM', 'HIGH', 'EXTREME']
 
         for severity in valid_severities:
-            response = client.get(
-                "/api/v2/signals/fo/premium-analysis/arbitrage-opportunities/NIFTY",
-                params={"min_severity": severity}
-            )
+            with patch('app.api.v2.premium_analysis._fetch_option_chain', AsyncMock(return_value=[])):
+                response = client.get(
+                    "/api/v2/signals/fo/premium-analysis/arbitrage-opportunities/NIFTY",
+                    params={"min_severity": severity}
+                )
             assert response.status_code == 200
 
         # Test invalid severity
@@ -365,6 +367,35 @@ class TestPremiumAnalysisAPI:
         )
         assert response.status_code == 422  # Validation error
 
+    def test_arbitrage_opportunities_chain_unavailable(self, client):
+        """Test that a ticker_service failure is reported as 503, not as an empty scan."""
+        adapter = Mock()
+        adapter.get_option_chain = AsyncMock(side_effect=ConnectionError("ticker_service down"))
+
+        with patch('app.api.v2.premium_analysis._ticker_adapter', adapter):
+            response = client.get("/api/v2/signals/fo/premium-analysis/arbitrage-opportunities/NIFTY")
+
+        assert response.status_code == 503
+        assert "Option chain unavailable" in response.json()['detail']
+
+    def test_arbitrage_opportunities_parity_reference(self, client, mock_premium_calculator):
+        """Test that spot is the parity reference only when requested."""
+        chain = [{'strike': 26000.0, 'expiry_date': '2025-01-30', 'option_type': 'CE',
+                  'market_price': 100.0, 'underlying_price': 26000.0}]
+        mock_premium_calculator.calculate_arbitrage_opportunities.return_value = []
+
+        with patch('app.api.v2.premium_analysis.premium_calculator', mock_premium_calculator), \
+                patch('app.api.v2.premium_analysis._fetch_option_chain', AsyncMock(return_value=chain)):
+            default = client.get("/api/v2/signals/fo/premium-analysis/arbitrage-opportunities/NIFTY")
+            spot = client.get(
+                "/api/v2/signals/fo/premium-analysis/arbitrage-opportunities/NIFTY",
+                params={"spot_reference": True}
+            )
+
+        assert default.status_code == 200 and spot.status_code == 200
+        references = [call.args[1] for call in mock_premium_calculator.calculate_arbitrage_opportunities.call_args_list]
+        assert references == [None, 26000.0]
+
     def test_performance_metrics_endpoint(self, client, mock_premium_calculator):
         """Test performance metrics endpoint."""
         mock_vectorized_metrics = {
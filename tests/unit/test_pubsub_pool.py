@@ -0,0 +1,195 @@
+"""
+Unit tests for the sharded Redis pub/sub listener pool.
+"""
+import asyncio
+import fnmatch
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.api.v2.websocket import ConnectionManager
+from app.services.pubsub_pool import (
+    ConsistentHashRing,
+    ShardedPubSubPool,
+    extract_payload_timestamp,
+)
+
+
+class _FakeBroker:
+
+    def __init__(self):
+        self.clients = []
+
+    def publish(self, channel, data):
+        for client in self.clients:
+            client.pubsub_instance.deliver(channel, data)
+
+
+class _FakePubSub:
+
+    def __init__(self):
+        self.channels = set()
+        self.patterns = set()
+        self.messages = asyncio.Queue()
+        self.blocking_reads = 0
+
+    async def subscribe(self, channel):
+        self.channels.add(channel)
+
+    async def unsubscribe(self, channel):
+        self.channels.discard(channel)
+
+    async def psubscribe(self, pattern):
+        self.patterns.add(pattern)
+
+    async def punsubscribe(self, pattern):
+        self.patterns.discard(pattern)
+
+    def deliver(self, channel, data):
+        if channel in self.channels:
+            self.messages.put_nowait({'type': 'message', 'channel': channel, 'data': data})
+        for pattern in self.patterns:
+            if fnmatch.fnmatchcase(channel, pattern):
+                self.messages.put_nowait({'type': 'pmessage', 'pattern': pattern, 'channel': channel, 'data': data})
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        assert timeout is None
+        self.blocking_reads += 1
+        return await self.messages.get()
+
+    async def close(self):
+        pass
+
+
+class _FakeClient:
+
+    def __init__(self, broker):
+        self.pubsub_instance = _FakePubSub()
+        broker.clients.append(self)
+
+    def pubsub(self):
+        return self.pubsub_instance
+
+    async def close(self):
+        pass
+
+
+async def _pool(broker, received, shards=4, **kwargs):
+    async def factory():
+        return _FakeClient(broker)
+
+    async def handler(channel, data):
+        received.append((channel, data))
+
+    pool = ShardedPubSubPool(factory, handler, shards=shards, **kwargs)
+    await pool.start()
+    return pool
+
+
+class TestConsistentHashRing:
+
+    def test_spreads_keys_and_moves_few_on_resize(self):
+        keys = [f"signal:updates:greeks:NSE@STOCK{i}@EQ" for i in range(4000)]
+        four, five = ConsistentHashRing(4), ConsistentHashRing(5)
+
+        counts = Counter(four.shard_for(k) for k in keys)
+        moved = sum(four.shard_for(k) != five.shard_for(k) for k in keys)
+
+        assert set(counts) == {0, 1, 2, 3}
+        assert min(counts.values()) > 4000 / 4 * 0.6
+        assert moved < 4000 * 0.35
+
+
+class TestShardedPubSubPool:
+
+    @pytest.mark.asyncio
+    async def test_channels_are_routed_to_their_shard(self):
+        broker, received = _FakeBroker(), []
+        pool = await _pool(broker, received)
+        channels = [f"signal:updates:greeks:NSE@S{i}@EQ" for i in range(20)]
+        for channel in channels:
+            await pool.subscribe(channel)
+
+        for channel in channels:
+            broker.publish(channel, f'{{"channel":"{channel}"}}')
+        broker.publish('signal:updates:unsubscribed', '{}')
+        await asyncio.sleep(0.01)
+
+        assert sorted(c for c, _ in received) == sorted(channels)
+        for channel in channels:
+            assert channel in pool.shard_for(channel).channels
+        metrics = pool.get_metrics()
+        assert metrics['channels'] == 20 and metrics['messages'] == 20
+        assert sum(1 for shard in metrics['shards'] if shard['listening']) > 1
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_pattern_subscription_and_unsubscribe(self):
+        broker, received = _FakeBroker(), []
+        pool = await _pool(broker, received, shards=2)
+        await pool.psubscribe('signal:updates:greeks:*')
+        await pool.subscribe('signal:updates:indicators:X')
+
+        broker.publish('signal:updates:greeks:A', '1')
+        broker.publish('signal:updates:indicators:X', '2')
+        await asyncio.sleep(0.01)
+        await pool.punsubscribe('signal:updates:greeks:*')
+        broker.publish('signal:updates:greeks:A', '3')
+        await asyncio.sleep(0.01)
+
+        assert received == [('signal:updates:greeks:A', '1'), ('signal:updates:indicators:X', '2')]
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_lag_is_sampled_per_shard_and_handler_errors_are_counted(self):
+        broker = _FakeBroker()
+
+        async def factory():
+            return _FakeClient(broker)
+
+        async def handler(channel, data):
+            raise RuntimeError("fan-out failed")
+
+        pool = ShardedPubSubPool(factory, handler, shards=1, lag_sample_every=1)
+        await pool.start()
+        await pool.subscribe('c')
+        published = (datetime.utcnow() - timedelta(seconds=2)).isoformat()
+        broker.publish('c', f'{{"data":{{"v":1}},"timestamp":"{published}"}}')
+        await asyncio.sleep(0.01)
+
+        shard = pool.get_metrics()['shards'][0]
+        assert 1.9 < shard['last_lag_seconds'] < 3.0
+        assert shard['errors'] == 1 and shard['messages'] == 1
+        await pool.close()
+
+
+class TestExtractPayloadTimestamp:
+
+    def test_parses_naive_and_aware_timestamps(self):
+        assert extract_payload_timestamp('{"timestamp": "2024-01-01T00:00:00"}') == 1704067200.0
+        assert extract_payload_timestamp(b'{"timestamp":"2024-01-01T05:30:00+05:30"}') == 1704067200.0
+        assert extract_payload_timestamp('{"value": 1}') is None
+        assert extract_payload_timestamp('{"timestamp": "yesterday"}') is None
+
+
+class TestConnectionManagerPubSub:
+
+    @pytest.mark.asyncio
+    async def test_pattern_mode_subscribes_once_per_channel_family(self):
+        broker, received = _FakeBroker(), []
+        manager = ConnectionManager()
+        manager.pubsub_pool = await _pool(broker, received, shards=2)
+        manager.pubsub_patterns = True
+
+        await manager._subscribe_to_redis_channel('greeks:NSE@A@EQ')
+        await manager._subscribe_to_redis_channel('greeks:NSE@B@EQ')
+        await manager._subscribe_to_redis_channel('indicators:NSE@A@EQ')
+        assert manager.pubsub_pool.get_metrics()['patterns'] == 2
+
+        await manager._unsubscribe_from_redis_channel('greeks:NSE@A@EQ')
+        assert manager.pubsub_pool.get_metrics()['patterns'] == 2
+        await manager._unsubscribe_from_redis_channel('greeks:NSE@B@EQ')
+        assert manager.pubsub_pool.get_metrics()['patterns'] == 1
+        assert manager.pattern_family_counts == {'indicators': 1}
+        await manager.pubsub_pool.close()
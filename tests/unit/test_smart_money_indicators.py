@@ -0,0 +1,295 @@
+"""
+Unit tests for the native Smart Money Concepts implementations.
+
+The array-based implementations are checked for exact equality against the
+previous per-bar loops, kept here as references, on randomised OHLCV data.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.smart_money_indicators import (
+    _get_real_swings,
+    _real_bos,
+    _real_choch,
+    _real_fvg,
+    _real_liquidity,
+    _real_order_blocks,
+)
+
+# =============================================================================
+# Reference per-bar implementations
+# =============================================================================
+
+
+def _reference_swings(df: pd.DataFrame, swing_length: int = 5) -> pd.Series:
+    def swing(prices, is_high):
+        result = pd.Series(index=df.index, dtype=float)
+        for i in range(swing_length, len(prices) - swing_length):
+            current = prices[i]
+            blocked = any(
+                (prices[i + j] >= current) if is_high else (prices[i + j] <= current)
+                for j in [*range(-swing_length, 0), *range(1, swing_length + 1)]
+            )
+            result.iloc[i] = np.nan if blocked else current
+        return result
+
+    result = pd.Series(0, index=df.index)
+    result[swing(df['high'].values, True).notna()] = 1
+    result[swing(df['low'].values, False).notna()] = -1
+    return result
+
+
+def _reference_bos(df: pd.DataFrame) -> pd.Series:
+    if len(df) < 20:
+        return pd.Series(0, index=df.index)
+    swings = _reference_swings(df, 5)
+    result = pd.Series(0, index=df.index)
+    swing_high_indices = df.index[swings == 1].tolist()
+    swing_low_indices = df.index[swings == -1].tolist()
+
+    for i in range(len(df)):
+        current_idx = df.index[i]
+        recent_swing_highs = [idx for idx in swing_high_indices if idx < current_idx]
+        if recent_swing_highs and df['high'].iloc[i] > df.loc[recent_swing_highs[-1], 'high']:
+            if 'volume' in df.columns and i > 0:
+                avg_volume = df['volume'].iloc[max(0, i-10):i].mean()
+                if df['volume'].iloc[i] > avg_volume * 1.2:
+                    result.iloc[i] = 1
+            else:
+                result.iloc[i] = 1
+
+        recent_swing_lows = [idx for idx in swing_low_indices if idx < current_idx]
+        if recent_swing_lows and df['low'].iloc[i] < df.loc[recent_swing_lows[-1], 'low']:
+            if 'volume' in df.columns and i > 0:
+                avg_volume = df['volume'].iloc[max(0, i-10):i].mean()
+                if df['volume'].iloc[i] > avg_volume * 1.2:
+                    result.iloc[i] = -1
+            else:
+                result.iloc[i] = -1
+    return result
+
+
+def _reference_choch(df: pd.DataFrame) -> pd.Series:
+    if len(df) < 30:
+        return pd.Series(0, index=df.index)
+    swings = _reference_swings(df, 5)
+    result = pd.Series(0, index=df.index)
+    swing_high_indices = df.index[swings == 1].tolist()
+    swing_low_indices = df.index[swings == -1].tolist()
+
+    for i in range(20, len(df)):
+        current_idx = df.index[i]
+        recent_highs = [idx for idx in swing_high_indices if idx < current_idx][-3:]
+        recent_lows = [idx for idx in swing_low_indices if idx < current_idx][-3:]
+        if len(recent_highs) >= 2 and len(recent_lows) >= 2:
+            high_values = [df.loc[idx, 'high'] for idx in recent_highs]
+            low_values = [df.loc[idx, 'low'] for idx in recent_lows]
+            is_bearish_trend = high_values[-1] < high_values[-2] and low_values[-1] < low_values[-2]
+            is_bullish_trend = high_values[-1] > high_values[-2] and low_values[-1] > low_values[-2]
+            if is_bearish_trend and df['high'].iloc[i] > df.loc[recent_highs[-1], 'high']:
+                result.iloc[i] = 1
+            elif is_bullish_trend and df['low'].iloc[i] < df.loc[recent_lows[-1], 'low']:
+                result.iloc[i] = -1
+    return result
+
+
+def _reference_order_blocks(df: pd.DataFrame) -> pd.DataFrame:
+    columns = ['top', 'bottom', 'type', 'timestamp', 'strength']
+    if len(df) < 20:
+        return pd.DataFrame(columns=columns)
+    order_blocks = []
+    price_change = df['close'].pct_change().abs()
+    displacement_threshold = price_change.rolling(window=20).mean() * 2
+
+    for i in range(10, len(df) - 5):
+        if price_change.iloc[i] > displacement_threshold.iloc[i]:
+            volume_confirmed = True
+            if 'volume' in df.columns:
+                volume_confirmed = df['volume'].iloc[i] > df['volume'].iloc[i-10:i].mean() * 1.5
+            if not volume_confirmed:
+                continue
+            if df['close'].iloc[i] > df['open'].iloc[i]:
+                kind, is_opposite = 'bullish', lambda j: df['close'].iloc[j] < df['open'].iloc[j]
+            elif df['close'].iloc[i] < df['open'].iloc[i]:
+                kind, is_opposite = 'bearish', lambda j: df['close'].iloc[j] > df['open'].iloc[j]
+            else:
+                continue
+            for j in range(i-1, max(0, i-5), -1):
+                if is_opposite(j):
+                    order_blocks.append({
+                        'top': float(df['high'].iloc[j]),
+                        'bottom': float(df['low'].iloc[j]),
+                        'type': kind,
+                        'timestamp': df.index[j],
+                        'strength': float(price_change.iloc[i])
+                    })
+                    break
+
+    if order_blocks:
+        ob_df = pd.DataFrame(order_blocks).sort_values('strength', ascending=False).head(10)
+        return ob_df.reset_index(drop=True)
+    return pd.DataFrame(columns=columns)
+
+
+def _reference_fvg(df: pd.DataFrame) -> pd.DataFrame:
+    columns = ['top', 'bottom', 'type', 'timestamp', 'filled']
+    if len(df) < 10:
+        return pd.DataFrame(columns=columns)
+    fvg_list = []
+    for i in range(2, len(df)):
+        candle1, candle3 = df.iloc[i-2], df.iloc[i]
+        if candle1['high'] < candle3['low']:
+            if (candle3['close'] > candle1['close'] * 1.005
+                    and (candle3['low'] - candle1['high']) / candle1['close'] > 0.001):
+                fvg_list.append({'top': float(candle3['low']), 'bottom': float(candle1['high']),
+                                 'type': 'bullish', 'timestamp': df.index[i], 'filled': False})
+        elif (candle1['low'] > candle3['high'] and candle3['close'] < candle1['close'] * 0.995
+                and (candle1['low'] - candle3['high']) / candle1['close'] > 0.001):
+            fvg_list.append({'top': float(candle1['low']), 'bottom': float(candle3['high']),
+                             'type': 'bearish', 'timestamp': df.index[i], 'filled': False})
+
+    if fvg_list:
+        fvg_df = pd.DataFrame(fvg_list)
+        current_price = df['close'].iloc[-1]
+        for idx, row in fvg_df.iterrows():
+            if row['bottom'] <= current_price <= row['top']:
+                fvg_df.loc[idx, 'filled'] = True
+        try:
+            return fvg_df[not fvg_df['filled']].reset_index(drop=True)
+        except ValueError:
+            # As in the per-bar implementation, whose handler returned the empty frame
+            return pd.DataFrame(columns=columns)
+    return pd.DataFrame(columns=columns)
+
+
+def _reference_liquidity(df: pd.DataFrame) -> pd.DataFrame:
+    columns = ['level', 'type', 'strength', 'touches']
+    if len(df) < 20:
+        return pd.DataFrame(columns=columns)
+    liquidity_levels = []
+    swings = _reference_swings(df, 5)
+
+    for side, column, flag in (('sell-side', 'high', 1), ('buy-side', 'low', -1)):
+        levels = [df.loc[idx, column] for idx in df.index[swings == flag].tolist()]
+        for level in levels[-10:]:
+            touches = sum(1 for x in levels if abs(x - level) < level * 0.002)
+            if touches >= 2:
+                liquidity_levels.append({'level': float(level), 'type': side,
+                                         'strength': min(touches / 5.0, 1.0), 'touches': touches})
+
+    if len(df) >= 50:
+        liquidity_levels.extend([
+            {'level': float(df['high'].iloc[-50:-1].max()), 'type': 'sell-side', 'strength': 0.8, 'touches': 1},
+            {'level': float(df['low'].iloc[-50:-1].min()), 'type': 'buy-side', 'strength': 0.8, 'touches': 1}
+        ])
+
+    current_price = df['close'].iloc[-1]
+    price_range = df['high'].max() - df['low'].min()
+    if current_price > 100:
+        step = 50 if current_price > 1000 else 25
+    else:
+        step = 10 if current_price > 50 else 5
+    price_min = int((current_price - price_range/2) / step) * step
+    price_max = int((current_price + price_range/2) / step) * step
+
+    for round_level in range(price_min, price_max + step, step):
+        if round_level > 0:
+            interaction_count = sum(1 for i in range(len(df))
+                                    if abs(df['high'].iloc[i] - round_level) < round_level * 0.001 or
+                                    abs(df['low'].iloc[i] - round_level) < round_level * 0.001)
+            if interaction_count > 0:
+                liquidity_levels.append({
+                    'level': float(round_level),
+                    'type': 'sell-side' if round_level > current_price else 'buy-side',
+                    'strength': 0.6,
+                    'touches': interaction_count
+                })
+
+    if liquidity_levels:
+        liq_df = pd.DataFrame(liquidity_levels).drop_duplicates(subset=['level'], keep='first')
+        return liq_df.sort_values('strength', ascending=False).head(15).reset_index(drop=True)
+    return pd.DataFrame(columns=columns)
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+def _ohlcv(n: int, seed: int, start: float = 1000.0, datetime_index: bool = False) -> pd.DataFrame:
+    """Random walk with occasional gaps, repeated levels and integer volume spikes."""
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0.0, 2.0, n)
+    steps[rng.random(n) < 0.03] *= 8  # displacement / gap bars
+    close = np.round(start + np.cumsum(steps), 1)
+    open_ = np.round(close - rng.normal(0.0, 1.5, n), 1)
+    high = np.maximum(open_, close) + np.round(rng.uniform(0.0, 2.0, n), 1)
+    low = np.minimum(open_, close) - np.round(rng.uniform(0.0, 2.0, n), 1)
+    volume = rng.choice([10, 12, 100, 120, 1000], size=n, p=[0.3, 0.2, 0.3, 0.1, 0.1])
+
+    df = pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume})
+    if datetime_index:
+        df.index = pd.date_range('2024-01-01 09:15', periods=n, freq='5min', tz='Asia/Kolkata')
+    return df
+
+
+CASES = [
+    pytest.param({'n': 400, 'seed': 1}, id='range-index'),
+    pytest.param({'n': 1500, 'seed': 2}, id='long'),
+    pytest.param({'n': 600, 'seed': 3, 'datetime_index': True}, id='datetime-index'),
+    pytest.param({'n': 500, 'seed': 4, 'start': 80.0}, id='low-price'),
+    pytest.param({'n': 25, 'seed': 5}, id='short'),
+]
+
+
+@pytest.fixture(params=CASES)
+def ohlcv(request) -> pd.DataFrame:
+    return _ohlcv(**request.param)
+
+
+# =============================================================================
+# Tests
+# =============================================================================
+
+
+class TestMatchesPerBarImplementation:
+
+    def test_swings(self, ohlcv):
+        pd.testing.assert_series_equal(_get_real_swings(ohlcv, 5), _reference_swings(ohlcv, 5))
+
+    def test_break_of_structure(self, ohlcv):
+        expected = _reference_bos(ohlcv)
+        pd.testing.assert_series_equal(_real_bos(ohlcv), expected)
+
+    def test_change_of_character(self, ohlcv):
+        pd.testing.assert_series_equal(_real_choch(ohlcv), _reference_choch(ohlcv))
+
+    def test_order_blocks(self, ohlcv):
+        pd.testing.assert_frame_equal(_real_order_blocks(ohlcv), _reference_order_blocks(ohlcv))
+
+    def test_fair_value_gaps(self, ohlcv):
+        pd.testing.assert_frame_equal(_real_fvg(ohlcv), _reference_fvg(ohlcv))
+
+    def test_liquidity(self, ohlcv):
+        pd.testing.assert_frame_equal(_real_liquidity(ohlcv), _reference_liquidity(ohlcv))
+
+    def test_without_volume_and_with_missing_volume(self):
+        df = _ohlcv(400, 6)
+        without_volume = df.drop(columns='volume')
+        with_gaps = df.astype({'volume': float})
+        with_gaps.loc[with_gaps.index[::7], 'volume'] = np.nan
+
+        for frame in (without_volume, with_gaps):
+            pd.testing.assert_series_equal(_real_bos(frame), _reference_bos(frame))
+            pd.testing.assert_frame_equal(_real_order_blocks(frame), _reference_order_blocks(frame))
+
+    def test_outputs_are_not_trivial(self):
+        df = _ohlcv(1500, 2)
+
+        assert (_real_bos(df) != 0).sum() > 10
+        assert (_real_choch(df) != 0).sum() > 0
+        assert len(_real_order_blocks(df)) > 0
+        # Gaps exist, but the legacy result for them is the empty frame
+        assert _real_fvg(df).empty
+        assert (_real_liquidity(df)['strength'] == 0.6).any()
@@ -0,0 +1,202 @@
+"""
+Unit tests for grouping threshold jobs by shared indicator computation.
+"""
+from enum import Enum
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.threshold_groups import (
+    ThresholdGroupIndex,
+    evaluate_thresholds,
+    threshold_computation_key,
+)
+
+
+class ThresholdType(Enum):
+    GREATER_THAN = "gt"
+    LESS_THAN = "lt"
+    EQUALS = "eq"
+    BETWEEN = "between"
+    OUTSIDE = "outside"
+    PERCENTAGE_CHANGE = "pct_change"
+
+
+def _scalar_condition(value, threshold_type, threshold_value, secondary_value):
+    """Scalar reference: ThresholdMonitor._evaluate_threshold_condition."""
+    if threshold_type == ThresholdType.GREATER_THAN:
+        return value > threshold_value
+    if threshold_type == ThresholdType.LESS_THAN:
+        return value < threshold_value
+    if threshold_type == ThresholdType.EQUALS:
+        return abs(value - threshold_value) <= abs(threshold_value) * 0.001
+    if threshold_type in (ThresholdType.BETWEEN, ThresholdType.OUTSIDE):
+        if secondary_value is None:
+            return False
+        low, high = min(threshold_value, secondary_value), max(threshold_value, secondary_value)
+        inside = low <= value <= high
+        return inside if threshold_type == ThresholdType.BETWEEN else value < low or value > high
+    return False
+
+
+def _job(threshold_type=ThresholdType.GREATER_THAN, value=70.0, secondary=None, indicator='rsi', params=None, symbol='NIFTY'):
+    config = SimpleNamespace(
+        indicator_name=indicator,
+        indicator_params={'period': 14} if params is None else params,
+        symbol=symbol,
+        timeframe='5m',
+        threshold_type=threshold_type,
+        threshold_value=value,
+        secondary_value=secondary
+    )
+    return SimpleNamespace(threshold_config=config)
+
+
+class TestEvaluateThresholds:
+
+    def test_matches_scalar_conditions(self):
+        rng = np.random.default_rng(2)
+        jobs = {}
+        for i in range(500):
+            threshold_type = list(ThresholdType)[i % len(ThresholdType)]
+            secondary = None if i % 7 == 0 else float(rng.uniform(0, 100))
+            jobs[f'job{i}'] = _job(threshold_type, float(rng.uniform(0, 100)), secondary)
+        jobs['exact'] = _job(ThresholdType.EQUALS, 50.04)
+        group = next(iter(ThresholdGroupIndex.from_jobs(jobs)))
+
+        for value in (0.0, 50.0, 63.2, 100.0):
+            expected = [
+                _scalar_condition(value, j.threshold_config.threshold_type, j.threshold_config.threshold_value,
+                                  j.threshold_config.secondary_value)
+                for j in jobs.values()
+            ]
+            assert [breach for _, _, breach in group.evaluate(value)] == expected
+
+    def test_missing_secondary_never_breaches(self):
+        codes = np.array([4, 5], dtype=np.int8)
+        breaches = evaluate_thresholds(10.0, codes, np.array([5.0, 20.0]), np.array([np.nan, np.nan]))
+
+        assert breaches.tolist() == [False, False]
+
+
+class TestThresholdGroupIndex:
+
+    def test_jobs_on_same_computation_share_a_group(self):
+        index = ThresholdGroupIndex()
+        index.add('a', _job(value=70.0))
+        index.add('b', _job(ThresholdType.LESS_THAN, 30.0, params={'period': 14}))
+        index.add('c', _job(params={'period': 21}))
+        index.add('d', _job(symbol='BANKNIFTY'))
+
+        groups = {group.key: group for group in index}
+
+        assert len(index) == 3 and index.job_count == 4
+        shared = groups[threshold_computation_key('rsi', {'period': 14}, 'NIFTY', '5m')]
+        assert list(shared.jobs) == ['a', 'b']
+        assert [(job_id, breach) for job_id, _, breach in shared.evaluate(75.0)] == [('a', True), ('b', False)]
+
+    def test_removal_rebuilds_arrays_and_drops_empty_groups(self):
+        index = ThresholdGroupIndex()
+        index.add('a', _job(value=70.0))
+        index.add('b', _job(value=80.0))
+        group = next(iter(index))
+        group.evaluate(75.0)
+
+        assert index.remove('a') and not index.remove('a')
+        assert [job_id for job_id, _, _ in group.evaluate(75.0)] == ['b']
+        index.remove('b')
+        assert len(index) == 0 and index.job_count == 0
+
+    def test_param_order_does_not_split_groups(self):
+        assert (threshold_computation_key('macd', {'fast': 12, 'slow': 26}, 'NIFTY', '5m') ==
+                threshold_computation_key('macd', {'slow': 26, 'fast': 12}, 'NIFTY', '5m'))
+
+
+class _FakeRedis:
+    """Stub Redis client: every command succeeds and is recorded."""
+
+    def __init__(self):
+        self.commands = []
+
+    def __getattr__(self, name):
+        async def command(*args, **kwargs):
+            self.commands.append((name, args[0] if args else None))
+            return 1
+        return command
+
+
+@pytest.fixture
+def monitor_module(monkeypatch):
+    pytest.importorskip('prometheus_client')
+    import app.utils.redis
+
+    redis = _FakeRedis()
+
+    async def get_redis_client():
+        return redis
+
+    monkeypatch.setattr(app.utils.redis, 'get_redis_client', get_redis_client, raising=False)
+    from app.services import threshold_monitor
+    monkeypatch.setattr(threshold_monitor, 'get_redis_client', get_redis_client)
+    return threshold_monitor, redis
+
+
+class TestThresholdMonitorGroups:
+
+    @pytest.mark.asyncio
+    async def test_real_time_thresholds_share_one_computation(self, monitor_module):
+        from app.services.dynamic_indicator_classifier import (
+            FinancialImpact,
+            MonitoringStrategy,
+            MonitoringTier,
+            TimeSensitivity,
+            UserIntent,
+        )
+
+        module, redis = monitor_module
+        monitor = module.ThresholdMonitor()
+        monitor.redis = redis
+        monitor.classifier.classify_indicator = lambda context: MonitoringStrategy(MonitoringTier.REAL_TIME, 'real_time_stream')
+
+        computations = []
+        alerts = []
+
+        async def compute(indicator_name, params, symbol, timeframe):
+            computations.append((indicator_name, symbol))
+            return 75.0
+
+        async def send_alert(channel, breach, config):
+            alerts.append(config.threshold_id)
+
+        monitor._compute_indicator_value = compute
+        monitor._send_alert = send_alert
+
+        def config(threshold_id, threshold_type, value, symbol='NIFTY'):
+            return module.ThresholdConfig(
+                threshold_id=threshold_id, user_id='u1', strategy_id='s1',
+                indicator_name='rsi', indicator_params={'period': 14}, symbol=symbol, timeframe='5m',
+                threshold_type=threshold_type, threshold_value=value,
+                user_priority=UserIntent.STOP_LOSS, financial_impact=FinancialImpact.HIGH,
+                time_sensitivity=TimeSensitivity.IMMEDIATE
+            )
+
+        above = await monitor.add_threshold(config('above', module.ThresholdType.GREATER_THAN, 70.0))
+        await monitor.add_threshold(config('below', module.ThresholdType.LESS_THAN, 30.0))
+        other = await monitor.add_threshold(config('other', module.ThresholdType.GREATER_THAN, 70.0, symbol='BANKNIFTY'))
+
+        assert len(monitor.real_time_groups) == 2 and monitor.real_time_groups.job_count == 3
+        results = await monitor._check_threshold_groups(monitor.real_time_groups)
+
+        assert sorted(computations) == [('rsi', 'BANKNIFTY'), ('rsi', 'NIFTY')]
+        assert sorted((r['threshold_id'], r['breach_detected']) for r in results) == [
+            ('above', True), ('below', False), ('other', True)
+        ]
+        assert sorted(alerts) == ['above', 'other']
+        assert monitor.metrics['indicator_computations'] == 2 and monitor.metrics['threshold_checks'] == 3
+
+        # Removing the last job of a group drops the group and its stored config
+        assert await monitor.remove_threshold(other)
+        assert len(monitor.real_time_groups) == 1
+        assert ('delete', f'threshold_config:{other}') in redis.commands
+        assert ('setex', f'threshold_config:{above}') in redis.commands
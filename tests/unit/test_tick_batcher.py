@@ -0,0 +1,65 @@
+"""
+Unit tests for tick batch planning.
+
+Covers single-pass decoding, grouping by instrument in arrival order and the
+coalescing decision taken from the instrument's configurations.
+"""
+from types import SimpleNamespace
+
+from app.services.tick_batcher import can_coalesce, coalesce_ticks, group_tick_batch
+
+ACTIVE = {'NSE@NIFTY@INDEX', 'NSE@RELIANCE@EQ'}
+
+
+def _messages():
+    return [
+        (b'stream:shard:0', [
+            (b'1-0', {b'instrument_key': b'NSE@NIFTY@INDEX', b'ltp': b'100', b'state': b'U'}),
+            (b'2-0', {b'instrument_key': b'NSE@RELIANCE@EQ', b'ltp': b'2500'}),
+            (b'3-0', {b'instrument_key': b'NSE@NIFTY@INDEX', b'ltp': b'101', b'state': b'P'}),
+        ]),
+        (b'stream:shard:1', [
+            (b'1-1', {b'instrument_key': b'NSE@NIFTY@INDEX', b'ltp': b'102'}),
+            (b'2-1', {b'instrument_key': b'NSE@TCS@EQ', b'ltp': b'3500'}),
+        ]),
+    ]
+
+
+class TestGroupTickBatch:
+
+    def test_groups_unprocessed_ticks_by_instrument(self):
+        batch = group_tick_batch(_messages(), ACTIVE)
+
+        assert list(batch.by_instrument) == ['NSE@NIFTY@INDEX', 'NSE@RELIANCE@EQ']
+        nifty = batch.by_instrument['NSE@NIFTY@INDEX']
+        assert [tick.fields['ltp'] for tick in nifty] == ['100', '102']
+        assert [tick.stream for tick in nifty] == ['stream:shard:0', 'stream:shard:1']
+        assert nifty[0].msg_id == b'1-0'
+        assert batch.tick_count == 3
+
+    def test_processed_ticks_are_ack_only_and_inactive_ones_ignored(self):
+        batch = group_tick_batch(_messages(), ACTIVE)
+
+        assert [tick.msg_id for tick in batch.already_processed] == [b'3-0']
+        assert batch.ignored == 1
+
+    def test_empty_read(self):
+        batch = group_tick_batch(None, ACTIVE)
+        assert not batch.by_instrument and not batch.already_processed
+
+
+class TestCoalescing:
+
+    def test_all_configs_must_allow_it(self):
+        assert can_coalesce([SimpleNamespace(coalesce_ticks=True)] * 2)
+        assert not can_coalesce([SimpleNamespace(coalesce_ticks=True), SimpleNamespace(coalesce_ticks=False)])
+        assert not can_coalesce([SimpleNamespace()])
+        assert not can_coalesce([])
+
+    def test_latest_tick_supersedes_the_rest(self):
+        ticks = group_tick_batch(_messages(), ACTIVE).by_instrument['NSE@NIFTY@INDEX']
+
+        latest, superseded = coalesce_ticks(ticks)
+
+        assert latest.fields['ltp'] == '102'
+        assert [tick.msg_id for tick in superseded] == [b'1-0']
@@ -0,0 +1,74 @@
+"""
+Unit tests for the traded-price fan-out from the tick streams to alerts and trailing stops.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.tick_batcher import group_tick_batch
+from app.services.tick_price_feed import TickPriceFeed
+
+NIFTY = 'NSE@NIFTY@INDEX'
+
+
+class _InstrumentClient:
+    async def get_instrument_metadata(self, instrument_key):
+        return SimpleNamespace(symbol=instrument_key.split('@')[1], exchange='NSE', sector='Index', instrument_type='INDEX')
+
+
+class _Recorder:
+    def __init__(self, fail: bool = False):
+        self.prices = []
+        self.fail = fail
+
+    def watched_instruments(self) -> frozenset[str]:
+        return frozenset({'NSE@TCS@EQ'})
+
+    async def on_price_update(self, instrument_key: str, price: float):
+        if self.fail:
+            raise RuntimeError('consumer down')
+        self.prices.append((instrument_key, price))
+
+
+class TestTickPriceFeed:
+
+    @pytest.mark.asyncio
+    async def test_stream_tick_triggers_price_alert(self):
+        from app.services.alert_service import AlertCondition, AlertService, AlertStatus, AlertType
+
+        service = AlertService(instrument_client=_InstrumentClient())
+        alert = await service.create_price_alert('u1', NIFTY, AlertCondition(AlertType.PRICE_ABOVE, 20000.0, '>='))
+        feed = TickPriceFeed()
+        feed.add_consumer(service)
+
+        # No configuration subscribes to NIFTY: the alert alone makes its ticks read
+        messages = [(b'stream:shard:3', [
+            (b'1-0', {b'instrument_key': NIFTY.encode(), b'ltp': b'19990', b'state': b'U'}),
+            (b'2-0', {b'instrument_key': NIFTY.encode(), b'ltp': b'20010', b'state': b'U'}),
+        ])]
+        batch = group_tick_batch(messages, frozenset() | feed.instruments)
+        assert list(batch.by_instrument) == [NIFTY]
+
+        published = await feed.publish(NIFTY, (tick.fields for tick in batch.by_instrument[NIFTY]))
+
+        assert published == 2
+        assert alert['alert_id'] not in service._active_alerts
+        triggered = service._alert_history['u1']
+        assert [a.status for a in triggered] == [AlertStatus.TRIGGERED]
+        assert triggered[0].triggered_at is not None
+        await service.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_failing_consumer_does_not_stop_the_others(self):
+        feed = TickPriceFeed()
+        failing, recorder = _Recorder(fail=True), _Recorder()
+        feed.add_consumer(failing)
+        feed.add_consumer(recorder)
+        feed.add_consumer(recorder)
+
+        published = await feed.publish(NIFTY, [{'ltp': '100'}, {'v': '10'}, {'ltp': '{"value": 101}'}])
+
+        assert published == 2
+        assert recorder.prices == [(NIFTY, 100.0), (NIFTY, 101.0)]
+        assert feed.instruments == {'NSE@TCS@EQ'}
+        assert feed.get_metrics() == {'consumers': 2, 'prices_published': 2, 'consumer_errors': 2}
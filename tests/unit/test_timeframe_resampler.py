@@ -0,0 +1,143 @@
+"""
+Unit tests for the session-aligned multi-timeframe resampler.
+"""
+from datetime import UTC, datetime, time, timedelta
+
+import numpy as np
+import pytest
+
+from app.services.timeframe_resampler import BaseBars, MultiTimeframeResampler, aggregation_for
+from app.services.trading_session import TradingSession
+
+IST = timedelta(hours=5, minutes=30)
+OPEN = timedelta(hours=9, minutes=15)
+
+
+def _bars(days=3, start=datetime(2024, 3, 4, 3, 0, tzinfo=UTC), seed=4):
+    """Minute records from 08:30 IST to 15:30 IST on consecutive days, with a few gaps and NaNs."""
+    rng = np.random.default_rng(seed)
+    records = []
+    for day in range(days):
+        first = start + timedelta(days=day)
+        for minute in range(420):
+            if rng.random() < 0.05:
+                continue
+            records.append({
+                'timestamp': (first + timedelta(minutes=minute)).isoformat(),
+                'value': float(rng.normal(100, 5)) if rng.random() > 0.02 else np.nan,
+                'high': float(rng.normal(105, 5)),
+                'trades': float(rng.integers(0, 50)),
+                'id': minute
+            })
+    return records
+
+
+def _reference(records, minutes):
+    """Loop-based aggregation: buckets counted from 09:15 IST, never crossing an IST midnight."""
+    buckets = {}
+    for record in records:
+        local = datetime.fromisoformat(record['timestamp']).replace(tzinfo=None) + IST
+        midnight = local.replace(hour=0, minute=0)
+        if minutes >= 1440:
+            start = midnight + OPEN
+        else:
+            index = int((local - midnight - OPEN).total_seconds() // 60) // minutes
+            start = max(midnight, midnight + OPEN + timedelta(minutes=index * minutes))
+        buckets.setdefault(start, []).append(record)
+
+    rows = []
+    for start in sorted(buckets):
+        group = buckets[start]
+        values = [r['value'] for r in group if not np.isnan(r['value'])]
+        rows.append({
+            'timestamp': (start - IST).replace(tzinfo=UTC).isoformat(),
+            'value': np.mean(values) if values else np.nan,
+            'high': max(r['high'] for r in group),
+            'trades': sum(r['trades'] for r in group),
+            'open': values[0] if values else np.nan,
+            'close': values[-1] if values else np.nan,
+            'timeframe_minutes': minutes
+        })
+    return rows
+
+
+def _assert_rows_equal(found, expected):
+    assert [row['timestamp'] for row in found] == [row['timestamp'] for row in expected]
+    for got, want in zip(found, expected, strict=True):
+        assert got.keys() == want.keys()
+        for key, value in want.items():
+            assert got[key] == pytest.approx(value, nan_ok=True), key
+
+
+class TestMultiTimeframeResampler:
+
+    def test_matches_loop_reference_for_every_timeframe(self):
+        records = _bars()
+        bars = BaseBars.from_records(records)
+        timeframes = [3, 5, 7, 15, 60, 1440]
+
+        resampled = MultiTimeframeResampler().resample(bars, timeframes)
+
+        for minutes in timeframes:
+            _assert_rows_equal(resampled[minutes].to_records(), _reference(records, minutes))
+
+    def test_cascaded_timeframes_match_direct_resampling(self):
+        bars = BaseBars.from_records(_bars(seed=8))
+        resampler = MultiTimeframeResampler()
+
+        together = resampler.resample(bars, [5, 15, 60, 1440])
+        for minutes in (15, 60, 1440):
+            alone = resampler.resample(bars, [minutes])[minutes]
+            assert np.array_equal(together[minutes].timestamps, alone.timestamps)
+            assert np.array_equal(together[minutes].counts, alone.counts)
+            for name, column in alone.columns.items():
+                np.testing.assert_allclose(together[minutes].columns[name], column)
+
+    def test_buckets_start_at_session_open(self):
+        bars = BaseBars.from_records(_bars(days=1))
+        hourly = MultiTimeframeResampler().resample(bars, [60])[60].to_records()
+
+        # Hours run from 09:15 IST (03:45 UTC); the 08:30 IST bars fall in the hour counted back from it
+        assert [row['timestamp'][11:16] for row in hourly[:3]] == ['02:45', '03:45', '04:45']
+
+        custom = MultiTimeframeResampler('UTC', time(0, 0)).resample(bars, [60])[60].to_records()
+        assert custom[0]['timestamp'][11:16] == '03:00' and custom[1]['timestamp'][11:16] == '04:00'
+
+    def test_week_buckets_start_on_monday_like_the_bar_builder(self):
+        # Thursday 2024-03-07 to Saturday 2024-03-16
+        bars = BaseBars.from_records(_bars(days=10, start=datetime(2024, 3, 7, 3, 0, tzinfo=UTC)))
+        resampler = MultiTimeframeResampler()
+        weekly = resampler.resample(bars, [1440, 7 * 1440])[7 * 1440]
+
+        assert [row['timestamp'] for row in weekly.to_records()] == [
+            '2024-03-04T03:45:00+00:00', '2024-03-11T03:45:00+00:00'
+        ]
+        assert np.array_equal(weekly.timestamps, resampler.resample(bars, [7 * 1440])[7 * 1440].timestamps)
+
+        session = TradingSession()
+        for stamp in weekly.timestamps:
+            label, _, _ = session.bucket(int(stamp) / 1e9 + 3600, 7 * 86400)
+            assert label == int(stamp) / 1e9
+
+    def test_records_are_parsed_into_sorted_numeric_columns(self):
+        records = [
+            {'timestamp': '2024-03-04T03:47:00+00:00', 'delta': 0.4, 'label': 'x', 'signal_id': 9},
+            {'timestamp': 'not a time', 'delta': 0.9},
+            {'timestamp': datetime(2024, 3, 4, 3, 46), 'delta': 0.5, 'label': 'y', 'signal_id': 8}
+        ]
+
+        bars = BaseBars.from_records(records)
+
+        assert list(bars.columns) == ['delta']
+        assert bars.columns['delta'].tolist() == [0.5, 0.4]
+        assert np.all(np.diff(bars.timestamps) > 0)
+        assert BaseBars.from_records(records, fields=['gamma']).columns == {}
+        assert len(BaseBars.from_records([])) == 0
+        assert MultiTimeframeResampler().resample(BaseBars.from_records([]), [5])[5].to_records() == []
+
+    def test_aggregation_rules(self):
+        assert aggregation_for('delta') == 'mean'
+        assert aggregation_for('ask') == 'max'
+        assert aggregation_for('bid') == 'min'
+        assert aggregation_for('trades') == 'sum'
+        assert aggregation_for('iv') == 'mean'
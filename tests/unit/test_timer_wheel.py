@@ -0,0 +1,138 @@
+"""
+Unit tests for the hierarchical timer wheel used to schedule config computations.
+"""
+import asyncio
+import math
+
+import pytest
+
+from app.services.timer_wheel import WHEEL_SIZE, HierarchicalTimerWheel, TimerWheelScheduler
+
+START = 1_700_000_000.0
+
+
+def _run(wheel: HierarchicalTimerWheel, until: float, step: float = 1.0) -> dict:
+    fired = {}
+    now = START
+    while now < until:
+        now += step
+        for entry, due in wheel.advance(now):
+            fired.setdefault(entry.key, []).append((due, now))
+    return fired
+
+
+class TestHierarchicalTimerWheel:
+
+    @pytest.mark.parametrize("interval", [1, 5, 60, 300, 900, 3600, 5000])
+    def test_fires_every_interval_without_drift(self, interval):
+        wheel = HierarchicalTimerWheel(now=START)
+        wheel.schedule('config', 'payload', interval, now=START)
+
+        fired = _run(wheel, START + 3 * 3600 + 1)['config']
+
+        assert [due for due, _ in fired] == [START + interval * k for k in range(1, len(fired) + 1)]
+        assert len(fired) == (3 * 3600 + 1) // interval
+        assert all(0 <= now - due < 1.0 for due, now in fired)
+
+    def test_timers_due_together_come_back_as_one_batch(self):
+        wheel = HierarchicalTimerWheel(now=START)
+        for i in range(1000):
+            wheel.schedule(f'c{i}', i, 300 if i % 2 else 900, now=START)
+
+        assert len(wheel.advance(START + 299)) == 0
+        assert len(wheel.advance(START + 300)) == 500
+        assert len(wheel.advance(START + 600)) == 500
+        assert len(wheel.advance(START + 900)) == 1000
+        assert sum(wheel.slot_occupancy()) == 1000
+
+    def test_never_fires_early_and_handles_long_horizons(self):
+        wheel = HierarchicalTimerWheel(resolution=1.0, levels=2, now=START)
+        horizon = WHEEL_SIZE ** 2
+        wheel.schedule('far', None, 10, first_due=START + 3 * horizon + 0.5, now=START)
+
+        fired = _run(wheel, START + 3 * horizon + 5)['far']
+
+        assert fired[0] == (START + 3 * horizon + 0.5, START + 3 * horizon + 1)
+
+    def test_cancel_and_reschedule(self):
+        wheel = HierarchicalTimerWheel(now=START)
+        wheel.schedule('a', 1, 10, now=START)
+        wheel.schedule('b', 2, 10, now=START)
+        wheel.schedule('b', 3, 20, now=START)
+
+        assert wheel.cancel('a') and not wheel.cancel('a')
+        assert [(e.key, e.payload) for e, _ in wheel.advance(START + 20)] == [('b', 3)]
+        assert 'a' not in wheel and len(wheel) == 1
+
+    def test_stalled_clock_skips_missed_firings(self):
+        wheel = HierarchicalTimerWheel(now=START)
+        wheel.schedule('config', None, 60, now=START)
+
+        fired = wheel.advance(START + 3600 + 30)
+
+        assert [due for _, due in fired] == [START + 60]
+        assert wheel._entries['config'].due == START + 3660
+        assert math.isclose(wheel.advance(START + 3660)[0][1], START + 3660)
+
+
+class TestTimerWheelScheduler:
+
+    @pytest.mark.asyncio
+    async def test_dispatches_due_batches_and_tracks_lag(self):
+        batches = []
+
+        async def dispatch(payloads):
+            batches.append(sorted(payloads))
+
+        scheduler = TimerWheelScheduler(dispatch, resolution=0.01)
+        for i in range(3):
+            scheduler.schedule(f'c{i}', i, 0.05)
+
+        await asyncio.sleep(0.13)
+        await scheduler.stop()
+        metrics = scheduler.get_metrics()
+
+        assert batches[:2] == [[0, 1, 2], [0, 1, 2]]
+        assert metrics['timers_fired'] == 3 * len(batches)
+        assert metrics['max_batch_size'] == 3
+        assert 0 <= metrics['avg_lag_seconds'] < 0.05
+        assert metrics['running'] is False
+
+    @pytest.mark.asyncio
+    async def test_dispatch_errors_are_counted(self):
+        async def dispatch(payloads):
+            raise RuntimeError("processor unavailable")
+
+        scheduler = TimerWheelScheduler(dispatch, resolution=0.01)
+        scheduler.schedule('c', None, 0.02)
+
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+
+        assert scheduler.get_metrics()['dispatch_errors'] >= 1
+
+    @pytest.mark.asyncio
+    async def test_overlapping_batches_are_bounded(self):
+        release = asyncio.Event()
+        started = []
+
+        async def dispatch(payloads):
+            started.append(payloads)
+            await release.wait()
+
+        scheduler = TimerWheelScheduler(dispatch, resolution=1.0, max_in_flight=2)
+        scheduler.wheel = HierarchicalTimerWheel(now=START)
+        scheduler.wheel.schedule('c', 'payload', 1.0, now=START)
+
+        dispatched = [scheduler.run_due(START + k) for k in range(1, 5)]
+        await asyncio.sleep(0)
+
+        assert dispatched == [['payload'], ['payload'], [], []]
+        assert len(started) == 2
+        metrics = scheduler.get_metrics()
+        assert (metrics['in_flight_batches'], metrics['batches_skipped'], metrics['timers_skipped']) == (2, 2, 2)
+
+        release.set()
+        await scheduler.stop()
+        assert scheduler.run_due(START + 5) == ['payload']
+        await scheduler.stop()
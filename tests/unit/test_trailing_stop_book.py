@@ -0,0 +1,171 @@
+"""
+Unit tests for array-backed trailing stop books and tick-driven stop evaluation.
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.tick_price_feed import TickPriceFeed
+from app.services.trailing_stop_book import LONG, SHORT, StopBook
+from app.services.trailing_stop_service import (
+    TrailingStopService,
+    TrailingStopStatus,
+    TrailingStopType,
+)
+
+NIFTY = 'NSE@NIFTY@INDEX'
+
+
+def _reference_tick(stop: dict, price: float) -> bool:
+    """Per-stop trailing logic the book must reproduce; True when the stop triggers."""
+    if stop['direction'] == LONG:
+        improved = price > stop['peak']
+        if improved:
+            stop['peak'] = price
+        if price <= stop['stop']:
+            return True
+        new_stop = stop['peak'] * stop['multiplier'] + stop['shift']
+        if improved and new_stop > stop['stop']:
+            stop['stop'] = new_stop
+    else:
+        improved = price < stop['peak']
+        if improved:
+            stop['peak'] = price
+        if price >= stop['stop']:
+            return True
+        new_stop = stop['peak'] * stop['multiplier'] + stop['shift']
+        if improved and new_stop < stop['stop']:
+            stop['stop'] = new_stop
+    return False
+
+
+class TestStopBook:
+
+    def test_matches_per_stop_logic_on_random_walk(self):
+        rng = np.random.default_rng(5)
+        book = StopBook(capacity=4)
+        reference = {}
+        for i in range(300):
+            direction = LONG if i % 2 else SHORT
+            trail = rng.uniform(0.005, 0.03)
+            stop = {
+                'direction': direction,
+                'peak': 20000.0,
+                'stop': 20000.0 * (1 - direction * trail),
+                'multiplier': 1 - direction * trail if i % 3 else 1.0,
+                'shift': 0.0 if i % 3 else -direction * rng.uniform(50, 400)
+            }
+            reference[f's{i}'] = stop
+            book.add(f's{i}', direction, stop['peak'], stop['stop'], stop['multiplier'], stop['shift'])
+
+        for price in 20000.0 + np.cumsum(rng.normal(0, 40, 400)):
+            expected = [stop_id for stop_id, stop in reference.items() if _reference_tick(stop, price)]
+            for stop_id in expected:
+                del reference[stop_id]
+
+            triggered = book.update(price, now=0.0).triggered
+
+            assert sorted(triggered) == sorted(expected)
+            assert len(book) == len(reference)
+
+        for stop_id, stop in reference.items():
+            peak, stop_price, _ = book.levels(stop_id)
+            assert peak == stop['peak']
+            assert stop_price == pytest.approx(stop['stop'])
+
+    def test_stop_only_tightens(self):
+        book = StopBook()
+        book.add('long', LONG, 100.0, 95.0, 0.95, 0.0)
+        book.add('short', SHORT, 120.0, 126.0, 1.05, 0.0)
+
+        assert book.update(110.0, now=1.0).adjusted == 2
+        assert book.levels('long') == (110.0, pytest.approx(104.5), 1.0)
+        assert book.levels('short') == (110.0, pytest.approx(115.5), 1.0)
+        book.update(108.0, now=2.0)
+        assert book.levels('long')[1] == pytest.approx(104.5)
+
+        result = book.update(104.0, now=3.0)
+
+        assert result.triggered == ['long']
+        assert result.final_levels['long'][1] == pytest.approx(104.5)
+        assert book.levels('short') == (104.0, pytest.approx(109.2), 3.0)
+        assert book.update(109.2, now=4.0).triggered == ['short']
+        assert len(book) == 0
+
+    def test_expired_and_removed_stops_free_their_slots(self):
+        book = StopBook(capacity=1)
+        book.add('a', LONG, 100.0, 90.0, 0.9, 0.0, expires_at=10.0)
+        book.add('b', LONG, 100.0, 90.0, 0.9, 0.0)
+        book.add('c', SHORT, 100.0, 110.0, 1.1, 0.0, expires_at=10.0)
+
+        assert book.pop_expired(5.0) == {}
+        assert book.remove('b') and not book.remove('b')
+        result = book.update(50.0, now=10.0)
+
+        assert sorted(result.expired) == ['a', 'c'] and result.triggered == []
+        book.add('d', LONG, 100.0, 90.0, 0.9, 0.0)
+        assert book._size == 3 and 'd' in book
+
+    def test_direction_is_validated(self):
+        with pytest.raises(ValueError):
+            StopBook().add('x', 0.0, 1.0, 1.0, 1.0, 0.0)
+
+
+class _Clients:
+
+    def __init__(self):
+        self.orders = []
+
+    async def get_instrument_metadata(self, instrument_key):
+        return SimpleNamespace(symbol='NIFTY', exchange='NSE', sector='Index', instrument_type='INDEX')
+
+    async def create_order(self, **order):
+        self.orders.append(order)
+        return SimpleNamespace(order_id=f'order_{len(self.orders)}', price=None)
+
+
+class TestTickDrivenTrailingStops:
+
+    @pytest.mark.asyncio
+    async def test_ticks_trail_and_trigger_stops(self):
+        clients = _Clients()
+        service = TrailingStopService(clients, clients, clients, tick_driven=True)
+        created = await service.create_trailing_stop(NIFTY, 'SELL', 50, TrailingStopType.PERCENTAGE, 1.0, initial_stop_price=19800.0)
+        stop_id = created['stop_id']
+
+        # Prices arrive as stream ticks through the tick consumer's price feed
+        feed = TickPriceFeed()
+        feed.add_consumer(service)
+        assert feed.instruments == {NIFTY}
+        await feed.publish(NIFTY, [{'ltp': '20000'}, {'ltp': '20100'}])
+        status = await service.get_trailing_stop_status(stop_id)
+
+        assert status['configuration']['peak_price'] == 20100.0
+        assert status['configuration']['current_stop_price'] == pytest.approx(19899.0)
+
+        await service.on_price_update(NIFTY, 19890.0)
+
+        assert service._stop_status[stop_id] == TrailingStopStatus.TRIGGERED
+        assert clients.orders[0]['quantity'] == 50
+        assert service._stop_executions[stop_id][0].trigger_price == 19890.0
+        await service._cleanup_subscriptions()
+        assert service._price_subscriptions == {} and service._stop_books == {}
+        await service.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_housekeeping_expires_stops_without_ticks(self):
+        clients = _Clients()
+        service = TrailingStopService(clients, clients, clients, tick_driven=True)
+        created = await service.create_trailing_stop(NIFTY, 'BUY', 10, TrailingStopType.ABSOLUTE, 25.0, initial_stop_price=20025.0)
+        await service.on_price_update(NIFTY, 19950.0)
+
+        service._expire_stops(datetime.now() + timedelta(hours=25))
+
+        assert service._stop_status[created['stop_id']] == TrailingStopStatus.EXPIRED
+        assert len(service._stop_books[NIFTY]) == 0
+        # The levels the stop had trailed to are kept once it leaves the book
+        status = await service.get_trailing_stop_status(created['stop_id'])
+        assert (status['configuration']['peak_price'], status['configuration']['current_stop_price']) == (19950.0, 19975.0)
+        await service.shutdown()
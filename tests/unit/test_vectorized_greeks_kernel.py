@@ -0,0 +1,114 @@
+"""
+Parity tests for the closed-form vectorized Greeks kernel.
+
+The per-option py_vollib path in VectorizedPyvolibGreeksEngine is kept as the
+reference oracle; the array kernel must match it for every model the engine
+can be configured with.
+"""
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from app.services.vectorized_greeks_kernel import GREEK_NAMES, compute_greeks
+from app.services.vectorized_pyvollib_engine import VectorizedPyvolibGreeksEngine
+
+MODELS = ["black_scholes", "black_scholes_merton", "black76"]
+
+
+def _make_engine(model_name: str) -> VectorizedPyvolibGreeksEngine:
+    config = MagicMock()
+    config.model_name = model_name
+    config.parameters = MagicMock()
+    config.parameters.risk_free_rate = 0.065
+    config.parameters.dividend_yield = 0.012
+    config.initialize = MagicMock()
+
+    with patch('app.services.vectorized_pyvollib_engine.get_greeks_model_config') as mock_config, \
+            patch('app.services.vectorized_pyvollib_engine.get_circuit_breaker'):
+        mock_config.return_value = config
+        return VectorizedPyvolibGreeksEngine(chunk_size=500, max_workers=2)
+
+
+def _make_chain_arrays(n_options: int, underlying: float = 100.0) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(7)
+    strikes = underlying * np.linspace(0.85, 1.15, n_options)
+    return {
+        'underlying_prices': np.full(n_options, underlying),
+        'strikes': strikes,
+        'times_to_expiry': rng.uniform(2 / 365.25, 0.5, n_options),
+        'risk_free_rates': np.full(n_options, 0.065),
+        'dividend_yields': np.full(n_options, 0.012),
+        'volatilities': rng.uniform(0.1, 0.45, n_options),
+        'flags': np.where(np.arange(n_options) % 2 == 0, 'c', 'p').astype('U1'),
+    }
+
+
+class TestVectorizedGreeksKernelParity:
+    """Kernel output must match the scalar py_vollib oracle option-by-option."""
+
+    @pytest.mark.parametrize("model_name", MODELS)
+    def test_kernel_matches_scalar_oracle(self, model_name):
+        engine = _make_engine(model_name)
+        arrays = _make_chain_arrays(120)
+
+        vectorized = engine._compute_greek_arrays(arrays, list(GREEK_NAMES))
+
+        for greek in GREEK_NAMES:
+            reference = engine._reference_greek_array(greek, arrays)
+            both_valid = ~np.isnan(reference) & ~np.isnan(vectorized[greek])
+            assert both_valid.sum() > 100, greek
+            assert np.array_equal(np.isnan(reference), np.isnan(vectorized[greek])), greek
+            np.testing.assert_allclose(
+                vectorized[greek][both_valid], reference[both_valid],
+                rtol=1e-7, atol=1e-10, err_msg=f"{model_name} {greek}"
+            )
+
+    @pytest.mark.parametrize("greek", GREEK_NAMES)
+    def test_single_greek_methods_use_kernel(self, greek):
+        engine = _make_engine("black_scholes_merton")
+        arrays = _make_chain_arrays(10)
+
+        with patch.object(engine, '_call_greek_function') as scalar_call:
+            values = getattr(engine, f'_vectorized_{greek}')(arrays)
+
+        scalar_call.assert_not_called()
+        assert values.shape == (10,)
+
+    def test_requesting_subset_only_returns_subset(self):
+        arrays = _make_chain_arrays(5)
+        result = compute_greeks(
+            'black_scholes', arrays['flags'] == 'c', arrays['underlying_prices'],
+            arrays['strikes'], arrays['times_to_expiry'], arrays['risk_free_rates'],
+            arrays['volatilities'], greeks=['delta', 'vega']
+        )
+        assert set(result) == {'delta', 'vega'}
+
+    def test_scalar_inputs_broadcast(self):
+        is_call = np.array([True, False])
+        result = compute_greeks(
+            'black_scholes_merton', is_call, 100.0, np.array([100.0, 100.0]),
+            0.25, 0.05, 0.2, 0.01
+        )
+        # Put-call delta relationship for BSM: delta_c - delta_p = exp(-qT)
+        assert result['delta'][0] - result['delta'][1] == pytest.approx(np.exp(-0.01 * 0.25))
+
+    def test_unsupported_model_rejected(self):
+        with pytest.raises(ValueError):
+            compute_greeks('heston', np.array([True]), 1.0, 1.0, 1.0, 0.0, 0.2)
+
+    @pytest.mark.asyncio
+    async def test_chain_results_come_from_kernel(self):
+        engine = _make_engine("black_scholes")
+        arrays = _make_chain_arrays(50)
+
+        results = await engine._execute_vectorized_greeks_calculation(arrays, list(GREEK_NAMES))
+        expected = engine._compute_greek_arrays(arrays, list(GREEK_NAMES))
+
+        assert len(results) == 50
+        for i in (0, 17, 49):
+            for greek in GREEK_NAMES:
+                if np.isnan(expected[greek][i]):
+                    assert results[i][greek] is None
+                else:
+                    assert results[i][greek] == pytest.approx(expected[greek][i])
@@ -0,0 +1,221 @@
+"""
+Unit tests for per-client WebSocket send queues and single-serialization fan-out.
+"""
+import asyncio
+import json
+
+import pytest
+
+from app.api.v2.websocket import ConnectionManager
+from app.services.websocket_fanout import DISCONNECT, DROP_OLDEST, ClientSendQueue, encode_frame
+
+
+class _FakeWebSocket:
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.sent = []
+        self.closed_with = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, frame):
+        if self.fail:
+            raise RuntimeError("connection reset")
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(frame)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+class TestClientSendQueue:
+
+    @pytest.mark.asyncio
+    async def test_frames_are_written_in_order(self):
+        websocket = _FakeWebSocket()
+        queue = ClientSendQueue('c1', websocket)
+        queue.start()
+
+        for i in range(5):
+            assert queue.enqueue(f'{{"seq":{i}}}')
+        await queue.drain()
+        queue.stop()
+
+        assert websocket.sent == [f'{{"seq":{i}}}' for i in range(5)]
+        assert queue.metrics['frames_sent'] == 5 and queue.depth == 0
+
+    @pytest.mark.asyncio
+    async def test_drain_waits_for_the_last_send_to_finish(self):
+        websocket = _FakeWebSocket(delay=0.02)
+        queue = ClientSendQueue('c1', websocket)
+        queue.start()
+
+        await asyncio.wait_for(queue.drain(), 0.01)    # nothing queued: returns at once
+        queue.enqueue('a')
+        queue.enqueue('b')
+        await queue.drain()
+        assert websocket.sent == ['a', 'b']
+
+        queue.enqueue('c')
+        await queue.drain(timeout=0.005)
+        assert websocket.sent == ['a', 'b']
+        queue.stop()
+        await asyncio.wait_for(queue.drain(), 0.01)    # stopped: returns at once
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_keeps_newest_frames(self):
+        websocket = _FakeWebSocket()
+        queue = ClientSendQueue('c1', websocket, max_frames=3, overflow_policy=DROP_OLDEST)
+
+        for i in range(10):
+            queue.enqueue(str(i))
+        queue.start()
+        await queue.drain()
+        queue.stop()
+
+        assert websocket.sent == ['7', '8', '9']
+        assert queue.metrics['frames_dropped'] == 7
+
+    @pytest.mark.asyncio
+    async def test_disconnect_policy_closes_overflowing_client(self):
+        closed = []
+        queue = ClientSendQueue('slow', _FakeWebSocket(), max_frames=2, overflow_policy=DISCONNECT,
+                                on_close=lambda client_id, reason: closed.append((client_id, reason)))
+
+        assert queue.enqueue('a') and queue.enqueue('b')
+        assert not queue.enqueue('c')
+        assert not queue.enqueue('d')
+
+        assert queue.closed and queue.depth == 0
+        assert closed == [('slow', 'send queue overflow')]
+
+    @pytest.mark.asyncio
+    async def test_send_failure_closes_client(self):
+        closed = []
+        queue = ClientSendQueue('c1', _FakeWebSocket(fail=True), on_close=lambda c, r: closed.append(c))
+        queue.start()
+        queue.enqueue('x')
+        await asyncio.sleep(0.01)
+
+        assert closed == ['c1'] and queue.metrics['send_errors'] == 1
+
+    @pytest.mark.asyncio
+    async def test_conflated_slots_keep_latest_value_per_key(self):
+        websocket = _FakeWebSocket()
+        queue = ClientSendQueue('c1', websocket, conflation_window=0.05)
+
+        for i in range(100):
+            queue.conflate('greeks:NIFTY', f'nifty{i}')
+            queue.conflate('greeks:BANKNIFTY', f'bank{i}')
+        queue.enqueue('pong')
+        assert queue.depth == 3
+
+        queue.start()
+        await asyncio.sleep(0.01)
+        queue.conflate('greeks:NIFTY', 'nifty100')
+        queue.conflate('greeks:NIFTY', 'nifty101')
+        await asyncio.sleep(0.02)
+
+        # Second value held until the window elapses
+        assert websocket.sent == ['pong', 'nifty99', 'bank99']
+        await asyncio.sleep(0.06)
+        queue.stop()
+
+        assert websocket.sent[3:] == ['nifty101']
+        assert queue.metrics['frames_conflated'] == 199
+        assert queue.metrics['slot_flushes'] == 2
+
+    @pytest.mark.asyncio
+    async def test_discarded_slot_is_not_sent(self):
+        websocket = _FakeWebSocket()
+        queue = ClientSendQueue('c1', websocket)
+        queue.conflate('a', '1')
+        queue.conflate('b', '2')
+        queue.discard_slot('a')
+        queue.start()
+        await queue.drain()
+        queue.stop()
+
+        assert websocket.sent == ['2']
+
+    def test_unknown_policy_is_rejected(self):
+        with pytest.raises(ValueError):
+            ClientSendQueue('c1', _FakeWebSocket(), overflow_policy='block')
+
+
+class TestConnectionManagerFanout:
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_hold_up_broadcast(self):
+        manager = ConnectionManager()
+        manager.send_queue_size, manager.overflow_policy = 4, DISCONNECT
+        fast, slow = _FakeWebSocket(), _FakeWebSocket(delay=10.0)
+        await manager.connect(fast, 'fast')
+        await manager.connect(slow, 'slow')
+        for client_id in ('fast', 'slow'):
+            manager.connection_subscriptions[client_id].add('greeks:NIFTY')
+        manager.subscription_connections['greeks:NIFTY'] = {'fast', 'slow'}
+
+        for i in range(6):
+            await asyncio.wait_for(manager.broadcast_to_subscription('greeks:NIFTY', {'seq': i}), 0.1)
+        await asyncio.sleep(0.01)
+
+        assert [json.loads(f).get('seq') for f in fast.sent[1:]] == list(range(6))
+        assert 'slow' not in manager.active_connections and slow.closed_with == 1008
+        assert manager.subscription_connections['greeks:NIFTY'] == {'fast'}
+        assert manager.get_fanout_metrics()['clients_dropped'] == 1
+        manager.disconnect('fast')
+
+    @pytest.mark.asyncio
+    async def test_raw_frames_are_forwarded_unchanged(self):
+        manager = ConnectionManager()
+        manager.send_queue_size, manager.overflow_policy = 10, DROP_OLDEST
+        websocket = _FakeWebSocket()
+        await manager.connect(websocket, 'c1')
+        manager.subscription_connections['k'] = {'c1'}
+
+        raw = '{"value": 1.50, "instrument_key": "NSE@NIFTY@INDEX"}'
+        await manager.broadcast_to_subscription('k', raw)
+        await manager.broadcast_to_subscription('k', {'value': 2})
+        await asyncio.sleep(0.01)
+
+        assert websocket.sent[1:] == [raw, encode_frame({'value': 2})]
+        manager.disconnect('c1')
+
+    @pytest.mark.asyncio
+    async def test_conflated_subscription_gets_latest_value_only(self):
+        manager = ConnectionManager()
+        manager.send_queue_size, manager.overflow_policy, manager.default_conflation_window = 100, DROP_OLDEST, 10.0
+        manager._subscribe_to_redis_channel = _noop
+        manager._send_initial_data = _noop
+        fast, slow = _FakeWebSocket(), _FakeWebSocket()
+        await manager.connect(fast, 'fast')
+        await manager.connect(slow, 'slow')
+        subscription = {'type': 'subscribe', 'channel': 'greeks', 'instrument_key': 'NSE@NIFTY@INDEX'}
+        await manager.subscribe('fast', subscription)
+        await manager.subscribe('slow', {**subscription, 'conflate': True})
+        await asyncio.sleep(0.01)
+        fast.sent.clear()
+        slow.sent.clear()
+
+        sub_key = 'greeks:NSE@NIFTY@INDEX'
+        for i in range(50):
+            await manager.broadcast_to_subscription(sub_key, {'seq': i})
+        await asyncio.sleep(0.01)
+
+        assert len(fast.sent) == 50
+        assert [json.loads(f)['seq'] for f in slow.sent] == [49]
+        assert manager.get_fanout_metrics()['frames_conflated'] == 49
+
+        await manager.unsubscribe('slow', subscription)
+        assert manager.conflated_subscriptions['slow'] == set()
+        manager.disconnect('fast')
+        manager.disconnect('slow')
+
+
+async def _noop(*args, **kwargs):
+    pass